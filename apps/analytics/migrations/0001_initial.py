@@ -0,0 +1,54 @@
+# Generated by Django 2.2.20 on 2026-10-18 05:25
+
+import django.contrib.postgres.fields.jsonb
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("challenges", "0135_alter_challenge_min_ecs_workers_default"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                ("day", models.DateField(db_index=True)),
+                ("status", models.CharField(max_length=30)),
+                ("submission_count", models.PositiveIntegerField(default=0)),
+                (
+                    "execution_time_histogram",
+                    django.contrib.postgres.fields.jsonb.JSONField(
+                        blank=True, default=dict
+                    ),
+                ),
+                (
+                    "challenge_phase",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="submission_daily_rollups",
+                        to="challenges.ChallengePhase",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "submission_daily_rollup",
+                "unique_together": {("challenge_phase", "day", "status")},
+            },
+        ),
+    ]
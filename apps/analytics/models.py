@@ -1 +1,47 @@
-# Create your models here.
+from __future__ import unicode_literals
+
+from base.models import TimeStampedModel
+from challenges.models import ChallengePhase
+from django.contrib.postgres.fields import JSONField
+from django.db import models
+
+
+class SubmissionDailyRollup(TimeStampedModel):
+    """
+    Number of submissions a challenge phase received on a day with a given
+    status, with a histogram of their execution times. Rows are recomputed
+    by the ``update_submission_rollups`` task for the days whose submissions
+    changed, so dashboards read a few rows per day instead of submissions.
+    """
+
+    challenge_phase = models.ForeignKey(
+        ChallengePhase,
+        related_name="submission_daily_rollups",
+        on_delete=models.CASCADE,
+    )
+    day = models.DateField(db_index=True)
+    status = models.CharField(max_length=30)
+    submission_count = models.PositiveIntegerField(default=0)
+    # Cumulative number of submissions which ran for at most the number of
+    # seconds in the key, "+Inf" counting every evaluated submission
+    execution_time_histogram = JSONField(default=dict, blank=True)
+
+    class Meta:
+        app_label = "analytics"
+        db_table = "submission_daily_rollup"
+        unique_together = ("challenge_phase", "day", "status")
+
+
+class RollupWatermark(TimeStampedModel):
+    """
+    Time up to which rollups were last brought up to date, kept in the
+    database so that it survives cache evictions and restarts. The next
+    update only recomputes what changed since.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    watermark = models.DateTimeField()
+
+    class Meta:
+        app_label = "analytics"
+        db_table = "rollup_watermark"
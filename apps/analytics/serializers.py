@@ -26,6 +26,43 @@ class ChallengePhaseSubmissionAnalyticsSerializer(serializers.Serializer):
     challenge_phase = serializers.IntegerField()
 
 
+class ChallengePhaseSubmissionAggregatesSerializer(serializers.Serializer):
+    challenge_phase = serializers.IntegerField()
+    total_submissions = serializers.IntegerField()
+    participant_team_count = serializers.IntegerField()
+    flagged_submissions_count = serializers.IntegerField()
+    public_submissions_count = serializers.IntegerField()
+    status_count = serializers.DictField(child=serializers.IntegerField())
+    last_submission_timestamp = serializers.DateTimeField(
+        format=None, allow_null=True
+    )
+    daily_submissions_count = serializers.IntegerField()
+    weekly_submissions_count = serializers.IntegerField()
+    monthly_submissions_count = serializers.IntegerField()
+
+
+class ChallengeSubmissionAnalytics:
+    def __init__(self, challenge_pk, challenge_phases):
+        self.challenge = challenge_pk
+        self.challenge_phases = challenge_phases
+        self.last_submission_timestamp = max(
+            (
+                challenge_phase["last_submission_timestamp"]
+                for challenge_phase in challenge_phases
+                if challenge_phase["last_submission_timestamp"]
+            ),
+            default=None,
+        )
+
+
+class ChallengeSubmissionAnalyticsSerializer(serializers.Serializer):
+    challenge = serializers.IntegerField()
+    last_submission_timestamp = serializers.DateTimeField(
+        format=None, allow_null=True
+    )
+    challenge_phases = ChallengePhaseSubmissionAggregatesSerializer(many=True)
+
+
 class ChallengePhaseSubmissionCount:
     def __init__(self, participant_team_submission_count, challenge_phase_pk):
         self.participant_team_submission_count = (
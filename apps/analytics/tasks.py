@@ -0,0 +1,52 @@
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.utils import timezone
+from jobs.models import Submission
+
+from evalai.celery import app
+
+from .utils import (
+    get_submission_rollup_watermark,
+    refresh_submission_rollups,
+    set_submission_rollup_watermark,
+)
+
+logger = logging.getLogger(__name__)
+
+# Submissions saved by transactions which committed after the previous run
+# started can carry an older modified_at, so each run looks back this much
+# further than where the previous one started
+SUBMISSION_ROLLUP_OVERLAP = timedelta(minutes=5)
+
+
+@app.task
+def update_submission_rollups():
+    """Recompute the submission rollups of every challenge phase and day
+    with submissions made, or which changed status, since the last run.
+    The first run computes the rollups of all submissions."""
+    started_at = timezone.now()
+    submissions = Submission.objects.all()
+    watermark = get_submission_rollup_watermark()
+    if watermark is not None:
+        submissions = submissions.filter(
+            modified_at__gte=watermark - SUBMISSION_ROLLUP_OVERLAP
+        )
+
+    changed_days = defaultdict(set)
+    for challenge_phase_pk, day in submissions.values_list(
+        "challenge_phase_id", "submitted_at__date"
+    ).distinct():
+        changed_days[challenge_phase_pk].add(day)
+
+    for challenge_phase_pk, days in changed_days.items():
+        refresh_submission_rollups(challenge_phase_pk, days)
+    set_submission_rollup_watermark(started_at)
+
+    if changed_days:
+        logger.info(
+            "Updated the submission rollups of %d days in %d challenge phases",
+            sum(len(days) for days in changed_days.values()),
+            len(changed_days),
+        )
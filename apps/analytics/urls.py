@@ -18,6 +18,16 @@ urlpatterns = [
         views.get_submission_count,
         name="get_submission_count",
     ),
+    re_path(
+        r"^challenge/(?P<challenge_pk>[0-9]+)/analytics$",
+        views.get_challenge_submission_analysis,
+        name="get_challenge_submission_analysis",
+    ),
+    re_path(
+        r"^challenge/(?P<challenge_pk>[0-9]+)/submission/time_series$",
+        views.get_submission_time_series,
+        name="get_submission_time_series",
+    ),
     re_path(
         r"^challenge/(?P<challenge_pk>[0-9]+)/challenge_phase/(?P<challenge_phase_pk>[0-9]+)/analytics$",
         views.get_challenge_phase_submission_analysis,
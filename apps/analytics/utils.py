@@ -0,0 +1,303 @@
+import datetime
+from datetime import timedelta
+
+from challenges.models import ChallengePhase
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Q,
+    Sum,
+)
+from django.utils import timezone
+from jobs.models import Submission
+
+from .models import RollupWatermark, SubmissionDailyRollup
+
+SUBMISSION_ROLLUP_WATERMARK_KEY = "submission_rollup_watermark"
+
+
+def get_submission_count_since_dates(now=None):
+    """
+    Returns the start of the durations submissions are counted over in
+    challenge analytics.
+
+    Arguments:
+        now {[datetime]} -- Time the durations end at
+
+    Returns:
+        [dict] -- Start of the daily, weekly and monthly durations
+    """
+    now = now or timezone.now()
+    midnight = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return {
+        "daily": midnight,
+        "weekly": midnight - timedelta(days=7),
+        "monthly": midnight - timedelta(days=30),
+    }
+
+
+def get_challenge_phase_submission_aggregates(challenge):
+    """
+    Compute the submission analytics of every phase of a challenge with a
+    single grouped query: status histogram, participating teams, flagged and
+    public submissions, last submission time and the daily, weekly and
+    monthly submission counts.
+
+    Arguments:
+        challenge {[Challenge]} -- Challenge to compute the analytics of
+
+    Returns:
+        [list] -- Analytics of every challenge phase, ordered by phase
+    """
+    status_count_keys = {
+        submission_status: "{}_submissions_count".format(submission_status)
+        for submission_status, _ in Submission.STATUS_OPTIONS
+    }
+    status_counts = {
+        key: Count("submissions", filter=Q(submissions__status=status))
+        for status, key in status_count_keys.items()
+    }
+    duration_counts = {
+        "{}_submissions_count".format(duration): Count(
+            "submissions", filter=Q(submissions__submitted_at__gte=since_date)
+        )
+        for duration, since_date in get_submission_count_since_dates().items()
+    }
+    challenge_phases = (
+        ChallengePhase.objects.filter(challenge=challenge)
+        .order_by("pk")
+        .values("pk")
+        .annotate(
+            total_submissions=Count("submissions"),
+            participant_team_count=Count(
+                "submissions__participant_team", distinct=True
+            ),
+            flagged_submissions_count=Count(
+                "submissions", filter=Q(submissions__is_flagged=True)
+            ),
+            public_submissions_count=Count(
+                "submissions", filter=Q(submissions__is_public=True)
+            ),
+            last_submission_timestamp=Max("submissions__submitted_at"),
+            **status_counts,
+            **duration_counts
+        )
+    )
+
+    challenge_phase_aggregates = []
+    for challenge_phase in challenge_phases:
+        challenge_phase_aggregates.append(
+            {
+                "challenge_phase": challenge_phase.pop("pk"),
+                "status_count": {
+                    submission_status: challenge_phase.pop(key)
+                    for submission_status, key in status_count_keys.items()
+                },
+                **challenge_phase,
+            }
+        )
+    return challenge_phase_aggregates
+
+
+def get_cached_challenge_submission_analytics(challenge, build_analytics):
+    """
+    Returns the submission analytics of a challenge from the cache, building
+    them with ``build_analytics`` once the cached ones expired.
+
+    Arguments:
+        challenge {[Challenge]} -- Challenge the analytics are about
+        build_analytics {[function]} -- Callable returning the analytics
+
+    Returns:
+        [dict] -- Submission analytics of the challenge
+    """
+    cache_key = "challenge_submission_analytics:{}".format(challenge.pk)
+    analytics = cache.get(cache_key)
+    if analytics is None:
+        analytics = build_analytics()
+        cache.set(
+            cache_key,
+            analytics,
+            timeout=getattr(settings, "ANALYTICS_CACHE_TIMEOUT", 60),
+        )
+    return analytics
+
+
+def get_submission_rollup_watermark():
+    """
+    Returns the time the submission rollups were last brought up to date,
+    None when they haven't been computed yet.
+    """
+    return (
+        RollupWatermark.objects.filter(name=SUBMISSION_ROLLUP_WATERMARK_KEY)
+        .values_list("watermark", flat=True)
+        .first()
+    )
+
+
+def set_submission_rollup_watermark(watermark):
+    RollupWatermark.objects.update_or_create(
+        name=SUBMISSION_ROLLUP_WATERMARK_KEY,
+        defaults={"watermark": watermark},
+    )
+
+
+def _get_day_start(day):
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time()))
+
+
+def refresh_submission_rollups(challenge_phase_pk, days):
+    """
+    Recompute the rollup rows of a challenge phase for the given days from
+    its submissions.
+
+    Arguments:
+        challenge_phase_pk {[int]} -- Challenge phase primary key
+        days {[list]} -- Days to recompute
+    """
+    days = set(days)
+    submitted_on_days = Q()
+    for day in days:
+        submitted_on_days |= Q(
+            submitted_at__gte=_get_day_start(day),
+            submitted_at__lt=_get_day_start(day + timedelta(days=1)),
+        )
+    execution_time_buckets = {
+        str(bucket): Count(
+            "id", filter=Q(execution_time__lte=timedelta(seconds=bucket))
+        )
+        for bucket in settings.SUBMISSION_ROLLUP_EXECUTION_TIME_BUCKETS
+    }
+    execution_time_buckets["+Inf"] = Count(
+        "id", filter=Q(execution_time__isnull=False)
+    )
+    # Buckets are annotated under plain aliases and renamed in the rows
+    bucket_annotations = {
+        "bucket_{}".format(index): count
+        for index, count in enumerate(execution_time_buckets.values())
+    }
+    rollups = (
+        Submission.objects.filter(submitted_on_days)
+        .filter(challenge_phase_id=challenge_phase_pk)
+        .annotate(
+            execution_time=ExpressionWrapper(
+                F("completed_at") - F("started_at"),
+                output_field=DurationField(),
+            )
+        )
+        .values("submitted_at__date", "status")
+        .annotate(submission_count=Count("id"), **bucket_annotations)
+    )
+    rollup_rows = [
+        SubmissionDailyRollup(
+            challenge_phase_id=challenge_phase_pk,
+            day=rollup["submitted_at__date"],
+            status=rollup["status"],
+            submission_count=rollup["submission_count"],
+            execution_time_histogram={
+                bucket: rollup["bucket_{}".format(index)]
+                for index, bucket in enumerate(execution_time_buckets)
+            },
+        )
+        for rollup in rollups
+    ]
+    with transaction.atomic():
+        SubmissionDailyRollup.objects.filter(
+            challenge_phase_id=challenge_phase_pk, day__in=days
+        ).delete()
+        SubmissionDailyRollup.objects.bulk_create(rollup_rows)
+
+
+def count_challenge_submissions(challenge, since_date=None):
+    """
+    Returns the number of submissions made to a challenge since a midnight.
+    Days the rollups are up to date for are summed from the rollups, only the
+    submissions made after the last rollup update are counted one by one.
+
+    Arguments:
+        challenge {[Challenge]} -- Challenge to count the submissions of
+        since_date {[datetime]} -- Midnight to count from, None for all time
+
+    Returns:
+        [int] -- Number of submissions
+    """
+    submissions = Submission.objects.filter(
+        challenge_phase__challenge=challenge
+    )
+    watermark = get_submission_rollup_watermark()
+    if watermark is None:
+        if since_date:
+            submissions = submissions.filter(submitted_at__gte=since_date)
+        return submissions.count()
+
+    # Days before the one the rollups were last updated on are complete
+    rolled_up_until = timezone.localtime(watermark).date()
+    rollups = SubmissionDailyRollup.objects.filter(
+        challenge_phase__challenge=challenge, day__lt=rolled_up_until
+    )
+    live_since_date = _get_day_start(rolled_up_until)
+    if since_date:
+        rollups = rollups.filter(day__gte=since_date.date())
+        live_since_date = max(live_since_date, since_date)
+    rolled_up_count = (
+        rollups.aggregate(count=Sum("submission_count"))["count"] or 0
+    )
+    return (
+        rolled_up_count
+        + submissions.filter(submitted_at__gte=live_since_date).count()
+    )
+
+
+def get_submission_rollup_time_series(
+    challenge, start_date, end_date, phase=None
+):
+    """
+    Returns the daily submission counts, status histograms and execution time
+    histograms of the phases of a challenge from the rollups.
+
+    Arguments:
+        challenge {[Challenge]} -- Challenge the time series is about
+        start_date {[date]} -- First day of the time series
+        end_date {[date]} -- Last day of the time series
+        phase {[int]} -- Only include this challenge phase if given
+
+    Returns:
+        [list] -- One entry per challenge phase and day with submissions
+    """
+    rollups = SubmissionDailyRollup.objects.filter(
+        challenge_phase__challenge=challenge,
+        day__gte=start_date,
+        day__lte=end_date,
+    ).order_by("challenge_phase", "day", "status")
+    if phase is not None:
+        rollups = rollups.filter(challenge_phase=phase)
+
+    time_series = []
+    for rollup in rollups:
+        if not time_series or (
+            time_series[-1]["challenge_phase"],
+            time_series[-1]["day"],
+        ) != (rollup.challenge_phase_id, rollup.day):
+            time_series.append(
+                {
+                    "challenge_phase": rollup.challenge_phase_id,
+                    "day": rollup.day,
+                    "submission_count": 0,
+                    "status_count": {},
+                    "execution_time_histogram": {},
+                }
+            )
+        entry = time_series[-1]
+        entry["submission_count"] += rollup.submission_count
+        entry["status_count"][rollup.status] = rollup.submission_count
+        for bucket, count in rollup.execution_time_histogram.items():
+            entry["execution_time_histogram"][bucket] = (
+                entry["execution_time_histogram"].get(bucket, 0) + count
+            )
+    return time_series
@@ -4,8 +4,10 @@ from datetime import timedelta
 from accounts.permissions import HasVerifiedEmail
 from challenges.permissions import IsChallengeCreator
 from challenges.utils import get_challenge_model, get_challenge_phase_model
+from django.db.models import Count, Max, Q
 from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date
 from hosts.utils import is_user_a_host_of_challenge
 from jobs.models import Submission
 from jobs.serializers import (
@@ -41,9 +43,19 @@ from .serializers import (
     ChallengePhaseSubmissionAnalyticsSerializer,
     ChallengePhaseSubmissionCount,
     ChallengePhaseSubmissionCountSerializer,
+    ChallengeSubmissionAnalytics,
+    ChallengeSubmissionAnalyticsSerializer,
     LastSubmissionTimestamp,
     LastSubmissionTimestampSerializer,
 )
+from .utils import (
+    count_challenge_submissions,
+    get_cached_challenge_submission_analytics,
+    get_challenge_phase_submission_aggregates,
+    get_submission_count_since_dates,
+    get_submission_rollup_time_series,
+    get_submission_rollup_watermark,
+)
 
 
 @api_view(["GET"])
@@ -101,32 +113,9 @@ def get_submission_count(request, challenge_pk, duration):
 
     challenge = get_challenge_model(challenge_pk)
 
-    challenge_phase_ids = challenge.challengephase_set.all().values_list(
-        "id", flat=True
-    )
-
-    q_params = {"challenge_phase__id__in": challenge_phase_ids}
-    since_date = None
-    if duration.lower() == "daily":
-        # Get the midnight time of the day
-        since_date = timezone.now().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-
-    elif duration.lower() == "weekly":
-        since_date = (timezone.now() - timedelta(days=7)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-
-    elif duration.lower() == "monthly":
-        since_date = (timezone.now() - timedelta(days=30)).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-    # for `all` we dont need any condition in `q_params`
-    if since_date:
-        q_params["submitted_at__gte"] = since_date
-
-    submission_count = Submission.objects.filter(**q_params).count()
+    # for `all` there is no date to count from
+    since_date = get_submission_count_since_dates().get(duration.lower())
+    submission_count = count_challenge_submissions(challenge, since_date)
     submission_count = SubmissionCount(submission_count)
     serializer = SubmissionCountSerializer(submission_count)
     return Response(serializer.data, status=status.HTTP_200_OK)
@@ -227,32 +216,31 @@ def get_last_submission_datetime_analysis(
 
     challenge_phase = get_challenge_phase_model(challenge_phase_pk)
 
-    submissions = Submission.objects.filter(
+    last_submission_timestamps = Submission.objects.filter(
         challenge_phase__challenge=challenge
+    ).aggregate(
+        in_challenge=Max("created_at"),
+        in_challenge_phase=Max(
+            "created_at", filter=Q(challenge_phase=challenge_phase)
+        ),
     )
+    last_submission_timestamp_in_challenge = last_submission_timestamps[
+        "in_challenge"
+    ]
 
-    if not submissions:
+    if last_submission_timestamp_in_challenge is None:
         response_data = {
             "message": "You dont have any submissions in this challenge!"
         }
         return Response(response_data, status.HTTP_200_OK)
 
-    last_submission_timestamp_in_challenge = submissions.order_by(
-        "-submitted_at"
-    )[0].created_at
-
-    submissions_in_a_phase = submissions.filter(
-        challenge_phase=challenge_phase
-    )
-
-    if not submissions_in_a_phase:
+    last_submission_timestamp_in_challenge_phase = last_submission_timestamps[
+        "in_challenge_phase"
+    ]
+    if last_submission_timestamp_in_challenge_phase is None:
         last_submission_timestamp_in_challenge_phase = (
             "You dont have any submissions in this challenge phase!"
         )
-    else:
-        last_submission_timestamp_in_challenge_phase = (
-            submissions_in_a_phase.order_by("-submitted_at")[0].created_at
-        )
 
     last_submission_timestamp = LastSubmissionTimestamp(
         last_submission_timestamp_in_challenge,
@@ -288,24 +276,20 @@ def get_challenge_phase_submission_analysis(
 
     challenge = get_challenge_model(challenge_pk)
     challenge_phase = get_challenge_phase_model(challenge_phase_pk)
-    # Get the total submissions in a challenge phase
-    submissions = Submission.objects.filter(
+    # Get the total, team, flagged and public counts in a single query
+    submission_counts = Submission.objects.filter(
         challenge_phase=challenge_phase, challenge_phase__challenge=challenge
+    ).aggregate(
+        total_submissions=Count("id"),
+        participant_team_count=Count("participant_team", distinct=True),
+        flagged_submissions_count=Count("id", filter=Q(is_flagged=True)),
+        public_submissions_count=Count("id", filter=Q(is_public=True)),
     )
-    total_submissions = submissions.count()
-    # Get the total participant teams in a challenge phase
-    participant_team_count = (
-        submissions.values("participant_team").distinct().count()
-    )
-    # Get flagged submission count
-    flagged_submissions_count = submissions.filter(is_flagged=True).count()
-    # Get public submission count
-    public_submissions_count = submissions.filter(is_public=True).count()
     challenge_phase_submission_count = ChallengePhaseSubmissionAnalytics(
-        total_submissions,
-        participant_team_count,
-        flagged_submissions_count,
-        public_submissions_count,
+        submission_counts["total_submissions"],
+        submission_counts["participant_team_count"],
+        submission_counts["flagged_submissions_count"],
+        submission_counts["public_submissions_count"],
         challenge_phase.pk,
     )
     try:
@@ -319,6 +303,101 @@ def get_challenge_phase_submission_analysis(
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(["GET"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def get_challenge_submission_analysis(request, challenge_pk):
+    """
+    Returns the submission analytics of every phase of a challenge
+    1. Number of submissions with each status
+    2. Total, flagged & public submissions and participating teams
+    3. Last submission time in the phase and in the challenge
+    4. Number of submissions made today, in the last week and month
+
+    The analytics are computed with a single query and cached for
+    ANALYTICS_CACHE_TIMEOUT seconds.
+    """
+    challenge = get_challenge_model(challenge_pk)
+    if not is_user_a_host_of_challenge(
+        user=request.user, challenge_pk=challenge.pk
+    ):
+        response_data = {
+            "error": "Sorry, you are not authorized to make this request"
+        }
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    def build_analytics():
+        challenge_submission_analytics = ChallengeSubmissionAnalytics(
+            challenge.pk, get_challenge_phase_submission_aggregates(challenge)
+        )
+        return ChallengeSubmissionAnalyticsSerializer(
+            challenge_submission_analytics
+        ).data
+
+    response_data = get_cached_challenge_submission_analytics(
+        challenge, build_analytics
+    )
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@api_view(["GET"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def get_submission_time_series(request, challenge_pk):
+    """
+    Returns the number of submissions made to the phases of a challenge per
+    day, along with their statuses and execution time histograms. Data comes
+    from the daily submission rollups, up to date as of `rolled_up_until`.
+
+    Query Parameters:
+        start_date (optional): First day, YYYY-MM-DD (default: 30 days ago)
+        end_date (optional): Last day, YYYY-MM-DD (default: today)
+        challenge_phase (optional): Only return this challenge phase
+    """
+    challenge = get_challenge_model(challenge_pk)
+    if not is_user_a_host_of_challenge(
+        user=request.user, challenge_pk=challenge.pk
+    ):
+        response_data = {
+            "error": "Sorry, you are not authorized to make this request"
+        }
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        end_date = request.query_params.get("end_date")
+        end_date = parse_date(end_date) if end_date else timezone.localdate()
+        start_date = request.query_params.get("start_date")
+        start_date = (
+            parse_date(start_date)
+            if start_date
+            else end_date - timedelta(days=30)
+        )
+        challenge_phase = request.query_params.get("challenge_phase")
+        if challenge_phase is not None:
+            challenge_phase = int(challenge_phase)
+    except (TypeError, ValueError):
+        start_date = end_date = None
+    if start_date is None or end_date is None:
+        response_data = {
+            "error": "start_date and end_date must be dates as YYYY-MM-DD "
+            "and challenge_phase an integer"
+        }
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    response_data = {
+        "challenge": challenge.pk,
+        "start_date": start_date,
+        "end_date": end_date,
+        "rolled_up_until": get_submission_rollup_watermark(),
+        "results": get_submission_rollup_time_series(
+            challenge, start_date, end_date, phase=challenge_phase
+        ),
+    }
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
 @api_view(["GET"])
 @throttle_classes([UserRateThrottle])
 @permission_classes(
@@ -0,0 +1,124 @@
+import threading
+import time
+
+import boto3
+from django.conf import settings
+
+# boto3 clients are thread safe and shared by the whole process, resources
+# aren't and are shared by the calls made from the same thread
+_clients = {}
+_clients_lock = threading.Lock()
+_local = threading.local()
+_generation = 0
+
+_sqs_queue_urls = {}
+_sqs_queue_urls_lock = threading.Lock()
+
+
+def _is_enabled():
+    return getattr(settings, "AWS_CLIENT_CACHE_ENABLED", True)
+
+
+def _get_sqs_queue_url_timeout():
+    return getattr(settings, "SQS_QUEUE_URL_CACHE_TIMEOUT", 5 * 60)
+
+
+def _get_or_create(registry, factory, service, kwargs):
+    key = (
+        service,
+        kwargs.get("region_name"),
+        kwargs.get("endpoint_url"),
+        kwargs.get("aws_access_key_id"),
+    )
+    secret_access_key = kwargs.get("aws_secret_access_key")
+    entry = registry.get(key)
+    if entry is not None and entry[0] == secret_access_key:
+        return entry[1]
+    # An entry for the same access key with another secret key was created
+    # before the credentials were rotated, it is replaced
+    boto3_object = factory(service, **kwargs)
+    registry[key] = (secret_access_key, boto3_object)
+    return boto3_object
+
+
+def get_client(service, **kwargs):
+    """
+    Returns a boto3 client for a service, reusing the one created for the
+    same region, endpoint and credentials earlier in the process.
+
+    Arguments:
+        service {[str]} -- Name of the AWS service
+        kwargs {[dict]} -- Arguments of ``boto3.client``
+
+    Returns:
+        [botocore.client.BaseClient] -- Client of the service
+    """
+    if not _is_enabled():
+        return boto3.client(service, **kwargs)
+    with _clients_lock:
+        return _get_or_create(_clients, boto3.client, service, kwargs)
+
+
+def get_resource(service, **kwargs):
+    """
+    Returns a boto3 resource for a service, reusing the one created for the
+    same region, endpoint and credentials earlier in the current thread.
+
+    Arguments:
+        service {[str]} -- Name of the AWS service
+        kwargs {[dict]} -- Arguments of ``boto3.resource``
+
+    Returns:
+        [boto3.resources.base.ServiceResource] -- Resource of the service
+    """
+    if not _is_enabled():
+        return boto3.resource(service, **kwargs)
+    if getattr(_local, "generation", None) != _generation:
+        _local.resources = {}
+        _local.generation = _generation
+    return _get_or_create(_local.resources, boto3.resource, service, kwargs)
+
+
+def get_sqs_queue_url(key):
+    """
+    Returns the cached URL of an SQS queue, None when it isn't cached or
+    its entry expired.
+
+    Arguments:
+        key {[tuple]} -- Endpoint, region, access key and name of the queue
+    """
+    if not _is_enabled():
+        return None
+    with _sqs_queue_urls_lock:
+        entry = _sqs_queue_urls.get(key)
+    if entry is None or entry[1] < time.monotonic():
+        return None
+    return entry[0]
+
+
+def set_sqs_queue_url(key, queue_url):
+    if not _is_enabled():
+        return
+    with _sqs_queue_urls_lock:
+        _sqs_queue_urls[key] = (
+            queue_url,
+            time.monotonic() + _get_sqs_queue_url_timeout(),
+        )
+
+
+def invalidate_sqs_queue_url(key):
+    with _sqs_queue_urls_lock:
+        _sqs_queue_urls.pop(key, None)
+
+
+def clear():
+    """
+    Drop every cached client, resource and queue URL, for instance after
+    the credentials of the process were changed.
+    """
+    global _generation
+    with _clients_lock:
+        _clients.clear()
+        _generation += 1
+    with _sqs_queue_urls_lock:
+        _sqs_queue_urls.clear()
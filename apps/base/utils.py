@@ -7,7 +7,6 @@ import uuid
 from contextlib import contextmanager
 from email.utils import formataddr, parseaddr
 
-import boto3
 import botocore
 import requests
 import sendgrid
@@ -23,6 +22,8 @@ from rest_framework.pagination import PageNumberPagination
 
 from settings.common import SQS_RETENTION_PERIOD
 
+from . import aws_clients
+
 logger = logging.getLogger(__name__)
 
 
@@ -338,7 +339,7 @@ def get_boto3_client(resource, aws_keys):
         Boto3 client object for the resource
     """
     try:
-        client = boto3.client(
+        client = aws_clients.get_client(
             resource,
             region_name=aws_keys["AWS_REGION"],
             aws_access_key_id=aws_keys["AWS_ACCESS_KEY_ID"],
@@ -351,7 +352,10 @@ def get_boto3_client(resource, aws_keys):
 
 
 def _get_sqs_resource_and_queue_name(queue_name, challenge=None):
-    """Build an SQS resource and normalize the queue name for lookup/create."""
+    """
+    Get the SQS resource and normalize the queue name for lookup/create.
+    Also returns the key the URL of the queue is cached under.
+    """
     is_fifo = queue_name.endswith(".fifo")
 
     if settings.DEBUG or settings.TEST:
@@ -360,54 +364,75 @@ def _get_sqs_resource_and_queue_name(queue_name, challenge=None):
             if is_fifo
             else "evalai_submission_queue"
         )
-        sqs = boto3.resource(
-            "sqs",
-            endpoint_url=os.environ.get("AWS_SQS_ENDPOINT", "http://sqs:9324"),
-            region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
-            aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY", "x"),
-            aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID", "x"),
-        )
+        sqs_kwargs = {
+            "endpoint_url": os.environ.get(
+                "AWS_SQS_ENDPOINT", "http://sqs:9324"
+            ),
+            "region_name": os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
+            "aws_secret_access_key": os.environ.get(
+                "AWS_SECRET_ACCESS_KEY", "x"
+            ),
+            "aws_access_key_id": os.environ.get("AWS_ACCESS_KEY_ID", "x"),
+        }
     else:
         if challenge and challenge.use_host_sqs:
-            sqs = boto3.resource(
-                "sqs",
-                region_name=challenge.queue_aws_region,
-                aws_secret_access_key=challenge.aws_secret_access_key,
-                aws_access_key_id=challenge.aws_access_key_id,
-            )
+            sqs_kwargs = {
+                "region_name": challenge.queue_aws_region,
+                "aws_secret_access_key": challenge.aws_secret_access_key,
+                "aws_access_key_id": challenge.aws_access_key_id,
+            }
         else:
-            sqs = boto3.resource(
-                "sqs",
-                region_name=os.environ.get("AWS_DEFAULT_REGION", "us-east-1"),
-                aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
-                aws_access_key_id=os.environ.get("AWS_ACCESS_KEY_ID"),
-            )
+            sqs_kwargs = {
+                "region_name": os.environ.get(
+                    "AWS_DEFAULT_REGION", "us-east-1"
+                ),
+                "aws_secret_access_key": os.environ.get(
+                    "AWS_SECRET_ACCESS_KEY"
+                ),
+                "aws_access_key_id": os.environ.get("AWS_ACCESS_KEY_ID"),
+            }
+    sqs = aws_clients.get_resource("sqs", **sqs_kwargs)
 
     if queue_name == "":
         queue_name = "evalai_submission_queue"
         is_fifo = False
 
-    return sqs, queue_name, is_fifo
+    queue_url_key = (
+        sqs_kwargs.get("endpoint_url"),
+        sqs_kwargs["region_name"],
+        sqs_kwargs["aws_access_key_id"],
+        queue_name,
+    )
+    return sqs, queue_name, is_fifo, queue_url_key
 
 
 def get_sqs_queue(queue_name, challenge=None):
     """
-    Look up an existing SQS queue; never create one.
+    Look up an existing SQS queue; never create one. The URL of the queue
+    is cached, so only the first lookup makes a GetQueueUrl call.
 
     Raises:
         botocore.exceptions.ClientError: if the queue does not exist or
             another AWS error occurs.
     """
-    sqs, queue_name, _ = _get_sqs_resource_and_queue_name(
+    sqs, queue_name, _, queue_url_key = _get_sqs_resource_and_queue_name(
         queue_name, challenge
     )
-    return sqs.get_queue_by_name(QueueName=queue_name)
+    queue_url = aws_clients.get_sqs_queue_url(queue_url_key)
+    if queue_url is not None:
+        return sqs.Queue(queue_url)
+    queue = sqs.get_queue_by_name(QueueName=queue_name)
+    aws_clients.set_sqs_queue_url(queue_url_key, queue.url)
+    return queue
 
 
 def get_or_create_sqs_queue(queue_name, challenge=None):
-    sqs, queue_name, is_fifo = _get_sqs_resource_and_queue_name(
+    sqs, queue_name, is_fifo, queue_url_key = _get_sqs_resource_and_queue_name(
         queue_name, challenge
     )
+    queue_url = aws_clients.get_sqs_queue_url(queue_url_key)
+    if queue_url is not None:
+        return sqs.Queue(queue_url)
 
     try:
         queue = sqs.get_queue_by_name(QueueName=queue_name)
@@ -429,9 +454,21 @@ def get_or_create_sqs_queue(queue_name, challenge=None):
             QueueName=queue_name,
             Attributes=attributes,
         )
+    aws_clients.set_sqs_queue_url(queue_url_key, queue.url)
     return queue
 
 
+def invalidate_sqs_queue_url(queue_name, challenge=None):
+    """
+    Drop the cached URL of an SQS queue, so that the next lookup asks SQS
+    for it again, e.g. after the queue was deleted.
+    """
+    _, _, _, queue_url_key = _get_sqs_resource_and_queue_name(
+        queue_name, challenge
+    )
+    aws_clients.invalidate_sqs_queue_url(queue_url_key)
+
+
 def get_slug(param):
     slug = param.replace(" ", "-").lower()
     slug = re.sub(r"\W+", "-", slug)
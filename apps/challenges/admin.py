@@ -29,6 +29,7 @@ from .models import (
     StarChallenge,
     UserInvitation,
 )
+from .response_cache import bump_challenge_versions
 
 
 class UpdateNumOfWorkersForm(ActionForm):
@@ -302,6 +303,9 @@ class ChallengeAdmin(ImportExportTimeStampedAdmin):
 
     def pause_selected_challenge_submissions(self, request, queryset):
         updated = queryset.update(is_submission_paused=True)
+        bump_challenge_versions(
+            queryset.values_list("pk", flat=True), challenge_list=True
+        )
         messages.success(
             request,
             "{} challenge(s) submissions paused.".format(updated),
@@ -313,6 +317,9 @@ class ChallengeAdmin(ImportExportTimeStampedAdmin):
 
     def unpause_selected_challenge_submissions(self, request, queryset):
         updated = queryset.update(is_submission_paused=False)
+        bump_challenge_versions(
+            queryset.values_list("pk", flat=True), challenge_list=True
+        )
         messages.success(
             request,
             "{} challenge(s) submissions unpaused.".format(updated),
@@ -1,12 +1,15 @@
 import ast
+import base64
 import hashlib
 import json
 import logging
 import os
+import posixpath
 import random
 import re
 import string
 import uuid
+from collections import deque
 from http import HTTPStatus
 
 import yaml
@@ -16,6 +19,7 @@ from botocore.exceptions import BotoCoreError, ClientError
 from celery.exceptions import MaxRetriesExceededError
 from django.conf import settings
 from django.core import serializers
+from django.core.cache import cache
 from django.core.files.temp import NamedTemporaryFile
 from django.db import DatabaseError
 
@@ -64,6 +68,9 @@ def load_aws_api_kwargs(formatted_kwargs):
     return ast.literal_eval(formatted_kwargs)
 
 
+# Bytes read at a time when hashing a file which isn't stored on S3
+FILE_FINGERPRINT_CHUNK_SIZE = 1024 * 1024
+
 ECS_RESOURCE_NAME_PATTERN = re.compile(r"[^a-zA-Z0-9_-]+")
 
 
@@ -2465,8 +2472,33 @@ def restart_workers(queryset):
     return {"count": count, "failures": failures}
 
 
+def _get_file_fingerprint(field_file):
+    """Return a fingerprint of the content of a stored file.
+
+    Files kept on S3 are fingerprinted by the ETag and size S3 reports for
+    the object, so their content is never downloaded. Other files are
+    MD5-hashed one chunk at a time.
+    """
+    storage = getattr(field_file, "storage", None)
+    bucket_name = getattr(storage, "bucket_name", None)
+    if bucket_name:
+        key = posixpath.join(getattr(storage, "location", ""), field_file.name)
+        s3 = get_boto3_client("s3", aws_keys)
+        response = s3.head_object(Bucket=bucket_name, Key=key)
+        return response["ETag"], response["ContentLength"]
+
+    md5 = hashlib.md5()
+    field_file.seek(0)
+    for chunk in iter(
+        lambda: field_file.read(FILE_FINGERPRINT_CHUNK_SIZE), b""
+    ):
+        md5.update(chunk)
+    field_file.seek(0)
+    return md5.hexdigest()
+
+
 def _file_content_changed(old_field, new_field):
-    """Compare two Django FileField values by content hash, not path.
+    """Compare two Django FileField values by content fingerprint, not path.
 
     Returns True if the file content actually changed, False if identical.
     Handles cases where one or both fields are empty/missing.
@@ -2475,14 +2507,14 @@ def _file_content_changed(old_field, new_field):
         return True
     if not old_field and not new_field:
         return False
+    old_name = getattr(old_field, "name", None)
+    if old_name and old_name == getattr(new_field, "name", None):
+        # Both values point to the same stored file
+        return False
     try:
-        old_field.seek(0)
-        old_hash = hashlib.md5(old_field.read()).hexdigest()
-        old_field.seek(0)
-        new_field.seek(0)
-        new_hash = hashlib.md5(new_field.read()).hexdigest()
-        new_field.seek(0)
-        return old_hash != new_hash
+        return _get_file_fingerprint(old_field) != _get_file_fingerprint(
+            new_field
+        )
     except Exception:
         return True
 
@@ -2582,6 +2614,205 @@ def get_logs_from_cloudwatch(
     return logs
 
 
+def encode_worker_logs_cursor(timestamp, event_ids):
+    """
+    Encode the position of the last worker log event returned, as the
+    timestamp of that event and the ids of the events returned at it.
+    """
+    cursor = json.dumps({"timestamp": timestamp, "event_ids": event_ids})
+    return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+
+def decode_worker_logs_cursor(cursor):
+    """
+    Returns the (timestamp, event ids) a worker logs cursor encodes.
+
+    Raises:
+        ValueError -- When the cursor is malformed
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return int(position["timestamp"]), set(position["event_ids"])
+    except (TypeError, KeyError, UnicodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _filter_log_events(client, kwargs, max_events, seen_event_ids=()):
+    """
+    Returns the first max_events events matching kwargs, skipping the
+    seen ones, and whether more events were available.
+    """
+    kwargs = dict(kwargs)
+    events = []
+    truncated = False
+    while True:
+        response = client.filter_log_events(
+            limit=min(10000, max_events - len(events) + len(seen_event_ids)),
+            **kwargs,
+        )
+        for event in response["events"]:
+            # Events at the cursor's timestamp may have been returned
+            if event["eventId"] in seen_event_ids:
+                continue
+            if len(events) == max_events:
+                truncated = True
+                break
+            events.append(event)
+        next_token = response.get("nextToken")
+        if truncated or not next_token:
+            break
+        if len(events) == max_events:
+            truncated = True
+            break
+        kwargs["nextToken"] = next_token
+    return events, truncated
+
+
+def _filter_latest_log_events(client, kwargs, max_events):
+    """
+    Returns the last max_events events matching kwargs. Events are only
+    listed oldest first, so windows ending at endTime, each longer than the
+    previous, are read back in time until enough events are found.
+    """
+    start_time, end_time = kwargs["startTime"], kwargs["endTime"]
+    window = settings.WORKER_LOGS_INITIAL_WINDOW * 1000
+    window_end = end_time
+    events = []
+    while window_end >= start_time and len(events) < max_events:
+        window_start = max(start_time, end_time - window)
+        window_events = deque(maxlen=max_events - len(events))
+        window_kwargs = dict(
+            kwargs, startTime=window_start, endTime=window_end
+        )
+        while True:
+            response = client.filter_log_events(limit=10000, **window_kwargs)
+            window_events.extend(response["events"])
+            if not response.get("nextToken"):
+                break
+            window_kwargs["nextToken"] = response["nextToken"]
+        events = list(window_events) + events
+        window_end = window_start - 1
+        window *= 4
+    return events
+
+
+def tail_logs_from_cloudwatch(
+    log_group_name,
+    log_stream_prefix,
+    start_time,
+    end_time,
+    pattern,
+    cursor=None,
+    max_events=None,
+    client=None,
+):
+    """
+    Fetch the logs of a container from cloudwatch a page at a time.
+
+    Without a cursor the latest events since start_time are returned. The
+    returned cursor points after the last event returned, passing it back
+    only fetches the events logged since. Pages are cached for a few
+    seconds per log stream and cursor.
+
+    Arguments:
+        log_group_name {[str]} -- Log group of the challenge
+        log_stream_prefix {[str]} -- Prefix of the log streams to read
+        start_time {[int]} -- Earliest event time in milliseconds
+        end_time {[int]} -- Latest event time in milliseconds
+        pattern {[str]} -- CloudWatch filter pattern
+        cursor {[str]} -- Cursor returned by a previous call
+        max_events {[int]} -- Most events to return, defaults to
+            WORKER_LOGS_MAX_EVENTS
+        client {[boto3.client]} -- CloudWatch logs client
+
+    Returns:
+        [dict] -- Log messages, the cursor to fetch the next events with and
+            whether more events were already available
+
+    Raises:
+        ValueError -- When the cursor is malformed
+    """
+    if settings.DEBUG:
+        return {
+            "logs": [
+                "The worker logs in the development environment are available on the terminal. Please use docker-compose logs -f worker to view the logs."
+            ],
+            "cursor": None,
+            "truncated": False,
+        }
+
+    max_events = max_events or settings.WORKER_LOGS_MAX_EVENTS
+    last_timestamp, seen_event_ids = None, set()
+    if cursor:
+        last_timestamp, seen_event_ids = decode_worker_logs_cursor(cursor)
+        start_time = max(start_time, last_timestamp)
+
+    cache_key = "worker_logs:{}".format(
+        hashlib.md5(
+            json.dumps(
+                [log_group_name, log_stream_prefix, pattern, cursor]
+            ).encode()
+        ).hexdigest()
+    )
+    page = cache.get(cache_key)
+    if page is not None:
+        return page
+
+    client = client or get_boto3_client("logs", aws_keys)
+    kwargs = {
+        "logGroupName": log_group_name,
+        "logStreamNamePrefix": log_stream_prefix,
+        "startTime": start_time,
+        "endTime": end_time,
+        "filterPattern": pattern,
+    }
+    events = []
+    truncated = False
+    try:
+        if cursor:
+            events, truncated = _filter_log_events(
+                client, kwargs, max_events, seen_event_ids
+            )
+        else:
+            events = _filter_latest_log_events(client, kwargs, max_events)
+    except (BotoCoreError, ClientError) as e:
+        # The log group doesn't exist until the workers first log
+        if not (
+            isinstance(e, ClientError)
+            and e.response["Error"]["Code"] == "ResourceNotFoundException"
+        ):
+            logger.exception(e)
+            return {
+                "logs": [
+                    f"There is an error in displaying logs. Please find the full error traceback here {e}"
+                ],
+                "cursor": cursor,
+                "truncated": False,
+            }
+
+    if events:
+        timestamp = events[-1]["timestamp"]
+        event_ids = [
+            event["eventId"]
+            for event in events
+            if event["timestamp"] == timestamp
+        ]
+        if timestamp == last_timestamp:
+            event_ids = list(seen_event_ids.union(event_ids))
+        cursor = encode_worker_logs_cursor(timestamp, event_ids)
+    elif not cursor:
+        # Everything up to end_time was read, the next call starts there
+        cursor = encode_worker_logs_cursor(end_time, [])
+
+    page = {
+        "logs": [event["message"] for event in events],
+        "cursor": cursor,
+        "truncated": truncated,
+    }
+    cache.set(cache_key, page, timeout=settings.WORKER_LOGS_CACHE_TIMEOUT)
+    return page
+
+
 def delete_log_group(log_group_name):
     if settings.DEBUG:
         pass
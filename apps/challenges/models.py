@@ -6,7 +6,7 @@ from django.conf import settings
 from django.contrib.auth.models import User
 from django.contrib.postgres.fields import ArrayField, JSONField
 from django.core import serializers
-from django.db import models
+from django.db import models, transaction
 from django.db.models import signals
 from django.db.models.signals import pre_save
 from django.dispatch import receiver
@@ -18,6 +18,7 @@ from .constants import (
     DEFAULT_WORKER_PYTHON_VERSION,
     SUPPORTED_WORKER_PYTHON_VERSIONS,
 )
+from .response_cache import bump_challenge_versions
 
 
 @receiver(pre_save, sender="challenges.Challenge")
@@ -39,6 +40,7 @@ class Challenge(TimeStampedModel):
         self._original_approved_by_admin = self.approved_by_admin
         self._original_sqs_retention_period = self.sqs_retention_period
         self._original_end_date = self.end_date
+        self._original_banned_email_ids = self.banned_email_ids
         for field in (
             settings.EKS_NODEGROUP_IMMUTABLE_FIELDS
             + settings.EKS_NODEGROUP_SCALING_FIELDS
@@ -1161,6 +1163,32 @@ class ChallengePhaseSplit(TimeStampedModel):
         db_table = "challenge_phase_split"
 
 
+def _bump_challenge_versions_on_commit(challenge_pks, challenge_list=False):
+    transaction.on_commit(
+        lambda: bump_challenge_versions(
+            challenge_pks, challenge_list=challenge_list
+        )
+    )
+
+
+@receiver(signals.post_save, sender="challenges.Challenge")
+@receiver(signals.post_delete, sender="challenges.Challenge")
+def bump_version_for_challenge(sender, instance, **kwargs):
+    _bump_challenge_versions_on_commit([instance.pk], challenge_list=True)
+
+
+@receiver(signals.post_save, sender="challenges.ChallengePhase")
+@receiver(signals.post_delete, sender="challenges.ChallengePhase")
+def bump_version_for_challenge_phase(sender, instance, **kwargs):
+    _bump_challenge_versions_on_commit([instance.challenge_id])
+
+
+@receiver(signals.post_save, sender="challenges.ChallengePhaseSplit")
+@receiver(signals.post_delete, sender="challenges.ChallengePhaseSplit")
+def bump_version_for_challenge_phase_split(sender, instance, **kwargs):
+    _bump_challenge_versions_on_commit([instance.challenge_phase.challenge_id])
+
+
 class ChallengeTemplate(TimeStampedModel):
     """
     Model to store challenge templates
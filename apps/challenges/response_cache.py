@@ -0,0 +1,119 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+CHALLENGE_LIST_VERSION_KEY = "challenge_list_version"
+
+
+def _get_cache_timeout():
+    return getattr(settings, "CHALLENGE_RESPONSE_CACHE_TIMEOUT", 60)
+
+
+def _get_version_key(challenge_pk):
+    return "challenge_version:{}".format(challenge_pk)
+
+
+def _get_initial_version():
+    # Versions start from the current time so that a version key evicted from
+    # the cache never comes back with a value older entries were stored with.
+    return int(time.time() * 1000)
+
+
+def _get_version(version_key):
+    version = cache.get(version_key)
+    if version is None:
+        version = _get_initial_version()
+        cache.add(version_key, version, timeout=None)
+        version = cache.get(version_key, version)
+    return version
+
+
+def get_challenge_version(challenge_pk):
+    """
+    Returns the version of everything shown about a challenge: its details,
+    phase splits and leaderboards. Responses are cached under this version.
+    """
+    return _get_version(_get_version_key(challenge_pk))
+
+
+def get_challenge_list_version():
+    """
+    Returns the version of the challenge lists, bumped when a challenge is
+    changed. Phases, splits and leaderboards aren't part of the lists.
+    """
+    return _get_version(CHALLENGE_LIST_VERSION_KEY)
+
+
+def bump_challenge_versions(challenge_pks, challenge_list=False):
+    """
+    Invalidate the cached responses of the given challenges and, when the
+    challenges themselves changed, of the challenge lists.
+
+    Arguments:
+        challenge_pks {[list]} -- Challenge primary keys
+        challenge_list {[bool]} -- Whether the challenge lists are stale too
+    """
+    version_keys = [
+        _get_version_key(challenge_pk) for challenge_pk in set(challenge_pks)
+    ]
+    if challenge_list:
+        version_keys.append(CHALLENGE_LIST_VERSION_KEY)
+    for version_key in version_keys:
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            cache.set(version_key, _get_initial_version(), timeout=None)
+
+
+def _get_etag(response_data):
+    content = json.dumps(response_data, cls=JSONEncoder, sort_keys=True)
+    return quote_etag(hashlib.md5(content.encode("utf-8")).hexdigest())
+
+
+def _get_response(request, response_data, etag):
+    if etag in parse_etags(request.META.get("HTTP_IF_NONE_MATCH", "")):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(response_data, status=status.HTTP_200_OK)
+    response["ETag"] = etag
+    return response
+
+
+def get_cached_response(request, version, build_response, vary_on=None):
+    """
+    Returns the response of a read endpoint from the cache, building it with
+    ``build_response`` on a cache miss. Successful responses carry an ETag and
+    a request with a matching If-None-Match header gets a 304 instead.
+
+    Arguments:
+        request {[Request]} -- Request being served
+        version {[int]} -- Version of the data the response is built from
+        build_response {[function]} -- Callable returning the response
+        vary_on {[str]} -- Part of the response that depends on the user
+
+    Returns:
+        [Response] -- Cached, built or not modified response
+    """
+    cache_key = "challenge_response:{}:{}:{}".format(
+        version,
+        vary_on,
+        hashlib.md5(request.build_absolute_uri().encode("utf-8")).hexdigest(),
+    )
+    cached_response = cache.get(cache_key)
+    if cached_response is not None:
+        etag, response_data = cached_response
+        return _get_response(request, response_data, etag)
+
+    response = build_response()
+    if response.status_code != status.HTTP_200_OK:
+        return response
+    etag = _get_etag(response.data)
+    cache.set(cache_key, (etag, response.data), timeout=_get_cache_timeout())
+    return _get_response(request, response.data, etag)
@@ -0,0 +1,285 @@
+import csv
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from participants.models import Participant
+
+from .queryset import get_submissions_queryset
+from .utils import parse_submission_meta_attributes
+
+logger = logging.getLogger(__name__)
+
+# Columns a host can pick for the export, in the order they are written
+SUBMISSION_EXPORT_FIELDS = {
+    "participant_team": "Team Name",
+    "participant_team_members": "Team Members",
+    "participant_team_members_email": "Team Members Email Id",
+    "participant_team_members_affiliation": "Team Members Affiliation",
+    "challenge_phase": "Challenge Phase",
+    "status": "Status",
+    "created_by": "Created By",
+    "execution_time": "Execution Time(sec.)",
+    "submission_number": "Submission Number",
+    "input_file": "Submitted File",
+    "stdout_file": "Stdout File",
+    "stderr_file": "Stderr File",
+    "environment_log_file": "Environment Log File",
+    "created_at": "Submitted At (mm/dd/yyyy hh:mm:ss)",
+    "submission_result_file": "Submission Result File",
+    "submission_metadata_file": "Submission Metadata File",
+    "method_name": "Method Name",
+    "method_description": "Method Description",
+    "publication_url": "Publication URL",
+    "project_url": "Project URL",
+    "submission_meta_attributes": "Submission Meta Attributes",
+}
+
+# Columns of the export when the host doesn't pick any
+DEFAULT_SUBMISSION_EXPORT_COLUMNS = (
+    ("participant_team", "Team Name"),
+    ("participant_team_members", "Team Members"),
+    ("participant_team_members_email", "Team Members Email Id"),
+    ("participant_team_members_affiliation", "Team Members Affiliaton"),
+    ("challenge_phase", "Challenge Phase"),
+    ("status", "Status"),
+    ("created_by", "Created By"),
+    ("execution_time", "Execution Time(sec.)"),
+    ("submission_number", "Submission Number"),
+    ("input_file", "Submitted File"),
+    ("stdout_file", "Stdout File"),
+    ("stderr_file", "Stderr File"),
+    ("environment_log_file", "Environment Log File"),
+    ("submitted_at", "Submitted At"),
+    ("submission_result_file", "Submission Result File"),
+    ("submission_metadata_file", "Submission Metadata File"),
+    ("method_name", "Method Name"),
+    ("method_description", "Method Description"),
+    ("publication_url", "Publication URL"),
+    ("project_url", "Project URL"),
+    ("submission_meta_attributes", "Submission Meta Attributes"),
+)
+
+SUBMISSION_EXPORT_FILE_FIELDS = (
+    "input_file",
+    "stdout_file",
+    "stderr_file",
+    "environment_log_file",
+    "submission_result_file",
+    "submission_metadata_file",
+)
+
+
+class Echo:
+    """
+    File-like object handing back what is written to it, so that rows
+    written by a csv writer can be streamed one at a time.
+    """
+
+    def write(self, value):
+        return value
+
+
+def get_submission_export_columns(fields=None):
+    """
+    Returns the (field, header) columns of a submission export.
+
+    Arguments:
+        fields {[list]} -- Fields picked by the host, None for the defaults
+
+    Returns:
+        [list] -- Columns of the export, starting with the submission id
+    """
+    if fields is None:
+        columns = list(DEFAULT_SUBMISSION_EXPORT_COLUMNS)
+    else:
+        columns = [
+            (field, SUBMISSION_EXPORT_FIELDS[field]) for field in fields
+        ]
+    return [("id", "id")] + columns
+
+
+def get_file_url(field_file):
+    """
+    Returns the URL of a stored file, signed by the storage when its files
+    aren't public, or an empty string for a missing file.
+    """
+    if not field_file:
+        return ""
+    return field_file.url
+
+
+def get_team_members_info(participant_team_pks):
+    """
+    Returns the usernames, emails and affiliations of the members of the
+    given participant teams, looked up with a single query.
+
+    Arguments:
+        participant_team_pks {[list]} -- Participant team primary keys
+
+    Returns:
+        [dict] -- Member usernames, emails and affiliations keyed by team
+    """
+    team_members_info = {
+        participant_team_pk: ([], [], [])
+        for participant_team_pk in participant_team_pks
+    }
+    participants = (
+        Participant.objects.filter(team_id__in=participant_team_pks)
+        .select_related("user", "user__profile")
+        .order_by("pk")
+    )
+    for participant in participants:
+        team_members, team_emails, team_affiliations = team_members_info[
+            participant.team_id
+        ]
+        team_members.append(participant.user.username)
+        team_emails.append(participant.user.email)
+        team_affiliations.append(
+            participant.user.profile.affiliation
+            if hasattr(participant.user, "profile")
+            else ""
+        )
+    return team_members_info
+
+
+def get_submission_export_value(submission, field, team_members_info):
+    if field in SUBMISSION_EXPORT_FILE_FIELDS:
+        return get_file_url(getattr(submission, field))
+    if field == "participant_team":
+        return submission.participant_team.team_name
+    if field == "participant_team_members":
+        return ",".join(team_members_info[0])
+    if field == "participant_team_members_email":
+        return ",".join(team_members_info[1])
+    if field == "participant_team_members_affiliation":
+        return ",".join(team_members_info[2])
+    if field == "challenge_phase":
+        return submission.challenge_phase.name
+    if field == "created_by":
+        return submission.created_by.username
+    if field == "created_at":
+        return submission.created_at.strftime("%m/%d/%Y %H:%M:%S")
+    if field == "submitted_at":
+        return submission.created_at
+    if field in (
+        "method_name",
+        "method_description",
+        "publication_url",
+        "project_url",
+    ):
+        return getattr(submission, field) or ""
+    if field == "submission_meta_attributes":
+        return parse_submission_meta_attributes(
+            {"submission_metadata": submission.submission_metadata}
+        )
+    return getattr(submission, field)
+
+
+def iter_submission_export_rows(challenge_phase, fields=None):
+    """
+    Yields the header and one row per submission of a challenge phase for
+    the submission export. Submissions are read in chunks through a server
+    side cursor and the members of each team are looked up once per export.
+
+    Arguments:
+        challenge_phase {[ChallengePhase]} -- Phase to export submissions of
+        fields {[list]} -- Fields picked by the host, None for the defaults
+
+    Yields:
+        [list] -- Header, then the values of each submission
+    """
+    columns = get_submission_export_columns(fields)
+    yield [header for _, header in columns]
+
+    chunk_size = settings.SUBMISSION_EXPORT_CHUNK_SIZE
+    # Prefetching isn't applied by iterator(), team members are looked up
+    # for each chunk of submissions instead
+    submissions = (
+        get_submissions_queryset(challenge_phase)
+        .prefetch_related(None)
+        .iterator(chunk_size=chunk_size)
+    )
+    team_members_info = {}
+    processed_count = 0
+    chunk = []
+    while True:
+        submission = next(submissions, None)
+        if submission is not None:
+            chunk.append(submission)
+            if len(chunk) < chunk_size:
+                continue
+        if not chunk:
+            break
+
+        team_members_info.update(
+            get_team_members_info(
+                {
+                    submission.participant_team_id
+                    for submission in chunk
+                    if submission.participant_team_id not in team_members_info
+                }
+            )
+        )
+        for submission in chunk:
+            yield [
+                get_submission_export_value(
+                    submission,
+                    field,
+                    team_members_info[submission.participant_team_id],
+                )
+                for field, _ in columns
+            ]
+        processed_count += len(chunk)
+        chunk = []
+        logger.info(
+            "Exported %s submissions of challenge phase %s",
+            processed_count,
+            challenge_phase.pk,
+        )
+
+
+def stream_submissions_csv(challenge_phase, fields=None):
+    """
+    Yields the submission export of a challenge phase as CSV lines.
+
+    Arguments:
+        challenge_phase {[ChallengePhase]} -- Phase to export submissions of
+        fields {[list]} -- Fields picked by the host, None for the defaults
+    """
+    writer = csv.writer(Echo(), quoting=csv.QUOTE_ALL)
+    for row in iter_submission_export_rows(challenge_phase, fields):
+        yield writer.writerow(row)
+
+
+def write_submissions_csv(csv_file, challenge_phase, fields=None):
+    """
+    Writes the submission export of a challenge phase to a text file.
+
+    Arguments:
+        csv_file {[file]} -- File opened for writing text
+        challenge_phase {[ChallengePhase]} -- Phase to export submissions of
+        fields {[list]} -- Fields picked by the host, None for the defaults
+    """
+    writer = csv.writer(csv_file, quoting=csv.QUOTE_ALL)
+    writer.writerows(iter_submission_export_rows(challenge_phase, fields))
+
+
+def _get_submission_export_key(challenge_phase_pk, export_id):
+    return "submission_export:{}:{}".format(challenge_phase_pk, export_id)
+
+
+def get_submission_export_status(challenge_phase_pk, export_id):
+    """
+    Returns the status of an asynchronous submission export, None when it
+    doesn't exist or its link has expired.
+    """
+    return cache.get(_get_submission_export_key(challenge_phase_pk, export_id))
+
+
+def set_submission_export_status(challenge_phase_pk, export_id, export_status):
+    cache.set(
+        _get_submission_export_key(challenge_phase_pk, export_id),
+        export_status,
+        timeout=settings.PRESIGNED_URL_EXPIRY_TIME,
+    )
@@ -0,0 +1,75 @@
+import logging
+import tempfile
+
+from base.utils import get_boto3_client
+from django.conf import settings
+
+from evalai.celery import app
+
+from .models import ChallengePhase
+from .submission_export import (
+    set_submission_export_status,
+    write_submissions_csv,
+)
+from .utils import get_submissions_csv_filename
+
+logger = logging.getLogger(__name__)
+
+
+@app.task
+def export_submissions_to_s3(challenge_phase_pk, fields, export_id):
+    """
+    Write the submissions of a challenge phase as CSV to S3 and store a
+    presigned link to download it as the status of the export.
+
+    Arguments:
+        challenge_phase_pk {[int]} -- Phase to export submissions of
+        fields {[list]} -- Fields picked by the host, None for the defaults
+        export_id {[str]} -- Identifier the host polls the export with
+    """
+    challenge_phase = ChallengePhase.objects.select_related("challenge").get(
+        pk=challenge_phase_pk
+    )
+    challenge = challenge_phase.challenge
+    aws_keys = {
+        "AWS_ACCESS_KEY_ID": settings.AWS_ACCESS_KEY_ID,
+        "AWS_SECRET_ACCESS_KEY": settings.AWS_SECRET_ACCESS_KEY,
+        "AWS_REGION": settings.AWS_REGION,
+    }
+    key = "submission_exports/{}/{}/{}/{}".format(
+        challenge.pk,
+        challenge_phase.pk,
+        export_id,
+        get_submissions_csv_filename(challenge, challenge_phase),
+    )
+    try:
+        with tempfile.NamedTemporaryFile(
+            mode="w", suffix=".csv", newline=""
+        ) as csv_file:
+            write_submissions_csv(csv_file, challenge_phase, fields)
+            csv_file.flush()
+            s3 = get_boto3_client("s3", aws_keys)
+            s3.upload_file(
+                csv_file.name,
+                settings.AWS_STORAGE_BUCKET_NAME,
+                key,
+                ExtraArgs={"ContentType": "text/csv"},
+            )
+        url = s3.generate_presigned_url(
+            ClientMethod="get_object",
+            Params={"Bucket": settings.AWS_STORAGE_BUCKET_NAME, "Key": key},
+            ExpiresIn=settings.PRESIGNED_URL_EXPIRY_TIME,
+        )
+    except Exception as e:  # pylint: disable=broad-exception-caught
+        logger.exception(
+            "Failed to export submissions of challenge phase %s: %s",
+            challenge_phase_pk,
+            e,
+        )
+        set_submission_export_status(
+            challenge_phase_pk, export_id, {"status": "failed"}
+        )
+        return
+    set_submission_export_status(
+        challenge_phase_pk, export_id, {"status": "finished", "url": url}
+    )
@@ -110,6 +110,18 @@ urlpatterns = [
         views.download_all_submissions,
         name="download_all_submissions",
     ),
+    url(
+        r"^(?P<challenge_pk>[0-9]+)/phase/(?P<challenge_phase_pk>[0-9]+)"
+        r"/export_all_submissions/$",
+        views.export_all_submissions,
+        name="export_all_submissions",
+    ),
+    url(
+        r"^(?P<challenge_pk>[0-9]+)/phase/(?P<challenge_phase_pk>[0-9]+)"
+        r"/export_all_submissions/(?P<export_id>[0-9a-f]+)/$",
+        views.get_all_submissions_export,
+        name="get_all_submissions_export",
+    ),
     url(
         r"^challenge/create/leaderboard/step_2/$",
         views.create_leaderboard,
@@ -57,7 +57,6 @@ from challenges.utils import (
     is_user_in_allowed_email_domains,
     is_user_in_blocked_email_domains,
     parse_invite_email_list,
-    parse_submission_meta_attributes,
 )
 from django.conf import settings
 from django.contrib.auth.hashers import make_password
@@ -65,9 +64,9 @@ from django.contrib.auth.models import User
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import transaction
-from django.db.models import Count, Prefetch
-from django.http import HttpResponse
-from django.utils import timezone
+from django.db.models import Count, Prefetch, Q
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils import dateparse, timezone
 from drf_spectacular.utils import (
     OpenApiParameter,
     OpenApiResponse,
@@ -80,6 +79,7 @@ from hosts.utils import (
     is_user_a_host_of_challenge,
     is_user_a_staff_or_host,
 )
+from jobs.constants import pending_submission_statuses
 from jobs.filters import SubmissionFilter
 from jobs.models import Submission
 from jobs.serializers import (
@@ -118,7 +118,6 @@ from .aws_utils import (
     delete_workers,
     describe_ec2_instance,
     get_log_group_name,
-    get_logs_from_cloudwatch,
     restart_ec2_instance,
     restart_workers,
     sanitize_ecs_resource_name,
@@ -127,6 +126,7 @@ from .aws_utils import (
     start_workers,
     stop_ec2_instance,
     stop_workers,
+    tail_logs_from_cloudwatch,
     terminate_ec2_instance,
 )
 from .models import (
@@ -145,6 +145,11 @@ from .models import (
 )
 from .permissions import IsChallengeCreator
 from .queryset import get_submissions_queryset
+from .response_cache import (
+    get_cached_response,
+    get_challenge_list_version,
+    get_challenge_version,
+)
 from .serializers import (
     ChallengeConfigSerializer,
     ChallengeEvaluationClusterSerializer,
@@ -166,8 +171,14 @@ from .serializers import (
     ZipChallengePhaseSplitSerializer,
     ZipChallengeSerializer,
 )
+from .submission_export import (
+    SUBMISSION_EXPORT_FIELDS,
+    get_submission_export_status,
+    set_submission_export_status,
+    stream_submissions_csv,
+)
+from .tasks import export_submissions_to_s3
 from .utils import (
-    extract_team_member_info,
     get_aws_credentials_for_submission,
     get_challenge_template_data,
     get_file_content,
@@ -967,51 +978,111 @@ def get_all_challenges(
     # don't return disabled challenges
     q_params["is_disabled"] = False
 
-    challenge = (
-        Challenge.objects.select_related("creator", "creator__created_by")
-        .filter(**q_params)
-        .order_by("-pk")
-    )
-    paginator, result_page = paginated_queryset(challenge, request)
-    serializer = ChallengeSerializer(
-        result_page, many=True, context={"request": request}
+    def build_response():
+        challenge = (
+            Challenge.objects.select_related("creator", "creator__created_by")
+            .filter(**q_params)
+            .order_by("-pk")
+        )
+        paginator, result_page = paginated_queryset(challenge, request)
+        serializer = ChallengeSerializer(
+            result_page, many=True, context={"request": request}
+        )
+        response_data = serializer.data
+        return paginator.get_paginated_response(response_data)
+
+    return get_cached_response(
+        request, get_challenge_list_version(), build_response
     )
-    response_data = serializer.data
-    return paginator.get_paginated_response(response_data)
 
 
 @api_view(["GET"])
 @throttle_classes([AnonRateThrottle])
 def get_all_challenges_submission_metrics(request):
     """
-    Returns the submission metrics for all challenges and their phases
+    Returns the number of submissions with each status for all challenges
+    which haven't ended yet, counted with one grouped query.
+
+    Query Parameters:
+        status (optional): Comma separated statuses to count, or `pending`
+            for the statuses autoscalers act on (default: all statuses)
+        changed_since (optional): Cursor returned by a previous request.
+            Only challenges with submissions made or changed since then are
+            returned, wrapped as {"metrics": ..., "changed_since": cursor}
     """
     if not is_user_a_staff(request.user):
         response_data = {
             "error": "Sorry, you are not authorized to make this request"
         }
         return Response(response_data, status=status.HTTP_403_FORBIDDEN)
-    challenges = Challenge.objects.all()
-    submission_metrics = {}
 
     submission_statuses = [status[0] for status in Submission.STATUS_OPTIONS]
+    requested_statuses = request.query_params.get("status")
+    if requested_statuses == "pending":
+        submission_statuses = pending_submission_statuses
+    elif requested_statuses:
+        requested_statuses = requested_statuses.split(",")
+        if not set(requested_statuses).issubset(submission_statuses):
+            response_data = {
+                "error": "status must be pending or a comma separated list "
+                "of {}".format(", ".join(submission_statuses))
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        submission_statuses = requested_statuses
 
-    for challenge in challenges:
-        challenge_id = challenge.id
-        challenge_metrics = {}
-
-        # Fetch challenge phases for the challenge
-        challenge_phases = ChallengePhase.objects.filter(challenge=challenge)
-
-        for submission_status in submission_statuses:
-            count = Submission.objects.filter(
-                challenge_phase__in=challenge_phases, status=submission_status
-            ).count()
-            challenge_metrics[submission_status] = count
+    now = timezone.now()
+    challenges = Challenge.objects.filter(
+        Q(end_date__isnull=True) | Q(end_date__gte=now)
+    )
+    changed_since = request.query_params.get("changed_since")
+    if changed_since is not None:
+        try:
+            changed_since = dateparse.parse_datetime(changed_since)
+        except ValueError:
+            changed_since = None
+        if changed_since is None:
+            response_data = {
+                "error": "changed_since must be a cursor returned by this API"
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        challenges = challenges.filter(
+            pk__in=Submission.objects.filter(
+                modified_at__gte=changed_since
+            ).values("challenge_phase__challenge")
+        )
+    challenge_pks = list(challenges.values_list("pk", flat=True))
 
-        submission_metrics[challenge_id] = challenge_metrics
+    submission_metrics = {
+        challenge_pk: {
+            submission_status: 0 for submission_status in submission_statuses
+        }
+        for challenge_pk in challenge_pks
+    }
+    # A single GROUP BY challenge, status over the submissions of the
+    # challenges instead of one COUNT per status and challenge
+    submission_counts = (
+        Submission.objects.filter(
+            challenge_phase__challenge__in=challenge_pks,
+            status__in=submission_statuses,
+        )
+        .values("challenge_phase__challenge", "status")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    for row in submission_counts:
+        submission_metrics[row["challenge_phase__challenge"]][
+            row["status"]
+        ] = row["count"]
 
-    return Response(submission_metrics, status=status.HTTP_200_OK)
+    if changed_since is None:
+        return Response(submission_metrics, status=status.HTTP_200_OK)
+    response_data = {
+        "metrics": submission_metrics,
+        # Submissions saved by transactions still open now may commit with
+        # an earlier modified_at, so the next request looks back a minute
+        "changed_since": (now - timedelta(minutes=1)).isoformat(),
+    }
+    return Response(response_data, status=status.HTTP_200_OK)
 
 
 @api_view(["GET"])
@@ -1077,26 +1148,38 @@ def get_challenge_by_pk(request, pk):
     """
     Returns a particular challenge by id
     """
-    try:
-        if is_user_a_host_of_challenge(request.user, pk):
-            challenge = Challenge.objects.get(pk=pk)
-        else:
-            challenge = Challenge.objects.get(
-                pk=pk, approved_by_admin=True, published=True
+    is_challenge_host = is_user_a_host_of_challenge(request.user, pk)
+
+    def build_response():
+        try:
+            if is_challenge_host:
+                challenge = Challenge.objects.get(pk=pk)
+            else:
+                challenge = Challenge.objects.get(
+                    pk=pk, approved_by_admin=True, published=True
+                )
+            if challenge.is_disabled:
+                response_data = {"error": "Sorry, the challenge was removed!"}
+                return Response(
+                    response_data, status=status.HTTP_406_NOT_ACCEPTABLE
+                )
+            serializer = ChallengeSerializer(
+                challenge, context={"request": request}
             )
-        if challenge.is_disabled:
-            response_data = {"error": "Sorry, the challenge was removed!"}
+            response_data = serializer.data
+            return Response(response_data, status=status.HTTP_200_OK)
+        except Challenge.DoesNotExist:
+            response_data = {"error": "Challenge does not exist!"}
             return Response(
                 response_data, status=status.HTTP_406_NOT_ACCEPTABLE
             )
-        serializer = ChallengeSerializer(
-            challenge, context={"request": request}
-        )
-        response_data = serializer.data
-        return Response(response_data, status=status.HTTP_200_OK)
-    except Challenge.DoesNotExist:
-        response_data = {"error": "Challenge does not exist!"}
-        return Response(response_data, status=status.HTTP_406_NOT_ACCEPTABLE)
+
+    return get_cached_response(
+        request,
+        get_challenge_version(pk),
+        build_response,
+        vary_on="host" if is_challenge_host else "public",
+    )
 
 
 @api_view(["GET"])
@@ -1322,33 +1405,43 @@ def challenge_phase_split_list(request, challenge_pk):
     """
     Returns the list of Challenge Phase Splits for a particular challenge
     """
-    try:
-        challenge = Challenge.objects.get(pk=challenge_pk)
-    except Challenge.DoesNotExist:
-        response_data = {"error": "Challenge does not exist"}
-        return Response(response_data, status=status.HTTP_406_NOT_ACCEPTABLE)
+    # Check if user is a challenge host or staff
+    challenge_host = is_user_a_staff_or_host(request.user, challenge_pk)
 
-    challenge_phase_split = (
-        ChallengePhaseSplit.objects.filter(
-            challenge_phase__challenge=challenge
+    def build_response():
+        try:
+            challenge = Challenge.objects.get(pk=challenge_pk)
+        except Challenge.DoesNotExist:
+            response_data = {"error": "Challenge does not exist"}
+            return Response(
+                response_data, status=status.HTTP_406_NOT_ACCEPTABLE
+            )
+
+        challenge_phase_split = (
+            ChallengePhaseSplit.objects.filter(
+                challenge_phase__challenge=challenge
+            )
+            .select_related("challenge_phase", "dataset_split", "leaderboard")
+            .order_by("pk")
         )
-        .select_related("challenge_phase", "dataset_split", "leaderboard")
-        .order_by("pk")
-    )
 
-    # Check if user is a challenge host or staff
-    challenge_host = is_user_a_staff_or_host(request.user, challenge_pk)
+        if not challenge_host:
+            challenge_phase_split = challenge_phase_split.filter(
+                visibility=ChallengePhaseSplit.PUBLIC
+            )
 
-    if not challenge_host:
-        challenge_phase_split = challenge_phase_split.filter(
-            visibility=ChallengePhaseSplit.PUBLIC
+        serializer = ChallengePhaseSplitSerializer(
+            challenge_phase_split, many=True
         )
+        response_data = serializer.data
+        return Response(response_data, status=status.HTTP_200_OK)
 
-    serializer = ChallengePhaseSplitSerializer(
-        challenge_phase_split, many=True
+    return get_cached_response(
+        request,
+        get_challenge_version(challenge_pk),
+        build_response,
+        vary_on="host" if challenge_host else "public",
     )
-    response_data = serializer.data
-    return Response(response_data, status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
@@ -2440,6 +2533,28 @@ def get_all_submissions_of_challenge(
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 
+def get_submissions_csv_response(challenge, challenge_phase, fields=None):
+    """
+    Returns a response streaming the submissions of a challenge phase as a
+    CSV attachment, so that large phases are never held in memory.
+
+    Arguments:
+        challenge {[Challenge]} -- Challenge the phase belongs to
+        challenge_phase {[ChallengePhase]} -- Phase to export submissions of
+        fields {[list]} -- Fields picked by the host, None for the defaults
+
+    Returns:
+        StreamingHttpResponse -- CSV attachment
+    """
+    filename = get_submissions_csv_filename(challenge, challenge_phase)
+    response = StreamingHttpResponse(
+        stream_submissions_csv(challenge_phase, fields),
+        content_type="text/csv",
+    )
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
 @extend_schema(
     methods=["GET"],
     operation_id="download_all_submissions",
@@ -2560,134 +2675,7 @@ def download_all_submissions(
                 logger.info(
                     f"Starting download_all_submissions for challenge {challenge_pk}"
                 )
-
-                # Use helper function to get optimized submissions queryset
-                submissions = get_submissions_queryset(challenge_phase)
-
-                submission_count = submissions.count()
-                logger.info(f"Found {submission_count} submissions to export")
-
-                # Use helper function to generate filename
-                filename = get_submissions_csv_filename(
-                    challenge, challenge_phase
-                )
-
-                response = HttpResponse(content_type="text/csv")
-                response["Content-Disposition"] = (
-                    f'attachment; filename="{filename}"'
-                )
-                writer = csv.writer(response, quoting=csv.QUOTE_ALL)
-                writer.writerow(
-                    [
-                        "id",
-                        "Team Name",
-                        "Team Members",
-                        "Team Members Email Id",
-                        "Team Members Affiliaton",
-                        "Challenge Phase",
-                        "Status",
-                        "Created By",
-                        "Execution Time(sec.)",
-                        "Submission Number",
-                        "Submitted File",
-                        "Stdout File",
-                        "Stderr File",
-                        "Environment Log File",
-                        "Submitted At",
-                        "Submission Result File",
-                        "Submission Metadata File",
-                        "Method Name",
-                        "Method Description",
-                        "Publication URL",
-                        "Project URL",
-                        "Submission Meta Attributes",
-                    ]
-                )
-                # Process submissions efficiently using prefetched data
-                logger.info(
-                    f"Starting to process {submission_count} submissions"
-                )
-                processed_count = 0
-
-                for submission in submissions:
-                    # Use helper function to extract team member info
-                    team_members, team_emails, team_affiliations = (
-                        extract_team_member_info(submission)
-                    )
-
-                    # Parse submission meta attributes
-                    submission_dict = {
-                        "submission_metadata": submission.submission_metadata,
-                        "method_name": submission.method_name,
-                        "method_description": submission.method_description,
-                        "publication_url": submission.publication_url,
-                        "project_url": submission.project_url,
-                    }
-                    submission_meta_attributes = (
-                        parse_submission_meta_attributes(submission_dict)
-                    )
-
-                    writer.writerow(
-                        [
-                            submission.id,
-                            submission.participant_team.team_name,
-                            ",".join(team_members),
-                            ",".join(team_emails),
-                            ",".join(team_affiliations),
-                            submission.challenge_phase.name,
-                            submission.status,
-                            submission.created_by.username,
-                            submission.execution_time,
-                            submission.submission_number,
-                            (
-                                submission.input_file.url
-                                if submission.input_file
-                                else ""
-                            ),
-                            (
-                                submission.stdout_file.url
-                                if submission.stdout_file
-                                else ""
-                            ),
-                            (
-                                submission.stderr_file.url
-                                if submission.stderr_file
-                                else ""
-                            ),
-                            (
-                                submission.environment_log_file.url
-                                if submission.environment_log_file
-                                else ""
-                            ),
-                            submission.created_at,
-                            (
-                                submission.submission_result_file.url
-                                if submission.submission_result_file
-                                else ""
-                            ),
-                            (
-                                submission.submission_metadata_file.url
-                                if submission.submission_metadata_file
-                                else ""
-                            ),
-                            submission.method_name or "",
-                            submission.method_description or "",
-                            submission.publication_url or "",
-                            submission.project_url or "",
-                            submission_meta_attributes,
-                        ]
-                    )
-
-                    processed_count += 1
-                    if processed_count % 500 == 0:
-                        logger.info(
-                            f"Processed {processed_count}/{submission_count} submissions"
-                        )
-
-                logger.info(
-                    f"Completed processing all {processed_count} submissions"
-                )
-                return response
+                return get_submissions_csv_response(challenge, challenge_phase)
 
             elif has_user_participated_in_challenge(
                 user=request.user, challenge_id=challenge_pk
@@ -2771,174 +2759,153 @@ def download_all_submissions(
                 logger.info(
                     f"Starting POST download_all_submissions for challenge {challenge_pk}"
                 )
+                fields = list(request.data)
+                invalid_fields = set(fields) - set(SUBMISSION_EXPORT_FIELDS)
+                if invalid_fields:
+                    response_data = {
+                        "error": "Invalid fields: {}".format(
+                            ", ".join(sorted(invalid_fields))
+                        )
+                    }
+                    return Response(
+                        response_data, status=status.HTTP_400_BAD_REQUEST
+                    )
+                return get_submissions_csv_response(
+                    challenge, challenge_phase, fields
+                )
 
-                fields_to_export = {
-                    "participant_team": "Team Name",
-                    "participant_team_members": "Team Members",
-                    "participant_team_members_email": "Team Members Email Id",
-                    "participant_team_members_affiliation": "Team Members Affiliation",
-                    "challenge_phase": "Challenge Phase",
-                    "status": "Status",
-                    "created_by": "Created By",
-                    "execution_time": "Execution Time(sec.)",
-                    "submission_number": "Submission Number",
-                    "input_file": "Submitted File",
-                    "stdout_file": "Stdout File",
-                    "stderr_file": "Stderr File",
-                    "environment_log_file": "Environment Log File",
-                    "created_at": "Submitted At (mm/dd/yyyy hh:mm:ss)",
-                    "submission_result_file": "Submission Result File",
-                    "submission_metadata_file": "Submission Metadata File",
-                    "method_name": "Method Name",
-                    "method_description": "Method Description",
-                    "publication_url": "Publication URL",
-                    "project_url": "Project URL",
-                    "submission_meta_attributes": "Submission Meta Attributes",
+            else:
+                response_data = {
+                    "error": "Sorry, you do not belong to this Host Team!"
                 }
+                return Response(
+                    response_data, status=status.HTTP_401_UNAUTHORIZED
+                )
 
-                # Use helper function to get optimized submissions queryset
-                submissions = get_submissions_queryset(challenge_phase)
+        else:
+            response_data = {"error": "The file type requested is not valid!"}
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
-                submission_count = submissions.count()
-                logger.info(
-                    f"Found {submission_count} submissions to export with custom fields"
-                )
 
-                # Use helper function to generate filename
-                filename = get_submissions_csv_filename(
-                    challenge, challenge_phase
-                )
+@api_view(["POST"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def export_all_submissions(request, challenge_pk, challenge_phase_pk):
+    """
+    API endpoint to export all the submissions of a challenge phase as a csv
+    in the background. The csv is uploaded to S3 and a presigned link to it
+    is served by `get_all_submissions_export` once it's ready.
 
-                response = HttpResponse(content_type="text/csv")
-                response["Content-Disposition"] = (
-                    f'attachment; filename="{filename}"'
-                )
-                writer = csv.writer(response, quoting=csv.QUOTE_ALL)
-                fields = [fields_to_export[field] for field in request.data]
-                fields.insert(0, "id")
-                writer.writerow(fields)
+    Arguments:
+        request {HttpRequest} -- The request object
+        challenge_pk {[int]} -- Challenge primary key
+        challenge_phase_pk {[int]} -- Challenge phase primary key
 
-                # Process submissions efficiently using prefetched data
-                logger.info(
-                    f"Starting to process {submission_count} submissions with custom fields"
+    Request Body:
+        fields (optional): Fields to export, all of them by default
+
+    Returns:
+        Response Object -- Identifier of the export
+    """
+    challenge = get_challenge_model(challenge_pk)
+    try:
+        challenge_phase = ChallengePhase.objects.get(
+            pk=challenge_phase_pk, challenge=challenge
+        )
+    except ChallengePhase.DoesNotExist:
+        response_data = {
+            "error": "Challenge Phase {} does not exist".format(
+                challenge_phase_pk
+            )
+        }
+        return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+
+    if not is_user_a_host_of_challenge(
+        user=request.user, challenge_pk=challenge_pk
+    ):
+        response_data = {
+            "error": "Sorry, you do not belong to this Host Team!"
+        }
+        return Response(response_data, status=status.HTTP_401_UNAUTHORIZED)
+
+    if not isinstance(request.data, dict):
+        response_data = {"error": "The request body must be a JSON object"}
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    fields = request.data.get("fields")
+    if fields is not None:
+        if not isinstance(fields, list) or not all(
+            isinstance(field, str) for field in fields
+        ):
+            response_data = {"error": "fields must be a list of field names"}
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        invalid_fields = set(fields) - set(SUBMISSION_EXPORT_FIELDS)
+        if invalid_fields:
+            response_data = {
+                "error": "Invalid fields: {}".format(
+                    ", ".join(sorted(invalid_fields))
                 )
-                processed_count = 0
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        fields = list(fields)
 
-                for submission in submissions:
-                    row = [submission.id]
+    export_id = uuid.uuid4().hex
+    set_submission_export_status(
+        challenge_phase.pk, export_id, {"status": "pending"}
+    )
+    export_submissions_to_s3.delay(challenge_phase.pk, fields, export_id)
+    response_data = {"export_id": export_id, "status": "pending"}
+    return Response(response_data, status=status.HTTP_202_ACCEPTED)
 
-                    # Use helper function to extract team member info
-                    team_members, team_emails, team_affiliations = (
-                        extract_team_member_info(submission)
-                    )
 
-                    for field in request.data:
-                        if field == "participant_team":
-                            row.append(submission.participant_team.team_name)
-                        elif field == "participant_team_members":
-                            row.append(",".join(team_members))
-                        elif field == "participant_team_members_email":
-                            row.append(",".join(team_emails))
-                        elif field == "participant_team_members_affiliation":
-                            row.append(",".join(team_affiliations))
-                        elif field == "challenge_phase":
-                            row.append(submission.challenge_phase.name)
-                        elif field == "status":
-                            row.append(submission.status)
-                        elif field == "created_by":
-                            row.append(submission.created_by.username)
-                        elif field == "execution_time":
-                            row.append(submission.execution_time)
-                        elif field == "submission_number":
-                            row.append(submission.submission_number)
-                        elif field == "input_file":
-                            row.append(
-                                submission.input_file.url
-                                if submission.input_file
-                                else ""
-                            )
-                        elif field == "stdout_file":
-                            row.append(
-                                submission.stdout_file.url
-                                if submission.stdout_file
-                                else ""
-                            )
-                        elif field == "stderr_file":
-                            row.append(
-                                submission.stderr_file.url
-                                if submission.stderr_file
-                                else ""
-                            )
-                        elif field == "environment_log_file":
-                            row.append(
-                                submission.environment_log_file.url
-                                if submission.environment_log_file
-                                else ""
-                            )
-                        elif field == "created_at":
-                            row.append(
-                                submission.created_at.strftime(
-                                    "%m/%d/%Y %H:%M:%S"
-                                )
-                            )
-                        elif field == "submission_result_file":
-                            row.append(
-                                submission.submission_result_file.url
-                                if submission.submission_result_file
-                                else ""
-                            )
-                        elif field == "submission_metadata_file":
-                            row.append(
-                                submission.submission_metadata_file.url
-                                if submission.submission_metadata_file
-                                else ""
-                            )
-                        elif field == "method_name":
-                            row.append(submission.method_name or "")
-                        elif field == "method_description":
-                            row.append(submission.method_description or "")
-                        elif field == "publication_url":
-                            row.append(submission.publication_url or "")
-                        elif field == "project_url":
-                            row.append(submission.project_url or "")
-                        elif field == "submission_meta_attributes":
-                            submission_dict = {
-                                "submission_metadata": submission.submission_metadata,
-                                "method_name": submission.method_name,
-                                "method_description": submission.method_description,
-                                "publication_url": submission.publication_url,
-                                "project_url": submission.project_url,
-                            }
-                            submission_meta_attributes = (
-                                parse_submission_meta_attributes(
-                                    submission_dict
-                                )
-                            )
-                            row.append(submission_meta_attributes)
-                    writer.writerow(row)
+@api_view(["GET"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def get_all_submissions_export(
+    request, challenge_pk, challenge_phase_pk, export_id
+):
+    """
+    API endpoint to get the status of a submissions export and the
+    presigned link to download it once it has finished
 
-                    processed_count += 1
-                    if processed_count % 500 == 0:
-                        logger.info(
-                            f"Processed {processed_count}/{submission_count} submissions"
-                        )
+    Arguments:
+        request {HttpRequest} -- The request object
+        challenge_pk {[int]} -- Challenge primary key
+        challenge_phase_pk {[int]} -- Challenge phase primary key
+        export_id {[str]} -- Identifier of the export
 
-                logger.info(
-                    f"Completed processing all {processed_count} submissions with custom fields"
-                )
-                return response
+    Returns:
+        Response Object -- Status of the export and its link when finished
+    """
+    challenge = get_challenge_model(challenge_pk)
+    if not ChallengePhase.objects.filter(
+        pk=challenge_phase_pk, challenge=challenge
+    ).exists():
+        response_data = {
+            "error": "Challenge Phase {} does not exist".format(
+                challenge_phase_pk
+            )
+        }
+        return Response(response_data, status=status.HTTP_404_NOT_FOUND)
 
-            else:
-                response_data = {
-                    "error": "Sorry, you do not belong to this Host Team!"
-                }
-                return Response(
-                    response_data, status=status.HTTP_401_UNAUTHORIZED
-                )
+    if not is_user_a_host_of_challenge(
+        user=request.user, challenge_pk=challenge_pk
+    ):
+        response_data = {
+            "error": "Sorry, you do not belong to this Host Team!"
+        }
+        return Response(response_data, status=status.HTTP_401_UNAUTHORIZED)
 
-        else:
-            response_data = {"error": "The file type requested is not valid!"}
-            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    export_status = get_submission_export_status(challenge_phase_pk, export_id)
+    if export_status is None:
+        response_data = {
+            "error": "Export {} does not exist or has expired".format(
+                export_id
+            )
+        }
+        return Response(response_data, status=status.HTTP_404_NOT_FOUND)
+    return Response(export_status, status=status.HTTP_200_OK)
 
 
 @api_view(["POST"])
@@ -3790,6 +3757,11 @@ def validate_challenge_config(request, challenge_host_team_pk):
 @permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
 @authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
 def get_worker_logs(request, challenge_pk):
+    """
+    Returns a page of the worker logs of a challenge. Passing back the
+    ``cursor`` of the response as query param only fetches the logs written
+    since, ``truncated`` telling whether more logs were already available.
+    """
     if not is_user_a_host_of_challenge(request.user, challenge_pk):
         response_data = {
             "error": "Sorry, you are not authorized to access the worker logs."
@@ -3806,16 +3778,22 @@ def get_worker_logs(request, challenge_pk):
     # This is to specify the time window for fetching logs: 3 days before from
     # current time.
     timeframe = 4320
-    limit = 1000
     current_time = int(round(time.time() * 1000))
     start_time = current_time - (timeframe * 60000)
     end_time = current_time
 
-    logs = get_logs_from_cloudwatch(
-        log_group_name, log_stream_prefix, start_time, end_time, pattern, limit
-    )
-
-    response_data = {"logs": logs}
+    try:
+        response_data = tail_logs_from_cloudwatch(
+            log_group_name,
+            log_stream_prefix,
+            start_time,
+            end_time,
+            pattern,
+            cursor=request.query_params.get("cursor"),
+        )
+    except ValueError:
+        response_data = {"error": "Invalid cursor"}
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
     return Response(response_data, status=status.HTTP_200_OK)
 
 
@@ -1 +1,35 @@
 submission_status_to_exclude = ["failed", "cancelled"]
+
+# Statuses of submissions still waiting for, or taking up, an evaluation
+# worker. Worker autoscalers scale on the number of these.
+pending_submission_statuses = ["submitted", "queued", "running", "resuming"]
+
+# Statuses of submissions counted against the number of submissions a team
+# can have being processed at once in a challenge phase
+in_progress_submission_statuses = [
+    "submitted",
+    "submitting",
+    "resuming",
+    "queued",
+    "running",
+]
+
+# Submission fields which can be picked with the `fields` query param of the
+# host submission listing, served without going through the serializer
+submission_listing_fields = [
+    "id",
+    "participant_team",
+    "challenge_phase",
+    "created_by",
+    "status",
+    "submission_number",
+    "is_public",
+    "is_flagged",
+    "is_baseline",
+    "ignore_submission",
+    "submitted_at",
+    "started_at",
+    "completed_at",
+    "rerun_resumed_at",
+    "job_name",
+]
@@ -0,0 +1,78 @@
+from datetime import timedelta
+
+from challenges.models import Challenge
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from jobs.models import SubmissionEvaluationLease
+
+
+def get_submission_evaluation_lease_timeout():
+    return getattr(settings, "SUBMISSION_EVALUATION_LEASE_TIMEOUT", 5 * 60)
+
+
+def acquire_submission_evaluation_lease(
+    challenge, maximum_concurrent_submissions, worker_id, submission_pk=None
+):
+    """
+    Take one of the ``maximum_concurrent_submissions`` evaluation slots of a
+    challenge. Slots are allocated one at a time per challenge, so workers
+    evaluating the same challenge never hand out more than the limit, and
+    leases which stopped getting heartbeats are reclaimed on the way.
+
+    Arguments:
+        challenge {[Challenge]} -- Challenge the submission belongs to
+        maximum_concurrent_submissions {[int]} -- Running submissions limit
+        worker_id {[str]} -- Worker evaluating the submission
+        submission_pk {[int]} -- Submission being evaluated, if known
+
+    Returns:
+        [SubmissionEvaluationLease] -- The lease, None if no slot is free
+    """
+    expired_before = timezone.now() - timedelta(
+        seconds=get_submission_evaluation_lease_timeout()
+    )
+    with transaction.atomic():
+        # Lock the challenge row so concurrent workers count and take the
+        # slots of the challenge one after another
+        list(
+            Challenge.objects.select_for_update()
+            .filter(pk=challenge.pk)
+            .values_list("pk", flat=True)
+        )
+        leases = SubmissionEvaluationLease.objects.filter(
+            challenge_id=challenge.pk
+        )
+        leases.filter(heartbeat_at__lt=expired_before).delete()
+        if leases.count() >= maximum_concurrent_submissions:
+            return None
+        return SubmissionEvaluationLease.objects.create(
+            challenge_id=challenge.pk,
+            submission_pk=submission_pk,
+            worker_id=worker_id,
+        )
+
+
+def renew_submission_evaluation_leases(worker_id):
+    """
+    Record a heartbeat for every lease held by a worker.
+
+    Arguments:
+        worker_id {[str]} -- Worker holding the leases
+
+    Returns:
+        [int] -- Number of renewed leases
+    """
+    return SubmissionEvaluationLease.objects.filter(
+        worker_id=worker_id
+    ).update(heartbeat_at=timezone.now())
+
+
+def release_submission_evaluation_lease(lease):
+    """
+    Give the evaluation slot held by a lease back to its challenge.
+
+    Arguments:
+        lease {[SubmissionEvaluationLease]} -- Lease to release
+    """
+    SubmissionEvaluationLease.objects.filter(pk=lease.pk).delete()
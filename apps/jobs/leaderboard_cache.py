@@ -0,0 +1,168 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+# Fields of a submission which are part of a ranked leaderboard row or decide
+# whether the submission shows up on the leaderboard at all.
+LEADERBOARD_SUBMISSION_FIELDS = (
+    "status",
+    "is_flagged",
+    "is_public",
+    "is_baseline",
+    "method_name",
+    "submission_metadata",
+    "is_verified_by_host",
+    "started_at",
+    "completed_at",
+)
+
+
+def _get_cache_timeout():
+    return getattr(settings, "LEADERBOARD_RANKING_CACHE_TIMEOUT", 60 * 60)
+
+
+def _get_version_key(challenge_phase_split_pk):
+    return "leaderboard_ranking_version:{}".format(challenge_phase_split_pk)
+
+
+def _get_lock_key(challenge_phase_split_pk):
+    return "leaderboard_ranking_lock:{}".format(challenge_phase_split_pk)
+
+
+def _get_initial_version():
+    # Versions start from the current time so that a version key evicted from
+    # the cache never comes back with a value older entries were stored with.
+    return int(time.time() * 1000)
+
+
+def get_leaderboard_ranking_cache_key(
+    challenge_phase_split_pk, version, order_by, only_public_entries
+):
+    return "leaderboard_ranking:{}:{}:{}:{}".format(
+        challenge_phase_split_pk,
+        version,
+        order_by,
+        "public" if only_public_entries else "all",
+    )
+
+
+def get_leaderboard_ranking_version(challenge_phase_split_pk):
+    """
+    Returns the current version of the ranked leaderboard of a challenge phase
+    split. Every cache entry of the split is keyed by this version, so bumping
+    it invalidates all of them at once.
+    """
+    version_key = _get_version_key(challenge_phase_split_pk)
+    version = cache.get(version_key)
+    if version is None:
+        version = _get_initial_version()
+        cache.add(version_key, version, timeout=None)
+        version = cache.get(version_key, version)
+    return version
+
+
+def invalidate_leaderboard_ranking(challenge_phase_split_pks):
+    """
+    Drop the ranked leaderboards of the given challenge phase splits. They
+    are rebuilt from the database on the next read.
+
+    Arguments:
+        challenge_phase_split_pks {[list]} -- Challenge phase split primary keys
+    """
+    for challenge_phase_split_pk in challenge_phase_split_pks:
+        version_key = _get_version_key(challenge_phase_split_pk)
+        try:
+            cache.incr(version_key)
+        except ValueError:
+            # The version was evicted or never read. Start a fresh one so
+            # that an in-flight rebuild does not store stale rows.
+            cache.set(version_key, _get_initial_version(), timeout=None)
+
+
+def get_cached_leaderboard_ranking(
+    challenge_phase_split_pk, order_by, only_public_entries, build_ranking
+):
+    """
+    Returns the ranked leaderboard rows of a challenge phase split, building
+    and caching them with ``build_ranking`` on a cache miss.
+
+    Arguments:
+        challenge_phase_split_pk {[int]} -- Challenge phase split primary key
+        order_by {[str]} -- Leaderboard label the rows are ranked by
+        only_public_entries {[bool]} -- Whether only public entries are ranked
+        build_ranking {[function]} -- Callable returning the ranked rows
+
+    Returns:
+        [list] -- Ranked leaderboard rows
+    """
+    version = get_leaderboard_ranking_version(challenge_phase_split_pk)
+    cache_key = get_leaderboard_ranking_cache_key(
+        challenge_phase_split_pk, version, order_by, only_public_entries
+    )
+    ranking = cache.get(cache_key)
+    if ranking is not None:
+        return ranking
+
+    ranking = build_ranking()
+    # Don't store the rows if the leaderboard changed while they were built,
+    # the next read rebuilds them against the new version instead.
+    if cache.get(_get_version_key(challenge_phase_split_pk)) == version:
+        cache.add(cache_key, ranking, timeout=_get_cache_timeout())
+    return ranking
+
+
+def update_cached_leaderboard_ranking(
+    challenge_phase_split_pk, variants, update_ranking
+):
+    """
+    Incrementally update the cached ranked leaderboards of a challenge phase
+    split. Leaderboards which aren't cached are left to be built on read.
+
+    If another process is updating the same split, the split is invalidated
+    instead so that concurrent updates never overwrite each other.
+
+    Arguments:
+        challenge_phase_split_pk {[int]} -- Challenge phase split primary key
+        variants {[list]} -- (order_by, only_public_entries) pairs to update
+        update_ranking {[function]} -- Callable taking the cached rows, the
+            order_by label and only_public_entries and returning new rows
+    """
+    version = get_leaderboard_ranking_version(challenge_phase_split_pk)
+    cache_keys = {
+        (order_by, only_public_entries): get_leaderboard_ranking_cache_key(
+            challenge_phase_split_pk, version, order_by, only_public_entries
+        )
+        for order_by, only_public_entries in variants
+    }
+    cached_rankings = cache.get_many(list(cache_keys.values()))
+    if not cached_rankings:
+        # Nothing to update, but a rebuild may be reading the old rows right
+        # now. Bumping the version keeps it from caching them.
+        invalidate_leaderboard_ranking([challenge_phase_split_pk])
+        return
+
+    lock_key = _get_lock_key(challenge_phase_split_pk)
+    if not cache.add(lock_key, True, timeout=30):
+        invalidate_leaderboard_ranking([challenge_phase_split_pk])
+        return
+    try:
+        updated_rankings = {}
+        for (order_by, only_public_entries), cache_key in cache_keys.items():
+            if cache_key not in cached_rankings:
+                continue
+            updated_rankings[cache_key] = update_ranking(
+                cached_rankings[cache_key], order_by, only_public_entries
+            )
+        cache.set_many(updated_rankings, timeout=_get_cache_timeout())
+    except Exception:
+        logger.exception(
+            "Failed to update the leaderboard ranking of challenge phase "
+            "split {}".format(challenge_phase_split_pk)
+        )
+        invalidate_leaderboard_ranking([challenge_phase_split_pk])
+    finally:
+        cache.delete(lock_key)
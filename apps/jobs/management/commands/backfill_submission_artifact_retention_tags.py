@@ -23,6 +23,28 @@ class Command(BaseCommand):
             default=None,
             help="Override the S3 bucket name resolved from Django storage settings.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of threads tagging objects concurrently.",
+        )
+        parser.add_argument(
+            "--max-requests-per-second",
+            type=float,
+            default=None,
+            help="Limit on S3 requests per second across all workers.",
+        )
+        parser.add_argument(
+            "--checkpoint-file",
+            default=None,
+            help="File recording the last backfilled submission ID, a rerun resumes after it.",
+        )
+        parser.add_argument(
+            "--skip-tagged",
+            action="store_true",
+            help="Read the tags of each object first and skip objects already tagged.",
+        )
 
     def handle(self, *args, **options):
         dry_run = not options["execute"]
@@ -39,6 +61,10 @@ class Command(BaseCommand):
                 challenge_phase_ids=challenge_phase_ids,
                 dry_run=dry_run,
                 bucket_name=bucket_name,
+                workers=options["workers"],
+                max_requests_per_second=options["max_requests_per_second"],
+                checkpoint_path=options["checkpoint_file"],
+                skip_tagged=options["skip_tagged"],
             )
         except Exception as exc:
             raise CommandError(str(exc))
@@ -47,6 +73,13 @@ class Command(BaseCommand):
         self.stdout.write(f"S3 retention tag backfill complete ({mode})")
         self.stdout.write(f"Submissions seen: {summary['submissions_seen']}")
         self.stdout.write(f"Objects seen: {summary['objects_seen']}")
+        self.stdout.write(
+            f"Objects already tagged: {summary['objects_already_tagged']}"
+        )
         self.stdout.write(f"Objects to tag: {summary['objects_to_tag']}")
         self.stdout.write(f"Objects tagged: {summary['objects_tagged']}")
         self.stdout.write(f"Objects failed: {summary['objects_failed']}")
+        self.stdout.write(
+            f"Elapsed: {summary['elapsed_seconds']}s "
+            f"({summary['objects_per_second']} objects/s)"
+        )
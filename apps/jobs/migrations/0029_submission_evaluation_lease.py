@@ -0,0 +1,59 @@
+# Generated by Django 2.2.20 on 2026-10-18 04:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("challenges", "0135_alter_challenge_min_ecs_workers_default"),
+        ("jobs", "0028_submission_artifact_upload_paths"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SubmissionEvaluationLease",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("modified_at", models.DateTimeField(auto_now=True)),
+                (
+                    "submission_pk",
+                    models.PositiveIntegerField(blank=True, null=True),
+                ),
+                ("worker_id", models.CharField(db_index=True, max_length=255)),
+                (
+                    "heartbeat_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "challenge",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="submission_evaluation_leases",
+                        to="challenges.Challenge",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "submission_evaluation_lease",
+            },
+        ),
+        migrations.AddIndex(
+            model_name="submissionevaluationlease",
+            index=models.Index(
+                fields=["challenge", "heartbeat_at"],
+                name="sub_lease_challenge_hb_idx",
+            ),
+        ),
+    ]
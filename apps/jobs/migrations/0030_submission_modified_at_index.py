@@ -0,0 +1,19 @@
+# Generated by Django 2.2.20 on 2026-10-18 05:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("jobs", "0029_submission_evaluation_lease"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="submission",
+            index=models.Index(
+                fields=["modified_at"], name="sub_modified_at_idx"
+            ),
+        ),
+    ]
@@ -7,12 +7,13 @@ from base.utils import SubmissionArtifactFileName
 from challenges.models import ChallengePhase
 from django.contrib.auth.models import User
 from django.contrib.postgres.fields import ArrayField, JSONField
-from django.db import models
+from django.db import models, transaction
 from django.db.models import Max
-from django.db.models.signals import post_save, pre_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 from jobs.constants import submission_status_to_exclude
+from jobs.leaderboard_cache import LEADERBOARD_SUBMISSION_FIELDS
 from participants.models import ParticipantTeam
 from rest_framework.exceptions import PermissionDenied
 
@@ -40,6 +41,13 @@ def save_file(sender, instance, created, **kwargs):
 
 
 class Submission(TimeStampedModel):
+    def __init__(self, *args, **kwargs):
+        super(Submission, self).__init__(*args, **kwargs)
+        for field in LEADERBOARD_SUBMISSION_FIELDS:
+            setattr(self, "_original_{}".format(field), getattr(self, field))
+        # Status the submission was last counted towards its team's
+        # submission limits with, None until it is saved
+        self._quota_status = self.status if self.pk else None
 
     SUBMITTED = "submitted"
     RUNNING = "running"
@@ -156,6 +164,8 @@ class Submission(TimeStampedModel):
                 fields=["challenge_phase", "participant_team", "submitted_at"],
                 name="sub_phase_team_date_idx",
             ),
+            # Finds the submissions changed since the last rollup update
+            models.Index(fields=["modified_at"], name="sub_modified_at_idx"),
         ]
 
     @property
@@ -221,31 +231,17 @@ class Submission(TimeStampedModel):
                     )
                 )
 
-            total_submissions_done = Submission.objects.filter(
-                challenge_phase__challenge=self.challenge_phase.challenge,
-                participant_team=self.participant_team,
-                challenge_phase=self.challenge_phase,
-            )
-
-            submissions_done_today_count = (
-                total_submissions_done.filter(
-                    submitted_at__gte=timezone.now().replace(
-                        hour=0, minute=0, second=0, microsecond=0
-                    )
-                )
-                .exclude(status__in=submission_status_to_exclude)
-                .count()
-            )
+            from jobs.submission_quota import get_submission_counts
 
-            submissions_done_in_month_count = (
-                total_submissions_done.filter(
-                    submitted_at__gte=timezone.now().replace(
-                        day=1, hour=0, minute=0, second=0, microsecond=0
-                    )
-                )
-                .exclude(status__in=submission_status_to_exclude)
-                .count()
-            )
+            submission_counts = get_submission_counts(
+                self.participant_team_id, [self.challenge_phase_id]
+            )[self.challenge_phase_id]
+            submissions_done_today_count = submission_counts[
+                "submissions_today_count"
+            ]
+            submissions_done_in_month_count = submission_counts[
+                "submissions_this_month_count"
+            ]
 
             if (
                 self.challenge_phase.max_submissions_per_month
@@ -277,3 +273,312 @@ class Submission(TimeStampedModel):
 
         submission_instance = super(Submission, self).save(*args, **kwargs)
         return submission_instance
+
+
+class SubmissionEvaluationLease(TimeStampedModel):
+    """
+    A concurrency slot held by a submission worker for a submission it is
+    evaluating. The worker keeps the lease alive with heartbeats, so the
+    leases of a worker which died mid-evaluation lapse on their own.
+    """
+
+    challenge = models.ForeignKey(
+        "challenges.Challenge",
+        related_name="submission_evaluation_leases",
+        on_delete=models.CASCADE,
+    )
+    # Not a foreign key, the message of a deleted submission may still be
+    # received and has to take a slot like any other
+    submission_pk = models.PositiveIntegerField(null=True, blank=True)
+    worker_id = models.CharField(max_length=255, db_index=True)
+    heartbeat_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return "{}: {}".format(self.worker_id, self.submission_pk)
+
+    class Meta:
+        app_label = "jobs"
+        db_table = "submission_evaluation_lease"
+        indexes = [
+            models.Index(
+                fields=["challenge", "heartbeat_at"],
+                name="sub_lease_challenge_hb_idx",
+            ),
+        ]
+
+
+def _bump_challenge_versions_for_splits(challenge_phase_split_pks):
+    from challenges.models import ChallengePhaseSplit
+    from challenges.response_cache import bump_challenge_versions
+
+    # Cached responses of the challenges showing these leaderboards are stale
+    bump_challenge_versions(
+        ChallengePhaseSplit.objects.filter(
+            pk__in=challenge_phase_split_pks
+        ).values_list("challenge_phase__challenge", flat=True)
+    )
+
+
+def _refresh_leaderboard_ranking_on_commit(
+    challenge_phase_split_pks, participant_team_pks
+):
+    from jobs.utils import refresh_leaderboard_ranking_for_teams
+
+    # Querysets passed in are only evaluated once the transaction commits,
+    # which keeps the lookups out of the request that saved the instance
+    def refresh_leaderboard_ranking():
+        split_pks = list(challenge_phase_split_pks)
+        team_pks = list(participant_team_pks)
+        if split_pks and team_pks:
+            refresh_leaderboard_ranking_for_teams(split_pks, team_pks)
+            _bump_challenge_versions_for_splits(split_pks)
+
+    transaction.on_commit(refresh_leaderboard_ranking)
+
+
+def _invalidate_leaderboard_ranking_on_commit(challenge_phase_split_pks):
+    from jobs.leaderboard_cache import invalidate_leaderboard_ranking
+
+    def invalidate_leaderboard_ranking_and_responses():
+        split_pks = list(challenge_phase_split_pks)
+        if split_pks:
+            invalidate_leaderboard_ranking(split_pks)
+            _bump_challenge_versions_for_splits(split_pks)
+
+    transaction.on_commit(invalidate_leaderboard_ranking_and_responses)
+
+
+def _get_challenge_phase_split_pks(**filters):
+    from challenges.models import ChallengePhaseSplit
+
+    return ChallengePhaseSplit.objects.filter(**filters).values_list(
+        "pk", flat=True
+    )
+
+
+@receiver(post_save, sender="jobs.Submission")
+def update_leaderboard_ranking_for_submission(
+    sender, instance, created, **kwargs
+):
+    """
+    Merge the entries of the submission's team into the cached leaderboard
+    rankings when a field shown on or deciding the leaderboard changed.
+    """
+    leaderboard_statuses = (
+        Submission.FINISHED,
+        Submission.PARTIALLY_EVALUATED,
+    )
+    # Submissions that never reached the leaderboard can't change it
+    is_on_leaderboard = (
+        instance._original_status in leaderboard_statuses
+        or instance.status in leaderboard_statuses
+    )
+    changed_fields = [
+        field
+        for field in LEADERBOARD_SUBMISSION_FIELDS
+        if getattr(instance, "_original_{}".format(field))
+        != getattr(instance, field)
+    ]
+    for field in changed_fields:
+        setattr(
+            instance, "_original_{}".format(field), getattr(instance, field)
+        )
+    if created or not changed_fields or not is_on_leaderboard:
+        return
+    _refresh_leaderboard_ranking_on_commit(
+        _get_challenge_phase_split_pks(
+            challenge_phase_id=instance.challenge_phase_id
+        ),
+        [instance.participant_team_id],
+    )
+
+
+@receiver(post_delete, sender="jobs.Submission")
+def remove_submission_from_leaderboard_ranking(sender, instance, **kwargs):
+    _refresh_leaderboard_ranking_on_commit(
+        _get_challenge_phase_split_pks(
+            challenge_phase_id=instance.challenge_phase_id
+        ),
+        [instance.participant_team_id],
+    )
+
+
+def _is_counted_towards_submission_limits(submission_status):
+    return (
+        submission_status is not None
+        and submission_status not in submission_status_to_exclude
+    )
+
+
+def _invalidate_submission_counts_on_commit(submission):
+    from jobs.submission_quota import invalidate_submission_counts
+
+    challenge_phase_pk = submission.challenge_phase_id
+    participant_team_pk = submission.participant_team_id
+    # Counting again rather than incrementing the cached counters, which
+    # may already have been counted with this submission once it committed
+    transaction.on_commit(
+        lambda: invalidate_submission_counts(
+            challenge_phase_pk, participant_team_pk
+        )
+    )
+
+
+@receiver(post_save, sender="jobs.Submission")
+def invalidate_submission_counts_for_submission(sender, instance, **kwargs):
+    """
+    Drop the cached submission counts of the submission's team when it is
+    made or moves in or out of a status counted towards the limits.
+    """
+    was_counted = _is_counted_towards_submission_limits(instance._quota_status)
+    is_counted = _is_counted_towards_submission_limits(instance.status)
+    instance._quota_status = instance.status
+    if was_counted != is_counted:
+        _invalidate_submission_counts_on_commit(instance)
+
+
+@receiver(post_delete, sender="jobs.Submission")
+def invalidate_submission_counts_for_deleted_submission(
+    sender, instance, **kwargs
+):
+    if _is_counted_towards_submission_limits(instance._quota_status):
+        _invalidate_submission_counts_on_commit(instance)
+
+
+@receiver(post_delete, sender="jobs.Submission")
+def refresh_submission_rollups_for_deleted_submission(
+    sender, instance, **kwargs
+):
+    """
+    Recompute the rollups of the deleted submission's day, which the
+    periodic rollup update can't tell changed as no submission is left to
+    carry a newer modified_at.
+    """
+    from analytics.utils import refresh_submission_rollups
+
+    challenge_phase_pk = instance.challenge_phase_id
+    day = timezone.localtime(instance.submitted_at).date()
+    transaction.on_commit(
+        lambda: refresh_submission_rollups(challenge_phase_pk, [day])
+    )
+
+
+@receiver(post_save, sender="challenges.LeaderboardData")
+def update_leaderboard_ranking_for_leaderboard_data(
+    sender, instance, **kwargs
+):
+    _refresh_leaderboard_ranking_on_commit(
+        [instance.challenge_phase_split_id],
+        [instance.submission.participant_team_id],
+    )
+
+
+@receiver(post_delete, sender="challenges.LeaderboardData")
+def remove_leaderboard_data_from_leaderboard_ranking(
+    sender, instance, **kwargs
+):
+    # The submission may already be gone when this is part of a cascade, so
+    # the whole split is rebuilt instead of just the team's entries
+    _invalidate_leaderboard_ranking_on_commit(
+        [instance.challenge_phase_split_id]
+    )
+
+
+@receiver(post_save, sender="challenges.Challenge")
+def update_leaderboard_ranking_for_banned_teams(
+    sender, instance, created, **kwargs
+):
+    from participants.models import ParticipantTeam
+
+    previous_banned_email_ids = set(instance._original_banned_email_ids or [])
+    banned_email_ids = set(instance.banned_email_ids or [])
+    instance._original_banned_email_ids = instance.banned_email_ids
+    if created or previous_banned_email_ids == banned_email_ids:
+        return
+    # Only the teams of newly banned or unbanned participants can move
+    participant_team_pks = (
+        ParticipantTeam.objects.filter(
+            participants__user__email__in=previous_banned_email_ids
+            ^ banned_email_ids,
+            submissions__challenge_phase__challenge=instance,
+        )
+        .values_list("pk", flat=True)
+        .distinct()
+    )
+    _refresh_leaderboard_ranking_on_commit(
+        _get_challenge_phase_split_pks(challenge_phase__challenge=instance),
+        participant_team_pks,
+    )
+
+
+@receiver(post_save, sender="participants.ParticipantTeam")
+@receiver(post_save, sender="participants.Participant")
+@receiver(post_delete, sender="participants.Participant")
+def update_leaderboard_ranking_for_participant_team(
+    sender, instance, created=False, **kwargs
+):
+    """
+    Team names, URLs and members (for bans) are part of the ranking, so the
+    team's entries are merged again wherever it is on a leaderboard.
+    """
+    from challenges.models import LeaderboardData
+
+    if created and sender._meta.model_name == "participantteam":
+        return
+    participant_team_pk = getattr(instance, "team_id", instance.pk)
+    if participant_team_pk is None:
+        return
+    challenge_phase_split_pks = (
+        LeaderboardData.objects.filter(
+            submission__participant_team=participant_team_pk
+        )
+        .values_list("challenge_phase_split", flat=True)
+        .distinct()
+    )
+    _refresh_leaderboard_ranking_on_commit(
+        challenge_phase_split_pks, [participant_team_pk]
+    )
+
+
+@receiver(post_save, sender="challenges.ChallengePhase")
+def invalidate_leaderboard_ranking_for_challenge_phase(
+    sender, instance, created, **kwargs
+):
+    if created:
+        return
+    _invalidate_leaderboard_ranking_on_commit(
+        _get_challenge_phase_split_pks(challenge_phase=instance)
+    )
+
+
+@receiver(post_save, sender="challenges.ChallengePhaseSplit")
+def invalidate_leaderboard_ranking_for_challenge_phase_split(
+    sender, instance, created, **kwargs
+):
+    if created:
+        return
+    _invalidate_leaderboard_ranking_on_commit([instance.pk])
+
+
+@receiver(post_save, sender="challenges.Leaderboard")
+def invalidate_leaderboard_ranking_for_leaderboard(
+    sender, instance, created, **kwargs
+):
+    if created:
+        return
+    _invalidate_leaderboard_ranking_on_commit(
+        _get_challenge_phase_split_pks(leaderboard=instance)
+    )
+
+
+@receiver(post_save, sender="hosts.ChallengeHost")
+@receiver(post_delete, sender="hosts.ChallengeHost")
+def invalidate_leaderboard_ranking_for_challenge_host(
+    sender, instance, **kwargs
+):
+    # Entries of challenge hosts are hidden from public leaderboards
+    _invalidate_leaderboard_ranking_on_commit(
+        _get_challenge_phase_split_pks(
+            challenge_phase__challenge__creator=instance.team_name_id
+        )
+    )
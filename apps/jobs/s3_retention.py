@@ -1,5 +1,9 @@
+import json
 import logging
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlencode
 
 import boto3
@@ -204,12 +208,73 @@ def tag_submission_artifacts_for_retention(submission, artifact_paths=None):
             )
 
 
+def get_submission_artifact_tags(path, s3_client, bucket_name):
+    response = s3_client.get_object_tagging(
+        Bucket=bucket_name, Key=get_submission_artifact_s3_key(path)
+    )
+    return {tag["Key"]: tag["Value"] for tag in response["TagSet"]}
+
+
+class RateLimiter:
+    """Space calls to ``acquire`` evenly, across threads, so that at most
+    ``rate`` of them return per second. A falsy rate disables the limit."""
+
+    def __init__(self, rate=None):
+        self.interval = 1.0 / rate if rate else 0
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            wait = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+def read_backfill_checkpoint(checkpoint_path):
+    """Return the last submission id recorded in a backfill checkpoint."""
+    if not checkpoint_path or not os.path.exists(checkpoint_path):
+        return None
+    with open(checkpoint_path) as checkpoint_file:
+        return json.load(checkpoint_file).get("last_submission_id")
+
+
+def write_backfill_checkpoint(checkpoint_path, last_submission_id):
+    if not checkpoint_path:
+        return
+    temp_path = f"{checkpoint_path}.tmp"
+    with open(temp_path, "w") as checkpoint_file:
+        json.dump({"last_submission_id": last_submission_id}, checkpoint_file)
+    os.replace(temp_path, checkpoint_path)
+
+
 def backfill_submission_artifact_tags(
     challenge_phase_ids=None,
     dry_run=True,
     s3_client=None,
     bucket_name=None,
+    workers=1,
+    max_requests_per_second=None,
+    checkpoint_path=None,
+    skip_tagged=False,
+    batch_size=1000,
 ):
+    """Tag the S3 artifacts of existing submissions with their retention tags.
+
+    Submissions are walked in id order, ``batch_size`` at a time, and their
+    objects are tagged by ``workers`` threads sharing a limit of
+    ``max_requests_per_second`` S3 requests. Once a batch is done the id of
+    its last submission is written to ``checkpoint_path``, and a later run
+    with the same checkpoint starts after it. The checkpoint never moves past
+    a submission with an object that failed to be tagged, so that a later
+    run retries it, and isn't written on dry runs. With ``skip_tagged`` the
+    tags of each object are read first and objects already tagged as
+    expected are left alone.
+    """
     from jobs.models import Submission
 
     queryset = Submission.objects.select_related(
@@ -220,36 +285,104 @@ def backfill_submission_artifact_tags(
     )
     if challenge_phase_ids:
         queryset = queryset.filter(challenge_phase_id__in=challenge_phase_ids)
+    last_submission_id = read_backfill_checkpoint(checkpoint_path)
+    if last_submission_id is not None:
+        queryset = queryset.filter(pk__gt=last_submission_id)
 
     summary = {
         "submissions_seen": 0,
         "objects_seen": 0,
         "objects_to_tag": 0,
+        "objects_already_tagged": 0,
         "objects_tagged": 0,
         "objects_failed": 0,
     }
+    if skip_tagged or not dry_run:
+        s3_client, bucket_name = get_s3_client_and_bucket(
+            s3_client=s3_client, bucket_name=bucket_name
+        )
+    rate_limiter = RateLimiter(max_requests_per_second)
+    summary_lock = threading.Lock()
+    checkpoint_stalled = False
 
-    for submission in queryset.iterator(chunk_size=1000):
-        summary["submissions_seen"] += 1
-        for path in get_submission_artifact_paths(submission):
-            summary["objects_seen"] += 1
-            summary["objects_to_tag"] += 1
-            if dry_run:
-                continue
-            try:
-                if put_submission_artifact_tags(
-                    submission,
-                    path,
-                    s3_client=s3_client,
-                    bucket_name=bucket_name,
-                ):
-                    summary["objects_tagged"] += 1
-            except Exception:
-                summary["objects_failed"] += 1
-                logger.exception(
-                    "Failed to backfill retention tags: submission_id=%s path=%s",
-                    submission.pk,
-                    path,
+    def count(key):
+        with summary_lock:
+            summary[key] += 1
+
+    def backfill_object(submission, path):
+        try:
+            if skip_tagged:
+                rate_limiter.acquire()
+                tags = get_submission_artifact_tags(
+                    path, s3_client, bucket_name
                 )
+                if tags == build_submission_artifact_s3_tags(submission):
+                    count("objects_already_tagged")
+                    return True
+            count("objects_to_tag")
+            if dry_run:
+                return True
+            rate_limiter.acquire()
+            if put_submission_artifact_tags(
+                submission,
+                path,
+                s3_client=s3_client,
+                bucket_name=bucket_name,
+            ):
+                count("objects_tagged")
+                return True
+        except Exception:
+            logger.exception(
+                "Failed to backfill retention tags: submission_id=%s path=%s",
+                submission.pk,
+                path,
+            )
+        count("objects_failed")
+        return False
 
+    def backfill_batch(executor, submissions):
+        nonlocal checkpoint_stalled
+        objects = [
+            (submission, path)
+            for submission in submissions
+            for path in get_submission_artifact_paths(submission)
+        ]
+        summary["submissions_seen"] += len(submissions)
+        summary["objects_seen"] += len(objects)
+        results = executor.map(lambda args: backfill_object(*args), objects)
+        failed_submission_ids = {
+            submission.pk
+            for (submission, _), tagged in zip(objects, results)
+            if not tagged
+        }
+        if dry_run or checkpoint_stalled:
+            return
+        # The checkpoint only moves past submissions whose objects were all
+        # tagged, the ones after a failure are tagged again by the next run
+        last_submission_id = None
+        for submission in submissions:
+            if submission.pk in failed_submission_ids:
+                checkpoint_stalled = True
+                break
+            last_submission_id = submission.pk
+        if last_submission_id is not None:
+            write_backfill_checkpoint(checkpoint_path, last_submission_id)
+
+    start_time = time.monotonic()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        submissions = []
+        for submission in queryset.order_by("pk").iterator(
+            chunk_size=batch_size
+        ):
+            submissions.append(submission)
+            if len(submissions) >= batch_size:
+                backfill_batch(executor, submissions)
+                submissions = []
+        if submissions:
+            backfill_batch(executor, submissions)
+
+    summary["elapsed_seconds"] = round(time.monotonic() - start_time, 2)
+    summary["objects_per_second"] = round(
+        summary["objects_seen"] / max(summary["elapsed_seconds"], 0.01), 2
+    )
     return summary
@@ -4,7 +4,12 @@ import json
 import logging
 import uuid
 
-from base.utils import get_or_create_sqs_queue, send_slack_notification
+import botocore
+from base.utils import (
+    get_or_create_sqs_queue,
+    invalidate_sqs_queue_url,
+    send_slack_notification,
+)
 from challenges.models import Challenge
 
 from .utils import get_submission_model
@@ -81,7 +86,19 @@ def publish_submission_message(message):
         send_kwargs["MessageDeduplicationId"] = "{}-{}".format(
             message["submission_pk"], uuid.uuid4()
         )
-    response = queue.send_message(**send_kwargs)
+    try:
+        response = queue.send_message(**send_kwargs)
+    except botocore.exceptions.ClientError as ex:
+        if (
+            ex.response["Error"]["Code"]
+            != "AWS.SimpleQueueService.NonExistentQueue"
+        ):
+            raise
+        # The queue was deleted after its URL was cached, look it up again
+        # and create it if needed
+        invalidate_sqs_queue_url(queue_name, challenge)
+        queue = get_or_create_sqs_queue(queue_name, challenge)
+        response = queue.send_message(**send_kwargs)
     # send slack notification
     if slack_url:
         challenge_name = challenge.title
@@ -0,0 +1,123 @@
+from challenges.models import Challenge, ChallengePhase
+from challenges.response_cache import get_challenge_version
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import (
+    BooleanField,
+    Count,
+    Exists,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from hosts.models import ChallengeHost
+from participants.models import Participant, ParticipantTeam
+
+from .constants import in_progress_submission_statuses
+from .models import Submission
+
+
+def _get_cache_timeout():
+    return getattr(settings, "SUBMISSION_ELIGIBILITY_CACHE_TIMEOUT", 60)
+
+
+def get_challenge_and_phase(challenge_pk, challenge_phase_pk):
+    """
+    Returns the challenge and the challenge phase a submission is made to.
+    Both are cached under the version of the challenge, which is bumped
+    whenever the challenge or one of its phases is saved.
+
+    Arguments:
+        challenge_pk {[int]} -- Challenge primary key
+        challenge_phase_pk {[int]} -- Challenge phase primary key
+
+    Returns:
+        [tuple] -- The challenge and the challenge phase
+
+    Raises:
+        Challenge.DoesNotExist -- The challenge doesn't exist
+        ChallengePhase.DoesNotExist -- The phase isn't one of the challenge
+    """
+    cache_key = "submission_challenge_and_phase:{}:{}:{}".format(
+        get_challenge_version(challenge_pk), challenge_pk, challenge_phase_pk
+    )
+    challenge_and_phase = cache.get(cache_key)
+    if challenge_and_phase is None:
+        challenge = Challenge.objects.get(pk=challenge_pk)
+        challenge_phase = ChallengePhase.objects.get(
+            pk=challenge_phase_pk, challenge=challenge
+        )
+        challenge_phase.challenge = challenge
+        challenge_and_phase = (challenge, challenge_phase)
+        cache.set(cache_key, challenge_and_phase, timeout=_get_cache_timeout())
+    return challenge_and_phase
+
+
+def get_submission_eligibility(user, challenge, challenge_phase):
+    """
+    Look up everything needed to decide whether a user can submit to a
+    challenge phase with two queries: one for the host membership and one
+    for the participant team of the user, annotated with whether the host
+    approved it, whether any of its members is banned and the number of its
+    submissions to the phase being processed.
+
+    Arguments:
+        user {[User]} -- User making the submission
+        challenge {[Challenge]} -- Challenge the submission is made to
+        challenge_phase {[ChallengePhase]} -- Phase the submission is made to
+
+    Returns:
+        [dict] -- Whether the user is a host of the challenge and their
+                  annotated participant team, None if they haven't
+                  participated
+    """
+    is_host = ChallengeHost.objects.filter(
+        user=user, team_name_id=challenge.creator_id
+    ).exists()
+
+    if challenge.manual_participant_approval:
+        is_approved = Exists(
+            Challenge.approved_participant_teams.through.objects.filter(
+                challenge_id=challenge.pk, participantteam_id=OuterRef("pk")
+            )
+        )
+    else:
+        is_approved = Value(True, output_field=BooleanField())
+    if challenge.banned_email_ids:
+        is_banned = Exists(
+            Participant.objects.filter(
+                team_id=OuterRef("pk"),
+                user__email__in=set(challenge.banned_email_ids),
+            )
+        )
+    else:
+        is_banned = Value(False, output_field=BooleanField())
+    submissions_in_progress = (
+        Submission.objects.filter(
+            participant_team_id=OuterRef("pk"),
+            challenge_phase_id=challenge_phase.pk,
+            status__in=in_progress_submission_statuses,
+        )
+        .order_by()
+        .values("participant_team_id")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    participant_team = (
+        ParticipantTeam.objects.filter(
+            participants__user=user, challenge=challenge.pk
+        )
+        .annotate(
+            is_approved=is_approved,
+            is_banned=is_banned,
+            submissions_in_progress=Coalesce(
+                Subquery(submissions_in_progress, output_field=IntegerField()),
+                0,
+            ),
+        )
+        .order_by("pk")
+        .first()
+    )
+    return {"is_host": is_host, "participant_team": participant_team}
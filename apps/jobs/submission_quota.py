@@ -0,0 +1,176 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .constants import submission_status_to_exclude
+from .models import Submission
+
+SUBMISSION_COUNT_FIELDS = (
+    "submissions_count",
+    "submissions_this_month_count",
+    "submissions_today_count",
+)
+
+
+def _get_cache_timeout():
+    return getattr(settings, "SUBMISSION_QUOTA_CACHE_TIMEOUT", 10 * 60)
+
+
+def _get_version_key(challenge_phase_pk, participant_team_pk):
+    return "submission_quota_version:{}:{}".format(
+        challenge_phase_pk, participant_team_pk
+    )
+
+
+def _get_initial_version():
+    # Versions start from the current time so that a version key evicted from
+    # the cache never comes back with a value older counters were stored with.
+    return int(time.time() * 1000)
+
+
+def _get_version(challenge_phase_pk, participant_team_pk):
+    version_key = _get_version_key(challenge_phase_pk, participant_team_pk)
+    version = cache.get(version_key)
+    if version is None:
+        version = _get_initial_version()
+        cache.add(version_key, version, timeout=None)
+        version = cache.get(version_key, version)
+    return version
+
+
+def _get_period_starts(now):
+    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    return month_start, today_start
+
+
+def _get_counter_keys(challenge_phase_pk, participant_team_pk, now):
+    # Counters are keyed by the current day, so the monthly and daily counts
+    # start over from the database once the period they cover has ended.
+    prefix = "submission_quota:{}:{}:{}:{}".format(
+        challenge_phase_pk,
+        participant_team_pk,
+        _get_version(challenge_phase_pk, participant_team_pk),
+        now.strftime("%Y-%m-%d"),
+    )
+    return {
+        field: "{}:{}".format(prefix, field)
+        for field in SUBMISSION_COUNT_FIELDS
+    }
+
+
+def count_submissions(participant_team_pk, challenge_phase_pks, now=None):
+    """
+    Count the submissions of a participant team made in total, this month
+    and today to each of the given challenge phases with a single query.
+    Failed and cancelled submissions don't count towards the limits.
+
+    Arguments:
+        participant_team_pk {[int]} -- Participant team primary key
+        challenge_phase_pks {[list]} -- Challenge phase primary keys
+        now {[datetime]} -- Time the periods are computed from
+
+    Returns:
+        [dict] -- Counts keyed by challenge phase primary key
+    """
+    now = now or timezone.now()
+    month_start, today_start = _get_period_starts(now)
+    # Driving the query from submission puts participant_team_id in the WHERE
+    # clause, where its index narrows the scan to this team's rows before the
+    # counts of every phase are aggregated in one pass
+    phase_counts = (
+        Submission.objects.filter(
+            participant_team_id=participant_team_pk,
+            challenge_phase_id__in=challenge_phase_pks,
+        )
+        .exclude(status__in=submission_status_to_exclude)
+        .values("challenge_phase_id")
+        .annotate(
+            submissions_count=Count("id"),
+            submissions_this_month_count=Count(
+                "id", filter=Q(submitted_at__gte=month_start)
+            ),
+            submissions_today_count=Count(
+                "id", filter=Q(submitted_at__gte=today_start)
+            ),
+        )
+    )
+    counts_by_phase_pk = {
+        row["challenge_phase_id"]: row for row in phase_counts
+    }
+    return {
+        challenge_phase_pk: {
+            field: counts_by_phase_pk.get(challenge_phase_pk, {}).get(field, 0)
+            for field in SUBMISSION_COUNT_FIELDS
+        }
+        for challenge_phase_pk in challenge_phase_pks
+    }
+
+
+def get_submission_counts(participant_team_pk, challenge_phase_pks):
+    """
+    Returns the number of submissions a participant team made in total, this
+    month and today to each of the given challenge phases. Counts are served
+    from cached per phase and team counters, the phases missing from the
+    cache are counted together with one query and cached. Counters are
+    dropped whenever a submission of the team is added, removed or moves in
+    or out of the statuses counted towards the limits.
+
+    Arguments:
+        participant_team_pk {[int]} -- Participant team primary key
+        challenge_phase_pks {[list]} -- Challenge phase primary keys
+
+    Returns:
+        [dict] -- Counts keyed by challenge phase primary key
+    """
+    now = timezone.now()
+    counts = {}
+    missing_counter_keys = {}
+    for challenge_phase_pk in challenge_phase_pks:
+        counter_keys = _get_counter_keys(
+            challenge_phase_pk, participant_team_pk, now
+        )
+        cached_counts = cache.get_many(list(counter_keys.values()))
+        if len(cached_counts) == len(counter_keys):
+            counts[challenge_phase_pk] = {
+                field: cached_counts[key]
+                for field, key in counter_keys.items()
+            }
+        else:
+            missing_counter_keys[challenge_phase_pk] = counter_keys
+
+    if missing_counter_keys:
+        missing_counts = count_submissions(
+            participant_team_pk, list(missing_counter_keys), now
+        )
+        for challenge_phase_pk, counter_keys in missing_counter_keys.items():
+            # Counters are keyed by the version read before counting, so
+            # counts that may have missed a submission committed meanwhile
+            # are stored under a version its commit already moved past
+            for field, key in counter_keys.items():
+                cache.add(
+                    key,
+                    missing_counts[challenge_phase_pk][field],
+                    timeout=_get_cache_timeout(),
+                )
+        counts.update(missing_counts)
+    return counts
+
+
+def invalidate_submission_counts(challenge_phase_pk, participant_team_pk):
+    """
+    Drop the cached counters of a participant team for a challenge phase so
+    they are counted again on the next read.
+
+    Arguments:
+        challenge_phase_pk {[int]} -- Challenge phase primary key
+        participant_team_pk {[int]} -- Participant team primary key
+    """
+    version_key = _get_version_key(challenge_phase_pk, participant_team_pk)
+    try:
+        cache.incr(version_key)
+    except ValueError:
+        cache.set(version_key, _get_initial_version(), timeout=None)
@@ -4,7 +4,10 @@ import shutil
 
 from challenges.aws_utils import trigger_eks_node_autoscale
 from challenges.models import ChallengePhase
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.files import File
+from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.http import HttpRequest
 from participants.models import ParticipantTeam
@@ -15,7 +18,7 @@ from evalai.celery import app
 from .models import Submission
 from .sender import publish_submission_message
 from .serializers import SubmissionSerializer
-from .utils import get_file_from_url
+from .utils import get_file_from_url, is_url_valid, upload_file_from_url_to_s3
 
 logger = logging.getLogger(__name__)
 
@@ -47,39 +50,56 @@ def download_file_and_publish_submission_message(
     request = HttpRequest()
     request.method = request_method
     request.user = user
+    data = {
+        "method_name": request_data["method_name"],
+        "method_description": request_data["method_description"],
+        "project_url": request_data["project_url"],
+        "publication_url": request_data["publication_url"],
+        "status": Submission.SUBMITTED,
+    }
+    context = {
+        "participant_team": participant_team,
+        "challenge_phase": challenge_phase,
+        "request": request,
+    }
     file_download_temp_dir_path = ""
     try:
-        downloaded_file = get_file_from_url(request_data["file_url"])
-        file_path = os.path.join(
-            downloaded_file["temp_dir_path"], downloaded_file["name"]
-        )
-        file_download_temp_dir_path = downloaded_file["temp_dir_path"]
+        # The URL is checked here rather than when the submission is made, so
+        # that a slow host doesn't hold up the request
+        if not is_url_valid(request_data["file_url"]):
+            logger.warning(
+                "Failing URL-based submission: the file URL %s does not "
+                "exist",
+                request_data["file_url"],
+            )
+            create_failed_submission_for_invalid_url(
+                request_data["file_url"], data, context
+            )
+            return
+        if settings.DEBUG or settings.TEST:
+            downloaded_file = get_file_from_url(request_data["file_url"])
+            file_path = os.path.join(
+                downloaded_file["temp_dir_path"], downloaded_file["name"]
+            )
+            file_download_temp_dir_path = downloaded_file["temp_dir_path"]
 
-        with open(file_path, "rb") as f:
-            input_file = SimpleUploadedFile(
-                downloaded_file["name"],
-                f.read(),
-                content_type="multipart/form-data",
+            # The storage copies the file over in chunks instead of it being
+            # read into memory
+            with open(file_path, "rb") as f:
+                data["input_file"] = File(f, name=downloaded_file["name"])
+                serializer = SubmissionSerializer(data=data, context=context)
+                submission = None
+                if serializer.is_valid():
+                    serializer.save()
+                    submission = serializer.instance
+            shutil.rmtree(file_download_temp_dir_path)
+            file_download_temp_dir_path = ""
+        else:
+            submission = create_submission_streamed_from_url(
+                request_data["file_url"], data, context
             )
-        data = {
-            "input_file": input_file,
-            "method_name": request_data["method_name"],
-            "method_description": request_data["method_description"],
-            "project_url": request_data["project_url"],
-            "publication_url": request_data["publication_url"],
-            "status": Submission.SUBMITTED,
-        }
-        serializer = SubmissionSerializer(
-            data=data,
-            context={
-                "participant_team": participant_team,
-                "challenge_phase": challenge_phase,
-                "request": request,
-            },
-        )
-        if serializer.is_valid():
-            serializer.save()
-            submission = serializer.instance
+
+        if submission is not None:
             from .s3_retention import (
                 enqueue_submission_artifact_retention_tagging,
             )
@@ -103,7 +123,6 @@ def download_file_and_publish_submission_message(
                 submission_status=Submission.SUBMITTED,
             )
             logger.info("Message published to submission worker successfully!")
-        shutil.rmtree(file_download_temp_dir_path)
     except Exception as e:
         if len(file_download_temp_dir_path) > 0:
             shutil.rmtree(file_download_temp_dir_path)
@@ -114,6 +133,91 @@ def download_file_and_publish_submission_message(
         )
 
 
+def create_failed_submission_for_invalid_url(url, data, context):
+    """
+    Create a failed submission telling the participant that the file at the
+    url couldn't be found, so the submission doesn't silently go missing.
+
+    Arguments:
+        url {[str]} -- URL of the submission file
+        data {[dict]} -- Submission data, without the input file
+        context {[dict]} -- Context of the submission serializer
+
+    Returns:
+        [Submission] -- The submission, None if the data isn't valid
+    """
+    data["status"] = Submission.FAILED
+    data["input_file"] = SimpleUploadedFile(
+        url.split("/")[-1], b"file_content", content_type="text/plain"
+    )
+    serializer = SubmissionSerializer(data=data, context=context)
+    if not serializer.is_valid():
+        return None
+    serializer.save()
+    submission = serializer.instance
+    submission.stderr_file.save(
+        "stderr.txt",
+        ContentFile(
+            "The submission file could not be downloaded from {}. Please "
+            "check that the URL is correct and publicly accessible, and "
+            "submit again.".format(url)
+        ),
+    )
+    return submission
+
+
+def create_submission_streamed_from_url(url, data, context):
+    """
+    Create a submission with a placeholder input file, like submissions
+    uploaded through presigned urls, and stream the file at the url over it
+    in S3. The file never has to fit in the worker's memory or disk.
+
+    Arguments:
+        url {[str]} -- URL of the submission file
+        data {[dict]} -- Submission data, without the input file
+        context {[dict]} -- Context of the submission serializer
+
+    Returns:
+        [Submission] -- The submission, None if the data isn't valid
+    """
+    data["input_file"] = SimpleUploadedFile(
+        url.split("/")[-1], b"file_content", content_type="text/plain"
+    )
+    serializer = SubmissionSerializer(data=data, context=context)
+    if not serializer.is_valid():
+        return None
+    serializer.save()
+    submission = serializer.instance
+
+    from .s3_retention import (
+        get_s3_client_and_bucket,
+        get_submission_artifact_s3_key,
+    )
+
+    # The file is streamed over the placeholder, so it has to go to the
+    # bucket of the default storage rather than to the challenge's bucket
+    s3_client, bucket_name = get_s3_client_and_bucket()
+    try:
+        uploaded_file = upload_file_from_url_to_s3(
+            url,
+            s3_client,
+            bucket_name,
+            get_submission_artifact_s3_key(submission.input_file.name),
+        )
+    except Exception:
+        submission.status = Submission.FAILED
+        submission.save()
+        raise
+    logger.info(
+        "Uploaded %s bytes with SHA-256 %s from %s for submission %s",
+        uploaded_file["size"],
+        uploaded_file["sha256"],
+        url,
+        submission.pk,
+    )
+    return submission
+
+
 @app.task
 def tag_submission_artifact_retention_tags(submission_pk, artifact_paths):
     from .s3_retention import tag_submission_artifacts_for_retention
@@ -72,6 +72,21 @@ urlpatterns = [
         views.get_submission_message_from_queue,
         name="get_submission_message_from_queue",
     ),
+    url(
+        r"^challenge/queues/(?P<queue_name>[\w.-]+)/messages/$",
+        views.get_submission_messages_from_queue,
+        name="get_submission_messages_from_queue",
+    ),
+    url(
+        r"^queues/(?P<queue_name>[\w.-]+)/messages/delete/$",
+        views.delete_submission_messages_from_queue,
+        name="delete_submission_messages_from_queue",
+    ),
+    url(
+        r"^queues/(?P<queue_name>[\w.-]+)/messages/visibility/$",
+        views.change_submission_messages_visibility,
+        name="change_submission_messages_visibility",
+    ),
     url(
         r"^submission_files/$",
         views.get_signed_url_for_submission_related_file,
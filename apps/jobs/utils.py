@@ -1,4 +1,7 @@
+import base64
 import datetime
+import hashlib
+import json
 import logging
 import os
 import tempfile
@@ -10,18 +13,37 @@ from challenges.models import ChallengePhaseSplit, LeaderboardData
 from challenges.utils import get_challenge_phase_model
 from django.conf import settings
 from django.contrib.auth.models import User
-from django.db.models import ExpressionWrapper, F, FloatField, Q, fields
+from django.contrib.postgres.fields.jsonb import KeyTextTransform
+from django.db.models import (
+    Case,
+    ExpressionWrapper,
+    F,
+    FloatField,
+    IntegerField,
+    Q,
+    Value,
+    When,
+    fields,
+)
 from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce
 from django.utils import timezone
 from hosts.utils import is_user_a_staff_or_host
 from participants.models import ParticipantTeam
 from participants.utils import get_participant_team_id_of_user_for_a_challenge
 from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 
-from .constants import submission_status_to_exclude
+from .leaderboard_cache import (
+    get_cached_leaderboard_ranking,
+    update_cached_leaderboard_ranking,
+)
 from .models import Submission
 from .serializers import SubmissionSerializer
+from .submission_quota import get_submission_counts
 
 get_submission_model = get_model_object(Submission)
 get_challenge_phase_split_model = get_model_object(ChallengePhaseSplit)
@@ -83,28 +105,14 @@ def get_remaining_submission_for_a_phase(
     max_submissions_per_month_count = challenge_phase.max_submissions_per_month
     max_submissions_per_day_count = challenge_phase.max_submissions_per_day
 
-    submissions_done = Submission.objects.filter(
-        challenge_phase__challenge=challenge_pk,
-        challenge_phase=challenge_phase_pk,
-        participant_team=participant_team_pk,
-    ).exclude(status__in=submission_status_to_exclude)
-
-    submissions_done_this_month = submissions_done.filter(
-        submitted_at__gte=timezone.now().replace(
-            day=1, hour=0, minute=0, second=0, microsecond=0
-        )
-    )
-
-    # Get the submissions_done_today by midnight time of the day
-    submissions_done_today = submissions_done.filter(
-        submitted_at__gte=timezone.now().replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-    )
-
-    submissions_done_count = submissions_done.count()
-    submissions_done_this_month_count = submissions_done_this_month.count()
-    submissions_done_today_count = submissions_done_today.count()
+    submission_counts = get_submission_counts(
+        participant_team_pk, [challenge_phase.pk]
+    )[challenge_phase.pk]
+    submissions_done_count = submission_counts["submissions_count"]
+    submissions_done_this_month_count = submission_counts[
+        "submissions_this_month_count"
+    ]
+    submissions_done_today_count = submission_counts["submissions_today_count"]
 
     # Check for maximum submission limit
     if submissions_done_count >= max_submissions_count:
@@ -207,7 +215,7 @@ def get_file_from_url(url):
     headers = {"user-agent": "Wget/1.16 (linux-gnu)"}
     response = requests.get(url, stream=True, headers=headers)
     with open(file_path, "wb") as f:
-        for chunk in response.iter_content(chunk_size=1024):
+        for chunk in response.iter_content(chunk_size=1024 * 1024):
             if chunk:
                 f.write(chunk)
     file_obj["name"] = file_name
@@ -215,6 +223,83 @@ def get_file_from_url(url):
     return file_obj
 
 
+def upload_file_from_url_to_s3(url, s3_client, bucket, key):
+    """
+    Stream a remote file into an S3 multipart upload, holding at most one
+    part in memory. Every part is sent with its MD5 for S3 to check, and the
+    downloaded size is checked against the one announced by the server. The
+    ETag of the object isn't checked as it isn't derived from the MD5 of the
+    parts for KMS encrypted objects, nor on every S3 compatible store. The
+    upload is aborted on any failure.
+
+    Arguments:
+        url {[str]} -- URL of the file
+        s3_client {[boto3.client]} -- S3 client to upload with
+        bucket {[str]} -- Bucket to upload to
+        key {[str]} -- Key of the uploaded object
+
+    Returns:
+        [dict] -- Size in bytes and SHA-256 of the uploaded file
+    """
+    part_size = settings.SUBMISSION_URL_UPLOAD_PART_SIZE
+    headers = {"user-agent": "Wget/1.16 (linux-gnu)"}
+    upload_id = s3_client.create_multipart_upload(Bucket=bucket, Key=key)[
+        "UploadId"
+    ]
+    try:
+        with requests.get(url, stream=True, headers=headers) as response:
+            response.raise_for_status()
+            parts = []
+            size = 0
+            sha256 = hashlib.sha256()
+            buffer = bytearray()
+
+            def upload_part(body):
+                digest = hashlib.md5(body).digest()
+                part = s3_client.upload_part(
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    PartNumber=len(parts) + 1,
+                    Body=bytes(body),
+                    ContentMD5=base64.b64encode(digest).decode("ascii"),
+                )
+                parts.append(
+                    {"ETag": part["ETag"], "PartNumber": len(parts) + 1}
+                )
+
+            for chunk in response.iter_content(chunk_size=1024 * 1024):
+                size += len(chunk)
+                sha256.update(chunk)
+                buffer.extend(chunk)
+                while len(buffer) >= part_size:
+                    upload_part(buffer[:part_size])
+                    del buffer[:part_size]
+            # An empty file is still uploaded as a single empty part
+            if buffer or not parts:
+                upload_part(buffer)
+
+            expected_size = response.headers.get("Content-Length")
+            if expected_size is not None and int(expected_size) != size:
+                raise ValueError(
+                    "Downloaded {} bytes of {}, expected {}".format(
+                        size, url, expected_size
+                    )
+                )
+        s3_client.complete_multipart_upload(
+            Bucket=bucket,
+            Key=key,
+            UploadId=upload_id,
+            MultipartUpload={"Parts": parts},
+        )
+    except Exception:
+        s3_client.abort_multipart_upload(
+            Bucket=bucket, Key=key, UploadId=upload_id
+        )
+        raise
+    return {"size": size, "sha256": sha256.hexdigest()}
+
+
 def handle_submission_rerun(submission, updated_status):
     """
     Function to handle the submission re-running. It is handled in the following way -
@@ -311,23 +396,18 @@ def handle_submission_resume(submission, updated_status):
     return message
 
 
-def calculate_distinct_sorted_leaderboard_data(
-    user, challenge_obj, challenge_phase_split, only_public_entries, order_by
-):
+def _get_leaderboard_ordering(challenge_phase_split, order_by):
     """
-    Function to calculate and return the sorted leaderboard data
+    Function to resolve the key and direction used to rank the leaderboard
 
     Arguments:
-        user {[Class object]} -- User model object
-        challenge_obj {[Class object]} -- Challenge model object
         challenge_phase_split {[Class object]} -- Challenge phase split model object
-        only_public_entries {[Boolean]} -- Boolean value to determine if the user wants to include private entries or not
+        order_by {[str]} -- Leaderboard label requested to rank the entries by
 
     Returns:
-        [list] -- Ranked list of participant teams to be shown on leaderboard
+        [tuple] -- (label to rank by, is ranking descending) on success, error data otherwise
         [status] -- HTTP status code (200/400)
     """
-    # Get the leaderboard associated with the Challenge Phase Split
     leaderboard = challenge_phase_split.leaderboard
 
     # Get the default order by key to rank the entries on the leaderboard
@@ -364,7 +444,27 @@ def calculate_distinct_sorted_leaderboard_data(
             )
             is False
         )
+    return (
+        (default_order_by, is_leaderboard_order_descending),
+        status.HTTP_200_OK,
+    )
+
 
+def _get_leaderboard_data_queryset(
+    challenge_obj, challenge_phase_split, only_public_entries, order_by
+):
+    """
+    Function to build the queryset of all the leaderboard entries of a challenge phase split
+
+    Arguments:
+        challenge_obj {[Class object]} -- Challenge model object
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        only_public_entries {[Boolean]} -- Boolean value to determine if the user wants to include private entries or not
+        order_by {[str]} -- Leaderboard label to annotate the filtering score and error with
+
+    Returns:
+        [QuerySet] -- Leaderboard entries as dicts, latest entries first
+    """
     # Exclude the submissions done by members of the host team
     # while populating leaderboard
     challenge_hosts_emails = (
@@ -377,19 +477,6 @@ def calculate_distinct_sorted_leaderboard_data(
         [] if not is_challenge_phase_public else challenge_hosts_emails
     )
 
-    challenge_host_or_staff = is_user_a_staff_or_host(user, challenge_obj.pk)
-
-    all_banned_email_ids = challenge_obj.banned_email_ids
-
-    # Check if challenge phase leaderboard is public for participant user or
-    # not
-    if (
-        challenge_phase_split.visibility != ChallengePhaseSplit.PUBLIC
-        and not challenge_host_or_staff
-    ):
-        response_data = {"error": "Sorry, the leaderboard is not public!"}
-        return response_data, status.HTTP_400_BAD_REQUEST
-
     leaderboard_data = LeaderboardData.objects.filter(is_disabled=False)
     # Exclude host submissions using created_by_id (avoids auth_user JOIN in
     # main query; resolve emails to IDs with a single small query instead)
@@ -433,11 +520,11 @@ def calculate_distinct_sorted_leaderboard_data(
         )
         leaderboard_data = leaderboard_data.annotate(
             filtering_score=RawSQL(
-                "result->>%s", (default_order_by,), output_field=FloatField()
+                "result->>%s", (order_by,), output_field=FloatField()
             ),
             filtering_error=RawSQL(
                 "error->>%s",
-                ("error_{0}".format(default_order_by),),
+                ("error_{0}".format(order_by),),
                 output_field=FloatField(),
             ),
             submission__execution_time=time_diff_expression,
@@ -464,11 +551,11 @@ def calculate_distinct_sorted_leaderboard_data(
     else:
         leaderboard_data = leaderboard_data.annotate(
             filtering_score=RawSQL(
-                "result->>%s", (default_order_by,), output_field=FloatField()
+                "result->>%s", (order_by,), output_field=FloatField()
             ),
             filtering_error=RawSQL(
                 "error->>%s",
-                ("error_{0}".format(default_order_by),),
+                ("error_{0}".format(order_by),),
                 output_field=FloatField(),
             ),
         ).values(
@@ -490,19 +577,87 @@ def calculate_distinct_sorted_leaderboard_data(
             "submission__submission_metadata",
             "submission__is_verified_by_host",
         )
+    return leaderboard_data
+
+
+def _get_best_leaderboard_data_per_team(
+    leaderboard_data,
+    challenge_phase_split,
+    order_by,
+    is_leaderboard_order_descending,
+):
+    """
+    Function to select the best entry of every participant team in the database.
+    Baseline entries are all returned, as _rank_leaderboard_data decides which of them are shown.
+
+    Arguments:
+        leaderboard_data {[QuerySet]} -- Leaderboard entries returned by _get_leaderboard_data_queryset
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        order_by {[str]} -- Leaderboard label to rank the entries by
+        is_leaderboard_order_descending {[Boolean]} -- Whether higher scores rank first
+
+    Returns:
+        [list] -- Best entry of every participant team and all baseline entries, latest entries first
+    """
+    if challenge_phase_split.show_leaderboard_by_latest_submission:
+        team_ordering = []
+    else:
+        # Missing scores and errors rank as 0, like in _rank_leaderboard_data
+        filtering_score = Coalesce(
+            Cast(KeyTextTransform(order_by, "result"), FloatField()),
+            0.0,
+            output_field=FloatField(),
+        )
+        filtering_error = Coalesce(
+            Cast(
+                KeyTextTransform("error_{0}".format(order_by), "error"),
+                FloatField(),
+            ),
+            0.0,
+            output_field=FloatField(),
+        )
+        if is_leaderboard_order_descending:
+            team_ordering = [filtering_score.desc(), filtering_error.asc()]
+        else:
+            team_ordering = [filtering_score.asc(), filtering_error.desc()]
+
+    best_leaderboard_data = (
+        leaderboard_data.filter(submission__is_baseline=False)
+        .order_by(
+            "submission__participant_team",
+            *team_ordering,
+            "-created_at",
+            "-id"
+        )
+        .distinct("submission__participant_team")
+    )
+    baseline_leaderboard_data = leaderboard_data.filter(
+        submission__is_baseline=True
+    )
+    leaderboard_data = list(best_leaderboard_data) + list(
+        baseline_leaderboard_data
+    )
+    leaderboard_data.sort(key=lambda item: item["id"], reverse=True)
+    return leaderboard_data
+
 
+def _exclude_banned_participant_teams(leaderboard_data, challenge_obj):
+    """
+    Function to drop the leaderboard entries of participant teams with a banned member
+
+    Arguments:
+        leaderboard_data {[list]} -- Leaderboard entries as dicts
+        challenge_obj {[Class object]} -- Challenge model object
+
+    Returns:
+        [list] -- Leaderboard entries of teams without banned members, with missing scores and errors set to 0
+    """
+    all_banned_email_ids = challenge_obj.banned_email_ids
     all_banned_participant_team = set()
     all_banned_email_ids_set = (
         set(all_banned_email_ids) if all_banned_email_ids else set()
     )
 
-    # Apply query limit to prevent slow queries on popular challenges
-    max_limit = getattr(settings, "MAX_LEADERBOARD_QUERY_LIMIT", 10000)
-    leaderboard_data = leaderboard_data[:max_limit]
-
-    # Convert to list to allow multiple iterations
-    leaderboard_data = list(leaderboard_data)
-
     # Prefetch all participant teams and their participants' emails in bulk
     # (fixes N+1 query)
     unique_team_ids = set(
@@ -530,35 +685,164 @@ def calculate_distinct_sorted_leaderboard_data(
             leaderboard_item.update(filtering_error=0)
         if leaderboard_item["filtering_score"] is None:
             leaderboard_item.update(filtering_score=0)
+    return [
+        leaderboard_item
+        for leaderboard_item in leaderboard_data
+        if leaderboard_item["submission__participant_team"]
+        not in all_banned_participant_team
+    ]
+
+
+def _get_leaderboard_ranking_key(
+    challenge_phase_split, is_leaderboard_order_descending
+):
+    """
+    Function to return the key leaderboard entries are ranked in ascending order of
+
+    Arguments:
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        is_leaderboard_order_descending {[Boolean]} -- Whether higher scores rank first
+
+    Returns:
+        [function] -- Function returning the ranking key of a leaderboard entry
+    """
     if challenge_phase_split.show_leaderboard_by_latest_submission:
-        sorted_leaderboard_data = leaderboard_data
-    else:
-        sorted_leaderboard_data = sorted(
-            leaderboard_data,
-            key=lambda k: (
-                float(k["filtering_score"]),
-                float(-k["filtering_error"]),
-            ),
-            reverse=True if is_leaderboard_order_descending else False,
+        return lambda item: (-item["id"],)
+    # Ties are ranked latest entry first
+    if is_leaderboard_order_descending:
+        return lambda item: (
+            -float(item["filtering_score"]),
+            float(item["filtering_error"]),
+            -item["id"],
         )
+    return lambda item: (
+        float(item["filtering_score"]),
+        -float(item["filtering_error"]),
+        -item["id"],
+    )
+
+
+def _rank_leaderboard_data(
+    leaderboard_data, challenge_phase_split, is_leaderboard_order_descending
+):
+    """
+    Function to rank leaderboard entries and keep the best entry of every participant team
+
+    Arguments:
+        leaderboard_data {[list]} -- Leaderboard entries as dicts
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        is_leaderboard_order_descending {[Boolean]} -- Whether higher scores rank first
+
+    Returns:
+        [list] -- Ranked leaderboard entries, one per participant team apart from baselines
+    """
+    sorted_leaderboard_data = sorted(
+        leaderboard_data,
+        key=_get_leaderboard_ranking_key(
+            challenge_phase_split, is_leaderboard_order_descending
+        ),
+    )
     distinct_sorted_leaderboard_data = []
     team_list = set()
     for data in sorted_leaderboard_data:
-        if (
-            data["submission__participant_team__team_name"] in team_list
-            or data["submission__participant_team"]
-            in all_banned_participant_team
-        ):
+        if data["submission__participant_team__team_name"] in team_list:
             continue
         elif data["submission__is_baseline"] is True:
             distinct_sorted_leaderboard_data.append(data)
         else:
             distinct_sorted_leaderboard_data.append(data)
             team_list.add(data["submission__participant_team__team_name"])
+    return distinct_sorted_leaderboard_data
+
 
+def get_sorted_leaderboard_data(
+    user, challenge_obj, challenge_phase_split, only_public_entries, order_by
+):
+    """
+    Function to return the ranked leaderboard entries before they are formatted for display.
+    The ranking is cached per challenge phase split and kept up to date as submissions change.
+
+    Arguments:
+        user {[Class object]} -- User model object
+        challenge_obj {[Class object]} -- Challenge model object
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        only_public_entries {[Boolean]} -- Boolean value to determine if the user wants to include private entries or not
+        order_by {[str]} -- Leaderboard label requested to rank the entries by
+
+    Returns:
+        [list] -- Ranked list of participant teams, see format_leaderboard_data
+        [status] -- HTTP status code (200/400)
+    """
+    ordering, http_status_code = _get_leaderboard_ordering(
+        challenge_phase_split, order_by
+    )
+    if http_status_code == status.HTTP_400_BAD_REQUEST:
+        return ordering, http_status_code
+    order_by, is_leaderboard_order_descending = ordering
+
+    challenge_host_or_staff = is_user_a_staff_or_host(user, challenge_obj.pk)
+
+    # Check if challenge phase leaderboard is public for participant user or
+    # not
+    if (
+        challenge_phase_split.visibility != ChallengePhaseSplit.PUBLIC
+        and not challenge_host_or_staff
+    ):
+        response_data = {"error": "Sorry, the leaderboard is not public!"}
+        return response_data, status.HTTP_400_BAD_REQUEST
+
+    def build_ranking():
+        leaderboard_data = _get_leaderboard_data_queryset(
+            challenge_obj, challenge_phase_split, only_public_entries, order_by
+        )
+        if getattr(settings, "LEADERBOARD_RANKING_IN_DATABASE", False):
+            leaderboard_data = _get_best_leaderboard_data_per_team(
+                leaderboard_data,
+                challenge_phase_split,
+                order_by,
+                is_leaderboard_order_descending,
+            )
+        else:
+            # Apply query limit to prevent slow queries on popular challenges
+            max_limit = getattr(settings, "MAX_LEADERBOARD_QUERY_LIMIT", 10000)
+            leaderboard_data = leaderboard_data[:max_limit]
+
+        # Convert to list to allow multiple iterations
+        leaderboard_data = _exclude_banned_participant_teams(
+            list(leaderboard_data), challenge_obj
+        )
+        return _rank_leaderboard_data(
+            leaderboard_data,
+            challenge_phase_split,
+            is_leaderboard_order_descending,
+        )
+
+    ranked_leaderboard_data = get_cached_leaderboard_ranking(
+        challenge_phase_split.pk,
+        order_by,
+        only_public_entries,
+        build_ranking,
+    )
+    return ranked_leaderboard_data, status.HTTP_200_OK
+
+
+def format_leaderboard_data(challenge_phase_split, leaderboard_data):
+    """
+    Function to format ranked leaderboard entries for display
+
+    Arguments:
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        leaderboard_data {[list]} -- Ranked leaderboard entries returned by get_sorted_leaderboard_data
+
+    Returns:
+        [list] -- Leaderboard entries with results and errors ordered by the leaderboard labels
+    """
     leaderboard_labels = challenge_phase_split.leaderboard.schema["labels"]
     show_scores = challenge_phase_split.show_scores_on_leaderboard
-    for item in distinct_sorted_leaderboard_data:
+    formatted_leaderboard_data = []
+    for item in leaderboard_data:
+        # Entries can be shared with the leaderboard ranking cache
+        item = dict(item)
         item_result = []
         for index in leaderboard_labels:
             # Handle case for partially evaluated submissions
@@ -579,7 +863,292 @@ def calculate_distinct_sorted_leaderboard_data(
             item["error"] = None
             item.pop("filtering_score", None)
             item.pop("filtering_error", None)
-    return distinct_sorted_leaderboard_data, status.HTTP_200_OK
+        formatted_leaderboard_data.append(item)
+    return formatted_leaderboard_data
+
+
+class LeaderboardCursorPagination(BasePagination):
+    """
+    Keyset pagination over a ranked leaderboard, used when the request has a
+    ``cursor`` query param (left empty for the first page). The cursor holds
+    the ranking key of the last entry of a page, so the next page resumes
+    after that entry even if teams moved in between.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, challenge_phase_split, order_by):
+        (_, is_leaderboard_order_descending), _ = _get_leaderboard_ordering(
+            challenge_phase_split, order_by
+        )
+        self.get_ranking_key = _get_leaderboard_ranking_key(
+            challenge_phase_split, is_leaderboard_order_descending
+        )
+        self.page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, leaderboard_item):
+        cursor = list(self.get_ranking_key(leaderboard_item))
+        encoded = base64.urlsafe_b64encode(json.dumps(cursor).encode("ascii"))
+        return encoded.decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(
+                base64.urlsafe_b64decode(encoded.encode("ascii"))
+            )
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if (
+            not isinstance(cursor, list)
+            or not cursor
+            or not all(
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                for value in cursor
+            )
+        ):
+            raise NotFound(self.invalid_cursor_message)
+        return tuple(cursor)
+
+    def get_start_index(self, ranked_leaderboard_data, cursor):
+        """
+        Index of the first entry ranked after the cursor, found by bisecting
+        the ranking which is sorted by the same key.
+        """
+        low, high = 0, len(ranked_leaderboard_data)
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_ranking_key(ranked_leaderboard_data[middle]) <= cursor:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        start = 0
+        if cursor is not None:
+            start = self.get_start_index(queryset, cursor)
+        page = list(queryset[start : start + page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        self.next_cursor = (
+            self.encode_cursor(page[-1]) if self.has_next else None
+        )
+        return page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": None,
+                "results": data,
+            }
+        )
+
+
+class SubmissionCursorPagination(BasePagination):
+    """
+    Keyset pagination over submissions in primary key order, used when the
+    request has a ``cursor`` query param (left empty for the first page).
+    The cursor holds the id of the last submission of a page, so each page
+    is read with an index range scan however deep into the list it is.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self):
+        self.page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def encode_cursor(self, submission_pk):
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(submission_pk).encode("ascii")
+        )
+        return encoded.decode("ascii")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            return int(
+                json.loads(base64.urlsafe_b64decode(encoded.encode("ascii")))
+            )
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(pk__gt=cursor)
+        page = list(queryset.order_by("pk")[: page_size + 1])
+        self.has_next = len(page) > page_size
+        page = page[:page_size]
+        if self.has_next:
+            last_submission = page[-1]
+            self.next_cursor = self.encode_cursor(
+                last_submission["id"]
+                if isinstance(last_submission, dict)
+                else last_submission.pk
+            )
+        return page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.next_cursor
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": None,
+                "results": data,
+            }
+        )
+
+
+def calculate_distinct_sorted_leaderboard_data(
+    user, challenge_obj, challenge_phase_split, only_public_entries, order_by
+):
+    """
+    Function to calculate and return the sorted leaderboard data
+
+    Arguments:
+        user {[Class object]} -- User model object
+        challenge_obj {[Class object]} -- Challenge model object
+        challenge_phase_split {[Class object]} -- Challenge phase split model object
+        only_public_entries {[Boolean]} -- Boolean value to determine if the user wants to include private entries or not
+
+    Returns:
+        [list] -- Ranked list of participant teams to be shown on leaderboard
+        [status] -- HTTP status code (200/400)
+    """
+    leaderboard_data, http_status_code = get_sorted_leaderboard_data(
+        user,
+        challenge_obj,
+        challenge_phase_split,
+        only_public_entries,
+        order_by,
+    )
+    if http_status_code == status.HTTP_400_BAD_REQUEST:
+        return leaderboard_data, http_status_code
+    return (
+        format_leaderboard_data(challenge_phase_split, leaderboard_data),
+        status.HTTP_200_OK,
+    )
+
+
+def refresh_leaderboard_ranking_for_teams(
+    challenge_phase_split_pks, participant_team_pks
+):
+    """
+    Function to update the cached leaderboard rankings after entries of some participant teams changed.
+    Only the entries of those teams are read from the database and merged into the cached ranking.
+
+    Arguments:
+        challenge_phase_split_pks {[list]} -- Challenge phase split primary keys
+        participant_team_pks {[list]} -- Participant team primary keys
+    """
+    participant_team_pks = set(participant_team_pks)
+    challenge_phase_splits = ChallengePhaseSplit.objects.filter(
+        pk__in=set(challenge_phase_split_pks)
+    ).select_related("leaderboard", "challenge_phase__challenge__creator")
+    for challenge_phase_split in challenge_phase_splits:
+        challenge_obj = challenge_phase_split.challenge_phase.challenge
+        labels = challenge_phase_split.leaderboard.schema.get("labels", [])
+
+        def update_ranking(
+            ranked_leaderboard_data,
+            order_by,
+            only_public_entries,
+            challenge_phase_split=challenge_phase_split,
+            challenge_obj=challenge_obj,
+        ):
+            ordering, _ = _get_leaderboard_ordering(
+                challenge_phase_split, order_by
+            )
+            _, is_leaderboard_order_descending = ordering
+            teams_leaderboard_data = _get_leaderboard_data_queryset(
+                challenge_obj,
+                challenge_phase_split,
+                only_public_entries,
+                order_by,
+            ).filter(submission__participant_team__in=participant_team_pks)
+            if getattr(settings, "LEADERBOARD_RANKING_IN_DATABASE", False):
+                teams_leaderboard_data = _get_best_leaderboard_data_per_team(
+                    teams_leaderboard_data,
+                    challenge_phase_split,
+                    order_by,
+                    is_leaderboard_order_descending,
+                )
+            leaderboard_data = [
+                item
+                for item in ranked_leaderboard_data
+                if item["submission__participant_team"]
+                not in participant_team_pks
+            ] + _exclude_banned_participant_teams(
+                list(teams_leaderboard_data), challenge_obj
+            )
+            # Restore the latest-first order the ranking is built from, so
+            # that ties are broken the same way as in a full rebuild
+            leaderboard_data.sort(key=lambda item: item["id"], reverse=True)
+            return _rank_leaderboard_data(
+                leaderboard_data,
+                challenge_phase_split,
+                is_leaderboard_order_descending,
+            )
+
+        update_cached_leaderboard_ranking(
+            challenge_phase_split.pk,
+            [
+                (order_by, only_public_entries)
+                for order_by in labels
+                for only_public_entries in (True, False)
+            ],
+            update_ranking,
+        )
 
 
 def get_leaderboard_data_model(submission_pk, challenge_phase_split_pk):
@@ -667,3 +1236,139 @@ def reorder_submissions_comparator_to_key(comparator):
             return comparator(self.obj, other.obj) != 0
 
     return ComparatorToLambdaKey
+
+
+def order_submissions_in_progress_first(queryset):
+    """
+    Order submissions for the my submissions page in the database: in
+    progress submissions first, oldest first, then the other submissions,
+    latest first. Pages can then be sliced in the query.
+
+    Arguments:
+        queryset {[QuerySet]} -- Submissions to order
+
+    Returns:
+        [QuerySet] -- Ordered submissions
+    """
+    in_progress = Q(
+        status__in=[
+            Submission.SUBMITTED,
+            Submission.SUBMITTING,
+            Submission.RESUMING,
+            Submission.QUEUED,
+            Submission.RUNNING,
+        ]
+    )
+    return queryset.annotate(
+        in_progress_rank=Case(
+            When(in_progress, then=Value(0)),
+            default=Value(1),
+            output_field=IntegerField(),
+        ),
+        in_progress_submitted_at=Case(
+            When(in_progress, then=F("submitted_at")),
+            default=None,
+            output_field=fields.DateTimeField(),
+        ),
+    ).order_by(
+        "in_progress_rank", "in_progress_submitted_at", "-submitted_at", "-pk"
+    )
+
+
+# Most messages SQS receives, deletes or changes the visibility of per call
+SQS_BATCH_SIZE = 10
+# Longest time SQS lets a received message stay hidden for, 12 hours
+SQS_MAX_VISIBILITY_TIMEOUT = 12 * 60 * 60
+
+
+def receive_submission_messages(
+    queue, max_messages, wait_time, visibility_timeout=None
+):
+    """
+    Receive a batch of submission messages from a challenge queue.
+
+    Arguments:
+        queue {[sqs.Queue]} -- Queue of the challenge
+        max_messages {[int]} -- Most messages to receive, up to 10
+        wait_time {[int]} -- Seconds to long poll for when the queue is empty
+        visibility_timeout {[int]} -- Seconds the messages are hidden for,
+                                      None for the default of the queue
+
+    Returns:
+        [list] -- Body and receipt handle of each received message
+    """
+    receive_kwargs = {
+        "MaxNumberOfMessages": max_messages,
+        "WaitTimeSeconds": wait_time,
+    }
+    if visibility_timeout is not None:
+        receive_kwargs["VisibilityTimeout"] = visibility_timeout
+    return [
+        {
+            "body": json.loads(message.body),
+            "receipt_handle": message.receipt_handle,
+        }
+        for message in queue.receive_messages(**receive_kwargs)
+    ]
+
+
+def _run_sqs_batch(batch_call, receipt_handles, **entry_kwargs):
+    successful, failed = [], []
+    for start in range(0, len(receipt_handles), SQS_BATCH_SIZE):
+        batch = receipt_handles[start : start + SQS_BATCH_SIZE]
+        response = batch_call(
+            Entries=[
+                dict(
+                    Id=str(index), ReceiptHandle=receipt_handle, **entry_kwargs
+                )
+                for index, receipt_handle in enumerate(batch)
+            ]
+        )
+        successful.extend(
+            batch[int(entry["Id"])] for entry in response.get("Successful", [])
+        )
+        failed.extend(
+            {
+                "receipt_handle": batch[int(entry["Id"])],
+                "error": entry.get("Message", entry.get("Code")),
+            }
+            for entry in response.get("Failed", [])
+        )
+    return {"successful": successful, "failed": failed}
+
+
+def delete_submission_messages(queue, receipt_handles):
+    """
+    Delete submission messages from a challenge queue, 10 per SQS call.
+
+    Arguments:
+        queue {[sqs.Queue]} -- Queue of the challenge
+        receipt_handles {[list]} -- Receipt handles of the messages
+
+    Returns:
+        [dict] -- Receipt handles deleted and the ones that failed to be
+    """
+    return _run_sqs_batch(queue.delete_messages, receipt_handles)
+
+
+def extend_submission_messages_visibility(
+    queue, receipt_handles, visibility_timeout
+):
+    """
+    Hide submission messages of a challenge queue for some more time, e.g.
+    while a worker is still evaluating them, 10 per SQS call.
+
+    Arguments:
+        queue {[sqs.Queue]} -- Queue of the challenge
+        receipt_handles {[list]} -- Receipt handles of the messages
+        visibility_timeout {[int]} -- Seconds from now the messages stay
+                                      hidden for
+
+    Returns:
+        [dict] -- Receipt handles changed and the ones that failed to be
+    """
+    return _run_sqs_batch(
+        queue.change_message_visibility_batch,
+        receipt_handles,
+        VisibilityTimeout=visibility_timeout,
+    )
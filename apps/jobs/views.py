@@ -24,6 +24,10 @@ from challenges.models import (
     ChallengePhaseSplit,
     LeaderboardData,
 )
+from challenges.response_cache import (
+    get_cached_response,
+    get_challenge_version,
+)
 from challenges.utils import (
     complete_s3_multipart_file_upload,
     generate_presigned_url_for_multipart_upload,
@@ -37,7 +41,7 @@ from django.conf import settings
 from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import IntegrityError, transaction
-from django.db.models import Count, Q
+from django.db.models import Count
 from django.utils import dateparse, timezone
 from drf_spectacular.utils import (
     OpenApiParameter,
@@ -67,7 +71,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from apps.accounts.authentication import ExpiringTokenAuthentication
 
 from .aws_utils import generate_aws_eks_bearer_token
-from .constants import submission_status_to_exclude
+from .constants import submission_listing_fields
 from .filters import SubmissionFilter
 from .models import Submission
 from .s3_retention import (
@@ -82,16 +86,27 @@ from .serializers import (
     RemainingSubmissionDataSerializer,
     SubmissionSerializer,
 )
+from .submission_eligibility import (
+    get_challenge_and_phase,
+    get_submission_eligibility,
+)
+from .submission_quota import get_submission_counts
 from .tasks import download_file_and_publish_submission_message
 from .utils import (
-    calculate_distinct_sorted_leaderboard_data,
+    SQS_BATCH_SIZE,
+    SQS_MAX_VISIBILITY_TIMEOUT,
+    LeaderboardCursorPagination,
+    SubmissionCursorPagination,
+    delete_submission_messages,
+    extend_submission_messages_visibility,
+    format_leaderboard_data,
     get_leaderboard_data_model,
+    get_sorted_leaderboard_data,
     get_submission_model,
     handle_submission_rerun,
     handle_submission_resume,
-    is_url_valid,
-    reorder_submissions_comparator,
-    reorder_submissions_comparator_to_key,
+    order_submissions_in_progress_first,
+    receive_submission_messages,
     response_if_submissions_paused,
 )
 
@@ -149,18 +164,14 @@ logger = logging.getLogger(__name__)
 def challenge_submission(request, challenge_id, challenge_phase_id):
     """API Endpoint for making a submission to a challenge"""
 
-    # check if the challenge exists or not
+    # check if the challenge and the challenge phase exist or not
     try:
-        challenge = Challenge.objects.get(pk=challenge_id)
+        challenge, challenge_phase = get_challenge_and_phase(
+            challenge_id, challenge_phase_id
+        )
     except Challenge.DoesNotExist:
         response_data = {"error": "Challenge does not exist"}
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
-
-    # check if the challenge phase exists or not
-    try:
-        challenge_phase = ChallengePhase.objects.get(
-            pk=challenge_phase_id, challenge=challenge
-        )
     except ChallengePhase.DoesNotExist:
         response_data = {"error": "Challenge Phase does not exist"}
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
@@ -198,12 +209,10 @@ def challenge_submission(request, challenge_id, challenge_phase_id):
         filtered_submissions = SubmissionFilter(
             request.GET, queryset=submission
         )
-        # rerank in progress submissions in ascending order of submitted_at
-        reordered_submissions = sorted(
-            filtered_submissions.qs,
-            key=reorder_submissions_comparator_to_key(
-                reorder_submissions_comparator
-            ),
+        # rerank in progress submissions in ascending order of submitted_at,
+        # ordering and paginating in the query
+        reordered_submissions = order_submissions_in_progress_first(
+            filtered_submissions.qs
         )
         paginator, result_page = paginated_queryset(
             reordered_submissions, request
@@ -236,9 +245,12 @@ def challenge_submission(request, challenge_id, challenge_phase_id):
         if paused is not None:
             return paused
 
-        # check if user is a challenge host or a participant
-        is_host = is_user_a_host_of_challenge(request.user, challenge_id)
-        if not is_host:
+        # check if user is a challenge host or a participant, and look up
+        # their team with everything the checks below need about it
+        eligibility = get_submission_eligibility(
+            request.user, challenge, challenge_phase
+        )
+        if not eligibility["is_host"]:
             # check if challenge phase is public and accepting solutions
             if not challenge_phase.is_public:
                 response_data = {
@@ -258,63 +270,33 @@ def challenge_submission(request, challenge_id, challenge_phase_id):
                     return Response(
                         response_data, status=status.HTTP_403_FORBIDDEN
                     )
-            # Ensure worker stack exists for participant submissions
-            ensure_workers_for_submission(challenge)
-        else:
-            # Ensure the worker stack exists for host submissions
-            ensure_workers_for_submission(challenge)
+        # Ensure the worker stack exists for host and participant submissions
+        ensure_workers_for_submission(challenge)
 
-        participant_team_id = get_participant_team_id_of_user_for_a_challenge(
-            request.user, challenge_id
-        )
-        try:
-            participant_team = ParticipantTeam.objects.get(
-                pk=participant_team_id
-            )
-        except ParticipantTeam.DoesNotExist:
+        participant_team = eligibility["participant_team"]
+        if participant_team is None:
             response_data = {
                 "error": "You haven't participated in the challenge"
             }
             return Response(response_data, status=status.HTTP_403_FORBIDDEN)
 
         # check if manual approval is enabled and team is approved
-        if (
-            challenge.manual_participant_approval
-            and not challenge.approved_participant_teams.filter(
-                pk=participant_team_id
-            ).exists()
-        ):
+        if not participant_team.is_approved:
             response_data = {
                 "error": "Your team is not approved by challenge host"
             }
             return Response(response_data, status=status.HTTP_403_FORBIDDEN)
 
-        all_participants_email = participant_team.get_all_participants_email()
-        for participant_email in all_participants_email:
-            if participant_email in challenge.banned_email_ids:
-                message = "You're a part of {} team and it has been banned from this challenge. \
-                Please contact the challenge host.".format(
-                    participant_team.team_name
-                )
-                response_data = {"error": message}
-                return Response(
-                    response_data, status=status.HTTP_403_FORBIDDEN
-                )
-
-        # Fetch the number of submissions under progress.
-        submissions_in_progress_status = [
-            Submission.SUBMITTED,
-            Submission.SUBMITTING,
-            Submission.RESUMING,
-            Submission.QUEUED,
-            Submission.RUNNING,
-        ]
-        submissions_in_progress = Submission.objects.filter(
-            participant_team=participant_team_id,
-            challenge_phase=challenge_phase,
-            status__in=submissions_in_progress_status,
-        ).count()
+        if participant_team.is_banned:
+            message = "You're a part of {} team and it has been banned from this challenge. \
+            Please contact the challenge host.".format(
+                participant_team.team_name
+            )
+            response_data = {"error": message}
+            return Response(response_data, status=status.HTTP_403_FORBIDDEN)
 
+        # check the number of submissions under progress
+        submissions_in_progress = participant_team.submissions_in_progress
         if (
             submissions_in_progress
             >= challenge_phase.max_concurrent_submissions_allowed
@@ -332,11 +314,7 @@ def challenge_submission(request, challenge_id, challenge_phase_id):
                 return Response(
                     response_data, status=status.HTTP_400_BAD_REQUEST
                 )
-            if not is_url_valid(request.data["file_url"]):
-                response_data = {"error": "The file URL does not exists!"}
-                return Response(
-                    response_data, status=status.HTTP_400_BAD_REQUEST
-                )
+            # The URL is checked by the task, off the request thread
             download_file_and_publish_submission_message.delay(
                 request.data,
                 request.user.id,
@@ -635,6 +613,9 @@ def leaderboard(request, challenge_phase_split_id):
     - Arguments:
         ``challenge_phase_split_id``: Primary key for the challenge phase split for which leaderboard is to be fetched
 
+    - Query params:
+        ``cursor``: Page through the leaderboard with keyset cursors instead of page numbers, empty for the first page
+
     - Returns:
         Leaderboard entry objects in a list
     """
@@ -643,28 +624,51 @@ def leaderboard(request, challenge_phase_split_id):
     challenge_phase_split = get_challenge_phase_split_model(
         challenge_phase_split_id
     )
-    challenge_obj = challenge_phase_split.challenge_phase.challenge
     order_by = request.GET.get("order_by")
-    (
-        response_data,
-        http_status_code,
-    ) = calculate_distinct_sorted_leaderboard_data(
-        request.user,
-        challenge_obj,
-        challenge_phase_split,
-        only_public_entries=True,
-        order_by=order_by,
-    )
-    # The response 400 will be returned if the leaderboard isn't public or
-    # `default_order_by` key is missing in leaderboard.
-    if http_status_code == status.HTTP_400_BAD_REQUEST:
-        return Response(response_data, status=http_status_code)
 
-    paginator, result_page = paginated_queryset(
-        response_data, request, pagination_class=StandardResultSetPagination()
+    def build_response():
+        challenge_obj = challenge_phase_split.challenge_phase.challenge
+        (
+            response_data,
+            http_status_code,
+        ) = get_sorted_leaderboard_data(
+            request.user,
+            challenge_obj,
+            challenge_phase_split,
+            only_public_entries=True,
+            order_by=order_by,
+        )
+        # The response 400 will be returned if the leaderboard isn't public or
+        # `default_order_by` key is missing in leaderboard.
+        if http_status_code == status.HTTP_400_BAD_REQUEST:
+            return Response(response_data, status=http_status_code)
+
+        if LeaderboardCursorPagination.cursor_query_param in request.GET:
+            pagination_class = LeaderboardCursorPagination(
+                challenge_phase_split, order_by
+            )
+        else:
+            pagination_class = StandardResultSetPagination()
+        paginator, result_page = paginated_queryset(
+            response_data, request, pagination_class=pagination_class
+        )
+        # Only the entries of the requested page need formatting
+        response_data = format_leaderboard_data(
+            challenge_phase_split, result_page
+        )
+        return paginator.get_paginated_response(response_data)
+
+    # Leaderboards which aren't public are only shown to hosts and staff, so
+    # they are always built for the requesting user
+    if challenge_phase_split.visibility != ChallengePhaseSplit.PUBLIC:
+        return build_response()
+    return get_cached_response(
+        request,
+        get_challenge_version(
+            challenge_phase_split.challenge_phase.challenge_id
+        ),
+        build_response,
     )
-    response_data = result_page
-    return paginator.get_paginated_response(response_data)
 
 
 @extend_schema(
@@ -801,6 +805,9 @@ def get_all_entries_on_public_leaderboard(request, challenge_phase_split_pk):
     - Arguments:
         ``challenge_phase_split_pk``: Primary key for the challenge phase split for which leaderboard is to be fetched
 
+    - Query params:
+        ``cursor``: Page through the leaderboard with keyset cursors instead of page numbers, empty for the first page
+
     - Returns:
         All Leaderboard entry objects in a list
 
@@ -858,7 +865,7 @@ def get_all_entries_on_public_leaderboard(request, challenge_phase_split_pk):
     (
         response_data,
         http_status_code,
-    ) = calculate_distinct_sorted_leaderboard_data(
+    ) = get_sorted_leaderboard_data(
         request.user,
         challenge_obj,
         challenge_phase_split,
@@ -870,10 +877,17 @@ def get_all_entries_on_public_leaderboard(request, challenge_phase_split_pk):
     if http_status_code == status.HTTP_400_BAD_REQUEST:
         return Response(response_data, status=http_status_code)
 
+    if LeaderboardCursorPagination.cursor_query_param in request.GET:
+        pagination_class = LeaderboardCursorPagination(
+            challenge_phase_split, order_by
+        )
+    else:
+        pagination_class = StandardResultSetPagination()
     paginator, result_page = paginated_queryset(
-        response_data, request, pagination_class=StandardResultSetPagination()
+        response_data, request, pagination_class=pagination_class
     )
-    response_data = result_page
+    # Only the entries of the requested page need formatting
+    response_data = format_leaderboard_data(challenge_phase_split, result_page)
     return paginator.get_paginated_response(response_data)
 
 
@@ -1001,46 +1015,20 @@ def get_remaining_submissions(request, challenge_pk):
     challenge_phases = list(challenge_phases)
 
     now = timezone.now()
-    month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
-
-    # Aggregate from the submission side instead of annotating the phase
-    # queryset. Annotating phases emits a LEFT JOIN whose only join predicate
-    # is challenge_phase_id, so the participant_team check ends up inside
-    # FILTER (WHERE ...) and is applied during aggregation, not to prune the
-    # join. Postgres therefore reads every submission of the challenge to
-    # count the handful belonging to one team. Driving the query from
-    # submission puts participant_team_id in the WHERE clause, where its index
-    # narrows the scan to this team's rows before any grouping happens.
-    phase_counts = (
-        Submission.objects.filter(
-            participant_team=participant_team,
-            challenge_phase_id__in=[phase.pk for phase in challenge_phases],
-        )
-        .exclude(status__in=submission_status_to_exclude)
-        .values("challenge_phase_id")
-        .annotate(
-            submissions_count=Count("id"),
-            submissions_this_month_count=Count(
-                "id", filter=Q(submitted_at__gte=month_start)
-            ),
-            submissions_today_count=Count(
-                "id", filter=Q(submitted_at__gte=today_start)
-            ),
-        )
+    # Counts of every phase come from the team's cached counters, with the
+    # phases not cached counted together in a single query
+    counts_by_phase_id = get_submission_counts(
+        participant_team.pk, [phase.pk for phase in challenge_phases]
     )
-    counts_by_phase_id = {
-        row["challenge_phase_id"]: row for row in phase_counts
-    }
 
     phase_data_list = []
     for phase in challenge_phases:
-        counts = counts_by_phase_id.get(phase.pk, {})
+        counts = counts_by_phase_id[phase.pk]
         limits = _compute_remaining_limits(
             phase,
-            counts.get("submissions_count", 0),
-            counts.get("submissions_this_month_count", 0),
-            counts.get("submissions_today_count", 0),
+            counts["submissions_count"],
+            counts["submissions_this_month_count"],
+            counts["submissions_today_count"],
             now,
         )
         phase_data_list.append(
@@ -2324,7 +2312,18 @@ def resume_submission(request, submission_pk):
 @permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
 @authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
 def get_submissions_for_challenge(request, challenge_pk):
+    """
+    API endpoint to list the submissions of a challenge for hosts and staff
 
+    Query Parameters:
+        status (optional): Only list submissions with this status
+        submitted_after, submitted_before (optional): Submission time bounds
+        fields (optional): Comma separated fields to return, read with a
+            values() query instead of serializing whole submissions
+        cursor (optional): Pages the submissions by id, empty for the first
+            page and the `next` link of a page for the following one
+        page_size (optional): Number of submissions per page
+    """
     challenge = get_challenge_model(challenge_pk)
 
     if not is_user_a_staff(request.user) and not is_user_a_host_of_challenge(
@@ -2371,6 +2370,22 @@ def get_submissions_for_challenge(request, challenge_pk):
                 "error": "Invalid datetime format for 'submitted_before'"
             }
             return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    fields = request.query_params.get("fields")
+    if fields:
+        fields = fields.split(",")
+        invalid_fields = set(fields) - set(submission_listing_fields)
+        if invalid_fields:
+            response_data = {
+                "error": "Invalid fields: {}".format(
+                    ", ".join(sorted(invalid_fields))
+                )
+            }
+            return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+        # The id is what the cursor of the next page is made of
+        if "id" not in fields:
+            fields.insert(0, "id")
+
     submissions_done_in_challenge = Submission.objects.filter(
         challenge_phase__challenge=challenge.id
     )
@@ -2390,11 +2405,33 @@ def get_submissions_for_challenge(request, challenge_pk):
             submitted_at__lt=submitted_before
         )
 
-    serializer = SubmissionSerializer(
-        submissions_done_in_challenge, many=True, context={"request": request}
-    )
+    if fields:
+        submissions_done_in_challenge = submissions_done_in_challenge.values(
+            *fields
+        )
+    else:
+        submissions_done_in_challenge = (
+            submissions_done_in_challenge.select_related(
+                "participant_team", "challenge_phase__challenge__creator"
+            )
+        )
 
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    def serialize(submissions):
+        if fields:
+            return list(submissions)
+        return SubmissionSerializer(
+            submissions, many=True, context={"request": request}
+        ).data
+
+    if SubmissionCursorPagination.cursor_query_param in request.GET:
+        paginator = SubmissionCursorPagination()
+        page = paginator.paginate_queryset(
+            submissions_done_in_challenge, request
+        )
+        return paginator.get_paginated_response(serialize(page))
+    return Response(
+        serialize(submissions_done_in_challenge), status=status.HTTP_200_OK
+    )
 
 
 @extend_schema(
@@ -2616,6 +2653,387 @@ def delete_submission_message_from_queue(request, queue_name):
         return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
 
 
+def _get_challenge_of_queue_for_host(request, queue_name):
+    """
+    Returns the challenge of a queue and None, or None and the error response
+    when the queue doesn't exist or the user isn't a host of its challenge.
+    """
+    try:
+        challenge = Challenge.objects.get(queue=queue_name)
+    except Challenge.DoesNotExist:
+        response_data = {
+            "error": "Challenge with queue name {} does not exist".format(
+                queue_name
+            )
+        }
+        return None, Response(
+            response_data, status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if not is_user_a_host_of_challenge(request.user, challenge.pk):
+        response_data = {
+            "error": "Sorry, you are not authorized to access this resource"
+        }
+        return None, Response(
+            response_data, status=status.HTTP_401_UNAUTHORIZED
+        )
+    return challenge, None
+
+
+def _get_bounded_integer(params, name, default, minimum, maximum):
+    value = params.get(name)
+    if value in (None, ""):
+        return default
+    value = int(value)
+    if not minimum <= value <= maximum:
+        raise ValueError
+    return value
+
+
+def _get_receipt_handles(data):
+    if hasattr(data, "getlist"):
+        receipt_handles = data.getlist("receipt_handles")
+    else:
+        receipt_handles = data.get("receipt_handles")
+    if not isinstance(receipt_handles, list):
+        return []
+    return [
+        receipt_handle for receipt_handle in receipt_handles if receipt_handle
+    ]
+
+
+SUBMISSION_MESSAGES_BATCH_RESPONSE = {
+    "type": "object",
+    "properties": {
+        "successful": {
+            "type": "array",
+            "items": {"type": "string"},
+            "description": "Receipt handles of the messages processed",
+        },
+        "failed": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "receipt_handle": {"type": "string"},
+                    "error": {"type": "string"},
+                },
+            },
+            "description": "Receipt handles SQS failed to process",
+        },
+    },
+}
+
+ERROR_RESPONSE = {
+    "type": "object",
+    "properties": {
+        "error": {"type": "string", "description": "Error message"}
+    },
+}
+
+
+@extend_schema(
+    methods=["GET"],
+    operation_id="get_submission_messages_from_queue",
+    parameters=[
+        OpenApiParameter(
+            name="queue_name",
+            location=OpenApiParameter.PATH,
+            type=str,
+            description="Queue Name",
+            required=True,
+        ),
+        OpenApiParameter(
+            name="max_messages",
+            location=OpenApiParameter.QUERY,
+            type=int,
+            description="Most messages to receive, from 1 to 10 (default 10)",
+        ),
+        OpenApiParameter(
+            name="wait_time",
+            location=OpenApiParameter.QUERY,
+            type=int,
+            description="Seconds to wait for messages when the queue is empty",
+        ),
+        OpenApiParameter(
+            name="visibility_timeout",
+            location=OpenApiParameter.QUERY,
+            type=int,
+            description="Seconds the received messages stay hidden for",
+        ),
+    ],
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description="Messages received from the queue",
+            response={
+                "type": "object",
+                "properties": {
+                    "messages": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "body": {"type": "object"},
+                                "receipt_handle": {"type": "string"},
+                            },
+                        },
+                    }
+                },
+            },
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            description="Error occurred while fetching the messages",
+            response=ERROR_RESPONSE,
+        ),
+    },
+)
+@api_view(["GET"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def get_submission_messages_from_queue(request, queue_name):
+    """
+    API to fetch up to 10 submission messages from AWS SQS queue at once,
+    long polling the queue for ``wait_time`` seconds when it is empty.
+
+    - Arguments:
+        ``queue_name``: AWS SQS queue name
+
+    - Query Parameters:
+        ``max_messages``: Most messages to receive, from 1 to 10
+        ``wait_time``: Seconds to wait for messages, up to
+                       ``SQS_MAX_WAIT_TIME_SECONDS``
+        ``visibility_timeout``: Seconds the messages stay hidden for, the
+                                default of the queue when not given
+
+    - Returns:
+        ``messages``: Body and receipt handle of each message received
+    """
+    challenge, error_response = _get_challenge_of_queue_for_host(
+        request, queue_name
+    )
+    if error_response:
+        return error_response
+
+    try:
+        max_messages = _get_bounded_integer(
+            request.query_params,
+            "max_messages",
+            SQS_BATCH_SIZE,
+            1,
+            SQS_BATCH_SIZE,
+        )
+        wait_time = _get_bounded_integer(
+            request.query_params,
+            "wait_time",
+            0,
+            0,
+            getattr(settings, "SQS_MAX_WAIT_TIME_SECONDS", 20),
+        )
+        visibility_timeout = _get_bounded_integer(
+            request.query_params,
+            "visibility_timeout",
+            None,
+            0,
+            SQS_MAX_VISIBILITY_TIMEOUT,
+        )
+    except ValueError:
+        response_data = {
+            "error": "max_messages, wait_time or visibility_timeout is not valid"
+        }
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    queue = get_or_create_sqs_queue(queue_name, challenge)
+    try:
+        messages = receive_submission_messages(
+            queue, max_messages, wait_time, visibility_timeout
+        )
+    except botocore.exceptions.ClientError as ex:
+        response_data = {"error": str(ex)}
+        logger.exception("Exception raised: {}".format(ex))
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    logger.info(
+        "{} submissions received from the queue {}".format(
+            len(messages), queue_name
+        )
+    )
+    return Response({"messages": messages}, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    methods=["POST"],
+    operation_id="delete_submission_messages_from_queue",
+    parameters=[
+        OpenApiParameter(
+            name="queue_name",
+            location=OpenApiParameter.PATH,
+            type=str,
+            description="Queue Name",
+            required=True,
+        ),
+    ],
+    request={
+        "application/json": {
+            "type": "object",
+            "properties": {
+                "receipt_handles": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Receipt handles of the messages to be deleted",
+                },
+            },
+        }
+    },
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description="Messages deleted from the queue",
+            response=SUBMISSION_MESSAGES_BATCH_RESPONSE,
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            description="Error message goes here", response=ERROR_RESPONSE
+        ),
+    },
+)
+@api_view(["POST"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def delete_submission_messages_from_queue(request, queue_name):
+    """
+    API to delete submission messages from AWS SQS queue in batches of 10
+
+    - Arguments:
+        ``queue_name``  -- AWS SQS queue name
+
+    - Request Body:
+        ``receipt_handles`` -- Receipt handles of the messages to be deleted
+
+    - Returns:
+        ``successful`` -- Receipt handles of the messages deleted
+        ``failed`` -- Receipt handles SQS failed to delete and why
+    """
+    challenge, error_response = _get_challenge_of_queue_for_host(
+        request, queue_name
+    )
+    if error_response:
+        return error_response
+
+    receipt_handles = _get_receipt_handles(request.data)
+    if not receipt_handles:
+        response_data = {
+            "error": "Please add message receipt handles in the body"
+        }
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    queue = get_or_create_sqs_queue(queue_name, challenge)
+    try:
+        response_data = delete_submission_messages(queue, receipt_handles)
+    except botocore.exceptions.ClientError as ex:
+        response_data = {"error": str(ex)}
+        logger.exception(
+            "SQS messages are not deleted due to {}".format(response_data)
+        )
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    methods=["POST"],
+    operation_id="change_submission_messages_visibility",
+    parameters=[
+        OpenApiParameter(
+            name="queue_name",
+            location=OpenApiParameter.PATH,
+            type=str,
+            description="Queue Name",
+            required=True,
+        ),
+    ],
+    request={
+        "application/json": {
+            "type": "object",
+            "properties": {
+                "receipt_handles": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Receipt handles of the messages to hide",
+                },
+                "visibility_timeout": {
+                    "type": "integer",
+                    "description": "Seconds from now the messages stay hidden for",
+                },
+            },
+        }
+    },
+    responses={
+        status.HTTP_200_OK: OpenApiResponse(
+            description="Visibility timeout of the messages changed",
+            response=SUBMISSION_MESSAGES_BATCH_RESPONSE,
+        ),
+        status.HTTP_400_BAD_REQUEST: OpenApiResponse(
+            description="Error message goes here", response=ERROR_RESPONSE
+        ),
+    },
+)
+@api_view(["POST"])
+@throttle_classes([UserRateThrottle])
+@permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
+@authentication_classes((JWTAuthentication, ExpiringTokenAuthentication))
+def change_submission_messages_visibility(request, queue_name):
+    """
+    API to keep submission messages hidden in AWS SQS queue while a worker
+    is still evaluating them, in batches of 10
+
+    - Arguments:
+        ``queue_name``  -- AWS SQS queue name
+
+    - Request Body:
+        ``receipt_handles`` -- Receipt handles of the messages
+        ``visibility_timeout`` -- Seconds from now the messages stay hidden for
+
+    - Returns:
+        ``successful`` -- Receipt handles of the messages changed
+        ``failed`` -- Receipt handles SQS failed to change and why
+    """
+    challenge, error_response = _get_challenge_of_queue_for_host(
+        request, queue_name
+    )
+    if error_response:
+        return error_response
+
+    receipt_handles = _get_receipt_handles(request.data)
+    try:
+        visibility_timeout = _get_bounded_integer(
+            request.data,
+            "visibility_timeout",
+            None,
+            0,
+            SQS_MAX_VISIBILITY_TIMEOUT,
+        )
+    except (TypeError, ValueError):
+        visibility_timeout = None
+    if not receipt_handles or visibility_timeout is None:
+        response_data = {
+            "error": "Please add message receipt handles and a valid visibility timeout in the body"
+        }
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+
+    queue = get_or_create_sqs_queue(queue_name, challenge)
+    try:
+        response_data = extend_submission_messages_visibility(
+            queue, receipt_handles, visibility_timeout
+        )
+    except botocore.exceptions.ClientError as ex:
+        response_data = {"error": str(ex)}
+        logger.exception(
+            "Visibility of SQS messages is not changed due to {}".format(
+                response_data
+            )
+        )
+        return Response(response_data, status=status.HTTP_400_BAD_REQUEST)
+    return Response(response_data, status=status.HTTP_200_OK)
+
+
 @api_view(["GET"])
 @throttle_classes([UserRateThrottle])
 @permission_classes((permissions.IsAuthenticated, HasVerifiedEmail))
@@ -2853,7 +3271,7 @@ def get_github_badge_data(
     (
         response_data,
         http_status_code,
-    ) = calculate_distinct_sorted_leaderboard_data(
+    ) = get_sorted_leaderboard_data(
         request.user,
         challenge_obj,
         challenge_phase_split,
@@ -104,6 +104,8 @@
         vm.queueName = null;
 
         vm.workerLogs = [];
+        vm.workerLogsCursor = null;
+        vm.maxWorkerLogs = 10000;
         var timezone = moment.tz.guess();
         var gmtOffset = moment().utcOffset();
         var gmtSign = gmtOffset >= 0 ? '+' : '-';
@@ -234,19 +236,30 @@
         
         // Get the logs from worker if submissions are failing.
         vm.startLoadingLogs = function () {
+            vm.workerLogs = [];
+            vm.workerLogsCursor = null;
             vm.logs_poller = $interval(function () {
                 if (vm.evaluation_module_error) {
                     vm.workerLogs = [];
                     vm.workerLogs.push(vm.evaluation_module_error);
+                    vm.workerLogsCursor = null;
                 }
                 else {
+                    // Only fetch the logs written since the last poll
                     parameters.url = 'challenges/' + vm.challengeId + '/get_worker_logs/';
+                    if (vm.workerLogsCursor) {
+                        parameters.url += '?cursor=' + encodeURIComponent(vm.workerLogsCursor);
+                    }
                     parameters.method = 'GET';
                     parameters.data = {};
                     parameters.callback = {
                         onSuccess: function (response) {
                             var details = response.data;
-                            vm.workerLogs = [];
+                            // Logs without a cursor can't be tailed, show them afresh
+                            if (!details.cursor) {
+                                vm.workerLogs = [];
+                            }
+                            vm.workerLogsCursor = details.cursor;
                             for (var i = 0; i < details.logs.length; i++) {
                                 var log = details.logs[i];
                                 var utcTime = log.match(/\[\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}\]/);
@@ -260,6 +273,10 @@
                                     vm.workerLogs.push(log);
                                 }
                             }
+                            // Keep the page light on challenges logging a lot
+                            if (vm.workerLogs.length > vm.maxWorkerLogs) {
+                                vm.workerLogs.splice(0, vm.workerLogs.length - vm.maxWorkerLogs);
+                            }
                         },
                         onError: function (response) {
                             var error = response.data.error;
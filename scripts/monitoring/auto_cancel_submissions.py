@@ -1,3 +1,4 @@
+import itertools
 import os
 import time
 from datetime import datetime, timedelta
@@ -29,14 +30,16 @@ def auto_cancel_submissions(challenge_pk, days_threshold=14):
     try:
         evalai = EvalAI_Interface(AUTH_TOKEN, EVALAI_API_SERVER)
 
-        submissions = evalai.get_submissions_for_challenge(
-            challenge_pk, "submitted"
-        )
-        submissions += evalai.get_submissions_for_challenge(
-            challenge_pk, "running"
-        )
-        submissions += evalai.get_submissions_for_challenge(
-            challenge_pk, "resuming"
+        # Only the fields needed to decide on cancelling are fetched, a page
+        # at a time
+        fields = ["id", "status", "submitted_at", "rerun_resumed_at"]
+        submissions = itertools.chain(
+            *(
+                evalai.iter_submissions_for_challenge(
+                    challenge_pk, status, fields
+                )
+                for status in ["submitted", "running", "resuming"]
+            )
         )
 
         current_time = datetime.now(pytz.utc)
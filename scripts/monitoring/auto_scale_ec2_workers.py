@@ -81,13 +81,9 @@ def start_instance(challenge, evalai_interface):
         )
 
 
-def start_or_stop_workers(challenge, evalai_interface):
+def start_or_stop_workers(challenge, evalai_interface, submission_metrics):
     try:
-        challenge_metrics = (
-            evalai_interface.get_challenge_submission_metrics_by_pk(
-                challenge["id"]
-            )
-        )
+        challenge_metrics = submission_metrics.get(str(challenge["id"]), {})
         pending_submissions = get_pending_submission_count(challenge_metrics)
     except Exception as e:  # noqa: F841
         print(
@@ -113,11 +109,15 @@ def start_or_stop_workers(challenge, evalai_interface):
 
 
 # TODO: Factor in limits for the APIs
-def start_or_stop_workers_for_challenges(response, evalai_interface):
+def start_or_stop_workers_for_challenges(
+    response, evalai_interface, submission_metrics
+):
     for challenge in response["results"]:
         if challenge["uses_ec2_worker"]:
             try:
-                start_or_stop_workers(challenge, evalai_interface)
+                start_or_stop_workers(
+                    challenge, evalai_interface, submission_metrics
+                )
             except Exception as e:
                 print(e)
 
@@ -130,12 +130,20 @@ def create_evalai_interface(auth_token, evalai_endpoint):
 # Cron Job
 def start_job():
     evalai_interface = create_evalai_interface(auth_token, evalai_endpoint)
+    # Pending submission counts of all challenges are fetched with one request
+    submission_metrics = evalai_interface.get_challenges_submission_metrics(
+        status="pending"
+    )
     response = evalai_interface.get_challenges()
-    start_or_stop_workers_for_challenges(response, evalai_interface)
+    start_or_stop_workers_for_challenges(
+        response, evalai_interface, submission_metrics
+    )
     next_page = response["next"]
     while next_page is not None:
         response = evalai_interface.make_request(next_page, "GET")
-        start_or_stop_workers_for_challenges(response, evalai_interface)
+        start_or_stop_workers_for_challenges(
+            response, evalai_interface, submission_metrics
+        )
         next_page = response["next"]
 
 
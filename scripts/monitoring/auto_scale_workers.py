@@ -171,13 +171,12 @@ def scale_up_or_down_workers_for_challenge(challenge, challenge_metrics):
             print(e)
 
 
-def scale_up_or_down_workers_for_challenges(response, evalai_interface):
+def scale_up_or_down_workers_for_challenges(response, submission_metrics):
     for challenge in response["results"]:
         try:
-            challenge_metrics = (
-                evalai_interface.get_challenge_submission_metrics_by_pk(
-                    challenge["id"]
-                )
+            # Challenges which have ended are left out of the metrics
+            challenge_metrics = submission_metrics.get(
+                str(challenge["id"]), {}
             )
             scale_up_or_down_workers_for_challenge(
                 challenge, challenge_metrics
@@ -194,12 +193,16 @@ def create_evalai_interface(auth_token, evalai_endpoint):
 # Cron Job
 def start_job():
     evalai_interface = create_evalai_interface(auth_token, evalai_endpoint)
+    # Pending submission counts of all challenges are fetched with one request
+    submission_metrics = evalai_interface.get_challenges_submission_metrics(
+        status="pending"
+    )
     response = evalai_interface.get_challenges()
-    scale_up_or_down_workers_for_challenges(response, evalai_interface)
+    scale_up_or_down_workers_for_challenges(response, submission_metrics)
     next_page = response["next"]
     while next_page is not None:
         response = evalai_interface.make_request(next_page, "GET")
-        scale_up_or_down_workers_for_challenges(response, evalai_interface)
+        scale_up_or_down_workers_for_challenges(response, submission_metrics)
         next_page = response["next"]
 
 
@@ -1,9 +1,26 @@
 import logging
+from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait for a connection to and for a response from EvalAI
+REQUEST_TIMEOUT = (5, 60)
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
 
 URLS = {
     "get_message_from_sqs_queue": "/api/jobs/challenge/queues/{}/",
@@ -30,6 +47,25 @@ class EvalAI_Interface:
     def __init__(self, AUTH_TOKEN, EVALAI_API_SERVER):
         self.AUTH_TOKEN = AUTH_TOKEN
         self.EVALAI_API_SERVER = EVALAI_API_SERVER
+        self.session = self.create_session()
+
+    def create_session(self):
+        """
+        Session reusing its connections to EvalAI for the calls made by a
+        monitoring run, retrying connection errors and 5xx responses with
+        an exponential backoff.
+        """
+        retry = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = TimeoutHTTPAdapter(REQUEST_TIMEOUT, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
 
     def get_request_headers(self, include_json_content=False):
         headers = {"Authorization": "Bearer {}".format(self.AUTH_TOKEN)}
@@ -40,7 +76,7 @@ class EvalAI_Interface:
     def make_request(self, url, method, data=None, include_json_content=False):
         headers = self.get_request_headers(include_json_content)
         try:
-            response = requests.request(
+            response = self.session.request(
                 method=method, url=url, headers=headers, data=data
             )
             response.raise_for_status()
@@ -133,18 +169,50 @@ class EvalAI_Interface:
         response = self.make_request(url, "GET")
         return response
 
-    def get_submissions_for_challenge(self, submission_pk, status=None):
+    def get_submissions_for_challenge(
+        self, submission_pk, status=None, fields=None, cursor=None
+    ):
         url_template = URLS.get("get_submissions_for_challenge")
         url = url_template.format(submission_pk)
         url = self.return_url_per_environment(url)
+        params = {}
         if status:
-            url += f"?status={status}"
+            params["status"] = status
+        if fields:
+            params["fields"] = ",".join(fields)
+        if cursor is not None:
+            params["cursor"] = cursor
+        if params:
+            url += "?{}".format(urlencode(params))
         response = self.make_request(url, "GET")
         return response
 
-    def get_challenges_submission_metrics(self):
+    def iter_submissions_for_challenge(
+        self, challenge_pk, status=None, fields=None
+    ):
+        """Yields the submissions of a challenge page by page, following the
+        cursor of each page to the next one"""
+        response = self.get_submissions_for_challenge(
+            challenge_pk, status=status, fields=fields, cursor=""
+        )
+        while True:
+            yield from response["results"]
+            if response["next"] is None:
+                break
+            response = self.make_request(response["next"], "GET")
+
+    def get_challenges_submission_metrics(
+        self, status=None, changed_since=None
+    ):
         url = URLS.get("get_challenges_submission_metrics")
         url = self.return_url_per_environment(url)
+        params = {}
+        if status:
+            params["status"] = status
+        if changed_since:
+            params["changed_since"] = changed_since
+        if params:
+            url += "?{}".format(urlencode(params))
         response = self.make_request(url, "GET")
         return response
 
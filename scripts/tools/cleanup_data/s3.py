@@ -73,6 +73,7 @@ KUBE_CONFIG_FOLDER = "kube_config"  # ChallengeEvaluationCluster.kube_config
 # Batch sizes optimized for 1GB RAM
 SUBMISSION_BATCH_SIZE = 5000  # For DB queries (just path strings, low memory)
 S3_DELETE_BATCH_SIZE = 1000  # Max objects per S3 delete_objects call
+S3_HEAD_WORKERS = 16  # Concurrent HEAD requests when getting file sizes
 # =============================================================================
 
 try:
@@ -88,6 +89,8 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(SCRIPT_DIR)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
     sys.path.insert(0, os.path.join(PROJECT_ROOT, "apps"))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 # Setup Django - skip if already configured (running inside Django container)
 import django  # noqa: E402
@@ -112,6 +115,7 @@ from challenges.models import (  # noqa: E402
 )
 from django.core.files.storage import default_storage  # noqa: E402
 from jobs.models import Submission  # noqa: E402
+from s3_inventory import head_object_sizes  # noqa: E402
 
 
 class Logger:
@@ -176,9 +180,9 @@ def get_s3_key(path):
 
 def get_file_sizes_from_s3(file_paths, logger, dry_run=True):
     """
-    Get file sizes from S3 using HEAD requests.
+    Get file sizes from S3 using parallel HEAD requests.
 
-    Memory optimized: Processes in batches to avoid memory spikes.
+    Memory optimized: Requests are issued in bounded batches.
     Returns: list of tuples (path, size) or (path, None) if not found
 
     Note: Sizes are calculated in both dry run and execute modes.
@@ -193,42 +197,23 @@ def get_file_sizes_from_s3(file_paths, logger, dry_run=True):
         )
         return [(path, None) for path in file_paths]
 
-    file_sizes = []
     total = len(file_paths)
 
     logger.log(f"  Getting file sizes from S3 for {total} files...")
 
-    # Process in batches to avoid too many concurrent requests
-    batch_size = (
-        100  # HEAD requests are lightweight, so smaller batches are fine
+    # HEAD requests are lightweight and run S3_HEAD_WORKERS at a time
+    sizes = head_object_sizes(
+        s3_client,
+        bucket_name,
+        (get_s3_key(path) for path in file_paths),
+        max_workers=S3_HEAD_WORKERS,
     )
-    batch_range = range(0, total, batch_size)
-
     if TQDM_AVAILABLE:
-        batch_range = tqdm(
-            batch_range,
-            desc="Getting sizes",
-            unit="batch",
-            total=(total + batch_size - 1) // batch_size,
-        )
-
-    for i in batch_range:
-        batch = file_paths[i : i + batch_size]  # noqa: E203
-
-        for path in batch:
-            key = get_s3_key(path)
-            try:
-                response = s3_client.head_object(Bucket=bucket_name, Key=key)
-                size = response.get("ContentLength", 0)
-                file_sizes.append((path, size))
-            except Exception:
-                # If HEAD fails, just continue (file might not exist or be inaccessible)
-                # Don't log every failure to avoid log spam - just mark as None
-                file_sizes.append((path, None))
-
-        gc.collect()
+        sizes = tqdm(sizes, desc="Getting sizes", unit="file", total=total)
 
-    return file_sizes
+    # If HEAD fails the file might not exist or be inaccessible. Don't log
+    # every failure to avoid log spam - the size is just None.
+    return [(path, size) for path, (_, size) in zip(file_paths, sizes)]
 
 
 def bulk_delete_s3_files(file_paths, logger, dry_run=True):
@@ -0,0 +1,486 @@
+#!/usr/bin/env python
+"""
+Shared S3 inventory engine for the cleanup_data tools.
+
+Provides:
+    - head_object_sizes(): parallel HEAD requests with bounded fan-out
+    - InventoryState: SQLite file holding the paths referenced in the
+      database, the orphans found so far and per-source progress, so
+      memory stays bounded and a crashed run can resume where it stopped
+    - scan_s3_listing(): ListObjectsV2 pagination split into key ranges
+      listed by a thread pool
+    - scan_s3_inventory(): the same scan fed by an S3 Inventory manifest
+      (CSV, or Parquet when pyarrow is installed) instead of listing
+
+Django is not imported here, so the scripts in this directory can share
+the engine whatever environment they set up.
+"""
+
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import unquote_plus, urlparse
+
+try:
+    import pyarrow.parquet as pq
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Concurrent S3 requests (HEAD, ListObjectsV2 pages, inventory downloads)
+S3_WORKERS = 16
+
+# Keys HEADed per batch, bounds the number of pending requests
+HEAD_BATCH_SIZE = 1000
+
+# Each listed prefix is split into key ranges starting at these characters,
+# each range being paginated on its own
+LIST_SHARD_CHARACTERS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+# Rows read or written per SQLite statement (SQLite caps bound variables)
+SQLITE_BATCH_SIZE = 500
+
+# Object keys processed per inventory batch
+INVENTORY_BATCH_SIZE = 1000
+
+
+def _chunks(items, size):
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def head_object_sizes(s3_client, bucket_name, keys, max_workers=S3_WORKERS):
+    """
+    Yield (key, size) for each key using parallel HEAD requests.
+
+    Keys are yielded in the order given, size is None when the HEAD
+    request fails (file might not exist or be inaccessible).
+    """
+
+    def head(key):
+        try:
+            response = s3_client.head_object(Bucket=bucket_name, Key=key)
+            return key, response.get("ContentLength", 0)
+        except Exception:
+            return key, None
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for batch in _chunks(keys, HEAD_BATCH_SIZE):
+            yield from executor.map(head, batch)
+
+
+def get_reference_candidates(key, media_prefix):
+    """
+    Paths under which an S3 key may be referenced in the database.
+
+    Database paths are stored once, as they are. Looking up these
+    candidates matches exactly the keys that would match a set holding
+    every path both with and without media_prefix.
+    """
+
+    def strip_prefix(path):
+        if media_prefix and path.startswith(media_prefix):
+            return path[len(media_prefix) :]  # noqa: E203
+        return path
+
+    stripped = strip_prefix(key)
+    return {key, stripped, strip_prefix(stripped), f"{media_prefix}{key}"}
+
+
+class InventoryState:
+    """
+    On-disk state of an orphan scan, kept in a SQLite file.
+
+    Tables are clustered on their text key (WITHOUT ROWID), so paths are
+    stored sorted once and looked up through the B-tree instead of being
+    held in a Python set.
+    """
+
+    def __init__(self, path, media_prefix):
+        self.path = path
+        self.media_prefix = media_prefix
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS referenced (
+                path TEXT PRIMARY KEY
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS orphans (
+                key TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                deleted INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS progress (
+                source TEXT PRIMARY KEY,
+                last_key TEXT,
+                done INTEGER NOT NULL DEFAULT 0,
+                listed INTEGER NOT NULL DEFAULT 0,
+                kept INTEGER NOT NULL DEFAULT 0
+            ) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS flags (
+                name TEXT PRIMARY KEY
+            ) WITHOUT ROWID;
+            """
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def has_flag(self, name):
+        row = self.connection.execute(
+            "SELECT 1 FROM flags WHERE name = ?", (name,)
+        ).fetchone()
+        return row is not None
+
+    def set_flag(self, name):
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR IGNORE INTO flags (name) VALUES (?)", (name,)
+            )
+
+    def add_references(self, paths):
+        """Store referenced paths, skipping empty ones and duplicates."""
+        for batch in _chunks((path for path in paths if path), 5000):
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR IGNORE INTO referenced (path) VALUES (?)",
+                    ((path,) for path in batch),
+                )
+
+    def reference_count(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM referenced"
+        ).fetchone()[0]
+
+    def find_referenced(self, keys):
+        """Return the subset of S3 keys referenced in the database."""
+        candidates = {
+            key: get_reference_candidates(key, self.media_prefix)
+            for key in keys
+        }
+        found = set()
+        all_candidates = sorted(set().union(*candidates.values()))
+        for batch in _chunks(all_candidates, SQLITE_BATCH_SIZE):
+            placeholders = ",".join("?" * len(batch))
+            rows = self.connection.execute(
+                f"SELECT path FROM referenced WHERE path IN ({placeholders})",
+                batch,
+            )
+            found.update(row[0] for row in rows)
+        return {key for key, paths in candidates.items() if paths & found}
+
+    def get_progress(self, source):
+        """Return (last_key, done) of a listing shard or inventory file."""
+        row = self.connection.execute(
+            "SELECT last_key, done FROM progress WHERE source = ?", (source,)
+        ).fetchone()
+        if row is None:
+            return None, False
+        return row[0], bool(row[1])
+
+    def reset_progress(self, source):
+        with self.connection:
+            self.connection.execute(
+                "DELETE FROM progress WHERE source = ?", (source,)
+            )
+
+    def record_objects(self, source, objects, last_key, done):
+        """
+        Record a batch of listed (key, size) objects of a source.
+
+        Orphans and the progress of the source are written in the same
+        transaction, so a resumed run restarts right after the last
+        recorded batch.
+        """
+        referenced = self.find_referenced(key for key, _ in objects)
+        orphans = [
+            (key, size) for key, size in objects if key not in referenced
+        ]
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO orphans (key, size) VALUES (?, ?)",
+                orphans,
+            )
+            self.connection.execute(
+                """
+                INSERT INTO progress (source, last_key, done, listed, kept)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (source) DO UPDATE SET
+                    last_key = excluded.last_key,
+                    done = excluded.done,
+                    listed = listed + excluded.listed,
+                    kept = kept + excluded.kept
+                """,
+                (source, last_key, int(done), len(objects), len(referenced)),
+            )
+        return len(orphans)
+
+    def get_totals(self):
+        """Return (listed, kept, orphan_count, orphan_size)."""
+        listed, kept = self.connection.execute(
+            "SELECT COALESCE(SUM(listed), 0), COALESCE(SUM(kept), 0) "
+            "FROM progress"
+        ).fetchone()
+        orphan_count, orphan_size = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM orphans"
+        ).fetchone()
+        return listed, kept, orphan_count, orphan_size
+
+    def iter_orphans(self, batch_size=SQLITE_BATCH_SIZE, deleted=None):
+        """
+        Yield batches of orphan keys in key order, optionally filtered on
+        whether they were deleted. Rows can be updated between batches.
+        """
+        last_key = ""
+        condition = ""
+        if deleted is not None:
+            condition = f"AND deleted = {int(deleted)}"
+        while True:
+            rows = self.connection.execute(
+                f"SELECT key FROM orphans WHERE key > ? {condition} "
+                "ORDER BY key LIMIT ?",
+                (last_key, batch_size),
+            ).fetchall()
+            if not rows:
+                return
+            yield [row[0] for row in rows]
+            last_key = rows[-1][0]
+
+    def mark_deleted(self, keys):
+        with self.connection:
+            self.connection.executemany(
+                "UPDATE orphans SET deleted = 1 WHERE key = ?",
+                ((key,) for key in keys),
+            )
+
+
+def get_listing_shards(prefix, characters=LIST_SHARD_CHARACTERS):
+    """
+    Split the keys under a prefix into ranges listed independently.
+
+    Returns (name, start_after, end) tuples. A range holds the keys after
+    start_after up to and including end, None meaning unbounded, so every
+    key falls in exactly one range.
+    """
+    boundaries = [f"{prefix}{character}" for character in sorted(characters)]
+    starts = [None] + boundaries
+    ends = boundaries + [None]
+    return [
+        (f"list:{prefix}:{index}", start_after, end)
+        for index, (start_after, end) in enumerate(zip(starts, ends))
+    ]
+
+
+def scan_s3_listing(
+    s3_client, bucket_name, prefixes, state, logger, max_workers=S3_WORKERS
+):
+    """
+    List every object under the prefixes and record them in the state.
+
+    Ranges of each prefix are paginated concurrently, the state is only
+    written from the calling thread. Ranges finished by a previous run
+    are skipped, unfinished ones continue after their last recorded key.
+
+    Returns: number of ranges that failed and should be resumed
+    """
+    shards = {}
+    pending = {}
+    failed = 0
+
+    def submit(name, start_after, continuation_token=None):
+        kwargs = {"Bucket": bucket_name, "Prefix": shards[name][0]}
+        if continuation_token:
+            kwargs["ContinuationToken"] = continuation_token
+        elif start_after:
+            kwargs["StartAfter"] = start_after
+        pending[executor.submit(s3_client.list_objects_v2, **kwargs)] = name
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for prefix in prefixes:
+            for name, start_after, end in get_listing_shards(prefix):
+                shards[name] = (prefix, end)
+                last_key, done = state.get_progress(name)
+                if not done:
+                    submit(name, last_key or start_after)
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = pending.pop(future)
+                end = shards[name][1]
+                try:
+                    response = future.result()
+                except Exception as e:
+                    logger.log(f"  [ERROR] Failed to list {name}: {e}")
+                    failed += 1
+                    continue
+
+                objects = []
+                last_key = None
+                done = not response.get("IsTruncated")
+                for obj in response.get("Contents", []):
+                    if end is not None and obj["Key"] > end:
+                        done = True
+                        break
+                    last_key = obj["Key"]
+                    # Skip "folder" entries
+                    if not last_key.endswith("/"):
+                        objects.append((last_key, obj["Size"]))
+                if last_key is None:
+                    last_key = state.get_progress(name)[0]
+                state.record_objects(name, objects, last_key, done)
+                if not done:
+                    submit(name, last_key, response["NextContinuationToken"])
+    return failed
+
+
+def parse_s3_url(url):
+    """Split an s3://bucket/key URL into (bucket, key)."""
+    parsed = urlparse(url)
+    if parsed.scheme != "s3" or not parsed.netloc:
+        raise ValueError(f"Not an s3:// URL: {url}")
+    return parsed.netloc, parsed.path.lstrip("/")
+
+
+def _iter_inventory_rows(path, file_format, columns):
+    """Yield (key, size) of every row of a downloaded inventory file."""
+    if file_format == "CSV":
+        key_index = columns.index("Key")
+        size_index = columns.index("Size")
+        with gzip.open(path, "rt", newline="") as f:
+            for row in csv.reader(f):
+                yield unquote_plus(row[key_index]), int(row[size_index] or 0)
+    else:
+        parquet_file = pq.ParquetFile(path)
+        for batch in parquet_file.iter_batches(columns=["key", "size"]):
+            for key, size in zip(
+                batch.column(0).to_pylist(), batch.column(1).to_pylist()
+            ):
+                yield key, size or 0
+
+
+def _download_inventory_file(
+    s3_client, bucket_name, key, file_format, columns, prefixes
+):
+    """
+    Download an inventory data file and keep the objects under the
+    prefixes in a temporary TSV file, whose path is returned.
+    """
+    prefixes = tuple(prefixes)
+    fd, data_path = tempfile.mkstemp(suffix=".inventory")
+    os.close(fd)
+    fd, rows_path = tempfile.mkstemp(suffix=".tsv")
+    try:
+        s3_client.download_file(bucket_name, key, data_path)
+        with os.fdopen(fd, "w") as rows_file:
+            for object_key, size in _iter_inventory_rows(
+                data_path, file_format, columns
+            ):
+                if object_key.startswith(prefixes) and not (
+                    object_key.endswith("/")
+                ):
+                    rows_file.write(f"{object_key}\t{size}\n")
+    except Exception:
+        os.unlink(rows_path)
+        raise
+    finally:
+        os.unlink(data_path)
+    return rows_path
+
+
+def scan_s3_inventory(
+    s3_client, manifest_url, prefixes, state, logger, max_workers=S3_WORKERS
+):
+    """
+    Record the objects under the prefixes listed by an S3 Inventory report
+    in the state, instead of listing the bucket.
+
+    Data files of the report are downloaded concurrently. A data file is
+    the unit of resumption: files finished by a previous run are skipped.
+
+    Returns: number of data files that failed and should be resumed
+    """
+    manifest_bucket, manifest_key = parse_s3_url(manifest_url)
+    manifest = json.loads(
+        s3_client.get_object(Bucket=manifest_bucket, Key=manifest_key)[
+            "Body"
+        ].read()
+    )
+    file_format = manifest["fileFormat"]
+    if file_format not in ("CSV", "Parquet"):
+        raise ValueError(f"Unsupported inventory format: {file_format}")
+    if file_format == "Parquet" and not PARQUET_AVAILABLE:
+        raise RuntimeError("pyarrow is required to read Parquet inventories")
+    columns = [
+        column.strip() for column in manifest.get("fileSchema", "").split(",")
+    ]
+    data_bucket = (
+        manifest.get("destinationBucket", "").split(":::")[-1]
+        or manifest_bucket
+    )
+    logger.log(
+        f"  Using {file_format} inventory {manifest_url} "
+        f"({len(manifest['files'])} data files)"
+    )
+
+    failed = 0
+    pending = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for data_file in manifest["files"]:
+            name = f"inventory:{data_file['key']}"
+            if state.get_progress(name)[1]:
+                continue
+            future = executor.submit(
+                _download_inventory_file,
+                s3_client,
+                data_bucket,
+                data_file["key"],
+                file_format,
+                columns,
+                prefixes,
+            )
+            pending[future] = name
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = pending.pop(future)
+                try:
+                    rows_path = future.result()
+                except Exception as e:
+                    logger.log(f"  [ERROR] Failed to read {name}: {e}")
+                    failed += 1
+                    continue
+                # Files are read whole, drop counts of an interrupted read
+                state.reset_progress(name)
+                try:
+                    with open(rows_path) as rows_file:
+                        rows = (
+                            line.rstrip("\n").rsplit("\t", 1)
+                            for line in rows_file
+                        )
+                        for batch in _chunks(rows, INVENTORY_BATCH_SIZE):
+                            state.record_objects(
+                                name,
+                                [(key, int(size)) for key, size in batch],
+                                batch[-1][0],
+                                False,
+                            )
+                    state.record_objects(name, [], None, True)
+                finally:
+                    os.unlink(rows_path)
+    return failed
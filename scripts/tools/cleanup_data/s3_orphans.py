@@ -8,11 +8,19 @@ submission, configuration, or cluster.
 
 Memory Optimization Strategy:
     - Uses values_list() to fetch only file paths, not full objects
-    - Streams S3 files and checks immediately (no list accumulation)
-    - Writes orphan keys to temp file instead of memory
+    - Keeps referenced paths and orphan keys in an on-disk SQLite state
+      file (see s3_inventory.py) instead of in-memory sets
+    - Lists S3 folders with parallel key-range pagination, or reads an
+      S3 Inventory report instead of listing
     - Processes deletions in streaming batches
     - Aggressive garbage collection
 
+Resuming:
+    Progress is checkpointed in the state file after every page of
+    listed objects and every delete batch. If a run crashes, rerun it with
+    --resume to continue where it stopped. The state file is removed once
+    a run completes.
+
 S3 folders scanned (under MEDIA_PREFIX):
     - logos/
     - evaluation_scripts/
@@ -33,6 +41,13 @@ Usage:
     # Execute - actually delete orphaned files
     python scripts/tools/cleanup_data/s3_orphans.py --execute
 
+    # Resume a crashed run
+    python scripts/tools/cleanup_data/s3_orphans.py --execute --resume
+
+    # Read an S3 Inventory report instead of listing the bucket
+    python scripts/tools/cleanup_data/s3_orphans.py \
+        --inventory-manifest s3://inventory-bucket/path/manifest.json
+
 Progress bar:
     If tqdm is installed, progress bars will be shown.
 
@@ -43,7 +58,6 @@ import argparse
 import gc
 import os
 import sys
-import tempfile
 import time
 from datetime import datetime
 
@@ -60,6 +74,8 @@ PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(SCRIPT_DIR)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
     sys.path.insert(0, os.path.join(PROJECT_ROOT, "apps"))
+if SCRIPT_DIR not in sys.path:
+    sys.path.insert(0, SCRIPT_DIR)
 
 # Setup Django - skip if already configured (running inside Django container)
 import django  # noqa: E402
@@ -84,6 +100,12 @@ from challenges.models import (  # noqa: E402
 )
 from django.core.files.storage import default_storage  # noqa: E402
 from jobs.models import Submission  # noqa: E402
+from s3_inventory import (  # noqa: E402
+    S3_WORKERS,
+    InventoryState,
+    scan_s3_inventory,
+    scan_s3_listing,
+)
 
 # =============================================================================
 # CONFIGURATION - Change these for different environments/buckets
@@ -112,6 +134,9 @@ DB_BATCH_SIZE = (
 )
 S3_DELETE_BATCH_SIZE = 1000  # Max objects per S3 delete_objects call
 
+# Default state file, kept until a run completes so it can be resumed
+STATE_FILE_PATH = os.path.join(SCRIPT_DIR, "orphans_state.sqlite3")
+
 
 class Logger:
     """Simple logger that writes to both console and file."""
@@ -149,26 +174,16 @@ def format_duration(seconds):
         return f"{hours:.2f} hours"
 
 
-def collect_db_file_paths_optimized(logger):
+def collect_db_file_paths_optimized(state, logger):
     """
-    Collect all file paths referenced in the database.
+    Collect all file paths referenced in the database into the state.
 
     Memory optimized: Uses values_list() to fetch only path strings,
-    and normalizes paths in a single set with both prefix forms.
+    which are streamed into the on-disk state, each stored once.
     """
-    referenced_paths = set()
-    prefix_len = len(MEDIA_PREFIX)
 
-    def add_path_normalized(path):
-        """Add path in both forms (with and without MEDIA_PREFIX) for fast lookup."""
-        if not path:
-            return
-        referenced_paths.add(path)
-        # Also add alternate form for matching
-        if path.startswith(MEDIA_PREFIX):
-            referenced_paths.add(path[prefix_len:])
-        else:
-            referenced_paths.add(f"{MEDIA_PREFIX}{path}")
+    def add_paths(paths):
+        state.add_references(paths.iterator(chunk_size=DB_BATCH_SIZE))
 
     # 1. Challenge files - use values_list for memory efficiency
     logger.log("\n  Collecting Challenge file paths...")
@@ -182,8 +197,7 @@ def collect_db_file_paths_optimized(logger):
             .exclude(**{field: ""})
             .values_list(field, flat=True)
         )
-        for path in paths.iterator(chunk_size=DB_BATCH_SIZE):
-            add_path_normalized(path)
+        add_paths(paths)
 
     gc.collect()
     reset_queries()
@@ -198,8 +212,7 @@ def collect_db_file_paths_optimized(logger):
         .exclude(test_annotation="")
         .values_list("test_annotation", flat=True)
     )
-    for path in paths.iterator(chunk_size=DB_BATCH_SIZE):
-        add_path_normalized(path)
+    add_paths(paths)
 
     gc.collect()
     reset_queries()
@@ -226,13 +239,7 @@ def collect_db_file_paths_optimized(logger):
             .exclude(**{field: ""})
             .values_list(field, flat=True)
         )
-        count = 0
-        for path in paths.iterator(chunk_size=DB_BATCH_SIZE):
-            add_path_normalized(path)
-            count += 1
-            if count % 50000 == 0:
-                gc.collect()
-                reset_queries()
+        add_paths(paths)
         gc.collect()
         reset_queries()
 
@@ -250,10 +257,8 @@ def collect_db_file_paths_optimized(logger):
             .exclude(**{field: ""})
             .values_list(field, flat=True)
         )
-        field_count = 0
-        for path in paths.iterator(chunk_size=DB_BATCH_SIZE):
-            add_path_normalized(path)
-            field_count += 1
+        field_count = paths.count()
+        add_paths(paths)
         logger.log(f"    {field}: {field_count} files")
 
     gc.collect()
@@ -273,17 +278,14 @@ def collect_db_file_paths_optimized(logger):
             .exclude(**{field: ""})
             .values_list(field, flat=True)
         )
-        for path in paths.iterator(chunk_size=DB_BATCH_SIZE):
-            add_path_normalized(path)
+        add_paths(paths)
 
     gc.collect()
     reset_queries()
     connection.close()
 
-    logger.log(
-        f"\n  Total normalized reference paths: {len(referenced_paths)}"
-    )
-    return referenced_paths
+    state.set_flag("references_collected")
+    logger.log(f"\n  Total reference paths: {state.reference_count()}")
 
 
 def get_s3_client_and_bucket():
@@ -296,122 +298,85 @@ def get_s3_client_and_bucket():
     return s3_client, bucket_name
 
 
-def stream_s3_and_find_orphans(referenced_paths, orphan_file, logger):
+def stream_s3_and_find_orphans(
+    state, logger, inventory_manifest=None, workers=S3_WORKERS
+):
     """
-    Stream S3 files and write orphan keys to temp file.
+    List S3 files and record orphan keys in the state.
 
-    Memory optimized: Never holds full S3 file list in memory.
-    Checks each file immediately and writes orphans to disk.
+    Memory optimized: Never holds the S3 file list in memory. Each page
+    of listed files is checked against the referenced paths on disk and
+    its orphans are written to the state along with the listing progress.
 
-    Returns: (total_s3_count, orphan_count, total_orphan_size, kept_count)
+    Returns: (total_s3_count, orphan_count, total_orphan_size, kept_count,
+              failed_sources)
     """
     s3_client, bucket_name = get_s3_client_and_bucket()
-    if not bucket_name:
+    if not bucket_name and not inventory_manifest:
         logger.log(
             "  [ERROR] Could not determine S3 bucket name from settings"
         )
-        return 0, 0, 0, 0
-
-    logger.log(f"  Using bucket: {bucket_name}")
-
-    total_s3_count = 0
-    orphan_count = 0
-    total_orphan_size = 0
-    kept_count = 0
-    prefix_len = len(MEDIA_PREFIX)
-
-    folder_iter = S3_FOLDERS
-    if TQDM_AVAILABLE:
-        folder_iter = tqdm(S3_FOLDERS, desc="    S3 folders", unit="folder")
-
-    for folder in folder_iter:
-        folder_count = 0
-        folder_orphans = 0
-
-        try:
-            paginator = s3_client.get_paginator("list_objects_v2")
-            page_iterator = paginator.paginate(
-                Bucket=bucket_name, Prefix=folder
-            )
-
-            for page in page_iterator:
-                for obj in page.get("Contents", []):
-                    key = obj["Key"]
-                    # Skip "folder" entries
-                    if key.endswith("/"):
-                        continue
-
-                    total_s3_count += 1
-                    folder_count += 1
-
-                    # Check if referenced (check both with and without prefix)
-                    key_without_prefix = (
-                        key[prefix_len:]
-                        if key.startswith(MEDIA_PREFIX)
-                        else key
-                    )
-
-                    if (
-                        key in referenced_paths
-                        or key_without_prefix in referenced_paths
-                    ):
-                        kept_count += 1
-                    else:
-                        # Write orphan to temp file: key\tsize\n
-                        orphan_file.write(f"{key}\t{obj['Size']}\n")
-                        orphan_count += 1
-                        folder_orphans += 1
-                        total_orphan_size += obj["Size"]
-
-                # Periodic cleanup within large folders
-                if folder_count % 100000 == 0:
-                    gc.collect()
-
-        except Exception as e:
-            logger.log(f"  [ERROR] Failed to list {folder}: {e}")
-
-        logger.log(
-            f"    {folder}: {folder_count} files ({folder_orphans} orphans)"
+        return 0, 0, 0, 0, 0
+
+    if inventory_manifest:
+        failed_sources = scan_s3_inventory(
+            s3_client,
+            inventory_manifest,
+            S3_FOLDERS,
+            state,
+            logger,
+            max_workers=workers,
+        )
+    else:
+        logger.log(f"  Using bucket: {bucket_name}")
+        failed_sources = scan_s3_listing(
+            s3_client,
+            bucket_name,
+            S3_FOLDERS,
+            state,
+            logger,
+            max_workers=workers,
         )
 
+    total_s3_count, kept_count, orphan_count, total_orphan_size = (
+        state.get_totals()
+    )
     logger.log(f"\n  Total files in S3: {total_s3_count}")
     logger.log(
         f"  Orphaned files found: {orphan_count} ({format_size(total_orphan_size)})"
     )
     logger.log(f"  Referenced files (kept): {kept_count}")
+    if failed_sources:
+        logger.log(
+            f"  [WARNING] {failed_sources} listings failed - rerun with --resume"
+        )
 
-    return total_s3_count, orphan_count, total_orphan_size, kept_count
+    return (
+        total_s3_count,
+        orphan_count,
+        total_orphan_size,
+        kept_count,
+        failed_sources,
+    )
 
 
-def verify_no_overlap_streaming(
-    referenced_paths, orphan_file_path, logger, sample_limit=10
-):
+def verify_no_overlap_streaming(state, logger, sample_limit=10):
     """
-    Verify no overlap between orphans and referenced paths by streaming orphan file.
+    Verify no overlap between orphans and referenced paths by streaming orphans.
 
-    Memory optimized: Reads orphan file line by line.
+    Memory optimized: Reads orphan keys from the state in batches.
     """
     logger.log(
         "\n  Verifying no overlap between orphaned and referenced files..."
     )
 
     overlap_count = 0
-    prefix_len = len(MEDIA_PREFIX)
-
-    with open(orphan_file_path, "r") as f:
-        for line in f:
-            key = line.split("\t")[0]
-            key_without_prefix = (
-                key[prefix_len:] if key.startswith(MEDIA_PREFIX) else key
-            )
 
-            if (
-                key in referenced_paths
-                or key_without_prefix in referenced_paths
-            ):
-                overlap_count += 1
-                if overlap_count <= sample_limit:
-                    logger.log(f"    [WARNING] Overlap found: {key}")
+    for keys in state.iter_orphans():
+        for key in sorted(state.find_referenced(keys)):
+            overlap_count += 1
+            if overlap_count <= sample_limit:
+                logger.log(f"    [WARNING] Overlap found: {key}")
 
     if overlap_count > 0:
         logger.log(f"\n  [ERROR] Found {overlap_count} overlapping files!")
@@ -423,14 +388,14 @@ def verify_no_overlap_streaming(
     return True
 
 
-def bulk_delete_from_file(orphan_file_path, logger, dry_run=True):
+def bulk_delete_orphans(state, logger, dry_run=True):
     """
-    Delete orphaned files by streaming from temp file.
+    Delete orphaned files by streaming them from the state.
 
-    Memory optimized: Reads orphan file in batches, never loads all into memory.
+    Memory optimized: Reads orphan keys in batches, never loads all into memory.
+    Deleted keys are marked in the state, so a resumed run skips them.
     """
-    # Count total for progress
-    total_orphans = sum(1 for _ in open(orphan_file_path, "r"))
+    total_orphans = state.get_totals()[2]
 
     if total_orphans == 0:
         return 0, 0
@@ -448,70 +413,54 @@ def bulk_delete_from_file(orphan_file_path, logger, dry_run=True):
 
     deleted = 0
     failed = 0
-    batch = []
     batch_num = 0
     total_batches = (
         total_orphans + S3_DELETE_BATCH_SIZE - 1
     ) // S3_DELETE_BATCH_SIZE
 
-    with open(orphan_file_path, "r") as f:
-        if TQDM_AVAILABLE:
-            f_iter = tqdm(
-                f, desc="Deleting S3 files", unit="file", total=total_orphans
-            )
-        else:
-            f_iter = f
-
-        for line in f_iter:
-            key = line.split("\t")[0]
-            batch.append({"Key": key})
-
-            if len(batch) >= S3_DELETE_BATCH_SIZE:
-                batch_num += 1
-                try:
-                    response = s3_client.delete_objects(
-                        Bucket=bucket_name, Delete={"Objects": batch}
-                    )
-                    deleted_count = len(response.get("Deleted", []))
-                    error_count = len(response.get("Errors", []))
-                    deleted += deleted_count
-                    failed += error_count
-
-                    if error_count > 0:
-                        for error in response.get("Errors", [])[
-                            :3
-                        ]:  # Log first 3 errors
-                            logger.log(
-                                f"  [ERROR] Failed to delete {error['Key']}: {error['Message']}"
-                            )
+    batches = state.iter_orphans(
+        batch_size=S3_DELETE_BATCH_SIZE, deleted=False
+    )
+    if TQDM_AVAILABLE:
+        batches = tqdm(
+            batches,
+            desc="Deleting S3 files",
+            unit="batch",
+            total=total_batches,
+        )
 
+    for keys in batches:
+        batch_num += 1
+        try:
+            response = s3_client.delete_objects(
+                Bucket=bucket_name,
+                Delete={"Objects": [{"Key": key} for key in keys]},
+            )
+            deleted_keys = [
+                deleted_object["Key"]
+                for deleted_object in response.get("Deleted", [])
+            ]
+            error_count = len(response.get("Errors", []))
+            state.mark_deleted(deleted_keys)
+            deleted += len(deleted_keys)
+            failed += error_count
+
+            if error_count > 0:
+                for error in response.get("Errors", [])[
+                    :3
+                ]:  # Log first 3 errors
                     logger.log(
-                        f"  [BULK DELETE] Batch {batch_num}/{total_batches}: {deleted_count} deleted, {error_count} failed"
+                        f"  [ERROR] Failed to delete {error['Key']}: {error['Message']}"
                     )
-                except Exception as e:
-                    logger.log(f"  [ERROR] Bulk delete failed: {e}")
-                    failed += len(batch)
-
-                batch = []
-                gc.collect()
-
-        # Process remaining batch
-        if batch:
-            batch_num += 1
-            try:
-                response = s3_client.delete_objects(
-                    Bucket=bucket_name, Delete={"Objects": batch}
-                )
-                deleted_count = len(response.get("Deleted", []))
-                error_count = len(response.get("Errors", []))
-                deleted += deleted_count
-                failed += error_count
-                logger.log(
-                    f"  [BULK DELETE] Batch {batch_num}/{total_batches}: {deleted_count} deleted, {error_count} failed"
-                )
-            except Exception as e:
-                logger.log(f"  [ERROR] Bulk delete failed: {e}")
-                failed += len(batch)
+
+            logger.log(
+                f"  [BULK DELETE] Batch {batch_num}/{total_batches}: {len(deleted_keys)} deleted, {error_count} failed"
+            )
+        except Exception as e:
+            logger.log(f"  [ERROR] Bulk delete failed: {e}")
+            failed += len(keys)
+
+        gc.collect()
 
     return deleted, failed
 
@@ -527,6 +476,26 @@ def main():
         action="store_true",
         help="Actually delete files (default is dry run)",
     )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue the run recorded in the state file instead of starting over",
+    )
+    parser.add_argument(
+        "--state-file",
+        default=STATE_FILE_PATH,
+        help=f"SQLite file the scan is checkpointed in (default: {STATE_FILE_PATH})",
+    )
+    parser.add_argument(
+        "--inventory-manifest",
+        help="s3:// URL of an S3 Inventory manifest.json to read instead of listing the bucket",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=S3_WORKERS,
+        help=f"Concurrent S3 requests (default: {S3_WORKERS})",
+    )
     args = parser.parse_args()
 
     dry_run = not args.execute
@@ -542,6 +511,7 @@ def main():
     logger.log(f"S3 Orphan Cleanup - {'DRY RUN' if dry_run else 'EXECUTE'}")
     logger.log(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     logger.log(f"Log file: {log_file_path}")
+    logger.log(f"State file: {args.state_file}")
     logger.log("=" * 60)
     logger.log("\n[Memory Optimized for 1GB RAM]")
 
@@ -549,52 +519,60 @@ def main():
         logger.log("\n*** DRY RUN - No files will be deleted ***")
         logger.log("*** Use --execute to actually delete files ***")
 
-    # Phase 1: Collect all file paths from database (memory: ~200-300MB for refs)
-    logger.log(f"\n{'='*60}")
-    logger.log("PHASE 1: Collecting database references")
-    logger.log("=" * 60)
-    referenced_paths = collect_db_file_paths_optimized(logger)
-    gc.collect()
-
-    # Phase 2 & 3: Stream S3 files and identify orphans (write to temp file)
-    logger.log(f"\n{'='*60}")
-    logger.log("PHASE 2: Streaming S3 files and identifying orphans")
-    logger.log("=" * 60)
-
-    # Create temp file for orphan keys (stored on disk, not memory)
-    orphan_temp_file = tempfile.NamedTemporaryFile(
-        mode="w",
-        suffix=".txt",
-        prefix="orphans_",
-        dir=SCRIPT_DIR,
-        delete=False,
-    )
-    orphan_file_path = orphan_temp_file.name
+    if not args.resume and os.path.exists(args.state_file):
+        os.unlink(args.state_file)
+    state = InventoryState(args.state_file, MEDIA_PREFIX)
+    completed = False
 
     try:
-        total_s3_files, orphan_count, orphan_size, kept_count = (
-            stream_s3_and_find_orphans(
-                referenced_paths, orphan_temp_file, logger
+        # Phase 1: Collect all file paths from database (stored on disk)
+        logger.log(f"\n{'='*60}")
+        logger.log("PHASE 1: Collecting database references")
+        logger.log("=" * 60)
+        if state.has_flag("references_collected"):
+            logger.log(
+                f"\n  Resuming with {state.reference_count()} reference paths"
             )
+        else:
+            collect_db_file_paths_optimized(state, logger)
+        gc.collect()
+
+        # Phase 2: List S3 files and identify orphans (recorded in the state)
+        logger.log(f"\n{'='*60}")
+        logger.log("PHASE 2: Streaming S3 files and identifying orphans")
+        logger.log("=" * 60)
+
+        (
+            total_s3_files,
+            orphan_count,
+            orphan_size,
+            kept_count,
+            failed_sources,
+        ) = stream_s3_and_find_orphans(
+            state,
+            logger,
+            inventory_manifest=args.inventory_manifest,
+            workers=args.workers,
         )
-        orphan_temp_file.close()
+
+        if failed_sources:
+            logger.log(
+                "\n[ERROR] Listing is incomplete. Rerun with --resume to retry."
+            )
+            return
 
         if total_s3_files == 0:
             logger.log(
                 "\n[WARNING] No S3 files found. Check S3 bucket access."
             )
-            logger.close()
-            os.unlink(orphan_file_path)
-            print(f"\nLog saved to: {log_file_path}")
+            completed = True
             return
 
         if orphan_count == 0:
             logger.log(
                 "\n[INFO] No orphaned files found. All S3 files are referenced in database."
             )
-            logger.close()
-            os.unlink(orphan_file_path)
-            print(f"\nLog saved to: {log_file_path}")
+            completed = True
             return
 
         # Phase 3: Verify no overlap (streaming verification)
@@ -602,31 +580,21 @@ def main():
         logger.log("PHASE 3: Verifying no overlap")
         logger.log("=" * 60)
 
-        if not verify_no_overlap_streaming(
-            referenced_paths, orphan_file_path, logger
-        ):
+        if not verify_no_overlap_streaming(state, logger):
             logger.log(
                 "  [ERROR] Aborting to prevent data loss. Please investigate."
             )
-            logger.close()
-            os.unlink(orphan_file_path)
-            print(f"\nLog saved to: {log_file_path}")
+            completed = True
             return
 
-        # Free referenced_paths - no longer needed
-        del referenced_paths
-        gc.collect()
-
-        # Phase 4: Delete orphaned files (streaming from temp file)
+        # Phase 4: Delete orphaned files (streaming from the state)
         logger.log(f"\n{'='*60}")
         logger.log("PHASE 4: Deleting orphaned files")
         logger.log("=" * 60)
         logger.log(f"Files to delete: {orphan_count}")
         logger.log(f"Space to free: {format_size(orphan_size)}")
 
-        deleted, failed = bulk_delete_from_file(
-            orphan_file_path, logger, dry_run
-        )
+        deleted, failed = bulk_delete_orphans(state, logger, dry_run)
 
         # Summary
         logger.log("\n" + "=" * 60)
@@ -647,14 +615,17 @@ def main():
         logger.log(f"Execution time: {format_duration(elapsed_time)}")
         logger.log(f"Log file: {log_file_path}")
         logger.log("=" * 60)
+        completed = not failed
 
     finally:
-        # Cleanup temp file
-        if os.path.exists(orphan_file_path):
-            os.unlink(orphan_file_path)
-
-    logger.close()
-    print(f"\nLog saved to: {log_file_path}")
+        state.close()
+        # Keep the state of an interrupted run so it can be resumed
+        if completed and os.path.exists(args.state_file):
+            os.unlink(args.state_file)
+        elif not completed:
+            logger.log(f"\nState kept for --resume: {args.state_file}")
+        logger.close()
+        print(f"\nLog saved to: {log_file_path}")
 
 
 if __name__ == "__main__":
@@ -818,16 +818,18 @@ def main():
         "submission_time_limit"
     )
     while True:
-        time.sleep(2)
-        message = evalai.get_message_from_sqs_queue()
-        message_body = message.get("body")
-        if message_body:
+        messages = evalai.get_messages_from_sqs_queue().get("messages", [])
+        processed_receipt_handles = []
+        handled_messages = 0
+        for message in messages:
+            message_body = message.get("body")
+            if not message_body:
+                continue
             if challenge.get(
                 "is_static_dataset_code_upload"
             ) and not message_body.get(
                 "is_static_dataset_code_upload_submission"
             ):
-                time.sleep(35)
                 continue
             api_instance = get_api_object(
                 cluster_name, cluster_endpoint, challenge, evalai
@@ -854,7 +856,6 @@ def main():
                         # Fetch the last job name from the list as it is the
                         # latest running job
                         job_name = submission.get("job_name")
-                        message_receipt_handle = message.get("receipt_handle")
                         if job_name:
                             latest_job_name = job_name[-1]
                             delete_job(api_instance, latest_job_name)
@@ -865,18 +866,15 @@ def main():
                                     submission_pk, submission.get("status")
                                 )
                             )
-                        evalai.delete_message_from_sqs_queue(
-                            message_receipt_handle
-                        )
                     except Exception as e:
                         logger.exception(
                             "Failed to delete submission job: {}".format(e)
                         )
-                        # Delete message from sqs queue to avoid re-triggering
-                        # job delete
-                        evalai.delete_message_from_sqs_queue(
-                            message_receipt_handle
-                        )
+                    # Delete message from sqs queue, also when the job couldn't
+                    # be deleted to avoid re-triggering job delete
+                    processed_receipt_handles.append(
+                        message.get("receipt_handle")
+                    )
                 elif submission.get("status") == "queued":
                     job_name = submission.get("job_name")[-1]
                     pods_list = get_pods_from_job(
@@ -924,7 +922,16 @@ def main():
                         challenge,
                         evalai,
                     )
-
+            handled_messages += 1
+
+        if processed_receipt_handles:
+            evalai.delete_messages_from_sqs_queue(processed_receipt_handles)
+        if not messages:
+            time.sleep(2)
+        elif not handled_messages:
+            # Only messages of other submissions were received, wait for
+            # them to be picked up by the worker meant for them
+            time.sleep(35)
         if killer.kill_now:
             break
 
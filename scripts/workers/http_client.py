@@ -0,0 +1,189 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a connection to and for a response from EvalAI, the
+# read timeout has to be longer than the long poll of the queue endpoints
+CONNECT_TIMEOUT = float(os.environ.get("EVALAI_API_CONNECT_TIMEOUT", 5))
+READ_TIMEOUT = float(os.environ.get("EVALAI_API_READ_TIMEOUT", 60))
+# Retries of a request failing to connect or answered with a 5xx status
+MAX_RETRIES = int(os.environ.get("EVALAI_API_MAX_RETRIES", 3))
+RETRY_BACKOFF_FACTOR = float(
+    os.environ.get("EVALAI_API_RETRY_BACKOFF_FACTOR", 0.5)
+)
+RETRY_STATUSES = (500, 502, 503, 504)
+
+
+class JitteredRetry(Retry):
+    """
+    Retry policy waiting a random time up to the exponential backoff, so the
+    workers of a challenge don't all retry at the same moment after an
+    outage of the API.
+    """
+
+    def get_backoff_time(self):
+        return random.uniform(0, super().get_backoff_time())
+
+
+class TimeoutHTTPAdapter(HTTPAdapter):
+    def __init__(self, timeout, *args, **kwargs):
+        self.timeout = timeout
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        return super().send(request, **kwargs)
+
+
+def create_session(
+    timeout=(CONNECT_TIMEOUT, READ_TIMEOUT), max_retries=MAX_RETRIES
+):
+    """
+    Returns a session keeping connections to EvalAI alive, with a default
+    timeout and retrying connection errors and 5xx responses. Only requests
+    of idempotent methods are retried once the server received them.
+
+    Arguments:
+        timeout {[tuple]} -- Connect and read timeouts in seconds
+        max_retries {[int]} -- Retries of a failing request
+    """
+    retry = JitteredRetry(
+        total=max_retries,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUSES,
+        # The last response is returned so that callers keep raising
+        # ``HTTPError`` on it
+        raise_on_status=False,
+    )
+    adapter = TimeoutHTTPAdapter(timeout, max_retries=retry)
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_endpoint(method, url):
+    """
+    Name under which the latency of a request is recorded, its method and
+    path with the primary keys left out, e.g.
+    ``GET /api/jobs/submission/{}``.
+    """
+    path = re.sub(r"/\d+(?=/|$)", "/{}", urlparse(url).path)
+    return "{} {}".format(method.upper(), path)
+
+
+class RequestMetrics:
+    """
+    Number of requests, total and longest time spent on them per endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def record(self, endpoint, seconds):
+        with self._lock:
+            count, total, longest = self._endpoints.get(endpoint, (0, 0, 0))
+            self._endpoints[endpoint] = (
+                count + 1,
+                total + seconds,
+                max(longest, seconds),
+            )
+
+    def snapshot(self, reset=False):
+        with self._lock:
+            endpoints = self._endpoints
+            if reset:
+                self._endpoints = {}
+            else:
+                endpoints = dict(endpoints)
+        return {
+            endpoint: {
+                "count": count,
+                "total_seconds": total,
+                "mean_seconds": total / count,
+                "max_seconds": longest,
+            }
+            for endpoint, (count, total, longest) in endpoints.items()
+        }
+
+
+class EvalAIHTTPClient:
+    """
+    Client the workers call EvalAI with, sharing a pool of connections
+    between requests and recording the latency of each endpoint.
+    """
+
+    def __init__(self, session=None):
+        self.session = session or create_session()
+        self.metrics = RequestMetrics()
+
+    def request(self, method, url, **kwargs):
+        start = time.monotonic()
+        try:
+            return self.session.request(method=method, url=url, **kwargs)
+        finally:
+            self.metrics.record(
+                get_endpoint(method, url), time.monotonic() - start
+            )
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request("PATCH", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def log_metrics(self, reset=True):
+        """
+        Log the requests made since the metrics were last reset, e.g. the
+        calls to EvalAI made to evaluate a submission.
+        """
+        metrics = self.metrics.snapshot(reset=reset)
+        if not metrics:
+            return metrics
+        logger.info(
+            "EvalAI API calls: {} requests in {:.3f}s".format(
+                sum(endpoint["count"] for endpoint in metrics.values()),
+                sum(
+                    endpoint["total_seconds"] for endpoint in metrics.values()
+                ),
+            )
+        )
+        for endpoint, endpoint_metrics in sorted(metrics.items()):
+            logger.info(
+                "{}: {count} requests, {mean_seconds:.3f}s mean, "
+                "{max_seconds:.3f}s max".format(endpoint, **endpoint_metrics)
+            )
+        return metrics
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_http_client():
+    """
+    Returns the client shared by the whole worker process.
+    """
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = EvalAIHTTPClient()
+        return _client
@@ -14,6 +14,7 @@ import shutil
 import signal
 import sys
 import tempfile
+import threading
 import time
 import traceback
 import zipfile
@@ -21,6 +22,8 @@ from os.path import join
 
 import requests
 
+from .http_client import get_http_client
+
 # all challenge and submission will be stored in temp directory
 BASE_TEMP_DIR = tempfile.mkdtemp()
 COMPUTE_DIRECTORY_PATH = join(BASE_TEMP_DIR, "compute")
@@ -31,6 +34,14 @@ AUTH_TOKEN = os.environ.get("AUTH_TOKEN")
 DJANGO_SERVER = os.environ.get("DJANGO_SERVER", "localhost")
 DJANGO_SERVER_PORT = os.environ.get("DJANGO_SERVER_PORT", "8000")
 QUEUE_NAME = os.environ.get("QUEUE_NAME", "evalai_submission_queue")
+# Messages fetched per call and seconds the call waits for one to arrive
+MAX_MESSAGES_PER_BATCH = int(os.environ.get("MAX_MESSAGES_PER_BATCH", 10))
+MESSAGES_WAIT_TIME = int(os.environ.get("MESSAGES_WAIT_TIME", 20))
+# Seconds the messages of a batch are kept hidden from other workers for,
+# extended while a submission of the batch is being evaluated
+MESSAGE_VISIBILITY_TIMEOUT = int(
+    os.environ.get("MESSAGE_VISIBILITY_TIMEOUT", 15 * 60)
+)
 
 CHALLENGE_DATA_BASE_DIR = join(COMPUTE_DIRECTORY_PATH, "challenge_data")
 SUBMISSION_DATA_BASE_DIR = join(COMPUTE_DIRECTORY_PATH, "submission_files")
@@ -51,6 +62,9 @@ EVALUATION_SCRIPTS = {}
 URLS = {
     "get_message_from_sqs_queue": "/api/jobs/challenge/queues/{}/",
     "delete_message_from_sqs_queue": "/api/jobs/queues/{}/",
+    "get_messages_from_sqs_queue": "/api/jobs/challenge/queues/{}/messages/?max_messages={}&wait_time={}",
+    "delete_messages_from_sqs_queue": "/api/jobs/queues/{}/messages/delete/",
+    "change_messages_visibility": "/api/jobs/queues/{}/messages/visibility/",
     "get_submission_by_pk": "/api/jobs/submission/{}",
     "get_challenge_phases_by_challenge_pk": "/api/challenges/{}/phases/",
     "get_challenge_by_queue_name": "/api/challenges/challenge/queues/{}/",
@@ -59,6 +73,9 @@ URLS = {
 }
 EVALAI_ERROR_CODES = [400, 401, 406]
 
+# Keeps the connections to EvalAI alive between the calls of the worker
+http_client = get_http_client()
+
 # map of challenge id : phase id : phase annotation file name
 # Use: On arrival of submission message, lookup here to fetch phase file name
 # this saves db query just to fetch phase annotation file name
@@ -344,7 +361,7 @@ def make_request(url, method, data=None):
     headers = get_request_headers()
     if method == "GET":
         try:
-            response = requests.get(url=url, headers=headers)
+            response = http_client.get(url=url, headers=headers)
             response.raise_for_status()
         except requests.exceptions.RequestException:
             logger.info(
@@ -355,7 +372,7 @@ def make_request(url, method, data=None):
 
     elif method == "PUT":
         try:
-            response = requests.put(url=url, headers=headers, data=data)
+            response = http_client.put(url=url, headers=headers, data=data)
             response.raise_for_status()
         except requests.exceptions.RequestException:
             logger.exception(
@@ -372,7 +389,7 @@ def make_request(url, method, data=None):
 
     elif method == "PATCH":
         try:
-            response = requests.patch(url=url, headers=headers, data=data)
+            response = http_client.patch(url=url, headers=headers, data=data)
             response.raise_for_status()
         except requests.exceptions.RequestException:
             logger.info(
@@ -388,7 +405,7 @@ def make_request(url, method, data=None):
 
     elif method == "POST":
         try:
-            response = requests.post(url=url, headers=headers, data=data)
+            response = http_client.post(url=url, headers=headers, data=data)
             response.raise_for_status()
         except requests.exceptions.RequestException:
             logger.info(
@@ -419,6 +436,73 @@ def delete_message_from_sqs_queue(receipt_handle):
     return response
 
 
+def get_messages_from_sqs_queue(
+    max_messages=10, wait_time=20, visibility_timeout=None
+):
+    url = URLS.get("get_messages_from_sqs_queue").format(
+        QUEUE_NAME, max_messages, wait_time
+    )
+    if visibility_timeout is not None:
+        url = "{}&visibility_timeout={}".format(url, visibility_timeout)
+    url = return_url_per_environment(url)
+    response = make_request(url, "GET")
+    return response
+
+
+def delete_messages_from_sqs_queue(receipt_handles):
+    url = URLS.get("delete_messages_from_sqs_queue").format(QUEUE_NAME)
+    url = return_url_per_environment(url)
+    response = make_request(
+        url, "POST", data={"receipt_handles": receipt_handles}
+    )
+    return response
+
+
+def change_messages_visibility(receipt_handles, visibility_timeout):
+    url = URLS.get("change_messages_visibility").format(QUEUE_NAME)
+    url = return_url_per_environment(url)
+    response = make_request(
+        url,
+        "POST",
+        data={
+            "receipt_handles": receipt_handles,
+            "visibility_timeout": visibility_timeout,
+        },
+    )
+    return response
+
+
+@contextlib.contextmanager
+def keep_messages_hidden(receipt_handles):
+    """
+    Keep the messages of a batch hidden from other workers while one of
+    them is evaluated, extending their visibility before the evaluation
+    starts and then every half of ``MESSAGE_VISIBILITY_TIMEOUT`` until it
+    is over.
+    """
+    change_messages_visibility(receipt_handles, MESSAGE_VISIBILITY_TIMEOUT)
+    stopped = threading.Event()
+
+    def extend_visibility():
+        while not stopped.wait(MESSAGE_VISIBILITY_TIMEOUT / 2):
+            try:
+                change_messages_visibility(
+                    receipt_handles, MESSAGE_VISIBILITY_TIMEOUT
+                )
+            except requests.exceptions.RequestException:
+                logger.exception(
+                    "Failed to extend the visibility of the messages"
+                )
+
+    heartbeat_thread = threading.Thread(target=extend_visibility, daemon=True)
+    heartbeat_thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        heartbeat_thread.join()
+
+
 def get_submission_by_pk(submission_pk):
     url = URLS.get("get_submission_by_pk").format(submission_pk)
     url = return_url_per_environment(url)
@@ -602,26 +686,46 @@ def main():
         logger.info(
             "Fetching new messages from the queue {}".format(QUEUE_NAME)
         )
-        message = get_message_from_sqs_queue()
-        message_body = message.get("body")
-        if message_body:
-            submission_pk = message_body.get("submission_pk")
-            submission = get_submission_by_pk(submission_pk)
-            if submission:
-                if submission.get("status") == "finished":
-                    message_receipt_handle = message.get("receipt_handle")
-                    delete_message_from_sqs_queue(message_receipt_handle)
-                elif submission.get("status") == "running":
-                    continue
-                else:
-                    message_receipt_handle = message.get("receipt_handle")
-                    logger.info(
-                        "Processing message body: {}".format(message_body)
-                    )
-                    process_submission_callback(message_body)
-                    # Let the queue know that the message is processed
-                    delete_message_from_sqs_queue(message_receipt_handle)
-        time.sleep(5)
+        messages = get_messages_from_sqs_queue(
+            MAX_MESSAGES_PER_BATCH,
+            MESSAGES_WAIT_TIME,
+            MESSAGE_VISIBILITY_TIMEOUT,
+        ).get("messages", [])
+        processed_receipt_handles = []
+        for index, message in enumerate(messages):
+            message_body = message.get("body")
+            if not message_body:
+                continue
+            # The status is checked right before processing since earlier
+            # messages of the batch may have taken a while to evaluate
+            submission = get_submission_by_pk(
+                message_body.get("submission_pk")
+            )
+            if not submission or submission.get("status") == "running":
+                continue
+            receipt_handle = message.get("receipt_handle")
+            if submission.get("status") == "finished":
+                processed_receipt_handles.append(receipt_handle)
+                continue
+            if processed_receipt_handles:
+                delete_messages_from_sqs_queue(processed_receipt_handles)
+                processed_receipt_handles = []
+            logger.info("Processing message body: {}".format(message_body))
+            pending_receipt_handles = [
+                pending_message.get("receipt_handle")
+                for pending_message in messages[index:]
+            ]
+            with keep_messages_hidden(pending_receipt_handles):
+                http_client.metrics.snapshot(reset=True)
+                process_submission_callback(message_body)
+                # Time spent calling EvalAI while evaluating the submission
+                http_client.log_metrics()
+            # Let the queue know that the message is processed
+            delete_messages_from_sqs_queue([receipt_handle])
+        if processed_receipt_handles:
+            delete_messages_from_sqs_queue(processed_receipt_handles)
+        if not messages:
+            time.sleep(5)
         if killer.kill_now:
             break
 
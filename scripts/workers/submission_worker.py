@@ -6,18 +6,25 @@ from __future__ import (
 )
 
 import contextlib
+import hashlib
 import importlib
 import json
 import logging
+import multiprocessing
 import os
+import re
 import shutil
 import signal
+import socket
 import subprocess
 import sys
 import tempfile
+import threading
 import time
 import traceback
+import uuid
 import zipfile
+from concurrent import futures
 from os.path import join
 
 import django
@@ -37,13 +44,21 @@ from challenges.models import (  # noqa:E402
 )
 from django.conf import settings  # noqa:E402
 from django.core.files.base import ContentFile  # noqa:E402
+from django.db import transaction  # noqa:E402
 from django.utils import timezone  # noqa:E402
+from jobs.evaluation_leases import (  # noqa:E402
+    acquire_submission_evaluation_lease,
+    get_submission_evaluation_lease_timeout,
+    release_submission_evaluation_lease,
+    renew_submission_evaluation_leases,
+)
 from jobs.models import Submission  # noqa:E402
 from jobs.s3_retention import (  # noqa:E402
     enqueue_submission_artifact_retention_tagging,
     log_submission_artifact_upload_context,
 )
 from jobs.serializers import SubmissionSerializer  # noqa:E402
+from jobs.submission_quota import invalidate_submission_counts  # noqa:E402
 
 # all challenge and submission will be stored in temp directory
 BASE_TEMP_DIR = tempfile.mkdtemp(prefix="tmp")
@@ -67,6 +82,31 @@ LIMIT_CONCURRENT_SUBMISSION_PROCESSING = os.environ.get(
 DJANGO_SETTINGS_MODULE = os.environ.get(
     "DJANGO_SETTINGS_MODULE", "settings.dev"
 )
+# Number of submissions evaluated at the same time, each one in its own
+# process. 1 keeps evaluating submissions one by one in the worker process.
+SUBMISSION_EVALUATION_CONCURRENCY = int(
+    os.environ.get("SUBMISSION_EVALUATION_CONCURRENCY", 1)
+)
+
+# Evaluation scripts and annotation files are kept on the host across worker
+# restarts, outside of BASE_TEMP_DIR which is removed on every start. Cached
+# files are stored by content hash and the least recently used ones are
+# evicted once the cache grows past EVALUATION_DATA_CACHE_MAX_SIZE bytes.
+EVALUATION_DATA_CACHE_DIR = os.environ.get(
+    "EVALUATION_DATA_CACHE_DIR",
+    join(tempfile.gettempdir(), "evalai_evaluation_data_cache"),
+)
+EVALUATION_DATA_CACHE_MAX_SIZE = int(
+    os.environ.get("EVALUATION_DATA_CACHE_MAX_SIZE", 20 * 1024**3)
+)
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Large files, e.g. submissions uploaded through input_file_url, are
+# downloaded with DOWNLOAD_CONCURRENCY parallel range requests of
+# DOWNLOAD_PART_SIZE bytes each
+DOWNLOAD_PART_SIZE = int(
+    os.environ.get("DOWNLOAD_PART_SIZE", 64 * 1024 * 1024)
+)
+DOWNLOAD_CONCURRENCY = int(os.environ.get("DOWNLOAD_CONCURRENCY", 8))
 
 CHALLENGE_DATA_BASE_DIR = join(COMPUTE_DIRECTORY_PATH, "challenge_data")
 SUBMISSION_DATA_BASE_DIR = join(COMPUTE_DIRECTORY_PATH, "submission_files")
@@ -106,6 +146,10 @@ class ExecutionTimeLimitExceeded(Exception):
     pass
 
 
+class DownloadVerificationError(Exception):
+    pass
+
+
 class MultiOut(object):
     def __init__(self, *args):
         self.handles = args
@@ -121,20 +165,22 @@ class MultiOut(object):
 
 @contextlib.contextmanager
 def stdout_redirect(where):
+    previous_stdout = sys.stdout
     sys.stdout = where
     try:
         yield where
     finally:
-        sys.stdout = sys.__stdout__
+        sys.stdout = previous_stdout
 
 
 @contextlib.contextmanager
 def stderr_redirect(where):
+    previous_stderr = sys.stderr
     sys.stderr = where
     try:
         yield where
     finally:
-        sys.stderr = sys.__stderr__
+        sys.stderr = previous_stderr
 
 
 def alarm_handler(signum, frame):
@@ -167,13 +213,344 @@ def serialize_submission_artifact(value):
             return str(value)
 
 
-def download_and_extract_file(url, download_location):
+def get_cached_file_reference_path(cache_name):
+    return join(
+        EVALUATION_DATA_CACHE_DIR,
+        "references",
+        hashlib.sha256(cache_name.encode("utf-8")).hexdigest(),
+    )
+
+
+def get_cached_file_path(content_hash):
+    return join(EVALUATION_DATA_CACHE_DIR, "files", content_hash)
+
+
+def read_cached_file_reference(cache_name):
+    """
+    Returns the reference of a cached file, holding the hash of its content
+    and the validators of the response it was downloaded from, or None if
+    the file isn't cached.
+    """
+    try:
+        with open(get_cached_file_reference_path(cache_name)) as f:
+            reference = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.isfile(get_cached_file_path(reference["content_hash"])):
+        return None
+    return reference
+
+
+def write_cached_file_reference(cache_name, reference):
+    reference_path = get_cached_file_reference_path(cache_name)
+    fd, temporary_path = tempfile.mkstemp(
+        dir=os.path.dirname(reference_path), prefix="."
+    )
+    with os.fdopen(fd, "w") as f:
+        json.dump(reference, f)
+    os.replace(temporary_path, reference_path)
+
+
+def evict_cached_files(keep=None):
+    """
+    Remove the least recently used cached files until the cache fits in
+    EVALUATION_DATA_CACHE_MAX_SIZE.
+
+    Arguments:
+        keep {[str]} -- Path of a cached file which must not be removed
+    """
+    cached_files = []
+    for entry in os.scandir(join(EVALUATION_DATA_CACHE_DIR, "files")):
+        # Files being downloaded are hidden until they are complete
+        if entry.name.startswith("."):
+            continue
+        stat = entry.stat()
+        cached_files.append((stat.st_mtime, stat.st_size, entry.path))
+
+    cache_size = sum(size for _, size, _ in cached_files)
+    for _, size, path in sorted(cached_files):
+        if cache_size <= EVALUATION_DATA_CACHE_MAX_SIZE:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            # Already evicted by another worker on the host
+            pass
+        cache_size -= size
+
+
+def store_cached_file(response, cache_name):
+    """
+    Stream a response into the cache and return the path of the cached file.
+    """
+    fd, temporary_path = tempfile.mkstemp(
+        dir=join(EVALUATION_DATA_CACHE_DIR, "files"), prefix="."
+    )
+    content_hash = hashlib.sha256()
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                if chunk:
+                    f.write(chunk)
+                    content_hash.update(chunk)
+        cached_file_path = get_cached_file_path(content_hash.hexdigest())
+        os.replace(temporary_path, cached_file_path)
+    except Exception:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+
+    write_cached_file_reference(
+        cache_name,
+        {
+            "content_hash": content_hash.hexdigest(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        },
+    )
+    evict_cached_files(keep=cached_file_path)
+    return cached_file_path
+
+
+def link_cached_file(cached_file_path, download_location):
+    """
+    Hard link a cached file to where it's downloaded to, so that it isn't
+    copied. Falls back to copying it when the cache is on another
+    filesystem or the filesystem doesn't support hard links. A linked file
+    shares its content with the cache, so it's replaced rather than written
+    to.
+
+    Arguments:
+        cached_file_path {[str]} -- Path of the file in the cache
+        download_location {[str]} -- Path the file is linked to
+    """
+    try:
+        os.remove(download_location)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(cached_file_path, download_location)
+    except FileNotFoundError:
+        raise
+    except OSError:
+        shutil.copyfile(cached_file_path, download_location)
+
+
+def download_cached_file(url, cache_name, download_location):
+    """
+    Download a file through the evaluation data cache. A cached file is
+    revalidated with a conditional request, so an unchanged file is linked
+    from the cache without transferring its content again.
+
+    Arguments:
+        url {[str]} -- URL of the file
+        cache_name {[str]} -- Name identifying the file across URLs, e.g. its
+            storage name since presigned URLs change on every request
+        download_location {[str]} -- Path the file is linked to
+
+    Returns:
+        [bool] -- Whether the file was downloaded
+    """
+    create_dir(join(EVALUATION_DATA_CACHE_DIR, "files"))
+    create_dir(join(EVALUATION_DATA_CACHE_DIR, "references"))
+
+    reference = read_cached_file_reference(cache_name)
+    headers = {}
+    if reference is not None:
+        if reference.get("etag"):
+            headers["If-None-Match"] = reference["etag"]
+        if reference.get("last_modified"):
+            headers["If-Modified-Since"] = reference["last_modified"]
+    try:
+        response = requests.get(url, stream=True, headers=headers)
+        if response.status_code == 304:
+            cached_file_path = get_cached_file_path(reference["content_hash"])
+            try:
+                # Mark the file as recently used before linking it, so that
+                # other workers on the host don't evict it meanwhile
+                os.utime(cached_file_path)
+                link_cached_file(cached_file_path, download_location)
+                logger.info(
+                    "{} Using cached file {}".format(
+                        WORKER_LOGS_PREFIX, cache_name
+                    )
+                )
+                return True
+            except FileNotFoundError:
+                response = requests.get(url, stream=True)
+    except Exception as e:
+        logger.error(
+            "{} Failed to fetch file from {}, error {}".format(
+                WORKER_LOGS_PREFIX, url, e
+            )
+        )
+        return False
+
+    if response.status_code != 200:
+        return False
+    cached_file_path = store_cached_file(response, cache_name)
+    link_cached_file(cached_file_path, download_location)
+    return True
+
+
+def create_download_session(pool_size):
+    """
+    Returns a session reusing up to ``pool_size`` connections for the range
+    requests of a download.
+    """
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_response_content_md5(response):
+    """
+    Returns the MD5 of the file served by S3 according to the ETag of the
+    response, or None if the ETag isn't the MD5 of the content as it is for
+    multipart uploads and KMS encrypted objects.
+    """
+    if "x-amz-request-id" not in response.headers:
+        return None
+    if response.headers.get("x-amz-server-side-encryption") == "aws:kms":
+        return None
+    etag = response.headers.get("ETag", "").strip('"')
+    if re.fullmatch("[0-9a-f]{32}", etag):
+        return etag
+    return None
+
+
+def write_response_content(response, f):
+    """
+    Stream the content of a response into an open file and return its size.
+    """
+    size = 0
+    for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+        if chunk:
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+
+def download_file_range(session, url, download_location, start, end):
+    response = session.get(
+        url, headers={"Range": "bytes={}-{}".format(start, end)}, stream=True
+    )
+    if response.status_code != 206:
+        raise DownloadVerificationError(
+            "Range request for bytes {}-{} returned status {}".format(
+                start, end, response.status_code
+            )
+        )
+    with open(download_location, "r+b") as f:
+        f.seek(start)
+        size = write_response_content(response, f)
+    if size != end - start + 1:
+        raise DownloadVerificationError(
+            "Received {} bytes for bytes {}-{}".format(size, start, end)
+        )
+
+
+def verify_downloaded_file(download_location, size, content_md5):
+    if size is not None and os.path.getsize(download_location) != size:
+        raise DownloadVerificationError(
+            "Downloaded {} bytes instead of {}".format(
+                os.path.getsize(download_location), size
+            )
+        )
+    if content_md5 is None:
+        return
+    file_hash = hashlib.md5()
+    with open(download_location, "rb") as f:
+        for chunk in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b""):
+            file_hash.update(chunk)
+    if file_hash.hexdigest() != content_md5:
+        raise DownloadVerificationError(
+            "MD5 of the downloaded file is {} instead of {}".format(
+                file_hash.hexdigest(), content_md5
+            )
+        )
+
+
+def download_file_in_parts(url, download_location):
+    """
+    Download a file with parallel range requests of DOWNLOAD_PART_SIZE bytes.
+    The first part tells the size of the file, and a server which doesn't
+    support ranges sends the whole file in response to it instead. The
+    downloaded file is checked against the size and, for S3 objects, the MD5
+    of the file.
+
+    Arguments:
+        url {[str]} -- URL of the file
+        download_location {[str]} -- Path the file is downloaded to
+
+    Returns:
+        [bool] -- Whether the file was downloaded
+
+    Raises:
+        DownloadVerificationError -- If the downloaded file is incomplete
+    """
+    with create_download_session(DOWNLOAD_CONCURRENCY) as session:
+        response = session.get(
+            url,
+            headers={"Range": "bytes=0-{}".format(DOWNLOAD_PART_SIZE - 1)},
+            stream=True,
+        )
+        if response.status_code == 416:
+            # An empty file has no range to satisfy
+            response = session.get(url, stream=True)
+        if response.status_code not in (200, 206):
+            return False
+        content_md5 = get_response_content_md5(response)
+        with open(download_location, "wb") as f:
+            first_part_size = write_response_content(response, f)
+
+        file_size = None
+        if response.status_code == 206:
+            file_size = int(response.headers["Content-Range"].split("/")[-1])
+            parts = [
+                (start, min(start + DOWNLOAD_PART_SIZE, file_size) - 1)
+                for start in range(
+                    first_part_size, file_size, DOWNLOAD_PART_SIZE
+                )
+            ]
+            with futures.ThreadPoolExecutor(DOWNLOAD_CONCURRENCY) as executor:
+                list(
+                    executor.map(
+                        lambda part: download_file_range(
+                            session, url, download_location, *part
+                        ),
+                        parts,
+                    )
+                )
+    verify_downloaded_file(download_location, file_size, content_md5)
+    return True
+
+
+def download_and_extract_file(url, download_location, cache_name=None):
     """
     * Function to extract download a file.
     * `download_location` should include name of file as well.
+    * Files with a `cache_name` are downloaded through the evaluation data
+      cache, see `download_cached_file`, or without it if it can't be used.
+    * Other files are downloaded in parallel parts, see
+      `download_file_in_parts`.
     """
+    if cache_name is not None:
+        try:
+            download_cached_file(url, cache_name, download_location)
+            return
+        except Exception:
+            logger.exception(
+                "{} Failed to download {} through the evaluation data "
+                "cache".format(WORKER_LOGS_PREFIX, cache_name)
+            )
+
     try:
-        response = requests.get(url, stream=True)
+        download_file_in_parts(url, download_location)
     except Exception as e:
         logger.error(
             "{} Failed to fetch file from {}, error {}".format(
@@ -181,13 +558,9 @@ def download_and_extract_file(url, download_location):
             )
         )
         traceback.print_exc()
-        response = None
-
-    if response and response.status_code == 200:
-        with open(download_location, "wb") as f:
-            for chunk in response.iter_content(chunk_size=1024):
-                if chunk:
-                    f.write(chunk)
+        # Don't leave a partially downloaded file behind
+        if os.path.exists(download_location):
+            os.remove(download_location)
 
 
 def extract_zip_file(download_location, extract_location):
@@ -271,11 +644,33 @@ def delete_old_temp_directories(prefix="tmp"):
                 logger.info(f"Error deleting directory {dir_path}: {e}")
 
 
-def download_and_extract_zip_file(url, download_location, extract_location):
+def download_and_extract_zip_file(
+    url, download_location, extract_location, cache_name=None
+):
     """
     * Function to extract download a zip file, extract it and then removes the zip file.
     * `download_location` should include name of file as well.
+    * Zip files with a `cache_name` are downloaded through the evaluation data
+      cache, see `download_cached_file`, or without it if it can't be used.
     """
+    if cache_name is not None:
+        try:
+            is_downloaded = download_cached_file(
+                url, cache_name, download_location
+            )
+        except Exception:
+            logger.exception(
+                "{} Failed to download {} through the evaluation data "
+                "cache".format(WORKER_LOGS_PREFIX, cache_name)
+            )
+            return download_and_extract_zip_file(
+                url, download_location, extract_location
+            )
+        if is_downloaded:
+            extract_zip_file(download_location, extract_location)
+            delete_zip_file(download_location)
+        return
+
     try:
         response = requests.get(url, stream=True)
     except Exception as e:
@@ -288,7 +683,7 @@ def download_and_extract_zip_file(url, download_location, extract_location):
 
     if response and response.status_code == 200:
         with open(download_location, "wb") as f:
-            for chunk in response.iter_content(chunk_size=1024):
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
                 if chunk:
                     f.write(chunk)
         # extract zip file
@@ -414,7 +809,10 @@ def extract_challenge_data(challenge, phases):
         challenge_data_directory, "challenge_{}.zip".format(challenge.id)
     )
     download_and_extract_zip_file(
-        evaluation_script_url, challenge_zip_file, challenge_data_directory
+        evaluation_script_url,
+        challenge_zip_file,
+        challenge_data_directory,
+        cache_name=challenge.evaluation_script.name,
     )
 
     requirements_location = join(challenge_data_directory, "requirements.txt")
@@ -481,7 +879,11 @@ def extract_challenge_data(challenge, phases):
             phase_id=phase.id,
             annotation_file=annotation_file_name,
         )
-        download_and_extract_file(annotation_file_url, annotation_file_path)
+        download_and_extract_file(
+            annotation_file_url,
+            annotation_file_path,
+            cache_name=phase.test_annotation.name,
+        )
 
     try:
         # import the challenge after everything is finished
@@ -578,6 +980,54 @@ def extract_submission_data(submission_id):
     return submission
 
 
+def upload_submission_artifacts(submission, artifacts):
+    """
+    Upload the artifacts of a submission to storage concurrently without
+    saving the submission, which is saved once with the rest of its results.
+
+    Arguments:
+        submission {[Submission]} -- Submission the artifacts belong to
+        artifacts {[list]} -- (file field name, file name, content) tuples
+
+    Returns:
+        [list] -- Storage names of the uploaded artifacts
+    """
+    if not artifacts:
+        return []
+
+    uploads = {}
+    with futures.ThreadPoolExecutor(max_workers=len(artifacts)) as executor:
+        for field_name, file_name, content in artifacts:
+            field_file = getattr(submission, field_name)
+            # Upload paths may need the database, so they are built here
+            # rather than in the upload threads
+            name = field_file.field.generate_filename(submission, file_name)
+            future = executor.submit(
+                field_file.storage.save,
+                name,
+                ContentFile(content),
+                max_length=field_file.field.max_length,
+            )
+            uploads[future] = field_name
+
+    uploaded_artifact_names = []
+    for future, field_name in uploads.items():
+        try:
+            name = future.result()
+        except Exception:
+            logger.exception(
+                "{} Failed to upload {} for submission {}".format(
+                    SUBMISSION_LOGS_PREFIX, field_name, submission.id
+                )
+            )
+            continue
+        field_file = getattr(submission, field_name)
+        field_file.name = name
+        field_file._committed = True
+        uploaded_artifact_names.append(name)
+    return uploaded_artifact_names
+
+
 def run_submission(
     challenge_id, challenge_phase, submission, user_annotation_file_path
 ):
@@ -688,6 +1138,7 @@ def run_submission(
 
     # call `main` from globals and set `status` to running and hence
     # `started_at`
+    leaderboard_data_list = []
     try:
         successful_submission_flag = True
         with stdout_redirect(
@@ -736,40 +1187,35 @@ def run_submission(
                 error_bars_dict[split_code_name] = split_error[split_code_name]
 
         if "result" in submission_output:
+            # Load every split of the phase at once instead of one per result
+            challenge_phase_splits = {
+                challenge_phase_split.dataset_split.codename: (
+                    challenge_phase_split
+                )
+                for challenge_phase_split in (
+                    ChallengePhaseSplit.objects.select_related(
+                        "dataset_split", "leaderboard"
+                    ).filter(challenge_phase=challenge_phase)
+                )
+            }
 
-            leaderboard_data_list = []
             for split_result in submission_output["result"]:
                 # get split_code_name that is the key of the result
                 split_code_name = list(split_result.keys())[0]
 
                 # Check if the challenge_phase_split exists for the
                 # challenge_phase and dataset_split
-                try:
-                    challenge_phase_split = ChallengePhaseSplit.objects.get(
-                        challenge_phase=challenge_phase,
-                        dataset_split__codename=split_code_name,
-                    )
-                except Exception:
+                challenge_phase_split = challenge_phase_splits.get(
+                    split_code_name
+                )
+                if challenge_phase_split is None:
                     stderr.write(
                         "ORGINIAL EXCEPTION: No such relation between Challenge Phase and DatasetSplit"
                         " specified by Challenge Host \n"
                     )
-                    stderr.write(traceback.format_exc())
-                    successful_submission_flag = False
-                    break
-
-                # Check if the dataset_split exists for the codename in the
-                # result
-                try:
-                    dataset_split = challenge_phase_split.dataset_split
-                except Exception:
-                    stderr.write(
-                        "ORGINIAL EXCEPTION: The codename specified by your Challenge Host doesn't match"
-                        " with that in the evaluation Script.\n"
-                    )
-                    stderr.write(traceback.format_exc())
                     successful_submission_flag = False
                     break
+                dataset_split = challenge_phase_split.dataset_split
 
                 leaderboard_data = LeaderboardData()
                 leaderboard_data.challenge_phase_split = challenge_phase_split
@@ -789,12 +1235,6 @@ def run_submission(
 
                 leaderboard_data_list.append(leaderboard_data)
 
-            if successful_submission_flag and leaderboard_data_list:
-                LeaderboardData.objects.filter(submission=submission).update(
-                    is_disabled=True
-                )
-                LeaderboardData.objects.bulk_create(leaderboard_data_list)
-
         # Once the submission_output is processed, then save the submission
         # object with appropriate status
         else:
@@ -813,41 +1253,38 @@ def run_submission(
         if successful_submission_flag
         else Submission.FAILED
     )
-    submission.status = submission_status
-    submission.completed_at = timezone.now()
-    submission.save()
 
     # Always close redirected handles before reading temp log files.
     stdout.close()
     stderr.close()
 
-    # Persist stdout/stderr BEFORE result/metadata artifacts. Serialization of
-    # evaluate() return values (dict metadata without dumps, numpy scalars,
-    # etc.) or retention-tagging failures used to raise here and skip logs,
-    # leaving users with finished/failed submissions and empty file fields.
+    # Results are persisted in a single stage: the artifacts are uploaded
+    # concurrently, then the status, output, artifacts and leaderboard data
+    # are saved in one transaction. Failing to build or upload an artifact
+    # only loses that artifact.
+    log_submission_artifact_upload_context(
+        submission, "submission_worker.run_submission.before_artifacts"
+    )
+    artifacts = []
     if not challenge_phase.disable_logs:
         try:
-            log_submission_artifact_upload_context(
-                submission,
-                "submission_worker.run_submission.before_stdout_stderr",
-            )
             with open(stdout_file, "r") as stdout_fh:
-                stdout_content = stdout_fh.read().encode("utf-8")
-                submission.stdout_file.save(
-                    "stdout.txt", ContentFile(stdout_content)
+                artifacts.append(
+                    (
+                        "stdout_file",
+                        "stdout.txt",
+                        stdout_fh.read().encode("utf-8"),
+                    )
                 )
             if submission_status == Submission.FAILED:
                 with open(stderr_file, "r") as stderr_fh:
-                    stderr_content = stderr_fh.read().encode("utf-8")
-                    submission.stderr_file.save(
-                        "stderr.txt", ContentFile(stderr_content)
+                    artifacts.append(
+                        (
+                            "stderr_file",
+                            "stderr.txt",
+                            stderr_fh.read().encode("utf-8"),
+                        )
                     )
-            artifact_paths = [submission.stdout_file.name]
-            if submission.stderr_file.name:
-                artifact_paths.append(submission.stderr_file.name)
-            enqueue_submission_artifact_retention_tagging(
-                submission, artifact_paths
-            )
         except Exception:
             logger.exception(
                 "{} Failed to persist stdout/stderr for submission {}".format(
@@ -855,17 +1292,10 @@ def run_submission(
                 )
             )
 
-    # Persist result/metadata after logs so serialization or tagging failures
-    # cannot drop stdout/stderr for participants.
     if submission_output and successful_submission_flag:
         try:
-            log_submission_artifact_upload_context(
-                submission,
-                "submission_worker.run_submission.before_result_files",
-            )
             output = {}
             output["result"] = submission_output.get("result", "")
-            submission.output = output
 
             # Preserve historical json.dumps for submission_result (including
             # string values). default=str covers numpy scalars and similar.
@@ -878,24 +1308,64 @@ def run_submission(
             submission_metadata = serialize_submission_artifact(
                 submission_output.get("submission_metadata", "")
             )
-
-            submission.submission_result_file.save(
-                "submission_result.json", ContentFile(submission_result)
+            submission.output = output
+            artifacts.append(
+                (
+                    "submission_result_file",
+                    "submission_result.json",
+                    submission_result,
+                )
+            )
+            artifacts.append(
+                (
+                    "submission_metadata_file",
+                    "submission_metadata.json",
+                    submission_metadata,
+                )
             )
-            submission.submission_metadata_file.save(
-                "submission_metadata.json", ContentFile(submission_metadata)
+        except Exception:
+            logger.exception(
+                "{} Failed to persist result/metadata for submission {}".format(
+                    SUBMISSION_LOGS_PREFIX, submission.id
+                )
             )
+
+    artifact_paths = upload_submission_artifacts(submission, artifacts)
+
+    submission.status = submission_status
+    submission.completed_at = timezone.now()
+    try:
+        with transaction.atomic():
+            if successful_submission_flag and leaderboard_data_list:
+                LeaderboardData.objects.filter(submission=submission).update(
+                    is_disabled=True
+                )
+                LeaderboardData.objects.bulk_create(leaderboard_data_list)
             submission.save()
+    except Exception:
+        logger.exception(
+            "{} Failed to save the results of submission {}".format(
+                SUBMISSION_LOGS_PREFIX, submission.id
+            )
+        )
+        Submission.objects.filter(pk=submission.pk).update(
+            status=Submission.FAILED,
+            completed_at=submission.completed_at,
+            modified_at=timezone.now(),
+        )
+        # Queryset updates skip the signals keeping the counts in step
+        invalidate_submission_counts(
+            submission.challenge_phase_id, submission.participant_team_id
+        )
+
+    if artifact_paths:
+        try:
             enqueue_submission_artifact_retention_tagging(
-                submission,
-                [
-                    submission.submission_result_file.name,
-                    submission.submission_metadata_file.name,
-                ],
+                submission, artifact_paths
             )
         except Exception:
             logger.exception(
-                "{} Failed to persist result/metadata for submission {}".format(
+                "{} Failed to tag the artifacts of submission {}".format(
                     SUBMISSION_LOGS_PREFIX, submission.id
                 )
             )
@@ -1026,6 +1496,239 @@ def load_challenge_and_return_max_submissions(q_params):
     return maximum_concurrent_submissions, challenge
 
 
+class SubmissionEvaluationSlots(object):
+    """
+    Concurrency slots of the submissions evaluated by the worker. A local
+    semaphore bounds the evaluations of the worker itself and, for a
+    challenge limiting its running submissions, a lease in the database
+    bounds the evaluations across all the workers of the challenge. A
+    heartbeat thread keeps the leases alive while submissions are evaluated,
+    so the slots of a worker which dies are reclaimed once its leases lapse.
+    """
+
+    def __init__(
+        self, size, challenge=None, maximum_concurrent_submissions=None
+    ):
+        if challenge is not None:
+            size = min(size, maximum_concurrent_submissions)
+        self.worker_id = "{}:{}:{}".format(
+            socket.gethostname(), os.getpid(), uuid.uuid4().hex
+        )
+        self.challenge = challenge
+        self.maximum_concurrent_submissions = maximum_concurrent_submissions
+        self.semaphore = threading.BoundedSemaphore(size)
+        self.leases = {}
+        self.stopped = threading.Event()
+        self.heartbeat_thread = None
+
+    def acquire(self, message):
+        """
+        Take a slot for evaluating the submission of a message.
+
+        Returns:
+            [bool] -- Whether a slot was free
+        """
+        if not self.semaphore.acquire(blocking=False):
+            return False
+        if self.challenge is None:
+            self.leases[message] = None
+            return True
+        try:
+            lease = acquire_submission_evaluation_lease(
+                self.challenge,
+                self.maximum_concurrent_submissions,
+                self.worker_id,
+                submission_pk=json.loads(message.body).get("submission_pk"),
+            )
+        except Exception:
+            self.semaphore.release()
+            raise
+        if lease is None:
+            self.semaphore.release()
+            return False
+        self.leases[message] = lease
+        return True
+
+    def release(self, message):
+        lease = self.leases.pop(message)
+        try:
+            if lease is not None:
+                release_submission_evaluation_lease(lease)
+        finally:
+            self.semaphore.release()
+
+    def send_heartbeats(self):
+        interval = get_submission_evaluation_lease_timeout() / 3
+        while not self.stopped.wait(interval):
+            if not self.leases:
+                continue
+            try:
+                renew_submission_evaluation_leases(self.worker_id)
+            except Exception:
+                logger.exception(
+                    "{} Failed to renew the evaluation leases of worker "
+                    "{}".format(WORKER_LOGS_PREFIX, self.worker_id)
+                )
+            finally:
+                django.db.connection.close()
+
+    def start_heartbeat(self):
+        if self.challenge is None:
+            return
+        self.heartbeat_thread = threading.Thread(
+            target=self.send_heartbeats, daemon=True
+        )
+        self.heartbeat_thread.start()
+
+    def stop_heartbeat(self):
+        self.stopped.set()
+        if self.heartbeat_thread is not None:
+            self.heartbeat_thread.join()
+
+
+# Database connections inherited by an evaluation process from the worker,
+# kept referenced so that they are never closed from the process
+_inherited_database_connections = []
+
+
+def close_inherited_database_connections():
+    """
+    Runs in each evaluation process once it is forked, which only happens
+    at the first submissions handed to the pool, after the worker queried
+    the database. The process opens its own connections instead of sharing
+    the worker's. Those are detached rather than closed, since closing them
+    would also end the sessions of the worker.
+    """
+    for connection in django.db.connections.all():
+        if connection.connection is not None:
+            _inherited_database_connections.append(connection.connection)
+            connection.connection = None
+    django.db.connections.close_all()
+
+
+def create_submission_evaluation_pool(concurrency):
+    """
+    Creates the process pool submissions are evaluated in. Processes are
+    forked so that they share the evaluation scripts already loaded by the
+    worker, and each one captures the stdout/stderr of the single submission
+    it is evaluating.
+    """
+    return futures.ProcessPoolExecutor(
+        max_workers=concurrency,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=close_inherited_database_connections,
+    )
+
+
+def complete_submission_evaluations(
+    in_flight_evaluations, done_evaluations, evaluation_slots
+):
+    for future in done_evaluations:
+        message = in_flight_evaluations.pop(future)
+        evaluation_slots.release(message)
+        try:
+            future.result()
+        except Exception:
+            # The message is left on the queue to be evaluated again once it
+            # becomes visible, as it is when the worker itself crashes
+            logger.exception(
+                "{} Evaluation process failed for message body: {}".format(
+                    WORKER_LOGS_PREFIX, message.body
+                )
+            )
+            continue
+        # Let the queue know that the message is processed
+        message.delete()
+
+
+def evaluate_submissions_concurrently(
+    queue,
+    killer,
+    concurrency,
+    challenge=None,
+    maximum_concurrent_submissions=None,
+):
+    """
+    Evaluates up to ``concurrency`` submissions at the same time. The queue
+    is long polled without pausing for as long as there is a free process,
+    and messages are deleted once their evaluation finished.
+
+    Arguments:
+        queue {[SQS Queue]} -- Queue submission messages are received from
+        killer {[GracefulKiller]} -- Tells when the worker has to stop
+        concurrency {[int]} -- Number of evaluation processes
+        challenge {[Challenge]} -- Challenge whose running submissions are
+            limited to ``maximum_concurrent_submissions``, if any
+        maximum_concurrent_submissions {[int]} -- Running submissions limit
+    """
+    in_flight_evaluations = {}
+    evaluation_slots = SubmissionEvaluationSlots(
+        concurrency,
+        challenge=challenge,
+        maximum_concurrent_submissions=maximum_concurrent_submissions,
+    )
+    executor = create_submission_evaluation_pool(concurrency)
+    evaluation_slots.start_heartbeat()
+    try:
+        while not killer.kill_now:
+            done_evaluations = [
+                future for future in in_flight_evaluations if future.done()
+            ]
+            complete_submission_evaluations(
+                in_flight_evaluations, done_evaluations, evaluation_slots
+            )
+            free_processes = concurrency - len(in_flight_evaluations)
+            if free_processes <= 0:
+                futures.wait(
+                    list(in_flight_evaluations),
+                    timeout=20,
+                    return_when=futures.FIRST_COMPLETED,
+                )
+                continue
+
+            messages = queue.receive_messages(
+                WaitTimeSeconds=20,
+                MaxNumberOfMessages=min(free_processes, 10),
+            )
+            is_at_capacity = False
+            for message in messages:
+                if json.loads(message.body).get(
+                    "is_static_dataset_code_upload_submission"
+                ):
+                    continue
+                if not evaluation_slots.acquire(message):
+                    is_at_capacity = True
+                    continue
+                logger.info(
+                    "{} Processing message body: {}".format(
+                        WORKER_LOGS_PREFIX, message.body
+                    )
+                )
+                future = executor.submit(
+                    process_submission_callback, message.body
+                )
+                in_flight_evaluations[future] = message
+            if is_at_capacity and in_flight_evaluations:
+                futures.wait(
+                    list(in_flight_evaluations),
+                    timeout=60,
+                    return_when=futures.FIRST_COMPLETED,
+                )
+            elif is_at_capacity or (
+                not messages and not in_flight_evaluations
+            ):
+                time.sleep(60)
+
+        # Let the running evaluations finish before the worker quits
+        done_evaluations, _ = futures.wait(list(in_flight_evaluations))
+        complete_submission_evaluations(
+            in_flight_evaluations, done_evaluations, evaluation_slots
+        )
+    finally:
+        executor.shutdown(wait=True)
+        evaluation_slots.stop_heartbeat()
+
+
 def main():
     killer = GracefulKiller()
     logger.info(
@@ -1082,53 +1785,47 @@ def main():
     create_dir_as_python_package(SUBMISSION_DATA_BASE_DIR)
     queue_name = os.environ.get("CHALLENGE_QUEUE", "evalai_submission_queue")
     queue = get_or_create_sqs_queue(queue_name, challenge)
-    while True:
-        for message in queue.receive_messages(WaitTimeSeconds=20):
-            if json.loads(message.body).get(
-                "is_static_dataset_code_upload_submission"
-            ):
-                continue
-            if settings.DEBUG or settings.TEST:
-                if eval(LIMIT_CONCURRENT_SUBMISSION_PROCESSING):
-                    current_running_submissions_count = (
-                        Submission.objects.filter(
-                            challenge_phase__challenge=challenge.id,
-                            status="running",
-                        ).count()
-                    )
-                    if (
-                        current_running_submissions_count
-                        == maximum_concurrent_submissions
-                    ):
-                        pass
-                    else:
-                        logger.info(
-                            "{} Processing message body: {}".format(
-                                WORKER_LOGS_PREFIX, message.body
-                            )
-                        )
-                        process_submission_callback(message.body)
-                        # Let the queue know that the message is processed
-                        message.delete()
-                else:
-                    logger.info(
-                        "{} Processing message body: {}".format(
-                            WORKER_LOGS_PREFIX, message.body
-                        )
-                    )
-                    process_submission_callback(message.body)
-                    # Let the queue know that the message is processed
-                    message.delete()
-            else:
-                current_running_submissions_count = Submission.objects.filter(
-                    challenge_phase__challenge=challenge.id, status="running"
-                ).count()
-                if (
-                    current_running_submissions_count
-                    == maximum_concurrent_submissions
+    if SUBMISSION_EVALUATION_CONCURRENCY > 1:
+        if not (settings.DEBUG or settings.TEST) or eval(
+            LIMIT_CONCURRENT_SUBMISSION_PROCESSING
+        ):
+            evaluate_submissions_concurrently(
+                queue,
+                killer,
+                SUBMISSION_EVALUATION_CONCURRENCY,
+                challenge=challenge,
+                maximum_concurrent_submissions=maximum_concurrent_submissions,
+            )
+        else:
+            evaluate_submissions_concurrently(
+                queue, killer, SUBMISSION_EVALUATION_CONCURRENCY
+            )
+        return
+
+    if not (settings.DEBUG or settings.TEST) or eval(
+        LIMIT_CONCURRENT_SUBMISSION_PROCESSING
+    ):
+        evaluation_slots = SubmissionEvaluationSlots(
+            1,
+            challenge=challenge,
+            maximum_concurrent_submissions=maximum_concurrent_submissions,
+        )
+    else:
+        evaluation_slots = SubmissionEvaluationSlots(1)
+    evaluation_slots.start_heartbeat()
+    try:
+        while True:
+            messages = queue.receive_messages(WaitTimeSeconds=20)
+            has_evaluated_submission = False
+            for message in messages:
+                if json.loads(message.body).get(
+                    "is_static_dataset_code_upload_submission"
                 ):
-                    pass
-                else:
+                    continue
+                if not evaluation_slots.acquire(message):
+                    continue
+                has_evaluated_submission = True
+                try:
                     logger.info(
                         "{} Processing message body: {}".format(
                             WORKER_LOGS_PREFIX, message.body
@@ -1137,9 +1834,17 @@ def main():
                     process_submission_callback(message.body)
                     # Let the queue know that the message is processed
                     message.delete()
-        if killer.kill_now:
-            break
-        time.sleep(60)
+                finally:
+                    evaluation_slots.release(message)
+            if killer.kill_now:
+                break
+            # Keep long polling without a pause while submissions are being
+            # evaluated, and back off when none could be, e.g. when the
+            # challenge is running as many submissions as it allows
+            if not has_evaluated_submission:
+                time.sleep(60)
+    finally:
+        evaluation_slots.stop_heartbeat()
 
 
 if __name__ == "__main__":
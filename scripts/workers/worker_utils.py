@@ -2,12 +2,17 @@ import logging
 
 import requests
 
+from .http_client import get_http_client
+
 logger = logging.getLogger(__name__)
 
 
 URLS = {
     "get_message_from_sqs_queue": "/api/jobs/challenge/queues/{}/",
     "delete_message_from_sqs_queue": "/api/jobs/queues/{}/",
+    "get_messages_from_sqs_queue": "/api/jobs/challenge/queues/{}/messages/?max_messages={}&wait_time={}",
+    "delete_messages_from_sqs_queue": "/api/jobs/queues/{}/messages/delete/",
+    "change_messages_visibility": "/api/jobs/queues/{}/messages/visibility/",
     "get_submission_by_pk": "/api/jobs/submission/{}",
     "get_challenge_phases_by_challenge_pk": "/api/challenges/{}/phases/",
     "get_challenge_by_queue_name": "/api/challenges/challenge/queues/{}/",
@@ -23,6 +28,7 @@ class EvalAI_Interface:
         self.AUTH_TOKEN = AUTH_TOKEN
         self.EVALAI_API_SERVER = EVALAI_API_SERVER
         self.QUEUE_NAME = QUEUE_NAME
+        self.http_client = get_http_client()
 
     def get_request_headers(self):
         headers = {"Authorization": "Bearer {}".format(self.AUTH_TOKEN)}
@@ -31,7 +37,7 @@ class EvalAI_Interface:
     def make_request(self, url, method, data=None):
         headers = self.get_request_headers()
         try:
-            response = requests.request(
+            response = self.http_client.request(
                 method=method, url=url, headers=headers, data=data
             )
             response.raise_for_status()
@@ -60,6 +66,37 @@ class EvalAI_Interface:
         response = self.make_request(url, "POST", data)  # noqa
         return response
 
+    def get_messages_from_sqs_queue(
+        self, max_messages=10, wait_time=20, visibility_timeout=None
+    ):
+        url = URLS.get("get_messages_from_sqs_queue").format(
+            self.QUEUE_NAME, max_messages, wait_time
+        )
+        if visibility_timeout is not None:
+            url = "{}&visibility_timeout={}".format(url, visibility_timeout)
+        url = self.return_url_per_environment(url)
+        response = self.make_request(url, "GET")
+        return response
+
+    def delete_messages_from_sqs_queue(self, receipt_handles):
+        url = URLS.get("delete_messages_from_sqs_queue").format(
+            self.QUEUE_NAME
+        )
+        url = self.return_url_per_environment(url)
+        data = {"receipt_handles": receipt_handles}
+        response = self.make_request(url, "POST", data)
+        return response
+
+    def change_messages_visibility(self, receipt_handles, visibility_timeout):
+        url = URLS.get("change_messages_visibility").format(self.QUEUE_NAME)
+        url = self.return_url_per_environment(url)
+        data = {
+            "receipt_handles": receipt_handles,
+            "visibility_timeout": visibility_timeout,
+        }
+        response = self.make_request(url, "POST", data)
+        return response
+
     def get_submission_by_pk(self, submission_pk):
         url = URLS.get("get_submission_by_pk").format(submission_pk)
         url = self.return_url_per_environment(url)
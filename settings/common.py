@@ -164,6 +164,68 @@ SITE_ID = 1
 # Maximum number of leaderboard rows to load per query (prevents slow queries)
 MAX_LEADERBOARD_QUERY_LIMIT = 10000
 
+# Seconds a ranked leaderboard stays cached. Rankings are updated as
+# submissions change, this only bounds how long a missed update can linger.
+LEADERBOARD_RANKING_CACHE_TIMEOUT = 60 * 60
+
+# Select the best entry of every team in the database with DISTINCT ON
+# instead of loading up to MAX_LEADERBOARD_QUERY_LIMIT rows and ranking them
+# in Python
+LEADERBOARD_RANKING_IN_DATABASE = False
+
+# Seconds a response of a challenge read endpoint stays cached. Responses are
+# invalidated when the challenge changes, this bounds how stale lists filtered
+# by the current time can get.
+CHALLENGE_RESPONSE_CACHE_TIMEOUT = 60
+
+# Seconds the submission analytics of a challenge stay cached, so polling
+# host dashboards share one aggregation query per challenge
+ANALYTICS_CACHE_TIMEOUT = 60
+
+# Upper bounds in seconds of the execution time histogram buckets kept in
+# the daily submission rollups
+SUBMISSION_ROLLUP_EXECUTION_TIME_BUCKETS = (
+    60,
+    5 * 60,
+    15 * 60,
+    60 * 60,
+    4 * 60 * 60,
+    24 * 60 * 60,
+)
+
+# Seconds after its last heartbeat an evaluation lease of a submission worker
+# lapses, freeing the slot of a worker which died mid-evaluation
+SUBMISSION_EVALUATION_LEASE_TIMEOUT = 5 * 60
+
+# Seconds the submission counts of a team for a challenge phase stay cached.
+# Counters are updated as submissions are made or change status, this bounds
+# how long counts changed by bulk queryset updates can be off.
+SUBMISSION_QUOTA_CACHE_TIMEOUT = 10 * 60
+
+# Seconds the challenge and phase a submission is made to stay cached. Entries
+# are keyed by the challenge version, so any saved change invalidates them.
+SUBMISSION_ELIGIBILITY_CACHE_TIMEOUT = 60
+
+# Number of submissions read from the database at a time while exporting the
+# submissions of a challenge phase as CSV
+SUBMISSION_EXPORT_CHUNK_SIZE = 2000
+
+# Size of the parts submission files given by URL are streamed to S3 in, at
+# most one part of a file is held in a Celery worker's memory
+SUBMISSION_URL_UPLOAD_PART_SIZE = 64 * 1024 * 1024
+
+# Most worker log events returned by one request for the worker logs of a
+# challenge, later events are fetched with the returned cursor
+WORKER_LOGS_MAX_EVENTS = 1000
+
+# Seconds of worker logs first read back for a request without a cursor,
+# earlier logs are only read when too few events were logged in that time
+WORKER_LOGS_INITIAL_WINDOW = 5 * 60
+
+# Seconds a page of worker log events stays cached, so hosts polling the
+# logs of a challenge with the same cursor share one CloudWatch query
+WORKER_LOGS_CACHE_TIMEOUT = 5
+
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": (
         "rest_framework.pagination.LimitOffsetPagination"
@@ -222,6 +284,10 @@ AWS_SECRET_ACCESS_KEY = os.environ.get(
 )
 AWS_REGION = os.environ.get("AWS_DEFAULT_REGION", "us-east-1")
 
+# Reuse boto3 clients and resources created for the same region, endpoint and
+# credentials instead of building new ones for every AWS call
+AWS_CLIENT_CACHE_ENABLED = True
+
 # Broker url for celery
 CELERY_BROKER_URL = "sqs://%s:%s@" % (AWS_ACCESS_KEY_ID, AWS_SECRET_ACCESS_KEY)
 
@@ -258,6 +324,10 @@ CELERY_BEAT_SCHEDULE = {
         # to "America/Los_Angeles" if year-round 10:30 Pacific is required.
         "schedule": crontab(hour=18, minute=30),
     },
+    "update-submission-rollups": {
+        "task": "analytics.tasks.update_submission_rollups",
+        "schedule": datetime.timedelta(minutes=15),
+    },
 }
 
 # CORS Settings
@@ -628,3 +698,11 @@ EKS_NODEGROUP_SYNC_MAX_RETRIES = 20
 
 # SQS Queue Message Retention Period
 SQS_RETENTION_PERIOD = "345600"
+
+# Seconds the URL of an SQS queue stays cached, saving a GetQueueUrl call
+# every time a queue is used
+SQS_QUEUE_URL_CACHE_TIMEOUT = 5 * 60
+
+# Longest a worker can long poll a submission queue for when fetching a batch
+# of messages, each poll holds an API worker for up to that many seconds
+SQS_MAX_WAIT_TIME_SECONDS = 20
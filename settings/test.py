@@ -29,4 +29,7 @@ CACHES = {
 
 TEST = True
 
+# Tests patch boto3, clients must not be shared between them
+AWS_CLIENT_CACHE_ENABLED = False
+
 MEDIAFILES_LOCATION = "media"
@@ -0,0 +1,189 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from analytics.models import SubmissionDailyRollup
+from analytics.tasks import update_submission_rollups
+from analytics.utils import (
+    count_challenge_submissions,
+    get_submission_rollup_time_series,
+    get_submission_rollup_watermark,
+)
+from challenges.models import Challenge, ChallengePhase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from hosts.models import ChallengeHostTeam
+from jobs.models import Submission
+from participants.models import ParticipantTeam
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    SUBMISSION_ROLLUP_EXECUTION_TIME_BUCKETS=(60, 3600),
+)
+class UpdateSubmissionRollupsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            username="someuser",
+            email="user@test.com",
+            password="secret_password",
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.user
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        self.challenge_phase = ChallengePhase.objects.create(
+            name="Challenge Phase",
+            description="Description for Challenge Phase",
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            challenge=self.challenge,
+            max_submissions_per_day=100,
+            max_submissions_per_month=100,
+            max_submissions=100,
+        )
+        self.participant_team = ParticipantTeam.objects.create(
+            team_name="Participant Team", created_by=self.user
+        )
+        self.today = timezone.localdate()
+
+    def create_submission(self, days_ago=0, execution_time=None):
+        submission = Submission.objects.create(
+            participant_team=self.participant_team,
+            challenge_phase=self.challenge_phase,
+            created_by=self.user,
+            status=Submission.SUBMITTED,
+            input_file=SimpleUploadedFile(
+                "submission.json", b"{}", content_type="application/json"
+            ),
+        )
+        submitted_at = timezone.now() - timedelta(days=days_ago)
+        updates = {"submitted_at": submitted_at}
+        if execution_time is not None:
+            updates.update(
+                status=Submission.FINISHED,
+                started_at=submitted_at,
+                completed_at=submitted_at + timedelta(seconds=execution_time),
+            )
+        Submission.objects.filter(pk=submission.pk).update(**updates)
+        return submission
+
+    def test_rollups_are_computed_per_day_and_status(self):
+        self.create_submission(days_ago=3, execution_time=30)
+        self.create_submission(days_ago=3, execution_time=600)
+        self.create_submission(days_ago=3)
+        self.create_submission()
+
+        update_submission_rollups()
+
+        finished_rollup = SubmissionDailyRollup.objects.get(
+            challenge_phase=self.challenge_phase,
+            day=self.today - timedelta(days=3),
+            status=Submission.FINISHED,
+        )
+        self.assertEqual(finished_rollup.submission_count, 2)
+        self.assertEqual(
+            finished_rollup.execution_time_histogram,
+            {"60": 1, "3600": 2, "+Inf": 2},
+        )
+        self.assertEqual(
+            SubmissionDailyRollup.objects.get(
+                day=self.today, status=Submission.SUBMITTED
+            ).submission_count,
+            1,
+        )
+        self.assertIsNotNone(get_submission_rollup_watermark())
+
+    def test_changed_submissions_update_their_day(self):
+        submission = self.create_submission(days_ago=3)
+        update_submission_rollups()
+
+        submission.refresh_from_db()
+        submission.status = Submission.FAILED
+        submission.save()
+        update_submission_rollups()
+
+        self.assertEqual(
+            list(
+                SubmissionDailyRollup.objects.values_list(
+                    "status", "submission_count"
+                )
+            ),
+            [(Submission.FAILED, 1)],
+        )
+
+    @patch(
+        "jobs.models.transaction.on_commit",
+        side_effect=lambda callback: callback(),
+    )
+    def test_deleted_submissions_update_their_day(self, mock_on_commit):
+        self.create_submission(days_ago=3)
+        submission = self.create_submission(days_ago=3)
+        update_submission_rollups()
+
+        Submission.objects.get(pk=submission.pk).delete()
+
+        self.assertEqual(
+            SubmissionDailyRollup.objects.get(
+                day=self.today - timedelta(days=3)
+            ).submission_count,
+            1,
+        )
+        self.assertEqual(count_challenge_submissions(self.challenge), 1)
+
+    def test_watermark_survives_cache_eviction(self):
+        self.create_submission(days_ago=3)
+        update_submission_rollups()
+        watermark = get_submission_rollup_watermark()
+
+        cache.clear()
+
+        self.assertEqual(get_submission_rollup_watermark(), watermark)
+
+    def test_count_adds_submissions_made_since_last_update(self):
+        self.create_submission(days_ago=3)
+        self.create_submission(days_ago=40)
+        update_submission_rollups()
+        self.create_submission()
+
+        self.assertEqual(count_challenge_submissions(self.challenge), 3)
+        self.assertEqual(
+            count_challenge_submissions(
+                self.challenge, timezone.now() - timedelta(days=7)
+            ),
+            2,
+        )
+
+    def test_time_series_merges_statuses_of_a_day(self):
+        self.create_submission(days_ago=1, execution_time=30)
+        self.create_submission(days_ago=1)
+        update_submission_rollups()
+
+        time_series = get_submission_rollup_time_series(
+            self.challenge, self.today - timedelta(days=7), self.today
+        )
+
+        self.assertEqual(len(time_series), 1)
+        self.assertEqual(time_series[0]["day"], self.today - timedelta(days=1))
+        self.assertEqual(time_series[0]["submission_count"], 2)
+        self.assertEqual(
+            time_series[0]["status_count"],
+            {Submission.FINISHED: 1, Submission.SUBMITTED: 1},
+        )
+        self.assertEqual(time_series[0]["execution_time_histogram"]["+Inf"], 1)
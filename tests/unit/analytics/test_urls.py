@@ -55,3 +55,25 @@ class TestStringMethods(BaseAPITestClass):
                 self.challenge.pk
             ),
         )
+
+    def test_get_challenge_submission_analysis_url(self):
+        url = reverse_lazy(
+            "analytics:get_challenge_submission_analysis",
+            kwargs={"challenge_pk": self.challenge.pk},
+        )
+        self.assertEqual(
+            str(url),
+            "/api/analytics/challenge/{0}/analytics".format(self.challenge.pk),
+        )
+
+    def test_get_submission_time_series_url(self):
+        url = reverse_lazy(
+            "analytics:get_submission_time_series",
+            kwargs={"challenge_pk": self.challenge.pk},
+        )
+        self.assertEqual(
+            str(url),
+            "/api/analytics/challenge/{0}/submission/time_series".format(
+                self.challenge.pk
+            ),
+        )
@@ -5,10 +5,13 @@ import shutil
 from datetime import timedelta
 
 from allauth.account.models import EmailAddress
+from analytics.models import SubmissionDailyRollup
 from challenges.models import Challenge, ChallengePhase
 from challenges.utils import get_challenge_model
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import override_settings
 from django.urls import reverse_lazy
 from django.utils import timezone
 from hosts.models import ChallengeHost, ChallengeHostTeam
@@ -18,6 +21,11 @@ from participants.serializers import ChallengeParticipantSerializer
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
 
 class BaseAPITestClass(APITestCase):
     def setUp(self):
@@ -692,6 +700,135 @@ class ChallengePhaseSubmissionAnalyticsTest(BaseAPITestClass):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
 
+@override_settings(CACHES=LOCMEM_CACHES)
+class ChallengeSubmissionAnalysisTest(ChallengePhaseSubmissionAnalyticsTest):
+    def setUp(self):
+        super(ChallengeSubmissionAnalysisTest, self).setUp()
+        cache.clear()
+        self.url = reverse_lazy(
+            "analytics:get_challenge_submission_analysis",
+            kwargs={"challenge_pk": self.challenge.pk},
+        )
+
+    def test_get_challenge_submission_analysis(self):
+        Submission.objects.filter(pk=self.submission1.pk).update(
+            is_flagged=True
+        )
+        Submission.objects.filter(pk=self.submission2.pk).update(
+            is_public=False,
+            submitted_at=timezone.now() - timedelta(days=10),
+        )
+        Submission.objects.filter(
+            pk__in=[self.submission5.pk, self.submission6.pk]
+        ).update(status=Submission.FINISHED)
+
+        with self.assertNumQueries(4):
+            response = self.client.get(self.url, {})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["challenge"], self.challenge.pk)
+        challenge_phase_analytics = response.data["challenge_phases"][0]
+        self.assertEqual(
+            challenge_phase_analytics["challenge_phase"],
+            self.challenge_phase.pk,
+        )
+        self.assertEqual(challenge_phase_analytics["total_submissions"], 7)
+        self.assertEqual(
+            challenge_phase_analytics["participant_team_count"], 2
+        )
+        self.assertEqual(
+            challenge_phase_analytics["flagged_submissions_count"], 1
+        )
+        self.assertEqual(
+            challenge_phase_analytics["public_submissions_count"], 6
+        )
+        self.assertEqual(
+            challenge_phase_analytics["status_count"]["finished"], 2
+        )
+        self.assertEqual(
+            challenge_phase_analytics["status_count"]["submitted"], 5
+        )
+        self.assertEqual(
+            challenge_phase_analytics["daily_submissions_count"], 6
+        )
+        self.assertEqual(
+            challenge_phase_analytics["monthly_submissions_count"], 7
+        )
+        self.assertEqual(
+            response.data["last_submission_timestamp"],
+            Submission.objects.get(pk=self.submission7.pk).submitted_at,
+        )
+
+    def test_challenge_submission_analysis_is_cached(self):
+        response = self.client.get(self.url, {})
+        Submission.objects.filter(pk=self.submission1.pk).delete()
+
+        with self.assertNumQueries(3):
+            cached_response = self.client.get(self.url, {})
+
+        self.assertEqual(cached_response.data, response.data)
+
+    def test_get_challenge_submission_analysis_when_user_is_not_host(self):
+        self.client.force_authenticate(user=self.user2)
+
+        response = self.client.get(self.url, {})
+
+        self.assertEqual(
+            response.data,
+            {"error": "Sorry, you are not authorized to make this request"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class GetSubmissionTimeSeriesTest(BaseAPITestClass):
+    def setUp(self):
+        super(GetSubmissionTimeSeriesTest, self).setUp()
+        self.url = reverse_lazy(
+            "analytics:get_submission_time_series",
+            kwargs={"challenge_pk": self.challenge.pk},
+        )
+        self.day = timezone.localdate()
+        SubmissionDailyRollup.objects.create(
+            challenge_phase=self.challenge_phase,
+            day=self.day,
+            status="finished",
+            submission_count=3,
+            execution_time_histogram={"60": 1, "+Inf": 3},
+        )
+
+    def test_get_submission_time_series(self):
+        response = self.client.get(
+            self.url, {"challenge_phase": self.challenge_phase.pk}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["challenge"], self.challenge.pk)
+        self.assertEqual(
+            response.data["results"],
+            [
+                {
+                    "challenge_phase": self.challenge_phase.pk,
+                    "day": self.day,
+                    "submission_count": 3,
+                    "status_count": {"finished": 3},
+                    "execution_time_histogram": {"60": 1, "+Inf": 3},
+                }
+            ],
+        )
+
+    def test_get_submission_time_series_with_invalid_date(self):
+        response = self.client.get(self.url, {"start_date": "yesterday"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_submission_time_series_when_user_is_not_host(self):
+        self.client.force_authenticate(user=self.user2)
+
+        response = self.client.get(self.url, {})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
 class GetLastSubmissionTimeTest(BaseAPITestClass):
     def setUp(self):
         super(GetLastSubmissionTimeTest, self).setUp()
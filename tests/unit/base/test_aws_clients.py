@@ -0,0 +1,130 @@
+import threading
+from unittest.mock import patch
+
+from base import aws_clients
+from base.utils import (
+    get_boto3_client,
+    get_or_create_sqs_queue,
+    get_sqs_queue,
+    invalidate_sqs_queue_url,
+)
+from django.test import SimpleTestCase, override_settings
+from moto import mock_sqs
+
+AWS_KEYS = {
+    "AWS_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "access_key_id",
+    "AWS_SECRET_ACCESS_KEY": "secret_access_key",
+}
+
+SQS_ENVIRON = {
+    "AWS_DEFAULT_REGION": "us-east-1",
+    "AWS_ACCESS_KEY_ID": "access_key_id",
+    "AWS_SECRET_ACCESS_KEY": "secret_access_key",
+}
+
+
+@override_settings(AWS_CLIENT_CACHE_ENABLED=True)
+class AwsClientsTest(SimpleTestCase):
+    def setUp(self):
+        aws_clients.clear()
+        self.addCleanup(aws_clients.clear)
+
+    def test_clients_are_reused_for_the_same_credentials(self):
+        client = get_boto3_client("s3", AWS_KEYS)
+
+        self.assertIs(get_boto3_client("s3", AWS_KEYS), client)
+        self.assertIsNot(
+            get_boto3_client("s3", dict(AWS_KEYS, AWS_REGION="us-west-2")),
+            client,
+        )
+        self.assertIsNot(get_boto3_client("sqs", AWS_KEYS), client)
+
+    def test_clients_are_replaced_when_credentials_change(self):
+        client = get_boto3_client("s3", AWS_KEYS)
+        rotated_client = get_boto3_client(
+            "s3", dict(AWS_KEYS, AWS_SECRET_ACCESS_KEY="rotated_secret")
+        )
+
+        self.assertIsNot(rotated_client, client)
+        self.assertIs(
+            get_boto3_client(
+                "s3", dict(AWS_KEYS, AWS_SECRET_ACCESS_KEY="rotated_secret")
+            ),
+            rotated_client,
+        )
+
+    def test_clear_drops_cached_clients(self):
+        client = get_boto3_client("s3", AWS_KEYS)
+        aws_clients.clear()
+
+        self.assertIsNot(get_boto3_client("s3", AWS_KEYS), client)
+
+    def test_resources_are_reused_within_a_thread(self):
+        resource = aws_clients.get_resource("sqs", region_name="us-east-1")
+        other_thread_resources = []
+        thread = threading.Thread(
+            target=lambda: other_thread_resources.append(
+                aws_clients.get_resource("sqs", region_name="us-east-1")
+            )
+        )
+        thread.start()
+        thread.join()
+
+        self.assertIs(
+            aws_clients.get_resource("sqs", region_name="us-east-1"), resource
+        )
+        self.assertIsNot(other_thread_resources[0], resource)
+
+    @override_settings(AWS_CLIENT_CACHE_ENABLED=False)
+    def test_nothing_is_reused_when_disabled(self):
+        self.assertIsNot(
+            get_boto3_client("s3", AWS_KEYS), get_boto3_client("s3", AWS_KEYS)
+        )
+
+
+@override_settings(AWS_CLIENT_CACHE_ENABLED=True, DEBUG=False, TEST=False)
+@patch.dict("os.environ", SQS_ENVIRON)
+class SqsQueueUrlCacheTest(SimpleTestCase):
+    def setUp(self):
+        aws_clients.clear()
+        self.addCleanup(aws_clients.clear)
+        mock = mock_sqs()
+        mock.start()
+        self.addCleanup(mock.stop)
+        self.get_queue_url_calls = []
+        sqs = aws_clients.get_resource(
+            "sqs",
+            region_name="us-east-1",
+            aws_secret_access_key="secret_access_key",
+            aws_access_key_id="access_key_id",
+        )
+        sqs.meta.client.meta.events.register(
+            "before-call.sqs.GetQueueUrl",
+            lambda **kwargs: self.get_queue_url_calls.append(kwargs),
+        )
+
+    def test_queue_url_is_looked_up_once(self):
+        queue = get_or_create_sqs_queue("evalai-test-queue")
+        queue.send_message(MessageBody="first")
+
+        cached_queue = get_or_create_sqs_queue("evalai-test-queue")
+        cached_queue.send_message(MessageBody="second")
+
+        self.assertEqual(cached_queue.url, queue.url)
+        self.assertEqual(len(self.get_queue_url_calls), 1)
+        self.assertEqual(
+            sorted(
+                message.body
+                for message in queue.receive_messages(MaxNumberOfMessages=10)
+            ),
+            ["first", "second"],
+        )
+
+    def test_invalidated_queue_url_is_looked_up_again(self):
+        get_or_create_sqs_queue("evalai-test-queue")
+        get_sqs_queue("evalai-test-queue")
+        invalidate_sqs_queue_url("evalai-test-queue")
+        get_sqs_queue("evalai-test-queue")
+
+        self.assertEqual(len(self.get_queue_url_calls), 2)
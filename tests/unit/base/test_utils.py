@@ -255,7 +255,7 @@ class TestAwsReturnFunc(BaseAPITestClass):
 
 
 class TestGetOrCreateSqsQueue(BaseAPITestClass):
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.settings.DEBUG", True)
     @patch("base.utils.settings.TEST", False)
     def test_debug_mode_queue_name(self, mock_boto3):
@@ -276,7 +276,7 @@ class TestGetOrCreateSqsQueue(BaseAPITestClass):
             QueueName="evalai_submission_queue"
         )
 
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.settings.DEBUG", False)
     @patch("base.utils.settings.TEST", False)
     def test_non_debug_non_test_mode_with_challenge(self, mock_boto3):
@@ -299,7 +299,7 @@ class TestGetOrCreateSqsQueue(BaseAPITestClass):
         )
         mock_sqs.get_queue_by_name.assert_called_with(QueueName=queue_name)
 
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.settings.DEBUG", False)
     @patch("base.utils.settings.TEST", False)
     def test_non_debug_non_test_mode_without_challenge(self, mock_boto3):
@@ -325,7 +325,7 @@ class TestGetOrCreateSqsQueue(BaseAPITestClass):
         )
         mock_sqs.get_queue_by_name.assert_called_with(QueueName=queue_name)
 
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.logger")
     @patch("base.utils.settings")
     def test_get_or_create_sqs_queue_exception_logging(
@@ -352,7 +352,7 @@ class TestGetOrCreateSqsQueue(BaseAPITestClass):
             "Cannot get queue: %s", queue_name
         )
 
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.settings.DEBUG", False)
     @patch("base.utils.settings.TEST", False)
     @patch("base.utils.logger")
@@ -380,7 +380,7 @@ class TestGetOrCreateSqsQueue(BaseAPITestClass):
 
 
 class TestGetSqsQueue(BaseAPITestClass):
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.settings.DEBUG", False)
     @patch("base.utils.settings.TEST", False)
     def test_get_sqs_queue_returns_existing_queue(self, mock_boto3):
@@ -397,7 +397,7 @@ class TestGetSqsQueue(BaseAPITestClass):
         mock_sqs.create_queue.assert_not_called()
         self.assertEqual(queue, mock_queue)
 
-    @patch("base.utils.boto3.resource")
+    @patch("base.aws_clients.boto3.resource")
     @patch("base.utils.settings.DEBUG", False)
     @patch("base.utils.settings.TEST", False)
     def test_get_sqs_queue_raises_when_missing(self, mock_boto3):
@@ -942,7 +942,7 @@ class TestRenderHandlebars(unittest.TestCase):
 
 
 class TestGetBoto3Client(unittest.TestCase):
-    @patch("base.utils.boto3.client")
+    @patch("base.aws_clients.boto3.client")
     @patch("base.utils.logger")
     def test_get_boto3_client_exception(self, mock_logger, mock_boto3_client):
         mock_boto3_client.side_effect = Exception("Boto3 error")
@@ -5,8 +5,10 @@ from http import HTTPStatus
 from unittest import TestCase, mock
 from unittest.mock import MagicMock, mock_open, patch
 
+import boto3
 import pytest
 from botocore.exceptions import ClientError, NoCredentialsError, WaiterError
+from botocore.stub import Stubber
 from celery.exceptions import MaxRetriesExceededError
 from challenges.aws_utils import (
     _file_content_changed,
@@ -25,12 +27,14 @@ from challenges.aws_utils import (
     create_eks_nodegroup,
     create_nodegroup_for_challenge,
     create_service_by_challenge_pk,
+    decode_worker_logs_cursor,
     delete_challenge_cleanup_schedule,
     delete_log_group,
     delete_service_by_challenge_pk,
     delete_workers,
     describe_ec2_instance,
     eks_nodegroup_config_change_callback,
+    encode_worker_logs_cursor,
     ensure_workers_for_submission,
     get_capacity_provider_strategy,
     get_code_upload_setup_meta_for_challenge,
@@ -66,6 +70,7 @@ from challenges.aws_utils import (
     stop_ec2_instance,
     stop_workers,
     strip_fifo_suffix,
+    tail_logs_from_cloudwatch,
     terminate_ec2_instance,
     trigger_eks_node_autoscale,
     update_challenge_cleanup_schedule,
@@ -84,8 +89,9 @@ from challenges.worker_utils import (
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core import serializers
+from django.core.cache import cache
 from django.db import DatabaseError
-from django.test import override_settings
+from django.test import SimpleTestCase, override_settings
 from hosts.models import ChallengeHostTeam
 
 
@@ -3506,6 +3512,185 @@ class TestFileContentChanged(TestCase):
         new.__bool__ = lambda self: True
         self.assertTrue(_file_content_changed(old, new))
 
+    def _make_s3_file_field(self, name):
+        field_file = MagicMock()
+        field_file.name = name
+        field_file.storage.bucket_name = "evalai-test"
+        field_file.storage.location = "media"
+        return field_file
+
+    def test_same_stored_file_returns_false_without_reading(self):
+        old = self._make_s3_file_field("evaluation_scripts/script.zip")
+        new = self._make_s3_file_field("evaluation_scripts/script.zip")
+        self.assertFalse(_file_content_changed(old, new))
+        old.read.assert_not_called()
+        new.read.assert_not_called()
+
+    @patch("challenges.aws_utils.get_boto3_client")
+    def test_s3_files_are_compared_by_etag(self, mock_get_boto3_client):
+        etags = {
+            "media/annotations/old.json": '"abc"',
+            "media/annotations/same.json": '"abc"',
+            "media/annotations/new.json": '"def"',
+        }
+        mock_get_boto3_client.return_value.head_object.side_effect = (
+            lambda Bucket, Key: {"ETag": etags[Key], "ContentLength": 10}
+        )
+        old = self._make_s3_file_field("annotations/old.json")
+
+        self.assertFalse(
+            _file_content_changed(
+                old, self._make_s3_file_field("annotations/same.json")
+            )
+        )
+        self.assertTrue(
+            _file_content_changed(
+                old, self._make_s3_file_field("annotations/new.json")
+            )
+        )
+        old.read.assert_not_called()
+        mock_get_boto3_client.return_value.head_object.assert_any_call(
+            Bucket="evalai-test", Key="media/annotations/old.json"
+        )
+
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES, DEBUG=False, WORKER_LOGS_INITIAL_WINDOW=2
+)
+class TestTailLogsFromCloudwatch(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = boto3.client("logs", region_name="us-east-1")
+        self.stubber = Stubber(self.client)
+        self.stubber.activate()
+        self.addCleanup(self.stubber.deactivate)
+
+    def expect_filter_log_events(
+        self, events, start_time=1000, end_time=9000, **params
+    ):
+        self.stubber.add_response(
+            "filter_log_events",
+            {"events": events, **params.pop("response", {})},
+            {
+                "logGroupName": "group",
+                "logStreamNamePrefix": "prefix",
+                "startTime": start_time,
+                "endTime": end_time,
+                "filterPattern": "",
+                **params,
+            },
+        )
+
+    def tail(self, cursor=None, max_events=2):
+        return tail_logs_from_cloudwatch(
+            "group",
+            "prefix",
+            1000,
+            9000,
+            "",
+            cursor=cursor,
+            max_events=max_events,
+            client=self.client,
+        )
+
+    def make_event(self, event_id, timestamp):
+        return {
+            "eventId": event_id,
+            "timestamp": timestamp,
+            "message": f"log {event_id}",
+        }
+
+    def test_first_page_has_the_latest_events(self):
+        # The last 2 seconds hold a single event, so the 8 seconds before
+        # are read too
+        self.expect_filter_log_events(
+            [self.make_event("3", 8000)], start_time=7000, limit=10000
+        )
+        self.expect_filter_log_events(
+            [self.make_event("1", 2000)],
+            end_time=6999,
+            limit=10000,
+            response={"nextToken": "token"},
+        )
+        self.expect_filter_log_events(
+            [self.make_event("2", 3000)],
+            end_time=6999,
+            limit=10000,
+            nextToken="token",
+        )
+        page = self.tail()
+
+        self.assertEqual(page["logs"], ["log 2", "log 3"])
+        self.assertFalse(page["truncated"])
+        self.assertEqual(
+            decode_worker_logs_cursor(page["cursor"]), (8000, {"3"})
+        )
+        self.stubber.assert_no_pending_responses()
+
+    def test_pages_are_capped_and_tailed_with_the_cursor(self):
+        self.expect_filter_log_events(
+            [self.make_event("1", 2000), self.make_event("2", 3000)],
+            limit=2,
+            response={"nextToken": "token"},
+        )
+        page = self.tail(cursor=encode_worker_logs_cursor(1000, []))
+
+        self.assertEqual(page["logs"], ["log 1", "log 2"])
+        self.assertTrue(page["truncated"])
+        self.assertEqual(
+            decode_worker_logs_cursor(page["cursor"]), (3000, {"2"})
+        )
+
+        # Events at the cursor's timestamp already returned are skipped
+        self.expect_filter_log_events(
+            [self.make_event("2", 3000), self.make_event("3", 3000)],
+            start_time=3000,
+            limit=3,
+        )
+        next_page = self.tail(cursor=page["cursor"])
+
+        self.assertEqual(next_page["logs"], ["log 3"])
+        self.assertFalse(next_page["truncated"])
+        self.assertEqual(
+            decode_worker_logs_cursor(next_page["cursor"]),
+            (3000, {"2", "3"}),
+        )
+        self.stubber.assert_no_pending_responses()
+
+    def test_pages_are_cached_per_cursor(self):
+        cursor = encode_worker_logs_cursor(4000, [])
+        self.expect_filter_log_events(
+            [self.make_event("4", 5000)], start_time=4000, limit=2
+        )
+
+        first_page = self.tail(cursor=cursor)
+        # The stubber has no response left, a second query would fail
+        second_page = self.tail(cursor=cursor)
+
+        self.assertEqual(first_page, second_page)
+
+    def test_missing_log_group_returns_no_logs(self):
+        self.stubber.add_client_error(
+            "filter_log_events", service_error_code="ResourceNotFoundException"
+        )
+
+        page = self.tail()
+
+        self.assertEqual(page["logs"], [])
+        self.assertEqual(
+            decode_worker_logs_cursor(page["cursor"]), (9000, set())
+        )
+
+    def test_invalid_cursor_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            self.tail(cursor="not-a-cursor")
+
 
 class TestGetLogsFromCloudwatch(TestCase):
     @patch("challenges.aws_utils.settings", DEBUG=True)
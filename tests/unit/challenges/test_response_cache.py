@@ -0,0 +1,130 @@
+from datetime import timedelta
+from unittest import mock
+
+from challenges.models import Challenge
+from challenges.response_cache import (
+    bump_challenge_versions,
+    get_challenge_list_version,
+    get_challenge_version,
+)
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse_lazy
+from django.utils import timezone
+from hosts.models import ChallengeHostTeam
+from rest_framework import status
+from rest_framework.test import APIClient
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class ChallengeResponseCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.user = User.objects.create(
+            username="someuser",
+            email="user@test.com",
+            password="secret_password",
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.user
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            published=True,
+            approved_by_admin=True,
+            enable_forum=True,
+            anonymous_leaderboard=False,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        self.url = reverse_lazy(
+            "challenges:get_challenge_by_pk",
+            kwargs={"pk": self.challenge.pk},
+        )
+
+    def test_unchanged_challenge_is_served_from_cache(self):
+        response = self.client.get(self.url)
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_response.data, response.data)
+        self.assertEqual(cached_response["ETag"], response["ETag"])
+
+    def test_matching_etag_returns_not_modified(self):
+        response = self.client.get(self.url)
+
+        not_modified_response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(
+            not_modified_response.status_code, status.HTTP_304_NOT_MODIFIED
+        )
+        self.assertEqual(not_modified_response["ETag"], response["ETag"])
+
+    def test_bumped_version_rebuilds_response(self):
+        response = self.client.get(self.url)
+        Challenge.objects.filter(pk=self.challenge.pk).update(
+            title="Renamed Challenge"
+        )
+
+        bump_challenge_versions([self.challenge.pk])
+        updated_response = self.client.get(
+            self.url, HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        self.assertEqual(updated_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(updated_response.data["title"], "Renamed Challenge")
+        self.assertNotEqual(updated_response["ETag"], response["ETag"])
+
+    def test_leaderboard_changes_keep_challenge_lists_cached(self):
+        challenge_version = get_challenge_version(self.challenge.pk)
+        challenge_list_version = get_challenge_list_version()
+
+        bump_challenge_versions([self.challenge.pk])
+
+        self.assertNotEqual(
+            get_challenge_version(self.challenge.pk), challenge_version
+        )
+        self.assertEqual(get_challenge_list_version(), challenge_list_version)
+
+    @mock.patch(
+        "challenges.models.transaction.on_commit", side_effect=lambda cb: cb()
+    )
+    def test_saved_challenge_bumps_challenge_lists(self, mock_on_commit):
+        challenge_version = get_challenge_version(self.challenge.pk)
+        challenge_list_version = get_challenge_list_version()
+
+        self.challenge.title = "Renamed Challenge"
+        self.challenge.save()
+
+        self.assertNotEqual(
+            get_challenge_version(self.challenge.pk), challenge_version
+        )
+        self.assertNotEqual(
+            get_challenge_list_version(), challenge_list_version
+        )
+
+    def test_error_responses_are_not_cached(self):
+        Challenge.objects.filter(pk=self.challenge.pk).update(is_disabled=True)
+        self.client.get(self.url)
+        Challenge.objects.filter(pk=self.challenge.pk).update(
+            is_disabled=False
+        )
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -0,0 +1,124 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from challenges.models import Challenge, ChallengePhase
+from challenges.submission_export import get_submission_export_status
+from challenges.tasks import export_submissions_to_s3
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from hosts.models import ChallengeHostTeam
+from jobs.models import Submission
+from participants.models import Participant, ParticipantTeam
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(
+    CACHES=LOCMEM_CACHES,
+    AWS_STORAGE_BUCKET_NAME="evalai-test",
+    SUBMISSION_EXPORT_CHUNK_SIZE=2,
+)
+class ExportSubmissionsToS3Test(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            username="someuser",
+            email="user@test.com",
+            password="secret_password",
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.user
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        self.challenge_phase = ChallengePhase.objects.create(
+            name="Challenge Phase",
+            description="Description for Challenge Phase",
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            challenge=self.challenge,
+            max_submissions_per_day=100,
+            max_submissions_per_month=100,
+            max_submissions=100,
+        )
+        self.participant_team = ParticipantTeam.objects.create(
+            team_name="Participant Team", created_by=self.user
+        )
+        Participant.objects.create(
+            user=self.user,
+            status=Participant.ACCEPTED,
+            team=self.participant_team,
+        )
+        for _ in range(3):
+            Submission.objects.create(
+                participant_team=self.participant_team,
+                challenge_phase=self.challenge_phase,
+                created_by=self.user,
+                status=Submission.SUBMITTED,
+                input_file=SimpleUploadedFile(
+                    "submission.json", b"{}", content_type="application/json"
+                ),
+            )
+
+    @patch("challenges.tasks.get_boto3_client")
+    def test_export_is_uploaded_with_presigned_link(self, mock_client):
+        uploaded = {}
+
+        def upload_file(file_name, bucket, key, ExtraArgs=None):
+            with open(file_name) as csv_file:
+                uploaded["rows"] = csv_file.read().splitlines()
+            uploaded["bucket"] = bucket
+            uploaded["key"] = key
+
+        mock_client.return_value.upload_file.side_effect = upload_file
+        mock_client.return_value.generate_presigned_url.return_value = (
+            "https://evalai-test.s3.amazonaws.com/export.csv?signature"
+        )
+
+        export_submissions_to_s3(
+            self.challenge_phase.pk, ["participant_team_members"], "abc123"
+        )
+
+        self.assertEqual(uploaded["bucket"], "evalai-test")
+        self.assertTrue(
+            uploaded["key"].startswith(
+                "submission_exports/{}/{}/abc123/".format(
+                    self.challenge.pk, self.challenge_phase.pk
+                )
+            )
+        )
+        self.assertEqual(uploaded["rows"][0], '"id","Team Members"')
+        self.assertEqual(len(uploaded["rows"]), 4)
+        self.assertTrue(uploaded["rows"][1].endswith('"someuser"'))
+        self.assertEqual(
+            get_submission_export_status(self.challenge_phase.pk, "abc123"),
+            {
+                "status": "finished",
+                "url": "https://evalai-test.s3.amazonaws.com/export.csv"
+                "?signature",
+            },
+        )
+
+    @patch("challenges.tasks.get_boto3_client")
+    def test_failed_upload_marks_export_failed(self, mock_client):
+        mock_client.return_value.upload_file.side_effect = Exception("S3")
+
+        export_submissions_to_s3(self.challenge_phase.pk, None, "abc123")
+
+        self.assertEqual(
+            get_submission_export_status(self.challenge_phase.pk, "abc123"),
+            {"status": "failed"},
+        )
@@ -215,6 +215,43 @@ class TestChallengeUrls(BaseAPITestClass):
             resolver.view_name, "challenges:download_all_submissions"
         )
 
+        self.url = reverse_lazy(
+            "challenges:export_all_submissions",
+            kwargs={
+                "challenge_pk": self.challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+            },
+        )
+        self.assertEqual(
+            self.url,
+            "/api/challenges/{}/phase/{}/export_all_submissions/".format(
+                self.challenge.pk, self.challenge_phase.pk
+            ),
+        )
+        resolver = resolve(self.url)
+        self.assertEqual(
+            resolver.view_name, "challenges:export_all_submissions"
+        )
+
+        self.url = reverse_lazy(
+            "challenges:get_all_submissions_export",
+            kwargs={
+                "challenge_pk": self.challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+                "export_id": "abc123",
+            },
+        )
+        self.assertEqual(
+            self.url,
+            "/api/challenges/{}/phase/{}/export_all_submissions/abc123/".format(
+                self.challenge.pk, self.challenge_phase.pk
+            ),
+        )
+        resolver = resolve(self.url)
+        self.assertEqual(
+            resolver.view_name, "challenges:get_all_submissions_export"
+        )
+
         self.url = reverse_lazy("challenges:create_leaderboard")
         self.assertEqual(
             self.url, "/api/challenges/challenge/create/leaderboard/step_2/"
@@ -29,6 +29,7 @@ from challenges.models import (
     LeaderboardData,
     StarChallenge,
 )
+from challenges.submission_export import set_submission_export_status
 from django.conf import settings
 from django.contrib.auth.models import User
 from django.core.files.uploadedfile import SimpleUploadedFile
@@ -45,6 +46,11 @@ from participants.models import Participant, ParticipantTeam
 from rest_framework import status
 from rest_framework.test import APIClient, APITestCase
 
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
 
 class BaseAPITestClass(APITestCase):
     def setUp(self):
@@ -6026,6 +6032,101 @@ class GetAllSubmissionsTest(
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, expected_response)
 
+    def authenticate_staff_user(self):
+        staff_user = User.objects.create(
+            username="admin_test",
+            email="admin_test@example.com",
+            password="admin@123",
+            is_staff=True,
+        )
+        EmailAddress.objects.create(
+            user=staff_user,
+            email="admin_test@example.com",
+            primary=True,
+            verified=True,
+        )
+        self.client.force_authenticate(user=staff_user)
+
+    def test_get_all_challenges_submission_metrics_with_pending_status(self):
+        self.authenticate_staff_user()
+        url = reverse_lazy("challenges:get_all_challenges_submission_metrics")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {"status": "pending"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data[self.challenge5.pk],
+            {"submitted": 3, "queued": 0, "running": 0, "resuming": 0},
+        )
+
+    def test_get_all_challenges_submission_metrics_excludes_ended_challenges(
+        self,
+    ):
+        self.authenticate_staff_user()
+        Challenge.objects.filter(pk=self.challenge.pk).update(
+            end_date=timezone.now() - timedelta(days=1)
+        )
+        url = reverse_lazy("challenges:get_all_challenges_submission_metrics")
+
+        response = self.client.get(url, {"status": "submitted,failed"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data, {self.challenge5.pk: {"submitted": 3, "failed": 0}}
+        )
+
+    def test_get_all_challenges_submission_metrics_with_invalid_status(self):
+        self.authenticate_staff_user()
+        url = reverse_lazy("challenges:get_all_challenges_submission_metrics")
+
+        response = self.client.get(url, {"status": "submitted,unknown"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_all_challenges_submission_metrics_changed_since(self):
+        self.authenticate_staff_user()
+        Submission.objects.update(
+            modified_at=timezone.now() - timedelta(minutes=10)
+        )
+        url = reverse_lazy("challenges:get_all_challenges_submission_metrics")
+        changed_since = (timezone.now() - timedelta(minutes=5)).isoformat()
+
+        response = self.client.get(
+            url, {"status": "pending", "changed_since": changed_since}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["metrics"], {})
+
+        self.submission1.save()
+        response = self.client.get(
+            url,
+            {
+                "status": "pending",
+                "changed_since": response.data["changed_since"],
+            },
+        )
+        self.assertEqual(
+            response.data["metrics"],
+            {
+                self.challenge5.pk: {
+                    "submitted": 3,
+                    "queued": 0,
+                    "running": 0,
+                    "resuming": 0,
+                }
+            },
+        )
+
+    def test_get_all_challenges_submission_metrics_with_invalid_cursor(self):
+        self.authenticate_staff_user()
+        url = reverse_lazy("challenges:get_all_challenges_submission_metrics")
+
+        response = self.client.get(url, {"changed_since": "yesterday"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 
 class DownloadAllSubmissionsFileTest(
     BaseAPITestClass
@@ -6233,9 +6334,143 @@ class DownloadAllSubmissionsFileTest(
                     row.append(submission[field])
             expected_submissions.writerow(row)
         response = self.client.post(self.url, self.data)
-        self.assertEqual(response.content.decode("utf-8"), expected.getvalue())
+        self.assertEqual(
+            b"".join(response.streaming_content).decode("utf-8"),
+            expected.getvalue(),
+        )
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_download_all_submissions_for_host_streams_csv(self):
+        self.url = (  # pylint: disable=attribute-defined-outside-init
+            reverse_lazy(
+                "challenges:download_all_submissions",
+                kwargs={
+                    "challenge_pk": self.challenge.pk,
+                    "challenge_phase_pk": self.challenge_phase.pk,
+                    "file_type": self.file_type_csv,
+                },
+            )
+        )
+        response = self.client.get(self.url, {})
+
+        rows = list(
+            csv.reader(
+                io.StringIO(
+                    b"".join(response.streaming_content).decode("utf-8")
+                )
+            )
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][:3], ["id", "Team Name", "Team Members"])
+        self.assertEqual(rows[1][0], str(self.submission.pk))
+        self.assertEqual(rows[1][1], self.participant_team1.team_name)
+        self.assertEqual(rows[1][2], self.user1.username)
+        self.assertEqual(rows[1][10], self.submission.input_file.url)
+
+    def test_download_all_submissions_for_host_with_invalid_fields(self):
+        self.url = (  # pylint: disable=attribute-defined-outside-init
+            reverse_lazy(
+                "challenges:download_all_submissions",
+                kwargs={
+                    "challenge_pk": self.challenge.pk,
+                    "challenge_phase_pk": self.challenge_phase.pk,
+                    "file_type": self.file_type_csv,
+                },
+            )
+        )
+        response = self.client.post(self.url, ["status", "password"])
+
+        self.assertEqual(response.data, {"error": "Invalid fields: password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    @mock.patch("challenges.views.export_submissions_to_s3.delay")
+    def test_export_all_submissions_in_background(self, mock_export):
+        url = reverse_lazy(
+            "challenges:export_all_submissions",
+            kwargs={
+                "challenge_pk": self.challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+            },
+        )
+        response = self.client.post(url, {"fields": ["status"]}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        export_id = response.data["export_id"]
+        mock_export.assert_called_once_with(
+            self.challenge_phase.pk, ["status"], export_id
+        )
+
+        url = reverse_lazy(
+            "challenges:get_all_submissions_export",
+            kwargs={
+                "challenge_pk": self.challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+                "export_id": export_id,
+            },
+        )
+        response = self.client.get(url)
+        self.assertEqual(response.data, {"status": "pending"})
+
+        self.client.force_authenticate(user=self.user2)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    @mock.patch("challenges.views.export_submissions_to_s3.delay")
+    def test_export_all_submissions_with_list_body(self, mock_export):
+        url = reverse_lazy(
+            "challenges:export_all_submissions",
+            kwargs={
+                "challenge_pk": self.challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+            },
+        )
+        response = self.client.post(url, ["status"], format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        mock_export.assert_not_called()
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_get_all_submissions_export_of_phase_of_other_challenge(self):
+        other_challenge = Challenge.objects.create(
+            title="Other Challenge",
+            description="Description for other challenge",
+            terms_and_conditions="Terms and conditions for other challenge",
+            submission_guidelines="Submission guidelines for other challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        set_submission_export_status(
+            self.challenge_phase.pk, "abc123", {"status": "pending"}
+        )
+        url = reverse_lazy(
+            "challenges:get_all_submissions_export",
+            kwargs={
+                "challenge_pk": other_challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+                "export_id": "abc123",
+            },
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    @override_settings(CACHES=LOCMEM_CACHES)
+    def test_get_all_submissions_export_when_export_does_not_exist(self):
+        url = reverse_lazy(
+            "challenges:get_all_submissions_export",
+            kwargs={
+                "challenge_pk": self.challenge.pk,
+                "challenge_phase_pk": self.challenge_phase.pk,
+                "export_id": "abc123",
+            },
+        )
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
     def test_download_all_submissions_when_user_is_challenge_participant(self):
         self.url = (  # pylint: disable=attribute-defined-outside-init
             reverse_lazy(
@@ -9360,3 +9595,30 @@ class ClearChallengeWorkerStateAPITest(BaseAPITestClass):
         self.challenge.refresh_from_db()
         self.assertIsNone(self.challenge.workers)
         self.assertEqual(self.challenge.task_def_arn, "")
+
+
+class GetWorkerLogsTest(BaseAPITestClass):
+    def setUp(self):
+        super().setUp()
+        self.url = reverse_lazy(
+            "challenges:get_worker_logs",
+            kwargs={"challenge_pk": self.challenge.pk},
+        )
+
+    @mock.patch("challenges.views.tail_logs_from_cloudwatch")
+    def test_cursor_is_passed_to_tail_the_logs(self, mock_tail_logs):
+        page = {"logs": ["log 1"], "cursor": "next", "truncated": False}
+        mock_tail_logs.return_value = page
+
+        response = self.client.get(self.url, {"cursor": "previous"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, page)
+        self.assertEqual(mock_tail_logs.call_args[1]["cursor"], "previous")
+
+    def test_invalid_cursor(self):
+        with self.settings(DEBUG=False):
+            response = self.client.get(self.url, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {"error": "Invalid cursor"})
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from challenges.models import Challenge
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from hosts.models import ChallengeHostTeam
+from jobs.evaluation_leases import (
+    acquire_submission_evaluation_lease,
+    release_submission_evaluation_lease,
+    renew_submission_evaluation_leases,
+)
+from jobs.models import SubmissionEvaluationLease
+
+
+@override_settings(SUBMISSION_EVALUATION_LEASE_TIMEOUT=60)
+class SubmissionEvaluationLeaseTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(
+            username="someuser",
+            email="user@test.com",
+            password="secret_password",
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.user
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+
+    def test_leases_are_limited_per_challenge(self):
+        first_lease = acquire_submission_evaluation_lease(
+            self.challenge, 2, "worker-1", submission_pk=1
+        )
+        second_lease = acquire_submission_evaluation_lease(
+            self.challenge, 2, "worker-2", submission_pk=2
+        )
+
+        third_lease = acquire_submission_evaluation_lease(
+            self.challenge, 2, "worker-1", submission_pk=3
+        )
+
+        self.assertEqual(first_lease.submission_pk, 1)
+        self.assertEqual(second_lease.worker_id, "worker-2")
+        self.assertIsNone(third_lease)
+
+    def test_released_lease_frees_its_slot(self):
+        lease = acquire_submission_evaluation_lease(
+            self.challenge, 1, "worker-1"
+        )
+
+        release_submission_evaluation_lease(lease)
+
+        self.assertIsNotNone(
+            acquire_submission_evaluation_lease(self.challenge, 1, "worker-2")
+        )
+
+    def test_expired_lease_is_reclaimed(self):
+        lease = acquire_submission_evaluation_lease(
+            self.challenge, 1, "worker-1"
+        )
+        SubmissionEvaluationLease.objects.filter(pk=lease.pk).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=61)
+        )
+
+        new_lease = acquire_submission_evaluation_lease(
+            self.challenge, 1, "worker-2"
+        )
+
+        self.assertEqual(new_lease.worker_id, "worker-2")
+        self.assertFalse(
+            SubmissionEvaluationLease.objects.filter(pk=lease.pk).exists()
+        )
+
+    def test_renewed_lease_is_kept(self):
+        lease = acquire_submission_evaluation_lease(
+            self.challenge, 1, "worker-1"
+        )
+        SubmissionEvaluationLease.objects.filter(pk=lease.pk).update(
+            heartbeat_at=timezone.now() - timedelta(seconds=61)
+        )
+
+        renewed_leases_count = renew_submission_evaluation_leases("worker-1")
+
+        self.assertEqual(renewed_leases_count, 1)
+        self.assertIsNone(
+            acquire_submission_evaluation_lease(self.challenge, 1, "worker-2")
+        )
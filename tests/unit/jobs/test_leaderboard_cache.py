@@ -0,0 +1,385 @@
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+from challenges.models import (
+    Challenge,
+    ChallengePhase,
+    ChallengePhaseSplit,
+    DatasetSplit,
+    Leaderboard,
+    LeaderboardData,
+)
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse_lazy
+from django.utils import timezone
+from hosts.models import ChallengeHostTeam
+from jobs.leaderboard_cache import (
+    get_cached_leaderboard_ranking,
+    invalidate_leaderboard_ranking,
+    update_cached_leaderboard_ranking,
+)
+from jobs.models import Submission
+from jobs.utils import (
+    get_sorted_leaderboard_data,
+    refresh_leaderboard_ranking_for_teams,
+)
+from participants.models import Participant, ParticipantTeam
+from rest_framework import status
+from rest_framework.test import APIClient
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LeaderboardCacheTest(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_ranking_is_built_once(self):
+        build_ranking = MagicMock(return_value=[{"id": 1}])
+
+        first = get_cached_leaderboard_ranking(1, "score", True, build_ranking)
+        second = get_cached_leaderboard_ranking(
+            1, "score", True, build_ranking
+        )
+
+        self.assertEqual(first, [{"id": 1}])
+        self.assertEqual(second, [{"id": 1}])
+        build_ranking.assert_called_once()
+
+    def test_invalidate_rebuilds_ranking(self):
+        build_ranking = MagicMock(return_value=[{"id": 1}])
+        get_cached_leaderboard_ranking(1, "score", True, build_ranking)
+
+        invalidate_leaderboard_ranking([1])
+        get_cached_leaderboard_ranking(1, "score", True, build_ranking)
+
+        self.assertEqual(build_ranking.call_count, 2)
+
+    def test_ranking_changed_during_build_is_not_cached(self):
+        def build_ranking():
+            invalidate_leaderboard_ranking([1])
+            return [{"id": 1}]
+
+        get_cached_leaderboard_ranking(1, "score", True, build_ranking)
+        rebuild = MagicMock(return_value=[{"id": 2}])
+
+        self.assertEqual(
+            get_cached_leaderboard_ranking(1, "score", True, rebuild),
+            [{"id": 2}],
+        )
+
+    def test_update_only_touches_cached_rankings(self):
+        get_cached_leaderboard_ranking(
+            1, "score", True, MagicMock(return_value=[{"id": 1}])
+        )
+        update_ranking = MagicMock(return_value=[{"id": 1}, {"id": 2}])
+
+        update_cached_leaderboard_ranking(
+            1, [("score", True), ("score", False)], update_ranking
+        )
+
+        update_ranking.assert_called_once_with([{"id": 1}], "score", True)
+        build_ranking = MagicMock()
+        self.assertEqual(
+            get_cached_leaderboard_ranking(1, "score", True, build_ranking),
+            [{"id": 1}, {"id": 2}],
+        )
+        build_ranking.assert_not_called()
+
+    def test_concurrent_update_invalidates_ranking(self):
+        get_cached_leaderboard_ranking(
+            1, "score", True, MagicMock(return_value=[{"id": 1}])
+        )
+        cache.add("leaderboard_ranking_lock:1", True)
+        update_ranking = MagicMock()
+
+        update_cached_leaderboard_ranking(1, [("score", True)], update_ranking)
+
+        update_ranking.assert_not_called()
+        build_ranking = MagicMock(return_value=[])
+        get_cached_leaderboard_ranking(1, "score", True, build_ranking)
+        build_ranking.assert_called_once()
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+class LeaderboardRankingTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            username="user", email="user@test.com", password="password"
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.user
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            published=True,
+            enable_forum=True,
+            anonymous_leaderboard=False,
+        )
+        self.challenge_phase = ChallengePhase.objects.create(
+            name="Challenge Phase",
+            description="Description for Challenge Phase",
+            leaderboard_public=True,
+            is_public=True,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            challenge=self.challenge,
+            max_submissions_per_day=100000,
+            max_submissions_per_month=100000,
+            max_submissions=100000,
+        )
+        self.leaderboard = Leaderboard.objects.create(
+            schema={"labels": ["score"], "default_order_by": "score"}
+        )
+        self.challenge_phase_split = ChallengePhaseSplit.objects.create(
+            challenge_phase=self.challenge_phase,
+            dataset_split=DatasetSplit.objects.create(
+                name="Split 1", codename="split1"
+            ),
+            leaderboard=self.leaderboard,
+            visibility=ChallengePhaseSplit.PUBLIC,
+        )
+        self.participant_user = User.objects.create(
+            username="participant", email="participant@test.com"
+        )
+        self.team_1 = ParticipantTeam.objects.create(
+            team_name="Team 1", created_by=self.participant_user
+        )
+        self.team_2 = ParticipantTeam.objects.create(
+            team_name="Team 2", created_by=self.participant_user
+        )
+        Participant.objects.create(
+            user=self.participant_user,
+            status=Participant.ACCEPTED,
+            team=self.team_2,
+        )
+        self.submission_1 = self.create_submission(self.team_1, 10)
+        self.submission_2 = self.create_submission(self.team_1, 30)
+        self.submission_3 = self.create_submission(self.team_2, 20)
+
+    def create_submission(self, participant_team, score):
+        submission = Submission.objects.create(
+            participant_team=participant_team,
+            challenge_phase=self.challenge_phase,
+            created_by=self.participant_user,
+            status=Submission.SUBMITTED,
+            input_file=SimpleUploadedFile(
+                "submission.json", b"{}", content_type="application/json"
+            ),
+            is_public=True,
+        )
+        submission.status = Submission.FINISHED
+        submission.save()
+        LeaderboardData.objects.create(
+            challenge_phase_split=self.challenge_phase_split,
+            submission=submission,
+            leaderboard=self.leaderboard,
+            result={"score": score},
+        )
+        return submission
+
+    def get_ranked_submission_ids(self):
+        leaderboard_data, _ = get_sorted_leaderboard_data(
+            self.user,
+            self.challenge,
+            self.challenge_phase_split,
+            only_public_entries=True,
+            order_by="score",
+        )
+        return [item["submission__id"] for item in leaderboard_data]
+
+
+class RefreshLeaderboardRankingTest(LeaderboardRankingTestCase):
+    def test_flagged_submission_is_replaced_by_next_best_entry(self):
+        self.assertEqual(
+            self.get_ranked_submission_ids(),
+            [self.submission_2.pk, self.submission_3.pk],
+        )
+
+        Submission.objects.filter(pk=self.submission_2.pk).update(
+            is_flagged=True
+        )
+        refresh_leaderboard_ranking_for_teams(
+            [self.challenge_phase_split.pk], [self.team_1.pk]
+        )
+
+        self.assertEqual(
+            self.get_ranked_submission_ids(),
+            [self.submission_3.pk, self.submission_1.pk],
+        )
+
+    def test_banned_team_is_removed_from_ranking(self):
+        self.get_ranked_submission_ids()
+
+        Challenge.objects.filter(pk=self.challenge.pk).update(
+            banned_email_ids=["participant@test.com"]
+        )
+        self.challenge.refresh_from_db()
+        refresh_leaderboard_ranking_for_teams(
+            [self.challenge_phase_split.pk], [self.team_2.pk]
+        )
+
+        self.assertEqual(
+            self.get_ranked_submission_ids(), [self.submission_2.pk]
+        )
+
+
+@override_settings(CACHES=LOCMEM_CACHES, LEADERBOARD_RANKING_IN_DATABASE=True)
+class DatabaseLeaderboardRankingTest(RefreshLeaderboardRankingTest):
+    def get_ranking(self):
+        cache.clear()
+        leaderboard_data, _ = get_sorted_leaderboard_data(
+            self.user,
+            self.challenge,
+            self.challenge_phase_split,
+            only_public_entries=True,
+            order_by="score",
+        )
+        return leaderboard_data
+
+    def assert_ranking_matches_python_ranking(self):
+        ranking = self.get_ranking()
+        with self.settings(LEADERBOARD_RANKING_IN_DATABASE=False):
+            self.assertEqual(ranking, self.get_ranking())
+
+    def test_ranking_matches_python_ranking(self):
+        self.assertEqual(
+            [item["submission__id"] for item in self.get_ranking()],
+            [self.submission_2.pk, self.submission_3.pk],
+        )
+        self.assert_ranking_matches_python_ranking()
+
+    def test_ranking_matches_python_ranking_in_ascending_order(self):
+        self.leaderboard.schema["metadata"] = {
+            "score": {"sort_ascending": True}
+        }
+        self.leaderboard.save()
+
+        self.assertEqual(
+            [item["submission__id"] for item in self.get_ranking()],
+            [self.submission_1.pk, self.submission_3.pk],
+        )
+        self.assert_ranking_matches_python_ranking()
+
+    def test_ranking_keeps_baselines_and_latest_of_tied_entries(self):
+        submission_4 = self.create_submission(self.team_2, 20)
+        baseline = self.create_submission(self.team_1, 40)
+        Submission.objects.filter(pk=baseline.pk).update(is_baseline=True)
+
+        self.assertEqual(
+            [item["submission__id"] for item in self.get_ranking()],
+            [baseline.pk, self.submission_2.pk, submission_4.pk],
+        )
+        self.assert_ranking_matches_python_ranking()
+
+    def test_ranking_by_latest_submission(self):
+        self.challenge_phase_split.show_leaderboard_by_latest_submission = True
+        self.challenge_phase_split.save()
+
+        self.assertEqual(
+            [item["submission__id"] for item in self.get_ranking()],
+            [self.submission_3.pk, self.submission_2.pk],
+        )
+        self.assert_ranking_matches_python_ranking()
+
+
+class LeaderboardCursorPaginationTest(LeaderboardRankingTestCase):
+    def setUp(self):
+        super(LeaderboardCursorPaginationTest, self).setUp()
+        self.client = APIClient(enforce_csrf_checks=True)
+        self.url = reverse_lazy(
+            "jobs:leaderboard",
+            kwargs={"challenge_phase_split_id": self.challenge_phase_split.pk},
+        )
+
+    def get_page(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def test_pages_follow_the_ranking(self):
+        submission_4 = self.create_submission(self.team_2, 25)
+        team_3 = ParticipantTeam.objects.create(
+            team_name="Team 3", created_by=self.participant_user
+        )
+        submission_5 = self.create_submission(team_3, 5)
+
+        first_page = self.get_page(self.url, cursor="", page_size=2)
+        second_page = self.get_page(first_page["next"])
+
+        self.assertEqual(
+            [item["submission__id"] for item in first_page["results"]],
+            [self.submission_2.pk, submission_4.pk],
+        )
+        self.assertEqual(
+            [item["submission__id"] for item in second_page["results"]],
+            [submission_5.pk],
+        )
+        self.assertIsNone(second_page["next"])
+
+    def test_next_page_resumes_after_cursor_when_ranking_changes(self):
+        team_3 = ParticipantTeam.objects.create(
+            team_name="Team 3", created_by=self.participant_user
+        )
+        submission_4 = self.create_submission(team_3, 5)
+        first_page = self.get_page(self.url, cursor="", page_size=1)
+
+        # Team 1 drops below the cursor after the first page was served
+        Submission.objects.filter(pk=self.submission_2.pk).update(
+            is_flagged=True
+        )
+        refresh_leaderboard_ranking_for_teams(
+            [self.challenge_phase_split.pk], [self.team_1.pk]
+        )
+        second_page = self.get_page(first_page["next"], page_size=10)
+
+        self.assertEqual(
+            [item["submission__id"] for item in second_page["results"]],
+            [self.submission_3.pk, self.submission_1.pk, submission_4.pk],
+        )
+
+    def test_pages_break_ties_like_the_ranking(self):
+        tied_submissions = []
+        for index in range(3):
+            team = ParticipantTeam.objects.create(
+                team_name="Tied Team {}".format(index),
+                created_by=self.participant_user,
+            )
+            tied_submissions.append(self.create_submission(team, 20))
+
+        submission_ids = []
+        page = self.get_page(self.url, cursor="", page_size=1)
+        while True:
+            submission_ids += [
+                item["submission__id"] for item in page["results"]
+            ]
+            if page["next"] is None:
+                break
+            page = self.get_page(page["next"])
+
+        # Entries tied on score are ranked latest first
+        self.assertEqual(
+            submission_ids,
+            [self.submission_2.pk]
+            + [submission.pk for submission in reversed(tied_submissions)]
+            + [self.submission_3.pk],
+        )
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
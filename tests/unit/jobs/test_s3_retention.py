@@ -1,3 +1,6 @@
+import os
+import shutil
+import tempfile
 from datetime import timedelta
 from unittest.mock import MagicMock, patch
 
@@ -9,11 +12,13 @@ from django.utils import timezone
 from hosts.models import ChallengeHostTeam
 from jobs.models import Submission
 from jobs.s3_retention import (
+    RateLimiter,
     backfill_submission_artifact_tags,
     build_submission_artifact_s3_tags,
     enqueue_submission_artifact_retention_tagging,
     get_celery_queue_for_retention_tagging,
     get_submission_artifact_s3_key,
+    read_backfill_checkpoint,
     tag_submission_artifacts_for_retention,
 )
 from participants.models import ParticipantTeam
@@ -124,6 +129,152 @@ class S3RetentionTestCase(TestCase):
             kwargs["Tagging"]["TagSet"],
         )
 
+    def test_backfill_skips_objects_already_tagged(self):
+        s3_client = MagicMock()
+        tags = build_submission_artifact_s3_tags(self.submission)
+        s3_client.get_object_tagging.return_value = {
+            "TagSet": [
+                {"Key": key, "Value": value} for key, value in tags.items()
+            ]
+        }
+
+        summary = backfill_submission_artifact_tags(
+            challenge_phase_ids=[self.challenge_phase.pk],
+            dry_run=False,
+            s3_client=s3_client,
+            bucket_name="test-bucket",
+            skip_tagged=True,
+        )
+
+        self.assertEqual(1, summary["objects_already_tagged"])
+        self.assertEqual(0, summary["objects_to_tag"])
+        s3_client.put_object_tagging.assert_not_called()
+
+    def test_backfill_with_workers_resumes_from_checkpoint(self):
+        for _ in range(2):
+            Submission.objects.create(
+                participant_team=self.participant_team,
+                challenge_phase=self.challenge_phase,
+                created_by=self.user,
+                status=Submission.SUBMITTED,
+                input_file=SimpleUploadedFile(
+                    "submission.json",
+                    b"{}",
+                    content_type="application/json",
+                ),
+            )
+        checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir)
+        checkpoint_path = os.path.join(checkpoint_dir, "checkpoint.json")
+        s3_client = MagicMock()
+
+        summary = backfill_submission_artifact_tags(
+            challenge_phase_ids=[self.challenge_phase.pk],
+            dry_run=False,
+            s3_client=s3_client,
+            bucket_name="test-bucket",
+            workers=4,
+            checkpoint_path=checkpoint_path,
+            batch_size=2,
+        )
+        resumed_summary = backfill_submission_artifact_tags(
+            challenge_phase_ids=[self.challenge_phase.pk],
+            dry_run=False,
+            s3_client=s3_client,
+            bucket_name="test-bucket",
+            workers=4,
+            checkpoint_path=checkpoint_path,
+        )
+
+        self.assertEqual(3, summary["submissions_seen"])
+        self.assertEqual(3, summary["objects_tagged"])
+        self.assertIn("objects_per_second", summary)
+        self.assertEqual(0, resumed_summary["submissions_seen"])
+        self.assertEqual(3, s3_client.put_object_tagging.call_count)
+
+    def _create_submissions(self, count):
+        return [
+            Submission.objects.create(
+                participant_team=self.participant_team,
+                challenge_phase=self.challenge_phase,
+                created_by=self.user,
+                status=Submission.SUBMITTED,
+                input_file=SimpleUploadedFile(
+                    "submission.json",
+                    b"{}",
+                    content_type="application/json",
+                ),
+            )
+            for _ in range(count)
+        ]
+
+    def test_backfill_checkpoint_stops_before_failed_submission(self):
+        failed_submission, _ = self._create_submissions(2)
+        checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir)
+        checkpoint_path = os.path.join(checkpoint_dir, "checkpoint.json")
+        s3_client = MagicMock()
+        failed_key = get_submission_artifact_s3_key(
+            failed_submission.input_file.name
+        )
+
+        def put_object_tagging(**kwargs):
+            if kwargs["Key"] == failed_key:
+                raise Exception("Throttled")
+
+        s3_client.put_object_tagging.side_effect = put_object_tagging
+
+        summary = backfill_submission_artifact_tags(
+            challenge_phase_ids=[self.challenge_phase.pk],
+            dry_run=False,
+            s3_client=s3_client,
+            bucket_name="test-bucket",
+            checkpoint_path=checkpoint_path,
+            batch_size=1,
+        )
+
+        self.assertEqual(1, summary["objects_failed"])
+        self.assertEqual(2, summary["objects_tagged"])
+        self.assertEqual(
+            self.submission.pk, read_backfill_checkpoint(checkpoint_path)
+        )
+
+        s3_client.put_object_tagging.side_effect = None
+        resumed_summary = backfill_submission_artifact_tags(
+            challenge_phase_ids=[self.challenge_phase.pk],
+            dry_run=False,
+            s3_client=s3_client,
+            bucket_name="test-bucket",
+            checkpoint_path=checkpoint_path,
+        )
+
+        self.assertEqual(2, resumed_summary["objects_tagged"])
+        self.assertEqual(0, resumed_summary["objects_failed"])
+
+    def test_backfill_dry_run_leaves_checkpoint_alone(self):
+        checkpoint_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, checkpoint_dir)
+        checkpoint_path = os.path.join(checkpoint_dir, "checkpoint.json")
+
+        backfill_submission_artifact_tags(
+            challenge_phase_ids=[self.challenge_phase.pk],
+            dry_run=True,
+            checkpoint_path=checkpoint_path,
+        )
+
+        self.assertFalse(os.path.exists(checkpoint_path))
+
+    @patch("jobs.s3_retention.time.sleep")
+    def test_rate_limiter_spaces_requests(self, mock_sleep):
+        rate_limiter = RateLimiter(10)
+
+        for _ in range(3):
+            rate_limiter.acquire()
+
+        self.assertEqual(2, mock_sleep.call_count)
+        self.assertGreater(mock_sleep.call_args_list[0][0][0], 0.05)
+        self.assertGreater(mock_sleep.call_args_list[1][0][0], 0.15)
+
     def test_tag_submission_artifacts_skips_test_mode(self):
         with self.settings(TEST=True), patch(
             "jobs.s3_retention.boto3.client"
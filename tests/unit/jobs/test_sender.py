@@ -96,7 +96,7 @@ def test_publish_submission_message_success(
     assert response == {"MessageId": "12345"}
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_use_host_sqs(
     mock_settings, mock_boto3_resource
@@ -125,7 +125,7 @@ def test_get_or_create_sqs_queue_use_host_sqs(
     assert queue == mock_sqs.get_queue_by_name.return_value
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_challenge_use_host_sqs(
     mock_settings, mock_boto3_resource
@@ -155,7 +155,7 @@ def test_get_or_create_sqs_queue_challenge_use_host_sqs(
     assert queue == mock_sqs.get_queue_by_name.return_value
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_no_challenge(
     mock_settings, mock_boto3_resource
@@ -179,7 +179,7 @@ def test_get_or_create_sqs_queue_no_challenge(
     assert queue == mock_sqs.get_queue_by_name.return_value
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_non_existent_queue(
     mock_settings, mock_boto3_resource
@@ -215,7 +215,7 @@ def test_get_or_create_sqs_queue_non_existent_queue(
     assert queue == mock_created_queue
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_debug_or_test(
     mock_settings, mock_boto3_resource
@@ -242,7 +242,7 @@ def test_get_or_create_sqs_queue_debug_or_test(
     assert queue  # Ensure queue was returned
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_empty_queue_name(
     mock_settings, mock_boto3_resource
@@ -263,7 +263,7 @@ def test_get_or_create_sqs_queue_empty_queue_name(
     assert queue  # Ensure queue was returned
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 @patch("base.utils.logger")
 def test_get_or_create_sqs_queue_logs_exception_for_other_client_error(
@@ -571,7 +571,39 @@ def test_publish_submission_message_standard_no_fifo_params(
     assert "MessageDeduplicationId" not in call_kwargs
 
 
-@patch("base.utils.boto3.resource")
+@patch("jobs.sender.invalidate_sqs_queue_url")
+@patch("jobs.sender.get_or_create_sqs_queue")
+@patch("jobs.sender.Challenge.objects.get")
+def test_publish_submission_message_looks_up_deleted_queue_again(
+    mock_challenge_get,
+    mock_get_or_create_sqs_queue,
+    mock_invalidate_sqs_queue_url,
+    message,
+):
+    mock_challenge = MagicMock()
+    mock_challenge.queue = "test-queue"
+    mock_challenge.slack_webhook_url = ""
+    mock_challenge_get.return_value = mock_challenge
+
+    stale_queue = MagicMock()
+    stale_queue.send_message.side_effect = botocore.exceptions.ClientError(
+        {"Error": {"Code": "AWS.SimpleQueueService.NonExistentQueue"}},
+        "SendMessage",
+    )
+    queue = MagicMock()
+    queue.send_message.return_value = {"MessageId": "12345"}
+    mock_get_or_create_sqs_queue.side_effect = [stale_queue, queue]
+
+    response = publish_submission_message(message)
+
+    assert response == {"MessageId": "12345"}
+    mock_invalidate_sqs_queue_url.assert_called_once_with(
+        "test-queue", mock_challenge
+    )
+    assert mock_get_or_create_sqs_queue.call_count == 2
+
+
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_fifo_sets_fifo_attribute(
     mock_settings, mock_boto3_resource
@@ -601,7 +633,7 @@ def test_get_or_create_sqs_queue_fifo_sets_fifo_attribute(
     assert queue == mock_created_queue
 
 
-@patch("base.utils.boto3.resource")
+@patch("base.aws_clients.boto3.resource")
 @patch("base.utils.settings")
 def test_get_or_create_sqs_queue_fifo_debug_mode(
     mock_settings, mock_boto3_resource
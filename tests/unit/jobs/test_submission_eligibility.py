@@ -0,0 +1,165 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from challenges.models import Challenge, ChallengePhase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from hosts.models import ChallengeHost, ChallengeHostTeam
+from jobs.models import Submission
+from jobs.submission_eligibility import (
+    get_challenge_and_phase,
+    get_submission_eligibility,
+)
+from participants.models import Participant, ParticipantTeam
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch(
+    "challenges.models.transaction.on_commit",
+    side_effect=lambda callback: callback(),
+)
+class SubmissionEligibilityTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.host = User.objects.create(
+            username="hostuser",
+            email="host@test.com",
+            password="secret_password",
+        )
+        self.user = User.objects.create(
+            username="someuser",
+            email="user@test.com",
+            password="secret_password",
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.host
+        )
+        ChallengeHost.objects.create(
+            user=self.host,
+            team_name=self.challenge_host_team,
+            status=ChallengeHost.ACCEPTED,
+            permissions=ChallengeHost.ADMIN,
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        self.challenge_phase = ChallengePhase.objects.create(
+            name="Challenge Phase",
+            codename="phase",
+            description="Description for Challenge Phase",
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            challenge=self.challenge,
+            max_submissions_per_day=100,
+            max_submissions_per_month=100,
+            max_submissions=100,
+        )
+        self.participant_team = ParticipantTeam.objects.create(
+            team_name="Participant Team", created_by=self.user
+        )
+        Participant.objects.create(
+            user=self.user, status=Participant.SELF, team=self.participant_team
+        )
+        self.challenge.participant_teams.add(self.participant_team)
+
+    def create_submission(self, submission_status):
+        submission = Submission.objects.create(
+            participant_team=self.participant_team,
+            challenge_phase=self.challenge_phase,
+            created_by=self.user,
+            input_file=SimpleUploadedFile(
+                "submission.json", b"{}", content_type="application/json"
+            ),
+        )
+        Submission.objects.filter(pk=submission.pk).update(
+            status=submission_status
+        )
+
+    def test_challenge_and_phase_are_cached_until_saved(self, mock_on_commit):
+        get_challenge_and_phase(self.challenge.pk, self.challenge_phase.pk)
+
+        with self.assertNumQueries(0):
+            challenge, challenge_phase = get_challenge_and_phase(
+                self.challenge.pk, self.challenge_phase.pk
+            )
+            self.assertEqual(challenge_phase.challenge, challenge)
+        self.assertFalse(challenge.is_submission_paused)
+
+        self.challenge.is_submission_paused = True
+        self.challenge.save()
+        challenge, _ = get_challenge_and_phase(
+            self.challenge.pk, self.challenge_phase.pk
+        )
+        self.assertTrue(challenge.is_submission_paused)
+
+    def test_phase_of_another_challenge_does_not_exist(self, mock_on_commit):
+        with self.assertRaises(Challenge.DoesNotExist):
+            get_challenge_and_phase(
+                self.challenge.pk + 1000, self.challenge_phase.pk
+            )
+        other_challenge = Challenge.objects.create(
+            title="Other Challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        with self.assertRaises(ChallengePhase.DoesNotExist):
+            get_challenge_and_phase(
+                other_challenge.pk, self.challenge_phase.pk
+            )
+
+    def test_eligibility_is_resolved_with_two_queries(self, mock_on_commit):
+        self.challenge.manual_participant_approval = True
+        self.challenge.banned_email_ids = ["user@test.com"]
+        self.challenge.save()
+        self.create_submission(Submission.RUNNING)
+        self.create_submission(Submission.SUBMITTED)
+        self.create_submission(Submission.FINISHED)
+
+        with self.assertNumQueries(2):
+            eligibility = get_submission_eligibility(
+                self.user, self.challenge, self.challenge_phase
+            )
+        participant_team = eligibility["participant_team"]
+
+        self.assertFalse(eligibility["is_host"])
+        self.assertEqual(participant_team, self.participant_team)
+        self.assertFalse(participant_team.is_approved)
+        self.assertTrue(participant_team.is_banned)
+        self.assertEqual(participant_team.submissions_in_progress, 2)
+
+    def test_eligibility_of_eligible_team(self, mock_on_commit):
+        self.challenge.manual_participant_approval = True
+        self.challenge.banned_email_ids = ["other@test.com"]
+        self.challenge.save()
+        self.challenge.approved_participant_teams.add(self.participant_team)
+
+        participant_team = get_submission_eligibility(
+            self.user, self.challenge, self.challenge_phase
+        )["participant_team"]
+
+        self.assertTrue(participant_team.is_approved)
+        self.assertFalse(participant_team.is_banned)
+        self.assertEqual(participant_team.submissions_in_progress, 0)
+
+    def test_eligibility_of_host_without_team(self, mock_on_commit):
+        eligibility = get_submission_eligibility(
+            self.host, self.challenge, self.challenge_phase
+        )
+
+        self.assertTrue(eligibility["is_host"])
+        self.assertIsNone(eligibility["participant_team"])
@@ -0,0 +1,204 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from challenges.models import Challenge, ChallengePhase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from hosts.models import ChallengeHostTeam
+from jobs.models import Submission
+from jobs.submission_quota import (
+    count_submissions,
+    get_submission_counts,
+    invalidate_submission_counts,
+)
+from participants.models import ParticipantTeam
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "throttling": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+}
+
+
+@override_settings(CACHES=LOCMEM_CACHES)
+@patch(
+    "jobs.models.transaction.on_commit",
+    side_effect=lambda callback: callback(),
+)
+class SubmissionQuotaTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(
+            username="someuser",
+            email="user@test.com",
+            password="secret_password",
+        )
+        self.challenge_host_team = ChallengeHostTeam.objects.create(
+            team_name="Test Challenge Host Team", created_by=self.user
+        )
+        self.challenge = Challenge.objects.create(
+            title="Test Challenge",
+            description="Description for test challenge",
+            terms_and_conditions="Terms and conditions for test challenge",
+            submission_guidelines="Submission guidelines for test challenge",
+            creator=self.challenge_host_team,
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+        )
+        self.challenge_phase_1 = self.create_challenge_phase(
+            "Phase 1", "phase_1"
+        )
+        self.challenge_phase_2 = self.create_challenge_phase(
+            "Phase 2", "phase_2"
+        )
+        self.participant_team = ParticipantTeam.objects.create(
+            team_name="Participant Team", created_by=self.user
+        )
+
+    def create_challenge_phase(self, name, codename):
+        return ChallengePhase.objects.create(
+            name=name,
+            codename=codename,
+            description="Description for {}".format(name),
+            start_date=timezone.now() - timedelta(days=2),
+            end_date=timezone.now() + timedelta(days=1),
+            challenge=self.challenge,
+            max_submissions_per_day=100,
+            max_submissions_per_month=100,
+            max_submissions=100,
+        )
+
+    def create_submission(self, challenge_phase):
+        return Submission.objects.create(
+            participant_team=self.participant_team,
+            challenge_phase=challenge_phase,
+            created_by=self.user,
+            status=Submission.SUBMITTED,
+            input_file=SimpleUploadedFile(
+                "submission.json", b"{}", content_type="application/json"
+            ),
+        )
+
+    def get_counts(self, challenge_phase):
+        return get_submission_counts(
+            self.participant_team.pk, [challenge_phase.pk]
+        )[challenge_phase.pk]
+
+    def test_counts_of_all_phases_come_from_one_query(self, mock_on_commit):
+        self.create_submission(self.challenge_phase_1)
+        self.create_submission(self.challenge_phase_1)
+        self.create_submission(self.challenge_phase_2)
+        invalidate_submission_counts(
+            self.challenge_phase_1.pk, self.participant_team.pk
+        )
+        invalidate_submission_counts(
+            self.challenge_phase_2.pk, self.participant_team.pk
+        )
+
+        with self.assertNumQueries(1):
+            counts = get_submission_counts(
+                self.participant_team.pk,
+                [self.challenge_phase_1.pk, self.challenge_phase_2.pk],
+            )
+
+        self.assertEqual(
+            counts[self.challenge_phase_1.pk],
+            {
+                "submissions_count": 2,
+                "submissions_this_month_count": 2,
+                "submissions_today_count": 2,
+            },
+        )
+        self.assertEqual(
+            counts[self.challenge_phase_2.pk]["submissions_count"], 1
+        )
+
+    def test_cached_counts_are_served_without_queries(self, mock_on_commit):
+        self.create_submission(self.challenge_phase_1)
+        self.get_counts(self.challenge_phase_1)
+
+        with self.assertNumQueries(0):
+            counts = self.get_counts(self.challenge_phase_1)
+
+        self.assertEqual(counts["submissions_count"], 1)
+
+    def test_new_submission_is_counted_again(self, mock_on_commit):
+        self.get_counts(self.challenge_phase_1)
+
+        self.create_submission(self.challenge_phase_1)
+
+        with self.assertNumQueries(1):
+            counts = self.get_counts(self.challenge_phase_1)
+        self.assertEqual(counts["submissions_count"], 1)
+        self.assertEqual(counts["submissions_today_count"], 1)
+
+    def test_failed_and_deleted_submissions_are_taken_off_cached_counts(
+        self, mock_on_commit
+    ):
+        failed_submission = self.create_submission(self.challenge_phase_1)
+        deleted_submission = self.create_submission(self.challenge_phase_1)
+        self.get_counts(self.challenge_phase_1)
+
+        failed_submission.status = Submission.FAILED
+        failed_submission.save()
+        deleted_submission.delete()
+
+        counts = self.get_counts(self.challenge_phase_1)
+        self.assertEqual(counts["submissions_count"], 0)
+        self.assertEqual(counts["submissions_this_month_count"], 0)
+
+    def test_status_change_between_counted_statuses_keeps_counts(
+        self, mock_on_commit
+    ):
+        submission = self.create_submission(self.challenge_phase_1)
+        self.get_counts(self.challenge_phase_1)
+
+        submission.status = Submission.RUNNING
+        submission.save()
+        submission.status = Submission.FINISHED
+        submission.save()
+
+        self.assertEqual(
+            self.get_counts(self.challenge_phase_1)["submissions_count"], 1
+        )
+
+    def test_counts_taken_before_a_commit_are_not_served_after_it(
+        self, mock_on_commit
+    ):
+        def count_then_commit_submission(*args):
+            counts = count_submissions(*args)
+            # A submission commits after the counts were taken, before they
+            # are cached. Making it counts the submissions too.
+            if not mock_count_submissions.committed:
+                mock_count_submissions.committed = True
+                self.create_submission(self.challenge_phase_1)
+            return counts
+
+        with patch(
+            "jobs.submission_quota.count_submissions",
+            side_effect=count_then_commit_submission,
+        ) as mock_count_submissions:
+            mock_count_submissions.committed = False
+            stale_counts = self.get_counts(self.challenge_phase_1)
+
+        self.assertEqual(stale_counts["submissions_count"], 0)
+        self.assertEqual(
+            self.get_counts(self.challenge_phase_1)["submissions_count"], 1
+        )
+
+    def test_older_submissions_only_count_towards_total(self, mock_on_commit):
+        submission = self.create_submission(self.challenge_phase_1)
+        Submission.objects.filter(pk=submission.pk).update(
+            submitted_at=timezone.now() - timedelta(days=40)
+        )
+        invalidate_submission_counts(
+            self.challenge_phase_1.pk, self.participant_team.pk
+        )
+
+        counts = self.get_counts(self.challenge_phase_1)
+
+        self.assertEqual(counts["submissions_count"], 1)
+        self.assertEqual(counts["submissions_this_month_count"], 0)
+        self.assertEqual(counts["submissions_today_count"], 0)
@@ -7,6 +7,7 @@ from jobs.tasks import (
 )
 
 
+@patch("jobs.tasks.is_url_valid", return_value=True)
 @patch("jobs.tasks.get_participant_team_id_of_user_for_a_challenge")
 @patch("jobs.tasks.ParticipantTeam.objects.get")
 @patch("jobs.tasks.User.objects.get")
@@ -30,6 +31,7 @@ def test_download_file_and_publish_submission_message_success(
     mock_user_get,
     mock_participant_team_get,
     mock_get_participant_team_id,
+    mock_is_url_valid,
 ):
     mock_user = MagicMock()
     mock_user_get.return_value = mock_user
@@ -120,6 +122,7 @@ def test_tag_submission_artifact_retention_tags_handles_missing_submission(
     mock_tag_fn.assert_not_called()
 
 
+@patch("jobs.tasks.is_url_valid", return_value=True)
 @patch("jobs.tasks.get_participant_team_id_of_user_for_a_challenge")
 @patch("jobs.tasks.ParticipantTeam.objects.get")
 @patch("jobs.tasks.User.objects.get")
@@ -135,6 +138,7 @@ def test_download_file_and_publish_submission_message_exception(
     mock_user_get,
     mock_participant_team_get,
     mock_get_participant_team_id,
+    mock_is_url_valid,
 ):
     mock_user = MagicMock()
     mock_user_get.return_value = mock_user
@@ -168,6 +172,7 @@ def test_download_file_and_publish_submission_message_exception(
     mock_rmtree.assert_not_called()
 
 
+@patch("jobs.tasks.is_url_valid", return_value=True)
 @patch("jobs.tasks.get_participant_team_id_of_user_for_a_challenge")
 @patch("jobs.tasks.ParticipantTeam.objects.get")
 @patch("jobs.tasks.User.objects.get")
@@ -185,6 +190,7 @@ def test_download_file_and_publish_submission_message_exception_with_temp_dir(
     mock_user_get,
     mock_participant_team_get,
     mock_get_participant_team_id,
+    mock_is_url_valid,
 ):
     mock_user = MagicMock()
     mock_user_get.return_value = mock_user
@@ -300,3 +306,178 @@ def test_download_file_and_publish_submission_message_skipped_when_phase_paused(
     mock_publish.assert_not_called()
     mock_get_participant_team_id.assert_not_called()
     mock_participant_team_get.assert_not_called()
+
+
+@patch("jobs.tasks.is_url_valid", return_value=True)
+@patch("jobs.tasks.settings")
+@patch("jobs.tasks.get_participant_team_id_of_user_for_a_challenge")
+@patch("jobs.tasks.ParticipantTeam.objects.get")
+@patch("jobs.tasks.User.objects.get")
+@patch("jobs.tasks.ChallengePhase.objects.get")
+@patch("jobs.tasks.SubmissionSerializer")
+@patch("jobs.s3_retention.get_s3_client_and_bucket")
+@patch("jobs.tasks.upload_file_from_url_to_s3")
+@patch("jobs.tasks.publish_submission_message")
+@patch("jobs.tasks.trigger_eks_node_autoscale")
+@patch("jobs.s3_retention.enqueue_submission_artifact_retention_tagging")
+def test_download_file_and_publish_submission_message_streams_to_s3(
+    mock_enqueue_tagging,
+    mock_autoscale,
+    mock_publish,
+    mock_upload,
+    mock_get_s3_client_and_bucket,
+    mock_serializer,
+    mock_challenge_phase_get,
+    mock_user_get,
+    mock_participant_team_get,
+    mock_get_participant_team_id,
+    mock_settings,
+    mock_is_url_valid,
+):
+    mock_settings.DEBUG = False
+    mock_settings.TEST = False
+    mock_settings.MEDIAFILES_LOCATION = "media"
+    mock_challenge_phase = MagicMock()
+    mock_challenge_phase.challenge.pk = 1
+    mock_challenge_phase.pk = 2
+    mock_challenge_phase.challenge.is_submission_paused = False
+    mock_challenge_phase.is_submission_paused = False
+    mock_challenge_phase_get.return_value = mock_challenge_phase
+    mock_s3_client = MagicMock()
+    mock_get_s3_client_and_bucket.return_value = (
+        mock_s3_client,
+        "evalai-media",
+    )
+    mock_serializer_instance = MagicMock()
+    mock_serializer_instance.is_valid.return_value = True
+    mock_serializer_instance.instance.pk = 123
+    mock_serializer_instance.instance.input_file.name = (
+        "submission_files/foo/bar.zip"
+    )
+    mock_serializer.return_value = mock_serializer_instance
+    mock_upload.return_value = {"size": 10, "sha256": "abc"}
+
+    request_data = {
+        "file_url": "http://test/bar.zip",
+        "method_name": "test",
+        "method_description": "desc",
+        "project_url": "http://project",
+        "publication_url": "http://pub",
+    }
+
+    download_file_and_publish_submission_message(
+        request_data, user_pk=1, request_method="POST", challenge_phase_id=2
+    )
+
+    mock_upload.assert_called_once_with(
+        "http://test/bar.zip",
+        mock_s3_client,
+        "evalai-media",
+        "media/submission_files/foo/bar.zip",
+    )
+    mock_publish.assert_called_once_with(
+        {"challenge_pk": 1, "phase_pk": 2, "submission_pk": 123}
+    )
+
+
+@patch("jobs.tasks.is_url_valid", return_value=True)
+@patch("jobs.tasks.settings")
+@patch("jobs.tasks.get_participant_team_id_of_user_for_a_challenge")
+@patch("jobs.tasks.ParticipantTeam.objects.get")
+@patch("jobs.tasks.User.objects.get")
+@patch("jobs.tasks.ChallengePhase.objects.get")
+@patch("jobs.tasks.SubmissionSerializer")
+@patch("jobs.s3_retention.get_s3_client_and_bucket")
+@patch("jobs.tasks.upload_file_from_url_to_s3")
+@patch("jobs.tasks.publish_submission_message")
+@patch("jobs.tasks.logger")
+def test_download_file_and_publish_submission_message_failed_stream(
+    mock_logger,
+    mock_publish,
+    mock_upload,
+    mock_get_s3_client_and_bucket,
+    mock_serializer,
+    mock_challenge_phase_get,
+    mock_user_get,
+    mock_participant_team_get,
+    mock_get_participant_team_id,
+    mock_settings,
+    mock_is_url_valid,
+):
+    mock_settings.DEBUG = False
+    mock_settings.TEST = False
+    mock_challenge_phase = MagicMock()
+    mock_challenge_phase.challenge.is_submission_paused = False
+    mock_challenge_phase.is_submission_paused = False
+    mock_challenge_phase_get.return_value = mock_challenge_phase
+    mock_serializer_instance = MagicMock()
+    mock_serializer_instance.is_valid.return_value = True
+    mock_serializer.return_value = mock_serializer_instance
+    mock_get_s3_client_and_bucket.return_value = (MagicMock(), "evalai")
+    mock_upload.side_effect = ValueError("Truncated download")
+
+    request_data = {
+        "file_url": "http://test/bar.zip",
+        "method_name": "test",
+        "method_description": "desc",
+        "project_url": "http://project",
+        "publication_url": "http://pub",
+    }
+
+    download_file_and_publish_submission_message(
+        request_data, user_pk=1, request_method="POST", challenge_phase_id=2
+    )
+
+    submission = mock_serializer_instance.instance
+    assert submission.status == Submission.FAILED
+    submission.save.assert_called_once_with()
+    mock_publish.assert_not_called()
+    mock_logger.exception.assert_called_once()
+
+
+@patch("jobs.tasks.is_url_valid", return_value=False)
+@patch("jobs.tasks.get_participant_team_id_of_user_for_a_challenge")
+@patch("jobs.tasks.ParticipantTeam.objects.get")
+@patch("jobs.tasks.User.objects.get")
+@patch("jobs.tasks.ChallengePhase.objects.get")
+@patch("jobs.tasks.SubmissionSerializer")
+@patch("jobs.tasks.publish_submission_message")
+@patch("jobs.tasks.logger")
+def test_download_file_and_publish_submission_message_invalid_url(
+    mock_logger,
+    mock_publish,
+    mock_serializer,
+    mock_challenge_phase_get,
+    mock_user_get,
+    mock_participant_team_get,
+    mock_get_participant_team_id,
+    mock_is_url_valid,
+):
+    mock_challenge_phase = MagicMock()
+    mock_challenge_phase.challenge.is_submission_paused = False
+    mock_challenge_phase.is_submission_paused = False
+    mock_challenge_phase_get.return_value = mock_challenge_phase
+
+    request_data = {
+        "file_url": "http://test/missing.zip",
+        "method_name": "test",
+        "method_description": "desc",
+        "project_url": "http://project",
+        "publication_url": "http://pub",
+    }
+
+    download_file_and_publish_submission_message(
+        request_data, user_pk=1, request_method="POST", challenge_phase_id=2
+    )
+
+    mock_is_url_valid.assert_called_once_with("http://test/missing.zip")
+    mock_logger.warning.assert_called_once()
+    data = mock_serializer.call_args[1]["data"]
+    assert data["status"] == Submission.FAILED
+    assert data["input_file"].name == "missing.zip"
+    submission = mock_serializer.return_value.instance
+    submission.stderr_file.save.assert_called_once()
+    name, content = submission.stderr_file.save.call_args[0]
+    assert name == "stderr.txt"
+    assert "http://test/missing.zip" in content.read()
+    mock_publish.assert_not_called()
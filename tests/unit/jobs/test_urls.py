@@ -227,3 +227,15 @@ class TestJobsUrls(BaseAPITestClass):
             "jobs:delete_submission_message_from_queue",
         )
         self.assertEqual(delete_resolver.kwargs["queue_name"], fifo_queue)
+
+    def test_fifo_queue_name_resolves_for_batch_sqs_worker_apis(self):
+        fifo_queue = "challenge-title-1-production-abcd.fifo"
+        view_names = {
+            "/api/jobs/challenge/queues/{}/messages/": "jobs:get_submission_messages_from_queue",
+            "/api/jobs/queues/{}/messages/delete/": "jobs:delete_submission_messages_from_queue",
+            "/api/jobs/queues/{}/messages/visibility/": "jobs:change_submission_messages_visibility",
+        }
+        for url, view_name in view_names.items():
+            resolver = resolve(url.format(fifo_queue))
+            self.assertEqual(resolver.view_name, view_name)
+            self.assertEqual(resolver.kwargs["queue_name"], fifo_queue)
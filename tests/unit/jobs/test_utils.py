@@ -1,9 +1,12 @@
+import hashlib
 import os
 import unittest
 from unittest import TestCase, mock
 from unittest.mock import MagicMock, Mock, patch
 from urllib.error import HTTPError
 
+import boto3
+from django.test import SimpleTestCase, override_settings
 from jobs.utils import (
     calculate_distinct_sorted_leaderboard_data,
     get_file_from_url,
@@ -14,11 +17,23 @@ from jobs.utils import (
     is_url_valid,
     reorder_submissions_comparator_to_key,
     response_if_submissions_paused,
+    upload_file_from_url_to_s3,
 )
 from jobs.views import _compute_remaining_limits
+from moto import mock_s3
 from rest_framework import status
 
 
+def get_submission_counts_of_phase(total, this_month, today):
+    return {
+        1: {
+            "submissions_count": total,
+            "submissions_this_month_count": this_month,
+            "submissions_today_count": today,
+        }
+    }
+
+
 class TestUtils(unittest.TestCase):
     @patch("urllib.request.urlopen")
     def test_is_url_valid(self, mock_urlopen):
@@ -70,29 +85,26 @@ class TestUtils(unittest.TestCase):
         )
         self.assertEqual(status_code, 200)
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_for_a_phase_max_limit(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 1
         mock_challenge_phase.max_submissions_per_month = 5
         mock_challenge_phase.max_submissions_per_day = 2
         mock_get_challenge_phase_model.return_value = mock_challenge_phase
         mock_get_team_id.return_value = 123
 
-        mock_qs = MagicMock()
-        mock_qs.count.return_value = 1
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(1, 1, 1)
         )
-        mock_qs.filter.return_value = mock_qs
 
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1
@@ -103,31 +115,27 @@ class TestUtils(unittest.TestCase):
             "You have exhausted maximum submission limit!", response["message"]
         )
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_for_a_phase_monthly_and_daily_limit(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         # Setup mocks
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 10
         mock_challenge_phase.max_submissions_per_month = 2
         mock_challenge_phase.max_submissions_per_day = 1
         mock_get_challenge_phase_model.return_value = mock_challenge_phase
         mock_get_team_id.return_value = 123
 
-        mock_qs = MagicMock()
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(1, 2, 0)
         )
-        mock_qs.filter.return_value = mock_qs
-
-        mock_qs.count.side_effect = [1, 2, 0]
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1
         )
@@ -138,7 +146,9 @@ class TestUtils(unittest.TestCase):
         )
         self.assertIn("remaining_time", response)
 
-        mock_qs.count.side_effect = [1, 2, 1]
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(1, 2, 1)
+        )
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1
         )
@@ -149,37 +159,35 @@ class TestUtils(unittest.TestCase):
         )
         self.assertIn("remaining_time", response)
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_for_a_phase_both_monthly_and_daily_limit(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 10
         mock_challenge_phase.max_submissions_per_month = 2
         mock_challenge_phase.max_submissions_per_day = 1
         mock_get_challenge_phase_model.return_value = mock_challenge_phase
         mock_get_team_id.return_value = 123
 
-        mock_qs = MagicMock()
-
-        mock_qs.count.side_effect = [1, 2, 1]
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(1, 2, 1)
         )
-        mock_qs.filter.return_value = mock_qs
 
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1
         )
         self.assertEqual(status_code, 200)
 
-        mock_qs.count.side_effect = [1, 2, 2]
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(1, 2, 2)
+        )
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1
         )
@@ -190,29 +198,26 @@ class TestUtils(unittest.TestCase):
         )
         self.assertIn("remaining_time", response)
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_for_a_phase_with_prefetched_phase(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         """Test that passing a pre-fetched challenge_phase avoids N+1 queries."""
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 10
         mock_challenge_phase.max_submissions_per_month = 5
         mock_challenge_phase.max_submissions_per_day = 2
         mock_get_team_id.return_value = 123
 
-        mock_qs = MagicMock()
-        mock_qs.count.return_value = 0
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(0, 0, 0)
         )
-        mock_qs.filter.return_value = mock_qs
 
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1, challenge_phase=mock_challenge_phase
@@ -223,30 +228,27 @@ class TestUtils(unittest.TestCase):
         self.assertIn("remaining_submissions_count", response)
         self.assertEqual(response["remaining_submissions_count"], 10)
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_for_a_phase_without_prefetched_phase(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         """Test backward compatibility - when challenge_phase is not passed, it's fetched."""
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 10
         mock_challenge_phase.max_submissions_per_month = 5
         mock_challenge_phase.max_submissions_per_day = 2
         mock_get_challenge_phase_model.return_value = mock_challenge_phase
         mock_get_team_id.return_value = 123
 
-        mock_qs = MagicMock()
-        mock_qs.count.return_value = 0
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(0, 0, 0)
         )
-        mock_qs.filter.return_value = mock_qs
 
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1
@@ -256,28 +258,25 @@ class TestUtils(unittest.TestCase):
         mock_get_challenge_phase_model.assert_called_once_with(1)
         self.assertIn("remaining_submissions_count", response)
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_with_prefetched_participant_team_pk(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         """Test that passing participant_team_pk skips the DB lookup."""
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 10
         mock_challenge_phase.max_submissions_per_month = 5
         mock_challenge_phase.max_submissions_per_day = 2
 
-        mock_qs = MagicMock()
-        mock_qs.count.return_value = 0
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(0, 0, 0)
         )
-        mock_qs.filter.return_value = mock_qs
 
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user,
@@ -293,29 +292,26 @@ class TestUtils(unittest.TestCase):
         self.assertIn("remaining_submissions_count", response)
         self.assertEqual(response["remaining_submissions_count"], 10)
 
-    @patch("jobs.utils.Submission")
+    @patch("jobs.utils.get_submission_counts")
     @patch("jobs.utils.get_participant_team_id_of_user_for_a_challenge")
     @patch("jobs.utils.get_challenge_phase_model")
     def test_get_remaining_submission_without_participant_team_pk_falls_back(
         self,
         mock_get_challenge_phase_model,
         mock_get_team_id,
-        mock_Submission,
+        mock_get_submission_counts,
     ):
         """Test that omitting participant_team_pk still calls the lookup (backward compat)."""
         mock_user = MagicMock()
-        mock_challenge_phase = MagicMock()
+        mock_challenge_phase = MagicMock(pk=1)
         mock_challenge_phase.max_submissions = 10
         mock_challenge_phase.max_submissions_per_month = 5
         mock_challenge_phase.max_submissions_per_day = 2
         mock_get_team_id.return_value = 789
 
-        mock_qs = MagicMock()
-        mock_qs.count.return_value = 0
-        mock_Submission.objects.filter.return_value.exclude.return_value = (
-            mock_qs
+        mock_get_submission_counts.return_value = (
+            get_submission_counts_of_phase(0, 0, 0)
         )
-        mock_qs.filter.return_value = mock_qs
 
         response, status_code = get_remaining_submission_for_a_phase(
             mock_user, 1, 1, challenge_phase=mock_challenge_phase
@@ -411,6 +407,93 @@ class TestUtils(unittest.TestCase):
         self.assertEqual(status_code, 200)
 
 
+@mock_s3
+@override_settings(SUBMISSION_URL_UPLOAD_PART_SIZE=5 * 1024 * 1024)
+class TestUploadFileFromUrlToS3(SimpleTestCase):
+    def setUp(self):
+        self.s3 = boto3.client("s3", region_name="us-east-1")
+        self.s3.create_bucket(Bucket="evalai-test")
+        self.content = os.urandom(11 * 1024 * 1024)
+
+    def mock_response(self, mock_get, content_length):
+        mock_response = MagicMock()
+        mock_response.headers = {"Content-Length": str(content_length)}
+        mock_response.iter_content = lambda chunk_size: (
+            self.content[index : index + chunk_size]
+            for index in range(0, len(self.content), chunk_size)
+        )
+        mock_get.return_value.__enter__.return_value = mock_response
+
+    @patch("jobs.utils.requests.get")
+    def test_file_is_streamed_in_parts(self, mock_get):
+        self.mock_response(mock_get, len(self.content))
+
+        uploaded_file = upload_file_from_url_to_s3(
+            "http://example.com/file.zip", self.s3, "evalai-test", "file.zip"
+        )
+
+        self.assertEqual(uploaded_file["size"], len(self.content))
+        self.assertEqual(
+            uploaded_file["sha256"], hashlib.sha256(self.content).hexdigest()
+        )
+        uploaded_object = self.s3.get_object(
+            Bucket="evalai-test", Key="file.zip"
+        )
+        self.assertEqual(uploaded_object["Body"].read(), self.content)
+        self.assertTrue(uploaded_object["ETag"].endswith('-3"'))
+
+    @patch("jobs.utils.requests.get")
+    def test_kms_encrypted_upload_is_kept(self, mock_get):
+        self.mock_response(mock_get, len(self.content))
+        complete_multipart_upload = self.s3.complete_multipart_upload
+
+        def complete_kms_encrypted_upload(**kwargs):
+            # The ETag of a KMS encrypted object isn't derived from the MD5
+            # of its parts
+            response = complete_multipart_upload(**kwargs)
+            response["ETag"] = '"1b2cf535f27731c974343645a3985328"'
+            response["ServerSideEncryption"] = "aws:kms"
+            return response
+
+        with patch.object(
+            self.s3,
+            "complete_multipart_upload",
+            side_effect=complete_kms_encrypted_upload,
+        ):
+            uploaded_file = upload_file_from_url_to_s3(
+                "http://example.com/file.zip",
+                self.s3,
+                "evalai-test",
+                "file.zip",
+            )
+
+        self.assertEqual(uploaded_file["size"], len(self.content))
+        uploaded_object = self.s3.get_object(
+            Bucket="evalai-test", Key="file.zip"
+        )
+        self.assertEqual(uploaded_object["Body"].read(), self.content)
+
+    @patch("jobs.utils.requests.get")
+    def test_truncated_download_aborts_upload(self, mock_get):
+        self.mock_response(mock_get, len(self.content) + 1)
+
+        with self.assertRaises(ValueError):
+            upload_file_from_url_to_s3(
+                "http://example.com/truncated.zip",
+                self.s3,
+                "evalai-test",
+                "truncated.zip",
+            )
+
+        self.assertNotIn(
+            "Uploads", self.s3.list_multipart_uploads(Bucket="evalai-test")
+        )
+        self.assertNotIn(
+            "Contents",
+            self.s3.list_objects(Bucket="evalai-test", Prefix="truncated"),
+        )
+
+
 class TestHandleSubmissionResume(unittest.TestCase):
     @mock.patch("jobs.utils.SubmissionSerializer")
     @mock.patch("jobs.utils.timezone.now")
@@ -610,6 +693,7 @@ class TestReorderSubmissionsComparator(TestCase):
         # Test data for leaderboard entries
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -670,6 +754,7 @@ class TestReorderSubmissionsComparator(TestCase):
         # Test data for leaderboard entries
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -731,6 +816,7 @@ class TestReorderSubmissionsComparator(TestCase):
         # Test data for leaderboard entries
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -739,6 +825,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": 10, "time": 5},
             },
             {
+                "id": 9,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -747,6 +834,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": 8, "time": 6},
             },
             {
+                "id": 8,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Team2",
                 "submission__is_baseline": False,
@@ -823,6 +911,7 @@ class TestReorderSubmissionsComparator(TestCase):
         # Test data for leaderboard entries
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -831,6 +920,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": 10, "time": 5},
             },
             {
+                "id": 9,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Team2",
                 "submission__is_baseline": False,
@@ -905,6 +995,7 @@ class TestReorderSubmissionsComparator(TestCase):
 
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -913,6 +1004,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": 10, "time": 5},
             },
             {
+                "id": 9,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Team2",
                 "submission__is_baseline": False,
@@ -974,6 +1066,7 @@ class TestReorderSubmissionsComparator(TestCase):
 
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -1010,6 +1103,7 @@ class TestReorderSubmissionsComparator(TestCase):
 
         test_data = [
             {
+                "id": 9,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -1018,6 +1112,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": 10, "time": 5},
             },
             {
+                "id": 8,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Team2",
                 "submission__is_baseline": False,
@@ -1079,6 +1174,7 @@ class TestReorderSubmissionsComparator(TestCase):
         # Many entries from same teams - Team1 appears 5x, Team2 appears 3x
         test_data = [
             {
+                "id": 10 + i,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -1089,6 +1185,7 @@ class TestReorderSubmissionsComparator(TestCase):
             for i in range(10, 5, -1)
         ] + [
             {
+                "id": 20 + i,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Team2",
                 "submission__is_baseline": False,
@@ -1157,6 +1254,7 @@ class TestReorderSubmissionsComparator(TestCase):
 
         test_data = [
             {
+                "id": 10,
                 "submission__participant_team": 1,
                 "submission__participant_team__team_name": "Team1",
                 "submission__is_baseline": False,
@@ -1165,6 +1263,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": "10", "time": "0"},
             },
             {
+                "id": 9,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Baseline",
                 "submission__is_baseline": True,
@@ -1173,6 +1272,7 @@ class TestReorderSubmissionsComparator(TestCase):
                 "result": {"score": "5", "time": "0"},
             },
             {
+                "id": 8,
                 "submission__participant_team": 2,
                 "submission__participant_team__team_name": "Baseline",
                 "submission__is_baseline": True,
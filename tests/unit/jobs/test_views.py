@@ -270,9 +270,8 @@ class BaseAPITestClass(APITestCase):
     @mock.patch(
         "jobs.views.download_file_and_publish_submission_message.delay"
     )
-    @mock.patch("jobs.views.is_url_valid", return_value=True)
     def test_challenge_submission_file_url_not_queued_when_challenge_paused(
-        self, mock_is_url_valid, mock_delay
+        self, mock_delay
     ):
         self.url = reverse_lazy(
             "jobs:challenge_submission",
@@ -714,6 +713,109 @@ class BaseAPITestClass(APITestCase):
         self.assertEqual(response.data, expected)
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
 
+    @mock.patch(
+        "jobs.views.download_file_and_publish_submission_message.delay"
+    )
+    @mock.patch("jobs.utils.urllib.request.urlopen")
+    def test_challenge_submission_file_url_is_queued_without_checking_it(
+        self, mock_urlopen, mock_delay
+    ):
+        self.url = reverse_lazy(
+            "jobs:challenge_submission",
+            kwargs={
+                "challenge_id": self.challenge.pk,
+                "challenge_phase_id": self.challenge_phase.pk,
+            },
+        )
+        self.challenge.participant_teams.add(self.participant_team)
+
+        response = self.client.post(
+            self.url,
+            {
+                "status": "submitting",
+                "file_url": "http://example.com/submission.bin",
+                "method_name": "test",
+                "method_description": "desc",
+                "project_url": "http://project.example.com",
+                "publication_url": "http://pub.example.com",
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        mock_urlopen.assert_not_called()
+        mock_delay.assert_called_once()
+
+    def test_challenge_submission_when_team_is_not_approved(self):
+        self.url = reverse_lazy(
+            "jobs:challenge_submission",
+            kwargs={
+                "challenge_id": self.challenge.pk,
+                "challenge_phase_id": self.challenge_phase.pk,
+            },
+        )
+        self.challenge.participant_teams.add(self.participant_team)
+        self.challenge.manual_participant_approval = True
+        self.challenge.save()
+
+        response = self.client.post(
+            self.url,
+            {"status": "submitting", "input_file": self.input_file},
+            format="multipart",
+        )
+        self.assertEqual(
+            response.data,
+            {"error": "Your team is not approved by challenge host"},
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_challenge_submission_when_team_member_is_banned(self):
+        self.url = reverse_lazy(
+            "jobs:challenge_submission",
+            kwargs={
+                "challenge_id": self.challenge.pk,
+                "challenge_phase_id": self.challenge_phase.pk,
+            },
+        )
+        self.challenge.participant_teams.add(self.participant_team)
+        self.challenge.banned_email_ids = ["other@test.com", "user1@test.com"]
+        self.challenge.save()
+
+        response = self.client.post(
+            self.url,
+            {"status": "submitting", "input_file": self.input_file},
+            format="multipart",
+        )
+        self.assertIn("has been banned", response.data["error"])
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_challenge_submission_when_too_many_submissions_in_progress(self):
+        self.url = reverse_lazy(
+            "jobs:challenge_submission",
+            kwargs={
+                "challenge_id": self.challenge.pk,
+                "challenge_phase_id": self.challenge_phase.pk,
+            },
+        )
+        self.challenge.participant_teams.add(self.participant_team)
+        self.challenge_phase.max_concurrent_submissions_allowed = 1
+        self.challenge_phase.save()
+        Submission.objects.create(
+            participant_team=self.participant_team,
+            challenge_phase=self.challenge_phase,
+            created_by=self.user1,
+            input_file=self.challenge_phase.test_annotation,
+        )
+
+        response = self.client.post(
+            self.url,
+            {"status": "submitting", "input_file": self.input_file},
+            format="multipart",
+        )
+        self.assertIn(
+            "submissions that are being processed", response.data["error"]
+        )
+        self.assertEqual(response.status_code, status.HTTP_406_NOT_ACCEPTABLE)
+
 
 class GetChallengeSubmissionTest(BaseAPITestClass):
     def setUp(self):
@@ -858,6 +960,45 @@ class GetChallengeSubmissionTest(BaseAPITestClass):
         self.assertEqual(response.data["results"], expected)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_get_challenge_submissions_lists_in_progress_first(self):
+        now = timezone.now()
+        submissions = {}
+        for name, submission_status, minutes_ago in (
+            ("old_finished", Submission.FINISHED, 50),
+            ("old_running", Submission.RUNNING, 40),
+            ("new_failed", Submission.FAILED, 5),
+            ("new_submitted", Submission.SUBMITTED, 1),
+        ):
+            submission = Submission.objects.create(
+                participant_team=self.participant_team,
+                challenge_phase=self.challenge_phase,
+                created_by=self.user,
+                input_file=self.challenge_phase.test_annotation,
+            )
+            Submission.objects.filter(pk=submission.pk).update(
+                status=submission_status,
+                submitted_at=now - timedelta(minutes=minutes_ago),
+            )
+            submissions[name] = submission.pk
+        Submission.objects.filter(pk=self.submission.pk).update(
+            submitted_at=now - timedelta(minutes=30)
+        )
+        self.challenge.participant_teams.add(self.participant_team)
+
+        response = self.client.get(self.url, {})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [submission["id"] for submission in response.data["results"]],
+            [
+                submissions["old_running"],
+                self.submission.pk,
+                submissions["new_submitted"],
+                submissions["new_failed"],
+                submissions["old_finished"],
+            ],
+        )
+
 
 class GetRemainingSubmissionTest(BaseAPITestClass):
     def setUp(self):
@@ -3396,3 +3537,265 @@ class PresignedURLSubmissionTest(BaseAPITestClass):
             {"error": "Submission does not belong to this challenge phase"},
         )
         mock_publish.assert_not_called()
+
+
+class GetSubmissionsForChallengeTest(BaseAPITestClass):
+    def setUp(self):
+        super(GetSubmissionsForChallengeTest, self).setUp()
+        self.url = reverse_lazy(
+            "jobs:get_submissions_for_challenge",
+            kwargs={"challenge_pk": self.challenge.pk},
+        )
+        self.submissions = [
+            Submission.objects.create(
+                participant_team=self.participant_team,
+                challenge_phase=self.challenge_phase,
+                created_by=self.challenge_host_team.created_by,
+                status="submitted",
+                input_file=self.challenge_phase.test_annotation,
+                method_name="Test Method {}".format(index),
+            )
+            for index in range(3)
+        ]
+
+    def test_get_submissions_for_challenge_with_fields(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"fields": "status,started_at"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            sorted(response.data, key=lambda submission: submission["id"]),
+            [
+                {
+                    "id": submission.pk,
+                    "status": "submitted",
+                    "started_at": None,
+                }
+                for submission in self.submissions
+            ],
+        )
+
+    def test_get_submissions_for_challenge_with_invalid_fields(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"fields": "status,input_file"})
+
+        self.assertEqual(
+            response.data, {"error": "Invalid fields: input_file"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_get_submissions_for_challenge_pages_with_cursor(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(
+            self.url, {"fields": "status", "cursor": "", "page_size": 2}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [submission["id"] for submission in response.data["results"]],
+            [self.submissions[0].pk, self.submissions[1].pk],
+        )
+        self.assertIsNotNone(response.data["next"])
+
+        response = self.client.get(response.data["next"])
+
+        self.assertEqual(
+            response.data["results"],
+            [{"id": self.submissions[2].pk, "status": "submitted"}],
+        )
+        self.assertIsNone(response.data["next"])
+
+    def test_get_submissions_for_challenge_pages_serialized_submissions(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"cursor": "", "page_size": 2})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["method_name"], "Test Method 0"
+        )
+        self.assertEqual(len(response.data["results"]), 2)
+
+    def test_get_submissions_for_challenge_with_invalid_cursor(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.get(self.url, {"cursor": "invalid"})
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class SubmissionMessagesBatchTest(BaseAPITestClass):
+    def setUp(self):
+        super(SubmissionMessagesBatchTest, self).setUp()
+        self.challenge.queue = "test-challenge-queue"
+        self.challenge.save()
+        self.queue = mock.MagicMock()
+        patcher = mock.patch(
+            "jobs.views.get_or_create_sqs_queue", return_value=self.queue
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def get_url(self, name):
+        return reverse_lazy(
+            "jobs:{}".format(name),
+            kwargs={"queue_name": self.challenge.queue},
+        )
+
+    def test_get_submission_messages_from_queue(self):
+        self.client.force_authenticate(user=self.user)
+        self.queue.receive_messages.return_value = [
+            mock.Mock(
+                body=json.dumps({"submission_pk": index}),
+                receipt_handle="handle-{}".format(index),
+            )
+            for index in range(2)
+        ]
+        response = self.client.get(
+            self.get_url("get_submission_messages_from_queue"),
+            {"max_messages": 5, "wait_time": 20, "visibility_timeout": 600},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {
+                "messages": [
+                    {
+                        "body": {"submission_pk": 0},
+                        "receipt_handle": "handle-0",
+                    },
+                    {
+                        "body": {"submission_pk": 1},
+                        "receipt_handle": "handle-1",
+                    },
+                ]
+            },
+        )
+        self.queue.receive_messages.assert_called_once_with(
+            MaxNumberOfMessages=5, WaitTimeSeconds=20, VisibilityTimeout=600
+        )
+
+    def test_get_submission_messages_from_queue_with_defaults(self):
+        self.client.force_authenticate(user=self.user)
+        self.queue.receive_messages.return_value = []
+        response = self.client.get(
+            self.get_url("get_submission_messages_from_queue")
+        )
+
+        self.assertEqual(response.data, {"messages": []})
+        self.queue.receive_messages.assert_called_once_with(
+            MaxNumberOfMessages=10, WaitTimeSeconds=0
+        )
+
+    def test_get_submission_messages_from_queue_with_invalid_params(self):
+        self.client.force_authenticate(user=self.user)
+        for params in (
+            {"max_messages": 11},
+            {"wait_time": 21},
+            {"visibility_timeout": "soon"},
+        ):
+            response = self.client.get(
+                self.get_url("get_submission_messages_from_queue"), params
+            )
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.queue.receive_messages.assert_not_called()
+
+    def test_get_submission_messages_from_queue_when_not_a_host(self):
+        self.client.force_authenticate(user=self.user1)
+        response = self.client.get(
+            self.get_url("get_submission_messages_from_queue")
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.queue.receive_messages.assert_not_called()
+
+    def test_delete_submission_messages_from_queue_in_batches(self):
+        self.client.force_authenticate(user=self.user)
+        receipt_handles = ["handle-{}".format(index) for index in range(12)]
+        self.queue.delete_messages.side_effect = [
+            {
+                "Successful": [{"Id": str(index)} for index in range(9)],
+                "Failed": [
+                    {"Id": "9", "Code": "ReceiptHandleIsInvalid"},
+                ],
+            },
+            {"Successful": [{"Id": "0"}, {"Id": "1"}]},
+        ]
+        response = self.client.post(
+            self.get_url("delete_submission_messages_from_queue"),
+            {"receipt_handles": receipt_handles},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["successful"],
+            receipt_handles[:9] + receipt_handles[10:],
+        )
+        self.assertEqual(
+            response.data["failed"],
+            [
+                {
+                    "receipt_handle": "handle-9",
+                    "error": "ReceiptHandleIsInvalid",
+                }
+            ],
+        )
+        self.assertEqual(self.queue.delete_messages.call_count, 2)
+        self.queue.delete_messages.assert_called_with(
+            Entries=[
+                {"Id": "0", "ReceiptHandle": "handle-10"},
+                {"Id": "1", "ReceiptHandle": "handle-11"},
+            ]
+        )
+
+    def test_delete_submission_messages_from_queue_without_handles(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            self.get_url("delete_submission_messages_from_queue"), {}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.queue.delete_messages.assert_not_called()
+
+    def test_change_submission_messages_visibility(self):
+        self.client.force_authenticate(user=self.user)
+        self.queue.change_message_visibility_batch.return_value = {
+            "Successful": [{"Id": "0"}, {"Id": "1"}]
+        }
+        response = self.client.post(
+            self.get_url("change_submission_messages_visibility"),
+            {
+                "receipt_handles": ["handle-0", "handle-1"],
+                "visibility_timeout": 900,
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            {"successful": ["handle-0", "handle-1"], "failed": []},
+        )
+        self.queue.change_message_visibility_batch.assert_called_once_with(
+            Entries=[
+                {
+                    "Id": "0",
+                    "ReceiptHandle": "handle-0",
+                    "VisibilityTimeout": 900,
+                },
+                {
+                    "Id": "1",
+                    "ReceiptHandle": "handle-1",
+                    "VisibilityTimeout": 900,
+                },
+            ]
+        )
+
+    def test_change_submission_messages_visibility_without_timeout(self):
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            self.get_url("change_submission_messages_visibility"),
+            {"receipt_handles": ["handle-0"]},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.queue.change_message_visibility_batch.assert_not_called()
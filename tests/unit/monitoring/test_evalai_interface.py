@@ -26,7 +26,7 @@ class TestEvalAIInterface(unittest.TestCase):
             },
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_make_request_success(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"key": "value"}
@@ -43,7 +43,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_make_request_with_json_content_header(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"key": "value"}
@@ -63,7 +63,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=data,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_make_request_failure(self, mock_request):
         mock_request.side_effect = requests.exceptions.RequestException
 
@@ -75,7 +75,7 @@ class TestEvalAIInterface(unittest.TestCase):
         full_url = self.api.return_url_per_environment(url)
         self.assertEqual(full_url, "http://dummy.api.server/api/test")
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_message_from_sqs_queue(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"message": "test"}
@@ -91,7 +91,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_delete_message_from_sqs_queue(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"result": "success"}
@@ -110,7 +110,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data={"receipt_handle": receipt_handle},
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_submission_by_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"submission": "data"}
@@ -126,7 +126,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenge_phases_by_challenge_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"phases": "data"}
@@ -142,7 +142,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenge_by_queue_name(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"challenge": "data"}
@@ -158,7 +158,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenge_phase_by_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"phase": "data"}
@@ -174,7 +174,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_update_submission_data(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"result": "success"}
@@ -191,7 +191,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=data,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_update_submission_status(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"result": "success"}
@@ -208,7 +208,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=data,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_aws_eks_bearer_token(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"token": "token_data"}
@@ -224,7 +224,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_aws_eks_cluster_details(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"cluster": "details"}
@@ -240,7 +240,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenge_by_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"challenge": "details"}
@@ -256,7 +256,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenges(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"challenges": []}
@@ -272,7 +272,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_submissions_for_challenge(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"submissions": []}
@@ -288,7 +288,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_submissions_for_challenge_with_status(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"submissions": []}
@@ -307,7 +307,50 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
+    def test_get_submissions_for_challenge_with_fields_and_cursor(
+        self, mock_request
+    ):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"results": []}
+        mock_request.return_value = mock_response
+
+        self.api.get_submissions_for_challenge(
+            1, status="running", fields=["id", "status"], cursor=""
+        )
+        url = "/api/jobs/challenge/1/submission/"
+        expected_url = (
+            self.api.return_url_per_environment(url)
+            + "?status=running&fields=id%2Cstatus&cursor="
+        )
+        mock_request.assert_called_once_with(
+            method="GET",
+            url=expected_url,
+            headers=self.api.get_request_headers(),
+            data=None,
+        )
+
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
+    def test_iter_submissions_for_challenge(self, mock_request):
+        first_page = MagicMock()
+        first_page.json.return_value = {
+            "next": "http://evalai/next-page",
+            "results": [{"id": 1}, {"id": 2}],
+        }
+        last_page = MagicMock()
+        last_page.json.return_value = {"next": None, "results": [{"id": 3}]}
+        mock_request.side_effect = [first_page, last_page]
+
+        submissions = list(
+            self.api.iter_submissions_for_challenge(1, fields=["id"])
+        )
+
+        self.assertEqual(submissions, [{"id": 1}, {"id": 2}, {"id": 3}])
+        self.assertEqual(
+            mock_request.call_args[1]["url"], "http://evalai/next-page"
+        )
+
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenges_submission_metrics(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"metrics": []}
@@ -323,7 +366,29 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
+    def test_get_challenges_submission_metrics_with_filters(
+        self, mock_request
+    ):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"metrics": {}}
+        mock_request.return_value = mock_response
+
+        self.api.get_challenges_submission_metrics(
+            status="pending", changed_since="2024-01-01T00:00:00+00:00"
+        )
+        url = (
+            "/api/challenges/challenge/get_submission_metrics"
+            "?status=pending&changed_since=2024-01-01T00%3A00%3A00%2B00%3A00"
+        )
+        mock_request.assert_called_once_with(
+            method="GET",
+            url=self.api.return_url_per_environment(url),
+            headers=self.api.get_request_headers(),
+            data=None,
+        )
+
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_challenge_submission_metrics_by_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"metrics": "data"}
@@ -339,7 +404,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_get_ec2_instance_details(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"instance": "details"}
@@ -355,7 +420,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_start_challenge_ec2_instance(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"status": "started"}
@@ -371,7 +436,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_stop_challenge_ec2_instance(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"status": "stopped"}
@@ -387,7 +452,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.monitoring.evalai_interface.requests.request")
+    @patch("scripts.monitoring.evalai_interface.requests.Session.request")
     def test_update_challenge_attributes(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"result": "updated"}
@@ -8,13 +8,16 @@ import mock
 import responses
 
 from scripts.workers.remote_submission_worker import (
+    change_messages_visibility,
     create_dir_as_python_package,
     delete_message_from_sqs_queue,
+    delete_messages_from_sqs_queue,
     download_and_extract_file,
     get_challenge_by_queue_name,
     get_challenge_phase_by_pk,
     get_challenge_phases_by_challenge_pk,
     get_message_from_sqs_queue,
+    get_messages_from_sqs_queue,
     get_submission_by_pk,
     make_request,
     process_submission_callback,
@@ -63,7 +66,7 @@ class BaseTestClass(TestCase):
 @mock.patch(
     "scripts.workers.remote_submission_worker.AUTH_TOKEN", "test_token"
 )
-@mock.patch("scripts.workers.remote_submission_worker.requests")
+@mock.patch("scripts.workers.remote_submission_worker.http_client")
 class MakeRequestTestClass(BaseTestClass):
     def setUp(self):
         super(MakeRequestTestClass, self).setUp()
@@ -123,6 +126,36 @@ class APICallsTestClass(BaseTestClass):
         }
         mock_make_request.assert_called_with(url, "POST", data=expected_data)
 
+    def test_get_messages_from_sqs_queue(self, mock_make_request, mock_url):
+        url = (
+            "/api/jobs/challenge/queues/evalai_submission_queue/messages/"
+            "?max_messages=10&wait_time=20&visibility_timeout=600"
+        )
+        get_messages_from_sqs_queue(visibility_timeout=600)
+        mock_url.assert_called_with(url)
+        url = mock_url(url)
+        mock_make_request.assert_called_with(url, "GET")
+
+    def test_delete_messages_from_sqs_queue(self, mock_make_request, mock_url):
+        url = "/api/jobs/queues/evalai_submission_queue/messages/delete/"
+        delete_messages_from_sqs_queue(["handle-1", "handle-2"])
+        mock_url.assert_called_with(url)
+        url = mock_url(url)
+        mock_make_request.assert_called_with(
+            url, "POST", data={"receipt_handles": ["handle-1", "handle-2"]}
+        )
+
+    def test_change_messages_visibility(self, mock_make_request, mock_url):
+        url = "/api/jobs/queues/evalai_submission_queue/messages/visibility/"
+        change_messages_visibility(["handle-1"], 900)
+        mock_url.assert_called_with(url)
+        url = mock_url(url)
+        mock_make_request.assert_called_with(
+            url,
+            "POST",
+            data={"receipt_handles": ["handle-1"], "visibility_timeout": 900},
+        )
+
     def test_get_challenge_by_queue_name(self, mock_make_request, mock_url):
         url = self.get_challenge_by_queue_name_url("evalai_submission_queue")
         get_challenge_by_queue_name()
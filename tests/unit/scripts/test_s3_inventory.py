@@ -0,0 +1,195 @@
+import gzip
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+import uuid
+from unittest.mock import MagicMock
+
+import boto3
+from moto import mock_s3
+
+
+def _import_s3_inventory_module():
+    spec = importlib.util.spec_from_file_location(
+        "s3_inventory",
+        os.path.join(
+            os.path.dirname(__file__),
+            "..",
+            "..",
+            "..",
+            "scripts",
+            "tools",
+            "cleanup_data",
+            "s3_inventory.py",
+        ),
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+s3_inventory = _import_s3_inventory_module()
+
+FOLDERS = ["media/submission_files/", "media/logos/"]
+
+
+@mock_s3
+class TestS3Inventory(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.state = s3_inventory.InventoryState(
+            os.path.join(self.temp_dir, "state.sqlite3"), "media/"
+        )
+        self.logger = MagicMock()
+        self.s3_client = boto3.client("s3", region_name="us-east-1")
+        # Buckets of earlier tests may outlive their mock
+        self.bucket_name = f"evalai-test-{uuid.uuid4().hex}"
+        self.s3_client.create_bucket(Bucket=self.bucket_name)
+
+    def tearDown(self):
+        self.state.close()
+        shutil.rmtree(self.temp_dir)
+
+    def put_objects(self, keys):
+        for key in keys:
+            self.s3_client.put_object(
+                Bucket=self.bucket_name, Key=key, Body=b"1"
+            )
+
+    def test_references_match_with_and_without_media_prefix(self):
+        self.state.add_references(
+            ["submission_files/a.json", "media/logos/b.png", ""]
+        )
+
+        self.assertEqual(self.state.reference_count(), 2)
+        self.assertEqual(
+            self.state.find_referenced(
+                [
+                    "media/submission_files/a.json",
+                    "media/logos/b.png",
+                    "media/logos/c.png",
+                ]
+            ),
+            {"media/submission_files/a.json", "media/logos/b.png"},
+        )
+
+    def test_listing_shards_cover_every_key(self):
+        keys = [
+            "media/submission_files/0.json",
+            "media/submission_files/A.json",
+            "media/submission_files/_x/1.json",
+            "media/submission_files/m",
+            "media/submission_files/m/2.json",
+            "media/submission_files/z/3.json",
+            "media/submission_files/~4.json",
+            "media/logos/5.png",
+            "media/other/6.json",
+        ]
+        self.put_objects(keys)
+        self.state.add_references(["submission_files/m/2.json"])
+
+        failed = s3_inventory.scan_s3_listing(
+            self.s3_client, self.bucket_name, FOLDERS, self.state, self.logger
+        )
+
+        self.assertEqual(failed, 0)
+        self.assertEqual(self.state.get_totals(), (8, 1, 7, 7))
+        orphans = [key for batch in self.state.iter_orphans() for key in batch]
+        self.assertEqual(
+            orphans,
+            sorted(
+                set(keys)
+                - {"media/submission_files/m/2.json", "media/other/6.json"}
+            ),
+        )
+
+    def test_resumed_listing_skips_finished_ranges(self):
+        self.put_objects(
+            ["media/submission_files/1.json", "media/logos/2.png"]
+        )
+        s3_inventory.scan_s3_listing(
+            self.s3_client, self.bucket_name, FOLDERS, self.state, self.logger
+        )
+        list_objects = MagicMock(wraps=self.s3_client.list_objects_v2)
+        self.s3_client.list_objects_v2 = list_objects
+
+        s3_inventory.scan_s3_listing(
+            self.s3_client, self.bucket_name, FOLDERS, self.state, self.logger
+        )
+
+        list_objects.assert_not_called()
+        self.assertEqual(self.state.get_totals(), (2, 0, 2, 2))
+
+    def test_deleted_orphans_are_skipped(self):
+        self.put_objects(
+            ["media/submission_files/1.json", "media/submission_files/2.json"]
+        )
+        s3_inventory.scan_s3_listing(
+            self.s3_client, self.bucket_name, FOLDERS, self.state, self.logger
+        )
+        self.state.mark_deleted(["media/submission_files/1.json"])
+
+        self.assertEqual(
+            list(self.state.iter_orphans(deleted=False)),
+            [["media/submission_files/2.json"]],
+        )
+
+    def test_csv_inventory_is_read_instead_of_listing(self):
+        rows = (
+            '"bucket","media/submission_files/a%20b.json","5"\n'
+            '"bucket","media/submission_files/kept.json","7"\n'
+            '"bucket","media/other/c.json","9"\n'
+        )
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key="inventory/data/1.csv.gz",
+            Body=gzip.compress(rows.encode()),
+        )
+        manifest = {
+            "destinationBucket": f"arn:aws:s3:::{self.bucket_name}",
+            "fileFormat": "CSV",
+            "fileSchema": "Bucket, Key, Size",
+            "files": [{"key": "inventory/data/1.csv.gz"}],
+        }
+        self.s3_client.put_object(
+            Bucket=self.bucket_name,
+            Key="inventory/manifest.json",
+            Body=json.dumps(manifest).encode(),
+        )
+        self.state.add_references(["submission_files/kept.json"])
+
+        failed = s3_inventory.scan_s3_inventory(
+            self.s3_client,
+            f"s3://{self.bucket_name}/inventory/manifest.json",
+            FOLDERS,
+            self.state,
+            self.logger,
+        )
+
+        self.assertEqual(failed, 0)
+        self.assertEqual(self.state.get_totals(), (2, 1, 1, 5))
+        self.assertEqual(
+            list(self.state.iter_orphans()),
+            [["media/submission_files/a b.json"]],
+        )
+
+    def test_head_object_sizes_keeps_order(self):
+        self.put_objects(["media/logos/1.png"])
+
+        sizes = list(
+            s3_inventory.head_object_sizes(
+                self.s3_client,
+                self.bucket_name,
+                ["media/logos/missing.png", "media/logos/1.png"],
+            )
+        )
+
+        self.assertEqual(
+            sizes,
+            [("media/logos/missing.png", None), ("media/logos/1.png", 1)],
+        )
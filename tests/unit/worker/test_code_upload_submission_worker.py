@@ -1233,6 +1233,9 @@ class TestConfigFunctions(unittest.TestCase):
             "name": "test-cluster",
             "cluster_endpoint": "https://cluster-endpoint",
         }
+        mock_evalai_instance.get_messages_from_sqs_queue.return_value = {
+            "messages": []
+        }
         mock_killer_instance = mock_killer.return_value
         mock_killer_instance.kill_now = True
 
@@ -1271,6 +1274,9 @@ class TestConfigFunctions(unittest.TestCase):
             "id": 1,
             "submission_time_limit": 100,
         }
+        mock_evalai_instance.get_messages_from_sqs_queue.return_value = {
+            "messages": []
+        }
         mock_killer_instance = mock_killer.return_value
         mock_killer_instance.kill_now = True
 
@@ -1680,13 +1686,17 @@ class TestMainQueuedSubmission(unittest.TestCase):
         mock_evalai_instance.get_challenge_phase_by_pk.return_value = {
             "disable_logs": False
         }
-        mock_evalai_instance.get_message_from_sqs_queue.return_value = {
-            "body": {
-                "submission_pk": 1,
-                "challenge_pk": 1,
-                "phase_pk": 1,
-            },
-            "receipt_handle": "abc",
+        mock_evalai_instance.get_messages_from_sqs_queue.return_value = {
+            "messages": [
+                {
+                    "body": {
+                        "submission_pk": 1,
+                        "challenge_pk": 1,
+                        "phase_pk": 1,
+                    },
+                    "receipt_handle": "abc",
+                }
+            ]
         }
         mock_evalai_instance.get_submission_by_pk.return_value = {
             "status": "queued",
@@ -1750,13 +1760,17 @@ class TestMainJobDeleteBlock(unittest.TestCase):
             "cluster_endpoint": "https://cluster-endpoint",
         }
 
-        mock_evalai_instance.get_message_from_sqs_queue.return_value = {
-            "body": {
-                "submission_pk": 1,
-                "challenge_pk": 1,
-                "phase_pk": 1,
-            },
-            "receipt_handle": "abc",
+        mock_evalai_instance.get_messages_from_sqs_queue.return_value = {
+            "messages": [
+                {
+                    "body": {
+                        "submission_pk": 1,
+                        "challenge_pk": 1,
+                        "phase_pk": 1,
+                    },
+                    "receipt_handle": "abc",
+                }
+            ]
         }
         mock_evalai_instance.get_challenge_phase_by_pk.return_value = {
             "disable_logs": False
@@ -1774,8 +1788,8 @@ class TestMainJobDeleteBlock(unittest.TestCase):
         mock_delete_job.assert_called_once_with(
             mock_get_api_object.return_value, "job-123"
         )
-        mock_evalai_instance.delete_message_from_sqs_queue.assert_called_once_with(
-            "abc"
+        mock_evalai_instance.delete_messages_from_sqs_queue.assert_called_once_with(
+            ["abc"]
         )
 
     @patch("scripts.workers.code_upload_submission_worker.logger")
@@ -1811,13 +1825,17 @@ class TestMainJobDeleteBlock(unittest.TestCase):
             "cluster_endpoint": "https://cluster-endpoint",
         }
 
-        mock_evalai_instance.get_message_from_sqs_queue.return_value = {
-            "body": {
-                "submission_pk": 1,
-                "challenge_pk": 1,
-                "phase_pk": 1,
-            },
-            "receipt_handle": "abc",
+        mock_evalai_instance.get_messages_from_sqs_queue.return_value = {
+            "messages": [
+                {
+                    "body": {
+                        "submission_pk": 1,
+                        "challenge_pk": 1,
+                        "phase_pk": 1,
+                    },
+                    "receipt_handle": "abc",
+                }
+            ]
         }
         mock_evalai_instance.get_challenge_phase_by_pk.return_value = {
             "disable_logs": False
@@ -1837,6 +1855,6 @@ class TestMainJobDeleteBlock(unittest.TestCase):
             "Failed to delete submission job: Delete job failed"
         )
 
-        mock_evalai_instance.delete_message_from_sqs_queue.assert_called_with(
-            "abc"
+        mock_evalai_instance.delete_messages_from_sqs_queue.assert_called_once_with(
+            ["abc"]
         )
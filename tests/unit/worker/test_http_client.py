@@ -0,0 +1,116 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from scripts.workers.http_client import (
+    CONNECT_TIMEOUT,
+    READ_TIMEOUT,
+    EvalAIHTTPClient,
+    JitteredRetry,
+    RequestMetrics,
+    create_session,
+    get_endpoint,
+)
+
+
+class TestCreateSession(unittest.TestCase):
+    def test_session_retries_connection_errors_and_5xx_responses(self):
+        session = create_session(max_retries=4)
+        retry = session.get_adapter("https://evalai.test").max_retries
+
+        self.assertIsInstance(retry, JitteredRetry)
+        self.assertEqual(retry.total, 4)
+        self.assertEqual(set(retry.status_forcelist), {500, 502, 503, 504})
+        self.assertFalse(retry.raise_on_status)
+        self.assertFalse(retry.is_retry("POST", 503))
+        self.assertTrue(retry.is_retry("GET", 503))
+
+    @patch("scripts.workers.http_client.HTTPAdapter.send")
+    def test_session_applies_default_timeout(self, mock_send):
+        response = requests.Response()
+        response.status_code = 200
+        mock_send.return_value = response
+        session = create_session()
+
+        session.request(method="GET", url="https://evalai.test/api/")
+        self.assertEqual(
+            mock_send.call_args[1]["timeout"], (CONNECT_TIMEOUT, READ_TIMEOUT)
+        )
+
+        session.request(method="GET", url="https://evalai.test/", timeout=1)
+        self.assertEqual(mock_send.call_args[1]["timeout"], 1)
+
+    @patch("scripts.workers.http_client.random.uniform")
+    def test_backoff_is_jittered(self, mock_uniform):
+        mock_uniform.side_effect = lambda low, high: high / 2
+        retry = JitteredRetry(total=3, backoff_factor=1).increment("GET", "/")
+        retry = retry.increment("GET", "/")
+
+        self.assertEqual(retry.get_backoff_time(), 1)
+
+
+class TestEvalAIHTTPClient(unittest.TestCase):
+    def test_get_endpoint_leaves_primary_keys_out(self):
+        self.assertEqual(
+            get_endpoint("get", "https://evalai.test/api/jobs/submission/12"),
+            "GET /api/jobs/submission/{}",
+        )
+        self.assertEqual(
+            get_endpoint(
+                "PUT",
+                "https://evalai.test/api/jobs/challenge/3/update_submission/",
+            ),
+            "PUT /api/jobs/challenge/{}/update_submission/",
+        )
+
+    def test_requests_are_made_with_the_session_and_timed(self):
+        session = MagicMock()
+        client = EvalAIHTTPClient(session=session)
+
+        client.get(url="https://evalai.test/api/jobs/submission/1")
+        client.get(url="https://evalai.test/api/jobs/submission/2")
+        client.post(url="https://evalai.test/api/jobs/queues/q/", data={})
+
+        session.request.assert_called_with(
+            method="POST",
+            url="https://evalai.test/api/jobs/queues/q/",
+            data={},
+        )
+        metrics = client.log_metrics()
+        self.assertEqual(metrics["GET /api/jobs/submission/{}"]["count"], 2)
+        self.assertEqual(metrics["POST /api/jobs/queues/q/"]["count"], 1)
+        self.assertEqual(client.metrics.snapshot(), {})
+
+    def test_failed_requests_are_timed(self):
+        session = MagicMock()
+        session.request.side_effect = requests.exceptions.ConnectionError
+        client = EvalAIHTTPClient(session=session)
+
+        with self.assertRaises(requests.exceptions.ConnectionError):
+            client.get(url="https://evalai.test/api/jobs/submission/1")
+        self.assertEqual(
+            client.metrics.snapshot()["GET /api/jobs/submission/{}"]["count"],
+            1,
+        )
+
+
+class TestRequestMetrics(unittest.TestCase):
+    def test_snapshot(self):
+        metrics = RequestMetrics()
+        metrics.record("GET /api/", 1.0)
+        metrics.record("GET /api/", 3.0)
+
+        self.assertEqual(
+            metrics.snapshot(),
+            {
+                "GET /api/": {
+                    "count": 2,
+                    "total_seconds": 4.0,
+                    "mean_seconds": 2.0,
+                    "max_seconds": 3.0,
+                }
+            },
+        )
+        self.assertEqual(len(metrics.snapshot(reset=True)), 1)
+        self.assertEqual(metrics.snapshot(), {})
@@ -3,7 +3,9 @@ import logging
 import os
 import signal
 import sys
+import time
 import unittest
+from unittest import mock
 from unittest.mock import MagicMock, Mock, mock_open, patch
 
 import requests
@@ -332,7 +334,7 @@ class TestExtractChallengeData(unittest.TestCase):
         self.assertIsNone(result)
         mock_extract_submission_data.assert_called_once_with(3)
 
-    @patch("scripts.workers.remote_submission_worker.requests.get")
+    @patch("scripts.workers.remote_submission_worker.http_client.get")
     @patch("scripts.workers.remote_submission_worker.get_request_headers")
     @patch("scripts.workers.remote_submission_worker.logger")
     def test_make_request_get_exception(
@@ -356,7 +358,7 @@ class TestExtractChallengeData(unittest.TestCase):
             "The worker is not able to establish connection with EvalAI"
         )
 
-    @patch("scripts.workers.remote_submission_worker.requests.patch")
+    @patch("scripts.workers.remote_submission_worker.http_client.patch")
     @patch("scripts.workers.remote_submission_worker.get_request_headers")
     @patch("scripts.workers.remote_submission_worker.logger")
     def test_make_request_patch_request_exception(
@@ -381,7 +383,7 @@ class TestExtractChallengeData(unittest.TestCase):
             "The worker is not able to establish connection with EvalAI"
         )
 
-    @patch("scripts.workers.remote_submission_worker.requests.post")
+    @patch("scripts.workers.remote_submission_worker.http_client.post")
     @patch("scripts.workers.remote_submission_worker.get_request_headers")
     @patch("scripts.workers.remote_submission_worker.logger")
     def test_make_request_post_request_exception(
@@ -481,14 +483,14 @@ class TestExtractSubmissionDataHappyPath(unittest.TestCase):
 
 class TestMakeRequestExceptions(unittest.TestCase):
     @patch("scripts.workers.remote_submission_worker.logger")
-    @patch("scripts.workers.remote_submission_worker.requests.put")
+    @patch("scripts.workers.remote_submission_worker.http_client.put")
     def test_make_request_put_request_exception(self, mock_put, mock_logger):
         mock_put.side_effect = requests.exceptions.RequestException()
         with self.assertRaises(UnboundLocalError):
             make_request("http://test-url", "PUT", data={})
 
     @patch("scripts.workers.remote_submission_worker.logger")
-    @patch("scripts.workers.remote_submission_worker.requests.put")
+    @patch("scripts.workers.remote_submission_worker.http_client.put")
     def test_make_request_put_http_error(self, mock_put, mock_logger):
         mock_put.side_effect = requests.exceptions.HTTPError()
         with self.assertRaises(UnboundLocalError):
@@ -497,7 +499,7 @@ class TestMakeRequestExceptions(unittest.TestCase):
 
 class TestMakeRequestPatchHttpError(unittest.TestCase):
     @patch("scripts.workers.remote_submission_worker.logger")
-    @patch("scripts.workers.remote_submission_worker.requests.patch")
+    @patch("scripts.workers.remote_submission_worker.http_client.patch")
     def test_make_request_patch_http_error(self, mock_patch, mock_logger):
         mock_patch.side_effect = requests.exceptions.HTTPError()
         with self.assertRaises(requests.exceptions.HTTPError):
@@ -664,3 +666,92 @@ class TestRunSubmission(unittest.TestCase):
         mock_update_status.assert_called()
         mock_update_data.assert_called()
         mock_rmtree.assert_called()
+
+
+class TestMainBatch(unittest.TestCase):
+    @patch("scripts.workers.remote_submission_worker.time.sleep")
+    @patch(
+        "scripts.workers.remote_submission_worker.delete_messages_from_sqs_queue"
+    )
+    @patch(
+        "scripts.workers.remote_submission_worker.change_messages_visibility"
+    )
+    @patch(
+        "scripts.workers.remote_submission_worker.process_submission_callback"
+    )
+    @patch("scripts.workers.remote_submission_worker.get_submission_by_pk")
+    @patch(
+        "scripts.workers.remote_submission_worker.get_messages_from_sqs_queue"
+    )
+    @patch("scripts.workers.remote_submission_worker.load_challenge")
+    @patch(
+        "scripts.workers.remote_submission_worker.create_dir_as_python_package"
+    )
+    @patch("scripts.workers.remote_submission_worker.GracefulKiller")
+    def test_main_processes_a_batch_and_deletes_each_message_once_done(
+        self,
+        mock_killer,
+        mock_create_dir,
+        mock_load_challenge,
+        mock_get_messages,
+        mock_get_submission,
+        mock_process,
+        mock_change_visibility,
+        mock_delete_messages,
+        mock_sleep,
+    ):
+        mock_killer.return_value.kill_now = True
+        mock_get_messages.return_value = {
+            "messages": [
+                {"body": {"submission_pk": pk}, "receipt_handle": str(pk)}
+                for pk in (1, 2, 3, 4)
+            ]
+        }
+        statuses = {
+            1: "finished",
+            2: "submitted",
+            3: "running",
+            4: "finished",
+        }
+        mock_get_submission.side_effect = lambda pk: {"status": statuses[pk]}
+        calls = MagicMock()
+        calls.attach_mock(mock_delete_messages, "delete")
+        calls.attach_mock(mock_change_visibility, "change_visibility")
+        calls.attach_mock(mock_process, "process")
+
+        worker_mod.main()
+
+        # Pending messages are hidden before the evaluation starts, and
+        # each message is deleted as soon as it is processed
+        self.assertEqual(
+            calls.mock_calls,
+            [
+                mock.call.delete(["1"]),
+                mock.call.change_visibility(
+                    ["2", "3", "4"], worker_mod.MESSAGE_VISIBILITY_TIMEOUT
+                ),
+                mock.call.process({"submission_pk": 2}),
+                mock.call.delete(["2"]),
+                mock.call.delete(["4"]),
+            ],
+        )
+        mock_sleep.assert_not_called()
+
+    @patch(
+        "scripts.workers.remote_submission_worker.MESSAGE_VISIBILITY_TIMEOUT",
+        0.02,
+    )
+    @patch(
+        "scripts.workers.remote_submission_worker.change_messages_visibility"
+    )
+    def test_visibility_is_extended_during_a_long_evaluation(
+        self, mock_change_visibility
+    ):
+        with worker_mod.keep_messages_hidden(["1", "2"]):
+            time.sleep(0.1)
+        call_count = mock_change_visibility.call_count
+
+        self.assertGreater(call_count, 2)
+        mock_change_visibility.assert_called_with(["1", "2"], 0.02)
+        time.sleep(0.05)
+        self.assertEqual(mock_change_visibility.call_count, call_count)
@@ -1,3 +1,5 @@
+import errno
+import hashlib
 import json
 import os
 import shutil
@@ -6,11 +8,12 @@ import subprocess
 import sys
 import tempfile
 import zipfile
+from concurrent import futures
 from datetime import timedelta
 from io import BytesIO
 from os.path import join
 from unittest import TestCase
-from unittest.mock import MagicMock, Mock, patch
+from unittest.mock import MagicMock, Mock, PropertyMock, patch
 
 import boto3
 import mock
@@ -29,7 +32,7 @@ from django.core.files.base import ContentFile
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.utils import timezone
 from hosts.models import ChallengeHostTeam
-from jobs.models import Submission
+from jobs.models import Submission, SubmissionEvaluationLease
 from jobs.utils import get_leaderboard_data_model
 from moto import mock_sqs
 from participants.models import ParticipantTeam
@@ -38,25 +41,33 @@ from rest_framework.test import APITestCase
 from scripts.workers.submission_worker import (
     PHASE_ANNOTATION_FILE_NAME_MAP,
     SUBMISSION_DATA_DIR,
+    DownloadVerificationError,
     ExecutionTimeLimitExceeded,
     GracefulKiller,
     MultiOut,
+    SubmissionEvaluationSlots,
     alarm_handler,
+    close_inherited_database_connections,
     configure_challenge_pip_environment,
     create_dir,
     create_dir_as_python_package,
+    create_submission_evaluation_pool,
     delete_old_temp_directories,
     delete_zip_file,
     download_and_extract_file,
     download_and_extract_zip_file,
+    download_file_in_parts,
+    evaluate_submissions_concurrently,
     extract_challenge_data,
     extract_submission_data,
     extract_zip_file,
+    get_cached_file_path,
     get_or_create_sqs_queue,
     load_challenge_and_return_max_submissions,
     main,
     process_add_challenge_message,
     process_submission_message,
+    read_cached_file_reference,
     return_file_url_per_environment,
     run_submission,
     serialize_submission_artifact,
@@ -441,6 +452,219 @@ class DownloadAndExtractFileTest(BaseAPITestClass):
         self.assertFalse(os.path.exists(self.download_location))
 
 
+class DownloadFileInPartsTest(BaseAPITestClass):
+    def setUp(self):
+        super(DownloadFileInPartsTest, self).setUp()
+        self.req_url = "http://testserver/submission.zip"
+        self.file_content = b"0123456789abcdefghij"
+        self.download_location = join(self.BASE_TEMP_DIR, "submission.zip")
+        part_size_patcher = patch(
+            "scripts.workers.submission_worker.DOWNLOAD_PART_SIZE", 8
+        )
+        part_size_patcher.start()
+        self.addCleanup(part_size_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.BASE_TEMP_DIR, ignore_errors=True)
+
+    def add_ranged_file_response(self, headers=None):
+        def callback(request):
+            start, end = request.headers["Range"][len("bytes=") :].split("-")
+            end = min(int(end), len(self.file_content) - 1)
+            response_headers = {
+                "Content-Range": "bytes {}-{}/{}".format(
+                    start, end, len(self.file_content)
+                )
+            }
+            response_headers.update(headers or {})
+            return (
+                206,
+                response_headers,
+                self.file_content[int(start) : end + 1],
+            )
+
+        responses.add_callback(responses.GET, self.req_url, callback=callback)
+
+    def read_downloaded_file(self):
+        with open(self.download_location, "rb") as f:
+            return f.read()
+
+    @responses.activate
+    def test_file_is_downloaded_in_parts(self):
+        self.add_ranged_file_response()
+
+        self.assertTrue(
+            download_file_in_parts(self.req_url, self.download_location)
+        )
+
+        self.assertEqual(len(responses.calls), 3)
+        self.assertEqual(self.read_downloaded_file(), self.file_content)
+
+    @responses.activate
+    def test_file_is_downloaded_at_once_without_range_support(self):
+        responses.add(
+            responses.GET, self.req_url, body=self.file_content, status=200
+        )
+
+        self.assertTrue(
+            download_file_in_parts(self.req_url, self.download_location)
+        )
+
+        self.assertEqual(len(responses.calls), 1)
+        self.assertEqual(self.read_downloaded_file(), self.file_content)
+
+    @responses.activate
+    def test_s3_file_is_verified_against_its_md5(self):
+        self.add_ranged_file_response(
+            headers={
+                "x-amz-request-id": "request-id",
+                "ETag": '"{}"'.format(
+                    hashlib.md5(b"other content").hexdigest()
+                ),
+            }
+        )
+
+        with self.assertRaises(DownloadVerificationError):
+            download_file_in_parts(self.req_url, self.download_location)
+
+    @responses.activate
+    @mock.patch("scripts.workers.submission_worker.logger.error")
+    def test_unverified_file_is_removed(self, mock_logger):
+        self.add_ranged_file_response(
+            headers={
+                "x-amz-request-id": "request-id",
+                "ETag": '"{}"'.format(
+                    hashlib.md5(b"other content").hexdigest()
+                ),
+            }
+        )
+
+        download_and_extract_file(self.req_url, self.download_location)
+
+        mock_logger.assert_called()
+        self.assertFalse(os.path.exists(self.download_location))
+
+
+class DownloadCachedFileTest(BaseAPITestClass):
+    def setUp(self):
+        super(DownloadCachedFileTest, self).setUp()
+        self.req_url = "{}{}".format(self.testserver, self.url)
+        self.cache_name = "test_annotations/annotation.txt"
+        self.download_location = join(self.BASE_TEMP_DIR, "annotation.txt")
+        cache_dir_patcher = patch(
+            "scripts.workers.submission_worker.EVALUATION_DATA_CACHE_DIR",
+            join(self.BASE_TEMP_DIR, "cache"),
+        )
+        cache_dir_patcher.start()
+        self.addCleanup(cache_dir_patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.BASE_TEMP_DIR, ignore_errors=True)
+
+    def add_file_response(self, body, etag):
+        responses.add(
+            responses.GET,
+            self.req_url,
+            body=body,
+            headers={"ETag": etag},
+            status=200,
+        )
+
+    def read_downloaded_file(self):
+        with open(self.download_location, "rb") as f:
+            return f.read()
+
+    @responses.activate
+    def test_unchanged_file_is_copied_from_cache(self):
+        self.add_file_response(b"annotations", '"etag-1"')
+        download_and_extract_file(
+            self.req_url, self.download_location, cache_name=self.cache_name
+        )
+        os.remove(self.download_location)
+        responses.replace(responses.GET, self.req_url, status=304)
+
+        download_and_extract_file(
+            self.req_url, self.download_location, cache_name=self.cache_name
+        )
+
+        self.assertEqual(
+            responses.calls[1].request.headers["If-None-Match"], '"etag-1"'
+        )
+        self.assertEqual(self.read_downloaded_file(), b"annotations")
+
+    @responses.activate
+    def test_cached_file_is_hard_linked(self):
+        self.add_file_response(b"annotations", '"etag-1"')
+
+        download_and_extract_file(
+            self.req_url, self.download_location, cache_name=self.cache_name
+        )
+
+        cached_file_path = get_cached_file_path(
+            read_cached_file_reference(self.cache_name)["content_hash"]
+        )
+        self.assertTrue(
+            os.path.samefile(cached_file_path, self.download_location)
+        )
+
+    @responses.activate
+    def test_cached_file_is_copied_across_filesystems(self):
+        self.add_file_response(b"annotations", '"etag-1"')
+
+        with patch(
+            "scripts.workers.submission_worker.os.link",
+            side_effect=OSError(errno.EXDEV, "Invalid cross-device link"),
+        ):
+            download_and_extract_file(
+                self.req_url,
+                self.download_location,
+                cache_name=self.cache_name,
+            )
+
+        cached_file_path = get_cached_file_path(
+            read_cached_file_reference(self.cache_name)["content_hash"]
+        )
+        self.assertFalse(
+            os.path.samefile(cached_file_path, self.download_location)
+        )
+        self.assertEqual(self.read_downloaded_file(), b"annotations")
+
+    @responses.activate
+    def test_changed_file_is_downloaded_again(self):
+        self.add_file_response(b"annotations", '"etag-1"')
+        download_and_extract_file(
+            self.req_url, self.download_location, cache_name=self.cache_name
+        )
+        responses.reset()
+        self.add_file_response(b"new annotations", '"etag-2"')
+
+        download_and_extract_file(
+            self.req_url, self.download_location, cache_name=self.cache_name
+        )
+
+        self.assertEqual(self.read_downloaded_file(), b"new annotations")
+
+    @responses.activate
+    def test_least_recently_used_files_are_evicted(self):
+        self.add_file_response(b"old annotations", '"etag-1"')
+        download_and_extract_file(
+            self.req_url, self.download_location, cache_name="old.txt"
+        )
+        responses.reset()
+        self.add_file_response(b"new annotations", '"etag-2"')
+
+        with patch(
+            "scripts.workers.submission_worker.EVALUATION_DATA_CACHE_MAX_SIZE",
+            len(b"new annotations"),
+        ):
+            download_and_extract_file(
+                self.req_url, self.download_location, cache_name="new.txt"
+            )
+
+        self.assertIsNone(read_cached_file_reference("old.txt"))
+        self.assertIsNotNone(read_cached_file_reference("new.txt"))
+
+
 class DownloadAndExtractZipFileTest(BaseAPITestClass):
     def setUp(self):
         super(DownloadAndExtractZipFileTest, self).setUp()
@@ -621,7 +845,9 @@ class ExtractChallengeDataWorkerTest(BaseAPITestClass):
         mock_create_dir_as_python_package.assert_called()
         mock_download_and_extract_zip_file.assert_called()
         mock_create_dir.assert_called()
-        mock_download_and_extract_file.assert_called()
+        mock_download_and_extract_file.assert_called_with(
+            mock.ANY, mock.ANY, cache_name=phase.test_annotation.name
+        )
         mock_invalidate_caches.assert_called()
         mock_import_module.assert_called()
         self.assertIsNone(challenge.evaluation_module_error)
@@ -895,15 +1121,17 @@ class RunSubmissionDatasetSplitExceptionTest(BaseAPITestClass):
         }
 
         with patch(
-            "scripts.workers.submission_worker.ChallengePhaseSplit.objects.get"
-        ) as mock_cps_get:
+            "scripts.workers.submission_worker.ChallengePhaseSplit.objects.select_related"
+        ) as mock_cps_select_related:
             mock_cps = MagicMock()
             type(mock_cps).dataset_split = property(
                 lambda self: (_ for _ in ()).throw(
                     Exception("dataset_split error")
                 )
             )
-            mock_cps_get.return_value = mock_cps
+            mock_cps_select_related.return_value.filter.return_value = [
+                mock_cps
+            ]
 
             with patch(
                 "scripts.workers.submission_worker.ContentFile",
@@ -935,10 +1163,12 @@ class RunSubmissionLeaderboardDataTest(BaseAPITestClass):
     )
     @patch("scripts.workers.submission_worker.shutil.rmtree")
     @patch("scripts.workers.submission_worker.LeaderboardData")
-    @patch("scripts.workers.submission_worker.ChallengePhaseSplit.objects.get")
+    @patch(
+        "scripts.workers.submission_worker.ChallengePhaseSplit.objects.select_related"
+    )
     def test_run_submission_leaderboard_data_success(
         self,
-        mock_cps_get,
+        mock_cps_select_related,
         mock_leaderboard_data,
         mock_rmtree,
         mock_open_builtin,
@@ -966,7 +1196,7 @@ class RunSubmissionLeaderboardDataTest(BaseAPITestClass):
         mock_cps = MagicMock()
         mock_cps.leaderboard = MagicMock()
         mock_cps.dataset_split.codename = "split_codename_1"
-        mock_cps_get.return_value = mock_cps
+        mock_cps_select_related.return_value.filter.return_value = [mock_cps]
 
         with patch(
             "scripts.workers.submission_worker.ContentFile",
@@ -996,10 +1226,12 @@ class RunSubmissionLeaderboardDataTest(BaseAPITestClass):
     )
     @patch("scripts.workers.submission_worker.shutil.rmtree")
     @patch("scripts.workers.submission_worker.LeaderboardData")
-    @patch("scripts.workers.submission_worker.ChallengePhaseSplit.objects.get")
+    @patch(
+        "scripts.workers.submission_worker.ChallengePhaseSplit.objects.select_related"
+    )
     def test_run_submission_leaderboard_data_with_error(
         self,
-        mock_cps_get,
+        mock_cps_select_related,
         mock_leaderboard_data,
         mock_rmtree,
         mock_open_builtin,
@@ -1028,7 +1260,7 @@ class RunSubmissionLeaderboardDataTest(BaseAPITestClass):
         mock_cps = MagicMock()
         mock_cps.leaderboard = MagicMock()
         mock_cps.dataset_split.codename = "split_codename_1"
-        mock_cps_get.return_value = mock_cps
+        mock_cps_select_related.return_value.filter.return_value = [mock_cps]
 
         with patch(
             "scripts.workers.submission_worker.ContentFile",
@@ -1136,6 +1368,70 @@ class RunSubmissionLeaderboardDataReevalTest(BaseAPITestClass):
         )
         self.assertEqual(leaderboard_data.result["key1"], 99)
 
+    @patch("scripts.workers.submission_worker.EVALUATION_SCRIPTS")
+    @patch("scripts.workers.submission_worker.MultiOut")
+    @patch("scripts.workers.submission_worker.stdout_redirect")
+    @patch("scripts.workers.submission_worker.stderr_redirect")
+    @patch("scripts.workers.submission_worker.shutil.rmtree")
+    def test_results_are_persisted_with_a_single_submission_save(
+        self,
+        mock_rmtree,
+        mock_stderr_redirect,
+        mock_stdout_redirect,
+        mock_multiout,
+        mock_evaluation_scripts,
+    ):
+        second_challenge_phase_split = ChallengePhaseSplit.objects.create(
+            challenge_phase=self.challenge_phase,
+            dataset_split=DatasetSplit.objects.create(
+                name="Split 2", codename="split_codename_2"
+            ),
+            leaderboard=self.leaderboard,
+        )
+        submission = self.submission
+        submission.challenge_phase.challenge.remote_evaluation = False
+        self.challenge_phase.disable_logs = False
+        PHASE_ANNOTATION_FILE_NAME_MAP[self.challenge.id] = {
+            self.challenge_phase.id: "dummy_annotation.txt"
+        }
+        mock_evaluation_scripts.__getitem__.return_value.evaluate.return_value = {
+            "result": [
+                {"split_codename_1": {"key1": 10}},
+                {"split_codename_2": {"key1": 20}},
+            ],
+            "submission_result": {"score": 10},
+        }
+        temp_run_dir = join(
+            SUBMISSION_DATA_DIR.format(submission_id=submission.id), "run"
+        )
+        os.makedirs(temp_run_dir, exist_ok=True)
+        with open(join(temp_run_dir, "temp_stdout.txt"), "w") as fh:
+            fh.write("eval stdout")
+
+        with patch.object(
+            Submission, "save", autospec=True, side_effect=Submission.save
+        ) as mock_save:
+            run_submission(
+                self.challenge.id,
+                self.challenge_phase,
+                submission,
+                "dummy/path",
+            )
+
+        # One save when the evaluation starts and one with all the results
+        self.assertEqual(mock_save.call_count, 2)
+        submission.refresh_from_db()
+        self.assertEqual(submission.status, Submission.FINISHED)
+        self.assertTrue(bool(submission.stdout_file.name))
+        self.assertTrue(bool(submission.submission_result_file.name))
+        self.assertEqual(
+            LeaderboardData.objects.get(
+                submission=submission,
+                challenge_phase_split=second_challenge_phase_split,
+            ).result,
+            {"key1": 20},
+        )
+
 
 class ProcessAddChallengeMessageTest(BaseAPITestClass):
     @patch("scripts.workers.submission_worker.extract_challenge_data")
@@ -1443,6 +1739,64 @@ class MainFunctionTest(BaseAPITestClass):
                 mock_message.body
             )
 
+    @patch("scripts.workers.submission_worker.GracefulKiller")
+    @patch("scripts.workers.submission_worker.delete_old_temp_directories")
+    @patch("scripts.workers.submission_worker.create_dir_as_python_package")
+    @patch(
+        "scripts.workers.submission_worker.load_challenge_and_return_max_submissions"
+    )
+    @patch("scripts.workers.submission_worker.get_or_create_sqs_queue")
+    @patch("scripts.workers.submission_worker.SubmissionEvaluationSlots")
+    @patch("scripts.workers.submission_worker.process_submission_callback")
+    def test_main_backs_off_when_no_message_can_be_evaluated(
+        self,
+        mock_process_submission_callback,
+        mock_SubmissionEvaluationSlots,
+        mock_get_or_create_sqs_queue,
+        mock_load_challenge_and_return_max_submissions,
+        mock_create_dir_as_python_package,
+        mock_delete_old_temp_directories,
+        mock_GracefulKiller,
+    ):
+        with patch.object(sys, "argv", ["worker"]), patch(
+            "scripts.workers.submission_worker.settings"
+        ) as mock_settings, patch(
+            "scripts.workers.submission_worker.time.sleep", return_value=None
+        ) as mock_sleep, patch(
+            "scripts.workers.submission_worker.LIMIT_CONCURRENT_SUBMISSION_PROCESSING",
+            "True",
+        ), patch.dict(
+            "os.environ", {"CHALLENGE_PK": str(self.challenge.pk)}
+        ):
+            mock_settings.DEBUG = True
+            mock_settings.TEST = False
+            killer_instance = MagicMock()
+            type(killer_instance).kill_now = PropertyMock(
+                side_effect=[False, True]
+            )
+            mock_GracefulKiller.return_value = killer_instance
+            mock_load_challenge_and_return_max_submissions.return_value = (
+                1,
+                self.challenge,
+            )
+            mock_message = MagicMock()
+            mock_message.body = (
+                '{"is_static_dataset_code_upload_submission": false}'
+            )
+            mock_queue = MagicMock()
+            mock_queue.receive_messages.return_value = [mock_message]
+            mock_get_or_create_sqs_queue.return_value = mock_queue
+            # The challenge is already running as many submissions as it
+            # allows
+            evaluation_slots = mock_SubmissionEvaluationSlots.return_value
+            evaluation_slots.acquire.return_value = False
+
+            main()
+
+            mock_process_submission_callback.assert_not_called()
+            mock_sleep.assert_called_once_with(60)
+            self.assertEqual(mock_queue.receive_messages.call_count, 2)
+
 
 class DeleteOldTempDirectoriesTest(BaseAPITestClass):
     @patch("scripts.workers.submission_worker.logger.info")
@@ -1635,10 +1989,12 @@ class RunSubmissionArtifactPersistenceTest(BaseAPITestClass):
     @patch("scripts.workers.submission_worker.stderr_redirect")
     @patch("scripts.workers.submission_worker.shutil.rmtree")
     @patch("scripts.workers.submission_worker.LeaderboardData")
-    @patch("scripts.workers.submission_worker.ChallengePhaseSplit.objects.get")
+    @patch(
+        "scripts.workers.submission_worker.ChallengePhaseSplit.objects.select_related"
+    )
     def test_dict_metadata_still_persists_stdout_and_result_files(
         self,
-        mock_cps_get,
+        mock_cps_select_related,
         mock_leaderboard_data,
         mock_rmtree,
         mock_stderr_redirect,
@@ -1664,7 +2020,7 @@ class RunSubmissionArtifactPersistenceTest(BaseAPITestClass):
         mock_cps = MagicMock()
         mock_cps.leaderboard = MagicMock()
         mock_cps.dataset_split.codename = "split_codename_1"
-        mock_cps_get.return_value = mock_cps
+        mock_cps_select_related.return_value.filter.return_value = [mock_cps]
 
         temp_run_dir = join(
             SUBMISSION_DATA_DIR.format(submission_id=submission.id), "run"
@@ -1703,15 +2059,17 @@ class RunSubmissionArtifactPersistenceTest(BaseAPITestClass):
     @patch("scripts.workers.submission_worker.stderr_redirect")
     @patch("scripts.workers.submission_worker.shutil.rmtree")
     @patch("scripts.workers.submission_worker.LeaderboardData")
-    @patch("scripts.workers.submission_worker.ChallengePhaseSplit.objects.get")
+    @patch(
+        "scripts.workers.submission_worker.ChallengePhaseSplit.objects.select_related"
+    )
     @patch(
         "scripts.workers.submission_worker.enqueue_submission_artifact_retention_tagging",
-        side_effect=[None, RuntimeError("tagging boom")],
+        side_effect=RuntimeError("tagging boom"),
     )
     def test_result_artifact_failure_still_persists_stdout(
         self,
         mock_enqueue,
-        mock_cps_get,
+        mock_cps_select_related,
         mock_leaderboard_data,
         mock_rmtree,
         mock_stderr_redirect,
@@ -1736,7 +2094,7 @@ class RunSubmissionArtifactPersistenceTest(BaseAPITestClass):
         mock_cps = MagicMock()
         mock_cps.leaderboard = MagicMock()
         mock_cps.dataset_split.codename = "split_codename_1"
-        mock_cps_get.return_value = mock_cps
+        mock_cps_select_related.return_value.filter.return_value = [mock_cps]
 
         temp_run_dir = join(
             SUBMISSION_DATA_DIR.format(submission_id=submission.id), "run"
@@ -1758,7 +2116,183 @@ class RunSubmissionArtifactPersistenceTest(BaseAPITestClass):
         self.assertEqual(submission.status, Submission.FINISHED)
         self.assertTrue(bool(submission.stdout_file.name))
         self.assertIn(b"kept stdout", submission.stdout_file.read())
-        # Second enqueue (result/metadata tagging) must have raised after
-        # result files were already saved; stdout must still be present.
-        self.assertEqual(mock_enqueue.call_count, 2)
+        # All artifacts are tagged at once, after they were saved; a tagging
+        # failure must not drop any of them.
+        mock_enqueue.assert_called_once()
         self.assertTrue(bool(submission.submission_result_file.name))
+
+
+class EvaluateSubmissionsConcurrentlyTest(TestCase):
+    def setUp(self):
+        self.killer = MagicMock()
+        self.killer.kill_now = False
+        self.queue = MagicMock()
+        pool_patcher = patch(
+            "scripts.workers.submission_worker.create_submission_evaluation_pool",
+            side_effect=lambda concurrency: futures.ThreadPoolExecutor(
+                concurrency
+            ),
+        )
+        pool_patcher.start()
+        self.addCleanup(pool_patcher.stop)
+
+    def create_message(self, body):
+        message = MagicMock()
+        message.body = json.dumps(body)
+        return message
+
+    def stop_after_receive(self, messages):
+        def receive_messages(**kwargs):
+            self.killer.kill_now = True
+            return messages
+
+        self.queue.receive_messages.side_effect = receive_messages
+
+    @patch("scripts.workers.submission_worker.time.sleep")
+    @patch("scripts.workers.submission_worker.process_submission_callback")
+    def test_messages_are_evaluated_and_deleted(
+        self, mock_process_submission_callback, mock_sleep
+    ):
+        messages = [
+            self.create_message({"submission_pk": 1}),
+            self.create_message({"submission_pk": 2}),
+        ]
+        self.stop_after_receive(messages)
+
+        evaluate_submissions_concurrently(self.queue, self.killer, 2)
+
+        self.queue.receive_messages.assert_called_once_with(
+            WaitTimeSeconds=20, MaxNumberOfMessages=2
+        )
+        mock_process_submission_callback.assert_has_calls(
+            [mock.call(message.body) for message in messages],
+            any_order=True,
+        )
+        for message in messages:
+            message.delete.assert_called_once()
+        mock_sleep.assert_not_called()
+
+    @patch("scripts.workers.submission_worker.process_submission_callback")
+    def test_failed_evaluation_process_leaves_message_on_queue(
+        self, mock_process_submission_callback
+    ):
+        message = self.create_message({"submission_pk": 1})
+        self.stop_after_receive([message])
+        mock_process_submission_callback.side_effect = RuntimeError
+
+        evaluate_submissions_concurrently(self.queue, self.killer, 2)
+
+        message.delete.assert_not_called()
+
+    @patch("scripts.workers.submission_worker.time.sleep")
+    @patch("scripts.workers.submission_worker.process_submission_callback")
+    @patch(
+        "scripts.workers.submission_worker.acquire_submission_evaluation_lease",
+        return_value=None,
+    )
+    def test_messages_are_skipped_when_challenge_is_at_capacity(
+        self,
+        mock_acquire_submission_evaluation_lease,
+        mock_process_submission_callback,
+        mock_sleep,
+    ):
+        message = self.create_message({"submission_pk": 1})
+        self.stop_after_receive([message])
+
+        evaluate_submissions_concurrently(
+            self.queue,
+            self.killer,
+            2,
+            challenge=MagicMock(),
+            maximum_concurrent_submissions=1,
+        )
+
+        mock_process_submission_callback.assert_not_called()
+        message.delete.assert_not_called()
+        mock_sleep.assert_called_once_with(60)
+
+
+class SubmissionEvaluationPoolTest(TestCase):
+    def test_pool_processes_drop_the_inherited_database_connections(self):
+        with patch(
+            "scripts.workers.submission_worker.futures.ProcessPoolExecutor"
+        ) as mock_executor:
+            create_submission_evaluation_pool(2)
+        self.assertEqual(
+            mock_executor.call_args[1]["initializer"],
+            close_inherited_database_connections,
+        )
+
+    @patch("scripts.workers.submission_worker.django.db.connections")
+    def test_inherited_database_connections_are_detached(
+        self, mock_connections
+    ):
+        connection = MagicMock()
+        raw_connection = connection.connection
+        mock_connections.all.return_value = [connection]
+
+        close_inherited_database_connections()
+
+        self.assertIsNone(connection.connection)
+        raw_connection.close.assert_not_called()
+        mock_connections.close_all.assert_called_once_with()
+
+
+class SubmissionEvaluationSlotsTest(BaseAPITestClass):
+    def create_message(self, body):
+        message = MagicMock()
+        message.body = json.dumps(body)
+        return message
+
+    def test_slots_without_challenge_are_bounded_by_the_semaphore(self):
+        evaluation_slots = SubmissionEvaluationSlots(1)
+        first_message = self.create_message({"submission_pk": 1})
+
+        self.assertTrue(evaluation_slots.acquire(first_message))
+        self.assertFalse(
+            evaluation_slots.acquire(self.create_message({"submission_pk": 2}))
+        )
+        evaluation_slots.release(first_message)
+        self.assertFalse(SubmissionEvaluationLease.objects.exists())
+
+    def test_slots_of_a_challenge_are_held_as_leases(self):
+        evaluation_slots = SubmissionEvaluationSlots(
+            2, challenge=self.challenge, maximum_concurrent_submissions=2
+        )
+        message = self.create_message({"submission_pk": self.submission.pk})
+
+        self.assertTrue(evaluation_slots.acquire(message))
+        lease = SubmissionEvaluationLease.objects.get()
+        self.assertEqual(lease.submission_pk, self.submission.pk)
+        self.assertEqual(lease.worker_id, evaluation_slots.worker_id)
+
+        evaluation_slots.release(message)
+        self.assertFalse(SubmissionEvaluationLease.objects.exists())
+
+    def test_slot_is_not_taken_when_other_workers_hold_the_leases(self):
+        SubmissionEvaluationLease.objects.create(
+            challenge=self.challenge, worker_id="other-worker"
+        )
+        evaluation_slots = SubmissionEvaluationSlots(
+            2, challenge=self.challenge, maximum_concurrent_submissions=1
+        )
+
+        self.assertFalse(
+            evaluation_slots.acquire(self.create_message({"submission_pk": 1}))
+        )
+        # The local slot is given back when no lease could be taken
+        self.assertTrue(evaluation_slots.semaphore.acquire(blocking=False))
+
+    def test_dispatched_submissions_count_towards_the_limit(self):
+        evaluation_slots = SubmissionEvaluationSlots(
+            2, challenge=self.challenge, maximum_concurrent_submissions=1
+        )
+
+        # Neither submission is running yet, as when both messages are
+        # received by the same poll
+        self.assertTrue(
+            evaluation_slots.acquire(self.create_message({"submission_pk": 1}))
+        )
+        self.assertFalse(
+            evaluation_slots.acquire(self.create_message({"submission_pk": 2}))
+        )
@@ -16,13 +16,13 @@ class TestEvalAIInterface(unittest.TestCase):
         )
 
     @patch(
-        "scripts.workers.worker_utils.requests.request"
+        "scripts.workers.http_client.requests.Session.request"
     )  # Adjust the import path
     def test_get_request_headers(self, mock_request):
         headers = self.api.get_request_headers()
         self.assertEqual(headers, {"Authorization": "Bearer dummy_token"})
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_make_request_success(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"key": "value"}
@@ -40,7 +40,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_make_request_failure(self, mock_request):
         mock_request.side_effect = requests.exceptions.RequestException
 
@@ -52,7 +52,7 @@ class TestEvalAIInterface(unittest.TestCase):
         full_url = self.api.return_url_per_environment(url)
         self.assertEqual(full_url, "http://dummy.api.server/api/test")
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_message_from_sqs_queue(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"message": "test"}
@@ -68,7 +68,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_submission_by_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"submission": "data"}
@@ -84,7 +84,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_challenge_phases_by_challenge_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"phases": "data"}
@@ -100,7 +100,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_challenge_by_queue_name(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"challenge": "data"}
@@ -116,7 +116,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_challenge_phase_by_pk(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"phase": "data"}
@@ -132,7 +132,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_update_submission_data(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"result": "success"}
@@ -149,7 +149,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=data,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_update_submission_status(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"result": "success"}
@@ -166,7 +166,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=data,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_aws_eks_bearer_token(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"token": "token_data"}
@@ -182,7 +182,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_get_aws_eks_cluster_details(self, mock_request):
         mock_response = MagicMock()
         mock_response.json.return_value = {"cluster": "details"}
@@ -198,7 +198,7 @@ class TestEvalAIInterface(unittest.TestCase):
             data=None,
         )
 
-    @patch("scripts.workers.worker_utils.requests.request")
+    @patch("scripts.workers.http_client.requests.Session.request")
     def test_delete_message_from_sqs_queue(self, mock_request):
         # Mock the response of the requests.request method
         mock_response = MagicMock()
@@ -222,3 +222,47 @@ class TestEvalAIInterface(unittest.TestCase):
             data=expected_data,
         )
         self.assertEqual(response, {"result": "success"})
+
+    @patch("scripts.workers.http_client.requests.Session.request")
+    def test_get_messages_from_sqs_queue(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"messages": []}
+        mock_request.return_value = mock_response
+
+        response = self.api.get_messages_from_sqs_queue(
+            max_messages=5, wait_time=10, visibility_timeout=600
+        )
+        self.assertEqual(response, {"messages": []})
+        mock_request.assert_called_once_with(
+            method="GET",
+            url="http://dummy.api.server/api/jobs/challenge/queues/dummy_queue/messages/?max_messages=5&wait_time=10&visibility_timeout=600",
+            headers=self.api.get_request_headers(),
+            data=None,
+        )
+
+    @patch("scripts.workers.http_client.requests.Session.request")
+    def test_delete_messages_from_sqs_queue(self, mock_request):
+        mock_response = MagicMock()
+        mock_response.json.return_value = {"successful": ["a", "b"]}
+        mock_request.return_value = mock_response
+
+        response = self.api.delete_messages_from_sqs_queue(["a", "b"])
+        self.assertEqual(response, {"successful": ["a", "b"]})
+        mock_request.assert_called_once_with(
+            method="POST",
+            url="http://dummy.api.server/api/jobs/queues/dummy_queue/messages/delete/",
+            headers=self.api.get_request_headers(),
+            data={"receipt_handles": ["a", "b"]},
+        )
+
+    @patch("scripts.workers.http_client.requests.Session.request")
+    def test_change_messages_visibility(self, mock_request):
+        mock_request.return_value = MagicMock()
+
+        self.api.change_messages_visibility(["a"], 900)
+        mock_request.assert_called_once_with(
+            method="POST",
+            url="http://dummy.api.server/api/jobs/queues/dummy_queue/messages/visibility/",
+            headers=self.api.get_request_headers(),
+            data={"receipt_handles": ["a"], "visibility_timeout": 900},
+        )